@@ -1,8 +1,9 @@
 from UML_model.uml_element import UMLElement
 from UML_model.uml_relation import UMLRelation
 from grading.grade_reference import GradeReference
+from tools.name_normalizer import NameNormalizer, NormalizedName
 
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from enum import Enum
 import textwrap
 import re
@@ -85,8 +86,11 @@ class UMLVisibility(Enum):
 
 class UMLAttribute(GradeReference):
     # NOTE: add other specifications if needed (e.g. multiplicity constraints or modifier)
+    __slots__ = ("name", "norm", "data_type", "initial", "visibility", "derived", "reference", "multiplicity")
+
     def __init__(self, name: str, data_type: UMLDataType = UMLDataType.UNKNOWN, initial: str = "", visibility: UMLVisibility = UMLVisibility.UNKNOWN, derived: bool = False, multiplicity: str = ""):
         self.name: str = name
+        self.norm: NormalizedName = NameNormalizer.normalize(name)
         self.data_type: UMLDataType = data_type
         self.initial: str = initial
         self.visibility: UMLVisibility = visibility
@@ -175,8 +179,11 @@ class UMLAttribute(GradeReference):
 
 class UMLOperation(GradeReference):
     # NOTE: add other specifications if needed (e.g. modifier)
+    __slots__ = ("name", "norm", "params", "return_types", "visibility", "reference")
+
     def __init__(self, name: str, params: Optional[Dict[str, UMLDataType]] = None, return_types: Optional[List[UMLDataType]] = None, visibility: UMLVisibility = UMLVisibility.UNKNOWN):
         self.name: str = name
+        self.norm: NormalizedName = NameNormalizer.normalize(name)
         self.params: Dict[str, UMLDataType] = params if params is not None else {}
         self.return_types: List[UMLDataType] = return_types if return_types is not None else [UMLDataType.VOID]
         self.visibility: UMLVisibility = visibility 
@@ -288,15 +295,17 @@ class UMLClass(UMLElement, GradeReference):
             ends.append(rel.destination)
         return ends
     
-    def find_attribute(self, attribute_name: str) -> Optional[UMLAttribute]:
+    def find_attribute(self, attribute_name: Union[str, NormalizedName]) -> Optional[UMLAttribute]:
+        key = NameNormalizer.lower_form(attribute_name)
         for att in self.attributes:
-            if att.name.lower().strip() == attribute_name.lower().strip():
+            if att.norm.lower == key:
                 return att
         return None
     
-    def find_operation(self, operation_name: str) -> Optional[UMLOperation]:
+    def find_operation(self, operation_name: Union[str, NormalizedName]) -> Optional[UMLOperation]:
+        key = NameNormalizer.lower_form(operation_name)
         for opr in self.operations:
-            if opr.name.lower().strip() == operation_name.lower().strip():
+            if opr.norm.lower == key:
                 return opr
         return None
     
@@ -1,8 +1,14 @@
+from tools.name_normalizer import NameNormalizer, NormalizedName
 from abc import ABC, abstractmethod
 
 class UMLElement(ABC):
+    # NOTE: UMLRelation declares its own __slots__ and carries no __dict__, UMLClass and UMLEnum declare none and keep one
+    __slots__ = ("name", "norm")
+
     def __init__(self, name: str):
         self.name: str = name  
+        # NOTE: precomputed name forms, the name is not changed after construction
+        self.norm: NormalizedName = NameNormalizer.normalize(name)
 
     def __str__(self):
         return f"{self.__class__.__name__}({getattr(self, 'name', '-')})"
@@ -1,12 +1,16 @@
 from UML_model.uml_element import UMLElement
 from UML_model.uml_relation import UMLRelation
 from grading.grade_reference import GradeReference
+from tools.name_normalizer import NameNormalizer, NormalizedName
 
 from typing import List, Optional
 
 class UMLValue(GradeReference):
+    __slots__ = ("name", "norm", "reference")
+
     def __init__(self, name: str):
         self.name = name
+        self.norm: NormalizedName = NameNormalizer.normalize(name)
         self.reference: Optional[UMLEnum] = None  
 
     def __repr__(self):
@@ -0,0 +1,140 @@
+from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation
+from UML_model.uml_enum import UMLEnum
+from UML_model.uml_relation import UMLRelation, UMLRelationType
+from UML_model.uml_element import UMLElement
+from tools.instrumentation import Instrumentation
+
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+class UMLGraphIndex:
+    # NOTE: built once per model from the assigned element relations (see UMLModel.graph_index)
+    # and shared by all comparators, changes to the model after the first access are not reflected
+    # elements are keyed by id() since hashing a UMLClass hashes its whole content
+    def __init__(self, class_list: List[UMLClass], enum_list: List[UMLEnum], relation_list: List[UMLRelation]):
+        self.elements: List[Union[UMLClass, UMLEnum]] = class_list + enum_list
+        self.relations_by_type: Dict[int, Dict[UMLRelationType, List[UMLRelation]]] = {}
+        self.relation_ends_map: Dict[int, List[UMLElement]] = {}
+        for elm in self.elements:
+            by_type: Dict[UMLRelationType, List[UMLRelation]] = {}
+            for rel in elm.relations:
+                by_type.setdefault(rel.type, []).append(rel)
+            self.relations_by_type[id(elm)] = by_type
+            self.relation_ends_map[id(elm)] = [rel.destination for rel in elm.relations]
+
+        # NOTE: same graph as the former UMLModel.build_reachability_map, only relations between classes and enums,
+        # undirected relations in both directions
+        self.adjacency: Dict[int, List[UMLElement]] = {id(elm): [] for elm in self.elements}
+        self.self_related: Set[int] = set()
+        for rel in relation_list:
+            if isinstance(rel.source, (UMLClass, UMLEnum)) and isinstance(rel.destination, (UMLClass, UMLEnum)):
+                self.adjacency.setdefault(id(rel.source), []).append(rel.destination)
+                if not rel.directed:
+                    self.adjacency.setdefault(id(rel.destination), []).append(rel.source)
+                if rel.source is rel.destination:
+                    self.self_related.add(id(rel.source))
+        self.reach_cache: Dict[Tuple[int, Optional[int]], Tuple[List[UMLElement], FrozenSet[int]]] = {}
+
+        # NOTE: inheritance closure, filled on demand from super_class so it also works for classes outside of the model
+        self.ancestor_cache: Dict[int, Tuple[List[UMLClass], FrozenSet[int]]] = {}
+        self.inherited_member_cache: Dict[int, FrozenSet[int]] = {}
+
+    def __repr__(self):
+        return f"UMLGraphIndex(elements: {len(self.elements)}, edges: {sum(len(ends) for ends in self.adjacency.values())})"
+
+    def relations(self, elm: UMLElement, rel_type: Optional[UMLRelationType] = None) -> List[UMLRelation]:
+        by_type = self.relations_by_type.get(id(elm), {})
+        if rel_type is None:
+            return [rel for rels in by_type.values() for rel in rels]
+        return by_type.get(rel_type, [])
+
+    def relation_ends(self, elm: UMLElement) -> List[UMLElement]:
+        # same as UMLClass.get_relation_ends without rebuilding the list
+        return self.relation_ends_map.get(id(elm), [])
+
+    def neighbors(self, elm: UMLElement, rel_type: Optional[UMLRelationType] = None) -> List[UMLElement]:
+        if rel_type is None:
+            return self.relation_ends(elm)
+        return [rel.destination for rel in self.relations_by_type.get(id(elm), {}).get(rel_type, [])]
+
+    def degree(self, elm: UMLElement, rel_type: Optional[UMLRelationType] = None) -> int:
+        if rel_type is None:
+            return len(self.relation_ends(elm))
+        return len(self.relations_by_type.get(id(elm), {}).get(rel_type, []))
+
+    def reachable(self, elm: UMLElement, k: Optional[int] = None) -> List[UMLElement]:
+        # elements reachable within k hops (all if k is None), the element itself only if it has a self relation
+        return self._reach(elm, k)[0]
+
+    def reachable_ids(self, elm: UMLElement, k: Optional[int] = None) -> FrozenSet[int]:
+        # for fast membership checks: id(other) in index.reachable_ids(elm)
+        return self._reach(elm, k)[1]
+
+    def reachability_map(self, k: Optional[int] = None) -> Dict[UMLElement, List[UMLElement]]:
+        return {elm: self.reachable(elm, k) for elm in self.elements}
+
+    def ancestors(self, cls: UMLClass) -> List[UMLClass]:
+        # all super classes up to the root of the hierarchy, nearest first
+        return self._ancestors(cls)[0]
+
+    def is_ancestor(self, ancestor: UMLClass, cls: UMLClass) -> bool:
+        return id(ancestor) in self._ancestors(cls)[1]
+
+    def inherited_member_ids(self, cls: UMLClass) -> FrozenSet[int]:
+        # ids of all attributes and operations the class inherits from any of its ancestors
+        cached = self.inherited_member_cache.get(id(cls))
+        if cached is None:
+            cached = frozenset(
+                id(member) for ancestor in self.ancestors(cls) for member in (*ancestor.attributes, *ancestor.operations)
+            )
+            self.inherited_member_cache[id(cls)] = cached
+        return cached
+
+    def inherits(self, cls: UMLClass, member: Union[UMLAttribute, UMLOperation]) -> bool:
+        return id(member) in self.inherited_member_ids(cls)
+
+    def _ancestors(self, cls: UMLClass) -> Tuple[List[UMLClass], FrozenSet[int]]:
+        cached = self.ancestor_cache.get(id(cls))
+        if cached is not None:
+            return cached
+        chain: List[UMLClass] = []
+        seen: Set[int] = {id(cls)}
+        current = cls.super_class
+        while current is not None and id(current) not in seen:
+            known = self.ancestor_cache.get(id(current))
+            if known is not None:
+                # reuse the closure of an already resolved super class, a cycle back to cls is cut off
+                chain.append(current)
+                chain.extend(anc for anc in known[0] if id(anc) not in seen and anc is not current)
+                break
+            seen.add(id(current))
+            chain.append(current)
+            current = current.super_class
+        result = (chain, frozenset(id(anc) for anc in chain))
+        self.ancestor_cache[id(cls)] = result
+        return result
+
+    def _reach(self, elm: UMLElement, k: Optional[int]) -> Tuple[List[UMLElement], FrozenSet[int]]:
+        key = (id(elm), k)
+        cached = self.reach_cache.get(key)
+        if cached is not None:
+            Instrumentation.count("reach_cache_hits")
+            return cached
+        Instrumentation.count("reach_cache_misses")
+        visited: Set[int] = {id(elm)}
+        reachable: List[UMLElement] = []
+        queue = deque([(elm, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            if k is not None and depth >= k:
+                continue
+            for neighbor in self.adjacency.get(id(current), []):
+                if id(neighbor) not in visited:
+                    visited.add(id(neighbor))
+                    reachable.append(neighbor)
+                    queue.append((neighbor, depth + 1))
+        if id(elm) in self.self_related:
+            reachable.append(elm)
+        result = (reachable, frozenset(id(r) for r in reachable))
+        self.reach_cache[key] = result
+        return result
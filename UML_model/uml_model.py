@@ -2,19 +2,30 @@ from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation
 from UML_model.uml_enum import UMLEnum, UMLValue
 from UML_model.uml_relation import UMLRelation, UMLRelationType
 from UML_model.uml_element import UMLElement
-from tools.UML_parser import UMLParser
+from UML_model.uml_graph_index import UMLGraphIndex
+from tools.UML_parser import UMLParser, ParseBudget, ParseAbortedError
+from tools.name_normalizer import NameNormalizer, NormalizedName
 
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Union
 import textwrap
 import shutil
+import logging
+
+logger = logging.getLogger("uml.model")
+logger.setLevel(logging.INFO)
 
 class UMLModel:
-    def __init__(self, plantuml_str: str = None, class_list: List[UMLClass] = None, enum_list: List[UMLEnum] = None, relation_list: List[UMLRelation] = None):
-        
+    def __init__(self, plantuml_str: str = None, class_list: List[UMLClass] = None, enum_list: List[UMLEnum] = None, relation_list: List[UMLRelation] = None, budget: Optional[ParseBudget] = None):
+        # NOTE: without a budget the diagram is parsed without limits,
+        # parse_error is set if parsing exceeded the budget, the model is empty in that case
+        self.parse_error: Optional[ParseAbortedError] = None
         if plantuml_str:
-            self.class_list: List[UMLClass] = UMLParser.parse_plantuml_classes(plantuml_str)
-            self.enum_list: List[UMLEnum] = UMLParser.parse_plantuml_enums(plantuml_str)
-            self.relation_list: List[UMLRelation] = UMLParser.parse_plantuml_relations(plantuml_str, self.class_list, self.enum_list)
+            try:
+                self.class_list, self.enum_list, self.relation_list = UMLParser.parse_plantuml(plantuml_str, budget)
+            except ParseAbortedError as error:
+                logger.warning(f"{error}, the model is left empty")
+                self.parse_error = error
+                self.class_list, self.enum_list, self.relation_list = [], [], []
         else:
             self.class_list: List[UMLClass] = class_list or []
             self.enum_list: List[UMLEnum] = enum_list or []
@@ -36,18 +47,24 @@ class UMLModel:
         self.association_link_list: List[UMLRelation] = [rel for rel in self.relation_list if rel.type == UMLRelationType.ASSOCIATION_LINK]
                 
 
-        self.class_lookup: Dict[str, UMLClass] = {cls.name.lower().strip(): cls for cls in self.class_list}
-        self.enum_lookup: Dict[str, UMLEnum] = {enu.name.lower().strip(): enu for enu in self.enum_list}
-        self.relation_lookup: Dict[str, UMLRelation] = {rel.name.lower().strip(): rel for rel in self.relation_list}
+        self.class_lookup: Dict[str, UMLClass] = {cls.norm.lower: cls for cls in self.class_list}
+        self.enum_lookup: Dict[str, UMLEnum] = {enu.norm.lower: enu for enu in self.enum_list}
+        self.relation_lookup: Dict[str, UMLRelation] = {rel.norm.lower: rel for rel in self.relation_list}
         self.element_list: List[UMLElement] = self.class_list + self.enum_list + self.relation_list
         self.element_lookup: Dict[str, UMLElement] = self.class_lookup | self.enum_lookup | self.relation_lookup
 
         if self.relation_list:
             self.assign_relations()
+        # NOTE: built on first access, see graph_index
+        self._graph_index: Optional[UMLGraphIndex] = None
 
     def __repr__(self): 
         return f"UMLModel(\nClasses = [{', '.join(cls.name for cls in self.class_list)}], \nEnums = [{', '.join(e.name for e in self.enum_list)}], \nRelations = [{', '.join(str(r) for r in self.relation_list)}])"
 
+    @property
+    def parse_aborted(self) -> bool:
+        return self.parse_error is not None
+
     def __str__(self):
         return f"UMLModel(Classes: {len(self.class_list)}, Enums: {len(self.enum_list)}, Relations: {len(self.relation_list)})"
     
@@ -69,55 +86,35 @@ class UMLModel:
     def assign_relations(self):
         for relation in self.relation_list:
             if isinstance(relation.source, UMLElement) and isinstance(relation.destination, UMLElement):
-                UMLModel.find_element(self, relation.source.name).add_relation(relation)
+                UMLModel.find_element(self, relation.source.norm).add_relation(relation)
                 if isinstance(relation.source, UMLClass) and isinstance(relation.destination, UMLClass) and relation.type == UMLRelationType.GENERALIZATION:
                     relation.source.assign_super_class(relation.destination)
                     relation.destination.add_sub_class(relation.source)
                 if not relation.directed:
-                    UMLModel.find_element(self, relation.destination.name).add_relation(relation.swap_source_destination())
+                    UMLModel.find_element(self, relation.destination.norm).add_relation(relation.swap_source_destination())
 
-    def find_element(self, element_name: str) -> Optional[UMLElement]:
-        return self.element_lookup.get(element_name.lower().strip())
+    # NOTE: the find methods accept raw names or the precomputed element.norm
+    def find_element(self, element_name: Union[str, NormalizedName]) -> Optional[UMLElement]:
+        return self.element_lookup.get(NameNormalizer.lower_form(element_name))
     
-    def find_class(self, class_name: str) -> Optional[UMLClass]:
-        return self.class_lookup.get(class_name.lower().strip())
+    def find_class(self, class_name: Union[str, NormalizedName]) -> Optional[UMLClass]:
+        return self.class_lookup.get(NameNormalizer.lower_form(class_name))
     
-    def find_enum(self, enum_name: str) -> Optional[UMLEnum]:
-        return self.enum_lookup.get(enum_name.lower().strip())
+    def find_enum(self, enum_name: Union[str, NormalizedName]) -> Optional[UMLEnum]:
+        return self.enum_lookup.get(NameNormalizer.lower_form(enum_name))
     
-    def find_relation(self, relation_name: str) -> Optional[UMLRelation]:
-        return self.relation_lookup.get(relation_name.lower().strip())
+    def find_relation(self, relation_name: Union[str, NormalizedName]) -> Optional[UMLRelation]:
+        return self.relation_lookup.get(NameNormalizer.lower_form(relation_name))
 
-    def build_reachability_map(self) -> Dict[UMLElement, List[UMLElement]]:
-        cls_enum_list = self.class_list + self.enum_list
-        adjacency_reach_map: Dict[UMLElement, List[UMLElement]] = {elem: [] for elem in cls_enum_list}
-        elem_relations: List[UMLRelation] = [relation for relation in self.relation_list if isinstance(relation.source, (UMLClass, UMLEnum)) and isinstance(relation.destination, (UMLClass, UMLEnum))]
-        for relation in elem_relations:
-            adjacency_reach_map[relation.source].append(relation.destination)
-            if not relation.directed:
-                adjacency_reach_map[relation.destination].append(relation.source)
-        
-        def dfs(elm: UMLElement, visited: Set[UMLElement]):
-            for neighbor in adjacency_reach_map.get(elm, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    dfs(neighbor, visited)
-
-        reach_map: Dict[UMLElement, List[UMLElement]] = {}
-        for elm in cls_enum_list:
-            visited: Set[UMLElement] = set()
-            visited.add(elm)
-            dfs(elm, visited)
-            reachable = list(visited - {elm})
-            has_self_relation = any(
-                rel.source == elm and rel.destination == elm
-                for rel in self.relation_list
-            )
-            if has_self_relation:
-                reachable.append(elm)
-            reach_map[elm] = reachable
+    @property
+    def graph_index(self) -> UMLGraphIndex:
+        # adjacency, degree and reachability index shared by all comparators
+        if self._graph_index is None:
+            self._graph_index = UMLGraphIndex(self.class_list, self.enum_list, self.relation_list)
+        return self._graph_index
 
-        return reach_map
+    def build_reachability_map(self) -> Dict[UMLElement, List[UMLElement]]:
+        return self.graph_index.reachability_map()
 
     def print_details(self):
         term_width = shutil.get_terminal_size((80, 20)).columns  - 10
@@ -36,6 +36,8 @@ class UMLRelationType(Enum):
 
 
 class UMLRelation(UMLElement, GradeReference):
+    __slots__ = ("type", "source", "destination", "s_multiplicity", "d_multiplicity", "description", "directed")
+
     def __init__(self, type: UMLRelationType, source: UMLElement, destination: UMLElement, s_multiplicity: str = "", d_multiplicity: str = "", description: str = ""):
         self.type: UMLRelationType = type
         self.source: UMLElement = source
@@ -0,0 +1,216 @@
+from UML_model.uml_model import UMLModel
+from UML_model.uml_element import UMLElement
+from UML_model.uml_relation import UMLRelation, UMLRelationType
+from grading.grade_metamodel import GradeModel, FeatureType
+from tools.UML_serializer import UMLSerializer
+
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import msgpack
+
+logger = logging.getLogger("grade_file")
+logger.setLevel(logging.DEBUG)
+
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] - %(name)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+GRADE_FORMAT_VERSION = 1
+# decimals of the point totals written by to_spec
+POINT_DIGITS = 10
+
+# allowed keys per section with their point arguments of the add_*_grade_structure methods
+CLASS_POINTS: Dict[str, str] = {"exists": "exists_points", "attributes": "attribute_points", "operations": "operation_points"}
+ENUM_POINTS: Dict[str, str] = {"exists": "exists_points", "values": "all_value_points"}
+RELATION_POINTS: Dict[str, str] = {"exists": "exists_points", "structure": "relation_structure_points"}
+RELATION_KEYS: List[str] = ["relation", "source", "destination", "type"]
+
+class GradeModelFile:
+    # NOTE: grade models as JSON, points are bound to the instructor elements by name, e.g.
+    # {"format": 1, "name": "SS2015",
+    #  "classes": [{"name": "Square", "exists": 1.0, "attributes": 0.5}],
+    #  "enums": [{"name": "Color", "exists": 0.5, "values": 0.5}],
+    #  "relations": [{"relation": "(Square, Square)", "exists": 0.5, "structure": 0.5},
+    #                {"source": "Type", "destination": "Move", "type": "aggregation", "exists": 0.5, "structure": 0.5}]}
+    # relations are found by their name (see UMLModel.relation_lookup) or by their signature of source, destination and optional type,
+    # the ends of a signature can be relation names as well, e.g. "(Position, Piece)" for an association link
+    @staticmethod
+    def resolve_relation(entry: Dict[str, Any], uml_model: UMLModel) -> Tuple[Optional[UMLRelation], Optional[str]]:
+        # (relation, None) or (None, error)
+        relation_type: Optional[UMLRelationType] = None
+        if "type" in entry:
+            try:
+                relation_type = UMLRelationType(entry["type"])
+            except ValueError:
+                return (None, f"unknown relation type '{entry['type']}'")
+        if "relation" in entry:
+            relation = uml_model.find_relation(entry["relation"])
+            if relation is None:
+                return (None, f"relation '{entry['relation']}' not found")
+            if relation_type is not None and relation.type != relation_type:
+                return (None, f"relation '{entry['relation']}' is a {relation.type.value}, not a {relation_type.value}")
+            return (relation, None)
+        if "source" not in entry or "destination" not in entry:
+            return (None, "relation entry needs 'relation' or 'source' and 'destination'")
+        source: Optional[UMLElement] = uml_model.find_element(entry["source"])
+        destination: Optional[UMLElement] = uml_model.find_element(entry["destination"])
+        if source is None or destination is None:
+            return (None, f"relation ends '{entry['source']}', '{entry['destination']}' not found")
+        candidates = [
+            rel for rel in uml_model.relation_list
+            if rel.source is source and rel.destination is destination and (relation_type is None or rel.type == relation_type)
+        ]
+        if len(candidates) != 1:
+            return (None, f"relation {entry['source']} -> {entry['destination']} matches {len(candidates)} relations")
+        return (candidates[0], None)
+
+    @staticmethod
+    def bind(spec: Dict[str, Any], uml_model: UMLModel) -> Tuple[List[Tuple[str, UMLElement, Dict[str, float]]], List[str]]:
+        # the (section, element, keyword arguments) of every entry and all errors found on the way
+        bindings: List[Tuple[str, UMLElement, Dict[str, float]]] = []
+        errors: List[str] = []
+        if spec.get("format") != GRADE_FORMAT_VERSION:
+            errors.append(f"unsupported format {spec.get('format')}, expected {GRADE_FORMAT_VERSION}")
+        unknown_sections = set(spec) - {"format", "name", "classes", "enums", "relations"}
+        if unknown_sections:
+            errors.append(f"unknown sections {sorted(unknown_sections)}")
+
+        bound_ids = set()
+        for section, points in [("classes", CLASS_POINTS), ("enums", ENUM_POINTS), ("relations", RELATION_POINTS)]:
+            for i, entry in enumerate(spec.get(section, [])):
+                where = f"{section}[{i}]"
+                unknown_keys = set(entry) - set(points) - ({"name"} if section != "relations" else set(RELATION_KEYS))
+                if unknown_keys:
+                    errors.append(f"{where}: unknown keys {sorted(unknown_keys)}")
+                if section == "relations":
+                    element, error = GradeModelFile.resolve_relation(entry, uml_model)
+                else:
+                    find, label = (uml_model.find_class, "class") if section == "classes" else (uml_model.find_enum, "enum")
+                    element = find(entry.get("name", ""))
+                    error = None if element else f"{label} '{entry.get('name')}' not found"
+                if error:
+                    errors.append(f"{where}: {error}")
+                    continue
+                if id(element) in bound_ids:
+                    errors.append(f"{where}: '{element.name}' is graded twice")
+                    continue
+                bound_ids.add(id(element))
+                kwargs: Dict[str, float] = {}
+                for key, argument in points.items():
+                    value = entry.get(key, 0.0)
+                    if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                        errors.append(f"{where}: '{key}' has to be a non negative number, got {value!r}")
+                        continue
+                    kwargs[argument] = float(value)
+                bindings.append((section, element, kwargs))
+        return (bindings, errors)
+
+    @staticmethod
+    def validate(spec: Dict[str, Any], uml_model: UMLModel) -> List[str]:
+        return GradeModelFile.bind(spec, uml_model)[1]
+
+    @staticmethod
+    def build(spec: Dict[str, Any], uml_model: UMLModel) -> GradeModel:
+        bindings, errors = GradeModelFile.bind(spec, uml_model)
+        if errors:
+            raise ValueError(f"Invalid grade model '{spec.get('name', '')}': " + "; ".join(errors))
+        grade_model = GradeModel(spec.get("name", ""), uml_model)
+        for section, element, kwargs in bindings:
+            if section == "classes":
+                grade_model.add_class_grade_structure(element, **kwargs)
+            elif section == "enums":
+                grade_model.add_enum_grade_structure(element, **kwargs)
+            else:
+                grade_model.add_relation_grade_structure(element, **kwargs)
+        return grade_model
+
+    @staticmethod
+    def to_spec(grade_model: GradeModel) -> Dict[str, Any]:
+        # the spec of an existing grade model, e.g. to convert grade models built in Python
+        def class_entry(obj) -> Dict[str, Any]:
+            type_features = obj.type_features
+            return {
+                "name": obj.element.name,
+                "exists": type_features[FeatureType.CLASS][0].points,
+                "attributes": type_features[FeatureType.ATTRIBUTE][0].points if FeatureType.ATTRIBUTE in type_features else 0.0,
+                "operations": type_features[FeatureType.OPERATION][0].points if FeatureType.OPERATION in type_features else 0.0
+            }
+
+        def enum_entry(obj) -> Dict[str, Any]:
+            # NOTE: the points of one value times the number of values, their float sum can be off (0.49999999999999994)
+            values = obj.type_features.get(FeatureType.VALUE, [])
+            return {
+                "name": obj.element.name,
+                "exists": obj.type_features[FeatureType.ENUM][0].points,
+                "values": round(values[0].points * len(values), POINT_DIGITS) if values else 0.0
+            }
+
+        def relation_entry(obj) -> Dict[str, Any]:
+            rel = obj.element
+            return {
+                "source": rel.source.name,
+                "destination": rel.destination.name,
+                "type": rel.type.value,
+                "exists": obj.type_features[FeatureType.RELATION][0].points,
+                "structure": obj.type_features[FeatureType.RELATION_STRUCTURE][0].points
+            }
+
+        return {
+            "format": GRADE_FORMAT_VERSION,
+            "name": grade_model.name,
+            "classes": [class_entry(obj) for obj in grade_model.classes if obj.st_features],
+            "enums": [enum_entry(obj) for obj in grade_model.enums if obj.st_features],
+            "relations": [relation_entry(obj) for obj in grade_model.relations if obj.st_features]
+        }
+
+    @staticmethod
+    def load_spec(path: str) -> Dict[str, Any]:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def dump_spec(spec: Dict[str, Any], path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(spec, file, indent=2)
+
+    @staticmethod
+    def load(path: str, uml_model: UMLModel) -> GradeModel:
+        return GradeModelFile.build(GradeModelFile.load_spec(path), uml_model)
+
+    # NOTE: a bundle is the compiled instructor model (see UMLSerializer) with its validated grade spec,
+    # workers load both without parsing PlantUML or running Python grade model code
+    @staticmethod
+    def dumps_bundle(uml_model: UMLModel, spec: Dict[str, Any]) -> bytes:
+        errors = GradeModelFile.validate(spec, uml_model)
+        if errors:
+            raise ValueError(f"Invalid grade model '{spec.get('name', '')}': " + "; ".join(errors))
+        return msgpack.packb({"model": UMLSerializer.model_to_tables(uml_model), "grade": spec}, use_bin_type=True)
+
+    @staticmethod
+    def loads_bundle(data: bytes) -> Tuple[UMLModel, GradeModel]:
+        bundle = msgpack.unpackb(data, raw=False, strict_map_key=False)
+        uml_model = UMLSerializer.model_from_tables(bundle["model"])
+        return (uml_model, GradeModelFile.build(bundle["grade"], uml_model))
+
+    @staticmethod
+    def dump_bundle(uml_model: UMLModel, spec: Dict[str, Any], path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(GradeModelFile.dumps_bundle(uml_model, spec))
+
+    @staticmethod
+    def load_bundle(path: str) -> Tuple[UMLModel, GradeModel]:
+        # NOTE: cached per process by path and modification time, the models are only read by the evaluation
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+        cached = BUNDLE_CACHE.get(key)
+        if cached is None:
+            with open(path, "rb") as file:
+                cached = GradeModelFile.loads_bundle(file.read())
+            BUNDLE_CACHE[key] = cached
+            logger.debug(f"loaded grade bundle {path}")
+        return cached
+
+BUNDLE_CACHE: Dict[Tuple[str, int], Tuple[UMLModel, GradeModel]] = {}
@@ -72,6 +72,11 @@ class GradeObject:
         self.element = element
         self.points: float = 0
         self.st_features: List[StructuralFeature] = []
+        # NOTE: st_features by (id(reference), type) and by type with the points per type, used by the temp_grade methods
+        # of GradeModel, kept in sync by add_st_feature and set_st_features
+        self.feature_index: Dict[Tuple[int, FeatureType], StructuralFeature] = {}
+        self.type_features: Dict[FeatureType, List[StructuralFeature]] = {}
+        self.type_points: Dict[FeatureType, float] = {}
 
     def __repr__(self):
         return f"GradeObject({str(self.element)}): {self.points} point/s, features -> {self.st_features}"
@@ -84,6 +89,29 @@ class GradeObject:
 
     def set_st_features(self, st_features: List[StructuralFeature]):
         self.st_features = st_features
+        self.feature_index = {}
+        self.type_features = {}
+        self.type_points = {}
+        for st_feature in st_features:
+            self.index_st_feature(st_feature)
+
+    def add_st_feature(self, st_feature: StructuralFeature):
+        self.st_features.append(st_feature)
+        self.points += st_feature.points
+        self.index_st_feature(st_feature)
+
+    def index_st_feature(self, st_feature: StructuralFeature):
+        # the first feature of a reference wins, same as scanning st_features
+        self.feature_index.setdefault((id(st_feature.reference), st_feature.type), st_feature)
+        self.type_features.setdefault(st_feature.type, []).append(st_feature)
+        self.type_points[st_feature.type] = self.type_points.get(st_feature.type, 0.0) + st_feature.points
+
+    def st_feature(self, reference: GradeReference, type: FeatureType) -> Optional[StructuralFeature]:
+        st_feature = self.feature_index.get((id(reference), type))
+        if st_feature is None:
+            # NOTE: fallback for copies of the instructor elements, compares the content like before
+            st_feature = next((feature for feature in self.type_features.get(type, []) if feature.reference == reference), None)
+        return st_feature
 
 class GradeModel:
     def __init__(self, name: str, uml_model: UMLModel):
@@ -100,10 +128,12 @@ class GradeModel:
         for rel in uml_model.relation_list:
             self.relations.append(GradeObject(rel))
         
-        # mostly for access in add-structure methods
-        self.class_lookup: Dict[str, GradeObject] = {cls.element: cls for cls in self.classes}
-        self.enum_lookup: Dict[str, GradeObject] = {enm.element: enm for enm in self.enums}
-        self.relation_lookup: Dict[str, GradeObject] = {rel.element: rel for rel in self.relations}
+        # NOTE: grade objects by id() of their element since hashing a UML element hashes its whole content,
+        # used by the add-structure methods and the temp_grade methods of the assignment solver
+        self.object_lists: Dict[FeatureType, List[GradeObject]] = {FeatureType.CLASS: self.classes, FeatureType.ENUM: self.enums, FeatureType.RELATION: self.relations}
+        self.object_index: Dict[FeatureType, Dict[int, GradeObject]] = {
+            type: {id(obj.element): obj for obj in grade_objects} for type, grade_objects in self.object_lists.items()
+        }
 
 
     def __repr__(self):
@@ -118,52 +148,46 @@ class GradeModel:
     def __str__(self):
         return f"GradeModel({self.name})"
 
+    def grade_object(self, element: UMLElement, type: FeatureType) -> Optional[GradeObject]:
+        # type is one of CLASS, ENUM and RELATION
+        grade_object = self.object_index[type].get(id(element))
+        if grade_object is None:
+            # NOTE: fallback for copies of the instructor elements, compares the content like before
+            grade_object = next((obj for obj in self.object_lists[type] if obj.element == element), None)
+        return grade_object
+
+    def add_st_feature(self, grade_object: GradeObject, st_feature: StructuralFeature):
+        grade_object.add_st_feature(st_feature)
+        self.total_points += st_feature.points
+
     def add_class_grade_structure(self, cls: UMLClass, exists_points: float = 0.0, attribute_points: float = 0.0, operation_points: float = 0.0):
-        grade_class = self.class_lookup.get(cls)
+        grade_class = self.grade_object(cls, FeatureType.CLASS)
         if not grade_class:
             raise ValueError(f"Class '{cls.name}' not found in model.")
         
-        grade_class.st_features.append(StructuralFeature(f"class \"{cls.name}\"", grade_class.element, exists_points))
-        grade_class.points += exists_points
-        self.total_points += exists_points
-
+        self.add_st_feature(grade_class, StructuralFeature(f"class \"{cls.name}\"", grade_class.element, exists_points))
         for att in grade_class.element.attributes:
-            grade_class.st_features.append(StructuralFeature(f"attribute \"{att.name}\"", att, attribute_points))
-            grade_class.points += attribute_points
-            self.total_points += attribute_points
-
+            self.add_st_feature(grade_class, StructuralFeature(f"attribute \"{att.name}\"", att, attribute_points))
         for opr in grade_class.element.operations:
-            grade_class.st_features.append(StructuralFeature(f"operation \"{opr.name}\"", opr, operation_points))
-            grade_class.points += operation_points
-            self.total_points += operation_points
+            self.add_st_feature(grade_class, StructuralFeature(f"operation \"{opr.name}\"", opr, operation_points))
 
     def add_enum_grade_structure(self, enm: UMLEnum, exists_points: float = 0.0, all_value_points: float = 0.0):
-        grade_enum = self.enum_lookup.get(enm)
+        grade_enum = self.grade_object(enm, FeatureType.ENUM)
         if not grade_enum:
             raise ValueError(f"Enum '{enm.name}' not found in model.")
         
-        grade_enum.st_features.append(StructuralFeature(f"enum \"{enm.name}\"", grade_enum.element, exists_points))
-        grade_enum.points += exists_points
-        self.total_points += exists_points
+        self.add_st_feature(grade_enum, StructuralFeature(f"enum \"{enm.name}\"", grade_enum.element, exists_points))
         value_points: float = all_value_points / len(grade_enum.element.values) if grade_enum.element.values else 0.0
-
         for val in grade_enum.element.values:
-            grade_enum.st_features.append(StructuralFeature(f"value \"{val.name}\"", val, value_points))
-            grade_enum.points += value_points
-            self.total_points += value_points
+            self.add_st_feature(grade_enum, StructuralFeature(f"value \"{val.name}\"", val, value_points))
 
     def add_relation_grade_structure(self, rel: UMLRelation, exists_points: float = 0.0, relation_structure_points: float = 0.0):
-        grade_relation = self.relation_lookup.get(rel)
+        grade_relation = self.grade_object(rel, FeatureType.RELATION)
         if not grade_relation:
             raise ValueError(f"Relation '{rel.name}' not found in model.")
         
-        grade_relation.st_features.append(StructuralFeature(f"relation \"{rel.name}\"", grade_relation.element, exists_points))
-        grade_relation.points += exists_points
-        self.total_points += exists_points
-
-        grade_relation.st_features.append(StructuralFeature(f"relation structure {rel.to_plantuml()}", rel, relation_structure_points, FeatureType.RELATION_STRUCTURE))
-        grade_relation.points += relation_structure_points
-        self.total_points += relation_structure_points
+        self.add_st_feature(grade_relation, StructuralFeature(f"relation \"{rel.name}\"", grade_relation.element, exists_points))
+        self.add_st_feature(grade_relation, StructuralFeature(f"relation structure {rel.to_plantuml()}", rel, relation_structure_points, FeatureType.RELATION_STRUCTURE))
 
     def grade_attribute(self, st_feature: StructuralFeature, att: UMLAttribute, class_match_map: Optional[Dict[UMLClass, UMLClass]] = None) -> float:
         # attribute found -> 1/2 points
@@ -239,7 +263,7 @@ class GradeModel:
         if stud_class_element_list:
             all_temp_grades: List[float] = []
             for element in stud_class_element_list:
-                if st_feature.reference.name == element.name or SyntacticCheck.syntactic_match(element.name, st_feature.reference.name)[0] or SemanticCheck.semantic_match(element.name, st_feature.reference.name)[0]:
+                if st_feature.reference.name == element.name or SyntacticCheck.syntactic_match(element.norm, st_feature.reference.norm)[0] or SemanticCheck.semantic_match(element.norm, st_feature.reference.norm)[0]:
                     if isinstance(element, UMLAttribute):
                         all_temp_grades.append(self.grade_attribute(st_feature, element))
                     elif isinstance(element, UMLOperation):
@@ -258,89 +282,81 @@ class GradeModel:
 
     def temp_grade_class(self, stud_class: UMLClass, mapped_inst_class: UMLClass) -> Tuple[float, float]:
         temp_grade: float = 0.0
-        grade_class: GradeObject = next((cls for cls in self.classes if cls.element == mapped_inst_class), None)
+        grade_class: GradeObject = self.grade_object(mapped_inst_class, FeatureType.CLASS)
         if not grade_class:
             raise ValueError(f"Class '{mapped_inst_class.name}' not found in model.")
-        for st_feature in grade_class.st_features:
-            if st_feature.type == FeatureType.CLASS:
-                # class exists -> points
+        # class exists -> points, the features are looked up by type instead of scanning st_features
+        temp_grade += grade_class.type_points.get(FeatureType.CLASS, 0.0) / 2
+        for st_feature in grade_class.type_features.get(FeatureType.CLASS, []):
+            if st_feature.reference.name == stud_class.name or SyntacticCheck.syntactic_match(stud_class.norm, st_feature.reference.norm)[0] or SemanticCheck.semantic_match(stud_class.norm, st_feature.reference.norm)[0]:
+                # name match -> 1/2 points
                 temp_grade += st_feature.points / 2
-                if st_feature.reference.name == stud_class.name or SyntacticCheck.syntactic_match(stud_class.name, st_feature.reference.name)[0] or SemanticCheck.semantic_match(stud_class.name, st_feature.reference.name)[0]:
-                    # name match -> 1/2 points
-                    temp_grade += st_feature.points / 2
-            elif st_feature.type == FeatureType.ATTRIBUTE:
-                temp_grade += self.temp_grade_st_element(st_feature, stud_class.attributes)
-            elif st_feature.type == FeatureType.OPERATION:
-                temp_grade += self.temp_grade_st_element(st_feature, stud_class.operations)
-            else:
-                return NotImplemented
+        for st_feature in grade_class.type_features.get(FeatureType.ATTRIBUTE, []):
+            temp_grade += self.temp_grade_st_element(st_feature, stud_class.attributes)
+        for st_feature in grade_class.type_features.get(FeatureType.OPERATION, []):
+            temp_grade += self.temp_grade_st_element(st_feature, stud_class.operations)
         return (temp_grade / grade_class.points if grade_class.points > 0 else 0.0, temp_grade)
     
     def temp_grade_class_content(self, stud_content: GradeReference, mapped_inst_content: GradeReference, class_match_map: Optional[Dict[UMLClass, UMLClass]] = None) -> Tuple[float, float]:
         temp_grade: float = 0.0
-        grade_class: GradeObject = next((cls for cls in self.classes if cls.element == mapped_inst_content.reference), None)
+        grade_class: GradeObject = self.grade_object(mapped_inst_content.reference, FeatureType.CLASS)
         if not grade_class:
             raise ValueError(f"Class '{mapped_inst_content.reference.name}' of {str(mapped_inst_content)} not found in model.")
+        st_feature: Optional[StructuralFeature] = None
         if isinstance(mapped_inst_content, UMLAttribute):
             # attribute content grading
-            for st_feature in grade_class.st_features:
-                if st_feature.type == FeatureType.ATTRIBUTE and st_feature.reference == mapped_inst_content:
-                    temp_grade += self.temp_grade_st_element(st_feature=st_feature, stud_element=stud_content, class_match_map=class_match_map)
-                    break
+            st_feature = grade_class.st_feature(mapped_inst_content, FeatureType.ATTRIBUTE)
         elif isinstance(mapped_inst_content, UMLOperation):
             # operation content grading
-            for st_feature in grade_class.st_features:
-                if st_feature.type == FeatureType.OPERATION and st_feature.reference == mapped_inst_content:
-                    temp_grade += self.temp_grade_st_element(st_feature=st_feature, stud_element=stud_content, class_match_map=class_match_map)
-                    break
+            st_feature = grade_class.st_feature(mapped_inst_content, FeatureType.OPERATION)
+        if st_feature is None:
+            return (0.0, temp_grade)
+        temp_grade += self.temp_grade_st_element(st_feature=st_feature, stud_element=stud_content, class_match_map=class_match_map)
         return (temp_grade / st_feature.points if st_feature.points > 0 else 0.0, temp_grade)
     
     def temp_grade_enum(self, stud_enum: UMLEnum, mapped_inst_enum: UMLEnum) -> Tuple[float, float]:
         temp_grade: float = 0.0
-        grade_enum: GradeObject = next((enm for enm in self.enums if enm.element == mapped_inst_enum), None)
+        grade_enum: GradeObject = self.grade_object(mapped_inst_enum, FeatureType.ENUM)
         if not grade_enum:
             raise ValueError(f"Enum '{mapped_inst_enum.name}' not found in model.")
-        for st_feature in grade_enum.st_features:
-            if st_feature.type == FeatureType.ENUM:
-                # enum exists -> points
+        # enum exists -> points
+        temp_grade += grade_enum.type_points.get(FeatureType.ENUM, 0.0) / 2
+        for st_feature in grade_enum.type_features.get(FeatureType.ENUM, []):
+            if st_feature.reference.name == stud_enum.name or SyntacticCheck.syntactic_match(stud_enum.norm, st_feature.reference.norm)[0] or SemanticCheck.semantic_match(stud_enum.norm, st_feature.reference.norm)[0]:
+                # name match -> 1/2 points
                 temp_grade += st_feature.points / 2
-                if st_feature.reference.name == stud_enum.name or SyntacticCheck.syntactic_match(stud_enum.name, st_feature.reference.name)[0] or SemanticCheck.semantic_match(stud_enum.name, st_feature.reference.name)[0]:
-                    # name match -> 1/2 points
-                    temp_grade += st_feature.points / 2
-            elif st_feature.type == FeatureType.VALUE:
-                if any(v == st_feature.reference.name for v in stud_enum.values) or any(SyntacticCheck.syntactic_match(v.name, st_feature.reference.name)[0] for v in stud_enum.values) or any(SemanticCheck.semantic_match(v.name, st_feature.reference.name)[0] for v in stud_enum.values):
-                    # name match -> points
-                    temp_grade += st_feature.points 
+        for st_feature in grade_enum.type_features.get(FeatureType.VALUE, []):
+            if any(v == st_feature.reference.name for v in stud_enum.values) or any(SyntacticCheck.syntactic_match(v.norm, st_feature.reference.norm)[0] for v in stud_enum.values) or any(SemanticCheck.semantic_match(v.norm, st_feature.reference.norm)[0] for v in stud_enum.values):
+                # name match -> points
+                temp_grade += st_feature.points
         return temp_grade / grade_enum.points if grade_enum.points > 0 else 0.0, temp_grade
 
     def temp_grade_relation(self, stud_relation: UMLRelation, mapped_inst_relation: UMLRelation, element_match_map: Dict[Union[UMLClass, UMLEnum], Union[UMLClass, UMLEnum]]) -> Tuple[float, float]:
         temp_grade: float = 0.0
-        grade_relation: GradeObject = next((rel for rel in self.relations if rel.element == mapped_inst_relation), None)
+        grade_relation: GradeObject = self.grade_object(mapped_inst_relation, FeatureType.RELATION)
         if not grade_relation:
             raise ValueError(f"Relation '{mapped_inst_relation.name}' not found in model.")
-        for st_feature in grade_relation.st_features:
-            if st_feature.type == FeatureType.RELATION:
-                # relation exists -> points 
-                temp_grade += st_feature.points 
-            elif st_feature.type == FeatureType.RELATION_STRUCTURE:
-                # relation structure match -> points
-                temp_grade += GradeModel.grade_relation(st_feature, stud_relation, element_match_map)
+        # relation exists -> points
+        temp_grade += grade_relation.type_points.get(FeatureType.RELATION, 0.0)
+        for st_feature in grade_relation.type_features.get(FeatureType.RELATION_STRUCTURE, []):
+            # relation structure match -> points
+            temp_grade += GradeModel.grade_relation(st_feature, stud_relation, element_match_map)
         return temp_grade / grade_relation.points if grade_relation.points > 0 else 0.0, temp_grade
     
     def temp_grade_value(self, stud_value: UMLValue, mapped_inst_value: UMLValue) -> Tuple[float, float]:
         temp_grade: float = 0.0
-        grade_enum: GradeObject = next((enm for enm in self.enums if enm.element == mapped_inst_value.reference), None)
+        grade_enum: GradeObject = self.grade_object(mapped_inst_value.reference, FeatureType.ENUM)
         if not grade_enum:
             raise ValueError(f"Enum '{mapped_inst_value.reference.name}' not found in model.")
-        for st_feature in grade_enum.st_features:
-            if st_feature.type == FeatureType.VALUE and st_feature.reference == mapped_inst_value:
-                # NOTE: here only the name can be checked, as the value itself is not a complex object
-                # so we decided to give syntactic matches more weight than semantic matches
-                syn_res = SyntacticCheck.syntactic_match(stud_value.name, st_feature.reference.name)
-                sem_res = SemanticCheck.semantic_match(stud_value.name, st_feature.reference.name)
-                if syn_res[0]:
-                    temp_grade += st_feature.points * syn_res[1] * 3/5
-                if sem_res[0]:
-                    temp_grade += st_feature.points * sem_res[1] * 2/5
-                break
-        return temp_grade / st_feature.points if grade_enum.points > 0 else 0.0, temp_grade
\ No newline at end of file
+        st_feature = grade_enum.st_feature(mapped_inst_value, FeatureType.VALUE)
+        if st_feature is None:
+            return (0.0, temp_grade)
+        # NOTE: here only the name can be checked, as the value itself is not a complex object
+        # so we decided to give syntactic matches more weight than semantic matches
+        syn_res = SyntacticCheck.syntactic_match(stud_value.norm, st_feature.reference.norm)
+        sem_res = SemanticCheck.semantic_match(stud_value.norm, st_feature.reference.norm)
+        if syn_res[0]:
+            temp_grade += st_feature.points * syn_res[1] * 3/5
+        if sem_res[0]:
+            temp_grade += st_feature.points * sem_res[1] * 2/5
+        return temp_grade / st_feature.points if st_feature.points > 0 else 0.0, temp_grade
\ No newline at end of file
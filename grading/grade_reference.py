@@ -1,3 +1,5 @@
 class GradeReference:
+    __slots__ = ()
+
     def __repr__(self):
         return self.__class__.__name__
\ No newline at end of file
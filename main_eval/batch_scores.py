@@ -0,0 +1,93 @@
+from main_eval.eval_metrics import NO_STATEMENT
+from main_eval.scoring_plan import ScoringPlan, EVALUATED_GROUPS
+
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+class BatchScores:
+    # NOTE: criteria scores of many students as a (students, criteria) matrix in the column order of the ScoringPlan,
+    # NO_STATEMENT scores are masked out (valid is False, matrix is NaN) instead of being used as a number
+    def __init__(self, plan: ScoringPlan, raw_scores: np.ndarray, names: Optional[List[str]] = None):
+        self.plan: ScoringPlan = plan
+        self.names: List[str] = names if names is not None else [str(i) for i in range(raw_scores.shape[0])]
+        # criteria that are not evaluated (e.g. naming) never have a statement
+        evaluated = np.array([evaluator is not None for evaluator in plan.evaluators], dtype=bool)
+        self.valid: np.ndarray = (raw_scores != NO_STATEMENT) & evaluated
+        self.matrix: np.ndarray = np.where(self.valid, raw_scores, np.nan)
+
+    def __repr__(self):
+        return f"BatchScores(students: {self.matrix.shape[0]}, criteria: {self.matrix.shape[1]})"
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @staticmethod
+    def from_handlers(handlers: Sequence[Any], names: Optional[List[str]] = None) -> 'BatchScores':
+        # EvalHandlers of the same process share one plan, their score lists become the rows
+        plan = handlers[0].plan if handlers else BatchScores.default_plan()
+        raw_scores = np.array([handler.scores for handler in handlers], dtype=float).reshape(len(handlers), len(plan))
+        return BatchScores(plan, raw_scores, names)
+
+    @staticmethod
+    def from_criteria_scores(criteria_scores: Sequence[Dict[str, float]], names: Optional[List[str]] = None, plan: Optional[ScoringPlan] = None) -> 'BatchScores':
+        # e.g. from EvalHandler.criteria_scores() or stored results, missing criteria count as NO_STATEMENT
+        plan = plan or BatchScores.default_plan()
+        raw_scores = np.full((len(criteria_scores), len(plan)), NO_STATEMENT, dtype=float)
+        for row, scores in enumerate(criteria_scores):
+            for criteria_id, score in scores.items():
+                column = plan.index.get(criteria_id)
+                if column is not None:
+                    raw_scores[row, column] = score
+        return BatchScores(plan, raw_scores, names)
+
+    @staticmethod
+    def default_plan() -> ScoringPlan:
+        # NOTE: imported here, the handler pulls in the evaluators and the semantic models
+        from main_eval.eval_handler import EvalHandler
+        return EvalHandler.scoring_plan()
+
+    def group_weights(self) -> np.ndarray:
+        # (criteria, groups) weights of the top level criteria of each evaluated group, sub-criteria are only details
+        weights = np.zeros((len(self.plan), len(EVALUATED_GROUPS)))
+        for k, group in enumerate(EVALUATED_GROUPS):
+            for i in range(*self.plan.group_ranges[group]):
+                if self.plan.parents[i] == -1:
+                    weights[i, k] = self.plan.weights[i]
+        return weights
+
+    def category_scores(self) -> np.ndarray:
+        # (students, groups) weighted mean of the criteria with a statement, the weights are renormalized over those,
+        # NaN if no criteria of the group has a statement
+        weights = self.group_weights()
+        valid = self.valid.astype(float)
+        numerator = np.where(self.valid, self.matrix, 0.0) @ weights
+        denominator = valid @ weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1.0), np.nan)
+
+    def total_scores(self, category_weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        # (students,) weighted mean of the category scores, categories without a statement are left out
+        category_weights = category_weights or {group: 1.0 for group in EVALUATED_GROUPS}
+        weights = np.array([category_weights.get(group, 0.0) for group in EVALUATED_GROUPS], dtype=float)
+        categories = self.category_scores()
+        available = ~np.isnan(categories)
+        numerator = np.where(available, categories, 0.0) @ weights
+        denominator = available.astype(float) @ weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1.0), np.nan)
+
+    def column(self, criteria_id: str) -> np.ndarray:
+        return self.matrix[:, self.plan.index[criteria_id]]
+
+    def to_rows(self, category_weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        # one dict per student with the category and total scores, None where there is no statement
+        categories = self.category_scores()
+        totals = self.total_scores(category_weights)
+        rows: List[Dict[str, Any]] = []
+        for row, name in enumerate(self.names):
+            entry: Dict[str, Any] = {"name": name}
+            for k, group in enumerate(EVALUATED_GROUPS):
+                entry[group] = None if np.isnan(categories[row, k]) else float(categories[row, k])
+            entry["total"] = None if np.isnan(totals[row]) else float(totals[row])
+            rows.append(entry)
+        return rows
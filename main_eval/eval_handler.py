@@ -4,57 +4,47 @@ from main_eval.eval_metrics import ScoringCriteria, ScoringScheme, COMPLETENESS,
 from main_eval.eval_completeness import CompletenessEvaluator
 from main_eval.eval_syntax import SyntaxEvaluator
 from main_eval.eval_semantics import SemanticsEvaluator
+from main_eval.scoring_plan import ScoringPlan, Evaluator, EVALUATED_GROUPS
+from tools.instrumentation import EvalMetrics, Instrumentation
 
+from functools import cached_property, lru_cache
 from typing import List, Dict, Tuple, Optional
 class EvalHandler:
     def __init__(self, model: EvalModel):
-        self.scheme = ScoringScheme()
-        self.completeness_criteria: Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]] = self.scheme.completeness_criteria
-        self.syntax_criteria: Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]] = self.scheme.syntax_criteria
-        self.global_syntax_criteria: Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]] = self.scheme.global_syntax_criteria
-        self.semantics_criteria: Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]] = self.scheme.semantics_criteria
-        self.naming_criteria: Dict[str, ScoringCriteria] = self.scheme.naming_criteria
-        self.global_naming_criteria: Dict[str, ScoringCriteria] = self.scheme.global_naming_criteria
+        # NOTE: the ScoringScheme is compiled once per process (see scoring_plan), an evaluation only fills the score list,
+        # the criteria dicts below are built from it on first access
+        self.plan: ScoringPlan = EvalHandler.scoring_plan()
+        self.scores: List[float] = self.plan.new_scores()
 
-        for tuple in self.completeness_criteria.values():
-            criteria, sub_criteria_1, sub_criteria_2 = tuple
-            self.evaluate_completeness(criteria, model)
-            if sub_criteria_1:
-                for sub_criteria in sub_criteria_1:
-                    self.evaluate_completeness(sub_criteria, model)
-            if sub_criteria_2:
-                for sub_criteria in sub_criteria_2:
-                    self.evaluate_completeness(sub_criteria, model)
+        # NOTE: one span per criteria group, the lazy EvalModel stages run inside of them on first use
+        self.metrics: Optional[EvalMetrics] = model.metrics
+        for group in EVALUATED_GROUPS:
+            with Instrumentation.record(self.metrics, GROUP_SPANS[group]):
+                self.plan.evaluate_group(group, model, self.scores)
 
-        for tuple in self.syntax_criteria.values():
-            criteria, sub_criteria_1, sub_criteria_2 = tuple
-            self.evaluate_criteria(criteria, model)
-            if sub_criteria_1:
-                for sub_criteria in sub_criteria_1:
-                    self.evaluate_criteria(sub_criteria, model)
-            if sub_criteria_2:
-                for sub_criteria in sub_criteria_2:
-                    self.evaluate_criteria(sub_criteria, model)
-        
-        for tuple in self.global_syntax_criteria.values():
-            criteria, sub_criteria_1, sub_criteria_2 = tuple
-            self.evaluate_criteria(criteria, model)
-            if sub_criteria_1:
-                for sub_criteria in sub_criteria_1:
-                    self.evaluate_criteria(sub_criteria, model)
-            if sub_criteria_2:
-                for sub_criteria in sub_criteria_2:
-                    self.evaluate_criteria(sub_criteria, model)
+    @cached_property
+    def completeness_criteria(self) -> Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]]:
+        return self.plan.criteria_group("completeness_criteria", self.scores)
+
+    @cached_property
+    def syntax_criteria(self) -> Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]]:
+        return self.plan.criteria_group("syntax_criteria", self.scores)
+
+    @cached_property
+    def global_syntax_criteria(self) -> Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]]:
+        return self.plan.criteria_group("global_syntax_criteria", self.scores)
+
+    @cached_property
+    def semantics_criteria(self) -> Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]]:
+        return self.plan.criteria_group("semantics_criteria", self.scores)
+
+    @cached_property
+    def naming_criteria(self) -> Dict[str, ScoringCriteria]:
+        return self.plan.criteria_group("naming_criteria", self.scores)
 
-        for tuple in self.semantics_criteria.values():
-            criteria, sub_criteria_1, sub_criteria_2 = tuple
-            self.evaluate_criteria(criteria, model)
-            if sub_criteria_1:
-                for sub_criteria in sub_criteria_1:
-                    self.evaluate_criteria(sub_criteria, model)
-            if sub_criteria_2:
-                for sub_criteria in sub_criteria_2:
-                    self.evaluate_criteria(sub_criteria, model)
+    @cached_property
+    def global_naming_criteria(self) -> Dict[str, ScoringCriteria]:
+        return self.plan.criteria_group("global_naming_criteria", self.scores)
     
     def __repr__(self):
         output = ["Eval Summary:"]
@@ -105,253 +95,47 @@ class EvalHandler:
     def __str__(self):
         return "EvalHandler()"
 
+    def criteria_scores(self) -> Dict[str, float]:
+        # score of every evaluated criteria and sub-criteria by id, e.g. to compare runs with different thresholds
+        return {self.plan.ids[i]: self.scores[i] for group in EVALUATED_GROUPS for i in range(*self.plan.group_ranges[group])}
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def scoring_plan() -> ScoringPlan:
+        return ScoringPlan(ScoringScheme(), EvalHandler.resolve_evaluator)
+
+    @staticmethod
+    def resolve_evaluator(criteria: ScoringCriteria) -> Evaluator:
+        evaluators = CATEGORY_EVALUATORS.get(criteria.category)
+        if evaluators is None:
+            raise ValueError(f"Unknown criteria category: {criteria.category}")
+        if criteria.id not in evaluators:
+            raise ValueError(f"Unknown {CATEGORY_NAMES[criteria.category]} criteria id: {criteria.id}")
+        return evaluators[criteria.id]
+
     @staticmethod
     def evaluate_criteria(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
-        if criteria.category == COMPLETENESS:
-            return EvalHandler.evaluate_completeness(criteria, model)
-        elif criteria.category == SYNTAX:
-            return EvalHandler.evaluate_syntactic_correctness(criteria, model)
-        elif criteria.category == SYNTAX_GLOBAL:
-            return EvalHandler.evaluate_syntactic_correctness_global(criteria, model)
-        elif criteria.category == SEMANTICS:
-            return EvalHandler.evaluate_semantic_correctness(criteria, model)
-        elif criteria.category == NAMING:
+        if criteria.category == NAMING:
             return EvalHandler.evaluate_naming(criteria, model)
         elif criteria.category == NAMING_GLOBAL:
             return EvalHandler.evaluate_naming_global(criteria, model)
-        else:   
-            raise ValueError(f"Unknown criteria category: {criteria.category}")
+        return EvalHandler.resolve_evaluator(criteria)(criteria, model)
     
     @staticmethod
     def evaluate_completeness(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
-        if criteria.id == "CPT.CLS":
-            return CompletenessEvaluator.evaluate_classes(criteria, model)
-        
-        elif criteria.id == "CPT.ATT":
-            return CompletenessEvaluator.evaluate_attributes(criteria, model)
-        elif criteria.id == "CPT.ATT.DER":
-            return CompletenessEvaluator.evaluate_att_derivation(criteria, model)
-        elif criteria.id == "CPT.ATT.VIS":
-            return CompletenessEvaluator.evaluate_att_visibility(criteria, model)
-        elif criteria.id == "CPT.ATT.MUL":
-            return CompletenessEvaluator.evaluate_att_multiplicity(criteria, model)
-        elif criteria.id == "CPT.ATT.TYP":
-            return CompletenessEvaluator.evaluate_att_data_type(criteria, model)
-        elif criteria.id == "CPT.ATT.INT":
-            return CompletenessEvaluator.evaluate_att_initial_value(criteria, model)
-        
-        elif criteria.id == "CPT.OPR":
-            return CompletenessEvaluator.evaluate_operations(criteria, model)
-        elif criteria.id == "CPT.OPR.VIS":
-            return CompletenessEvaluator.evaluate_op_visibility(criteria, model)
-        elif criteria.id == "CPT.OPR.PAR":
-            return CompletenessEvaluator.evaluate_op_parameters(criteria, model)
-        elif criteria.id == "CPT.OPR.RET":
-            return CompletenessEvaluator.evaluate_op_return_types(criteria, model)
-        
-        elif criteria.id == "CPT.ENM":
-            return CompletenessEvaluator.evaluate_enumerations(criteria, model)
-        elif criteria.id == "CPT.VAL":
-            return CompletenessEvaluator.evaluate_enum_values(criteria, model)
-        
-        elif criteria.id == "CPT.REL":
-            return CompletenessEvaluator.evaluate_relations(criteria, model)
-        elif criteria.id == "CPT.REL.MUL":
-            return CompletenessEvaluator.evaluate_rel_multiplicity(criteria, model)
-        elif criteria.id == "CPT.REL.DSC":
-            return CompletenessEvaluator.evaluate_rel_description(criteria, model)
-        elif criteria.id == "CPT.ASS":
-            return CompletenessEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.ASSOCIATION)
-        elif criteria.id == "CPT.AGG":
-            return CompletenessEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.AGGREGATION)
-        elif criteria.id == "CPT.COM":
-            return CompletenessEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.COMPOSITION)
-        elif criteria.id == "CPT.GEN":
-            return CompletenessEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.GENERALIZATION)
-        elif criteria.id == "CPT.ACR":
-            return CompletenessEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.ASSOCIATION_LINK)
-        else:
-            raise ValueError(f"Unknown completeness criteria id: {criteria.id}")
+        return EvalHandler.resolve_evaluator(criteria)(criteria, model)
         
     @staticmethod
     def evaluate_syntactic_correctness(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
-        if criteria.id == "SYC.CLS":
-            return SyntaxEvaluator.evaluate_classes(criteria, model)
-        
-        elif criteria.id == "SYC.ATT":
-            return SyntaxEvaluator.evaluate_attributes(criteria, model)
-        elif criteria.id == "SYC.ATT.NAM":
-            return SyntaxEvaluator.evaluate_att_name(criteria, model)
-        elif criteria.id == "SYC.ATT.VIS":
-            return SyntaxEvaluator.evaluate_att_visibility(criteria, model)
-        elif criteria.id == "SYC.ATT.MUL":
-            return SyntaxEvaluator.evaluate_att_multiplicity(criteria, model)
-        elif criteria.id == "SYC.ATT.TYP":
-            return SyntaxEvaluator.evaluate_att_data_type(criteria, model)
-        elif criteria.id == "SYC.ATT.INT":
-            return SyntaxEvaluator.evaluate_att_initial_value(criteria, model)
-        
-        elif criteria.id == "SYC.OPR":
-            return SyntaxEvaluator.evaluate_operations(criteria, model)
-        elif criteria.id == "SYC.OPR.NAM":
-            return SyntaxEvaluator.evaluate_op_name(criteria, model)
-        elif criteria.id == "SYC.OPR.VIS":
-            return SyntaxEvaluator.evaluate_op_visibility(criteria, model)
-        elif criteria.id == "SYC.OPR.PAR":
-            return SyntaxEvaluator.evaluate_op_parameters(criteria, model)
-        elif criteria.id == "SYC.OPR.RET":
-            return SyntaxEvaluator.evaluate_op_return_types(criteria, model)
-        
-        elif criteria.id == "SYC.ENM":
-            return SyntaxEvaluator.evaluate_enumerations(criteria, model)
-        elif criteria.id == "SYC.VAL":
-            return SyntaxEvaluator.evaluate_enum_values(criteria, model)
-        
-        elif criteria.id == "SYC.REL":
-            return SyntaxEvaluator.evaluate_relations(criteria, model)
-        elif criteria.id == "SYC.REL.TYP":
-            return SyntaxEvaluator.evaluate_rel_type(criteria, model)
-        elif criteria.id == "SYC.REL.MUL":
-            return SyntaxEvaluator.evaluate_rel_multiplicity(criteria, model)
-        elif criteria.id == "SYC.REL.DSC":
-            return SyntaxEvaluator.evaluate_rel_description(criteria, model)
-        elif criteria.id == "SYC.ASS":
-            return SyntaxEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.ASSOCIATION)
-        elif criteria.id == "SYC.AGG":
-            return SyntaxEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.AGGREGATION)
-        elif criteria.id == "SYC.COM":
-            return SyntaxEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.COMPOSITION)
-        elif criteria.id == "SYC.GEN":
-            return SyntaxEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.GENERALIZATION)
-        elif criteria.id == "SYC.ACR":
-            return SyntaxEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.ASSOCIATION_LINK)
-        else:
-            raise ValueError(f"Unknown syntactic correctness criteria id: {criteria.id}")
+        return EvalHandler.resolve_evaluator(criteria)(criteria, model)
         
     @staticmethod
     def evaluate_syntactic_correctness_global(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
-        if criteria.id == "SYG.CLS":
-            return SyntaxEvaluator.evaluate_classes_global(criteria, model)
-        
-        elif criteria.id == "SYG.ATT":
-            return SyntaxEvaluator.evaluate_attributes_global(criteria, model)
-        elif criteria.id == "SYG.ATT.NAM":
-            return SyntaxEvaluator.evaluate_att_name_global(criteria, model)
-        elif criteria.id == "SYG.ATT.VIS":
-            return SyntaxEvaluator.evaluate_att_visibility_global(criteria, model)
-        elif criteria.id == "SYG.ATT.MUL":
-            return SyntaxEvaluator.evaluate_att_multiplicity_global(criteria, model)
-        elif criteria.id == "SYG.ATT.TYP":
-            return SyntaxEvaluator.evaluate_att_data_type_global(criteria, model)
-        elif criteria.id == "SYG.ATT.INT":
-            return SyntaxEvaluator.evaluate_att_initial_value_global(criteria, model)
-        
-        elif criteria.id == "SYG.OPR":
-            return SyntaxEvaluator.evaluate_operations_global(criteria, model)
-        elif criteria.id == "SYG.OPR.NAM":
-            return SyntaxEvaluator.evaluate_op_name_global(criteria, model)
-        elif criteria.id == "SYG.OPR.VIS":
-            return SyntaxEvaluator.evaluate_op_visibility_global(criteria, model)
-        elif criteria.id == "SYG.OPR.PAR":
-            return SyntaxEvaluator.evaluate_op_parameters_global(criteria, model)
-        elif criteria.id == "SYG.OPR.RET":
-            return SyntaxEvaluator.evaluate_op_return_types_global(criteria, model)
-        
-        elif criteria.id == "SYG.ENM":
-            return SyntaxEvaluator.evaluate_enumerations_global(criteria, model)
-        elif criteria.id == "SYG.VAL":
-            return SyntaxEvaluator.evaluate_enum_values_global(criteria, model)
-        
-        elif criteria.id == "SYG.REL":
-            return SyntaxEvaluator.evaluate_relations_global(criteria, model)
-        elif criteria.id == "SYG.REL.TYP":
-            return SyntaxEvaluator.evaluate_rel_type_global(criteria, model)
-        elif criteria.id == "SYG.REL.MUL":
-            return SyntaxEvaluator.evaluate_rel_multiplicity_global(criteria, model)
-        elif criteria.id == "SYG.REL.DSC":
-            return SyntaxEvaluator.evaluate_rel_description_global(criteria, model)
-        elif criteria.id == "SYG.ASS":
-            return SyntaxEvaluator.evaluate_relations_with_type_global(criteria, model, UMLRelationType.ASSOCIATION)
-        elif criteria.id == "SYG.AGG":
-            return SyntaxEvaluator.evaluate_relations_with_type_global(criteria, model, UMLRelationType.AGGREGATION)
-        elif criteria.id == "SYG.COM":
-            return SyntaxEvaluator.evaluate_relations_with_type_global(criteria, model, UMLRelationType.COMPOSITION)
-        elif criteria.id == "SYG.GEN":
-            return SyntaxEvaluator.evaluate_relations_with_type_global(criteria, model, UMLRelationType.GENERALIZATION)
-        elif criteria.id == "SYG.ACR":
-            return SyntaxEvaluator.evaluate_relations_with_type_global(criteria, model, UMLRelationType.ASSOCIATION_LINK)
-        else:
-            raise ValueError(f"Unknown global syntactic correctness criteria id: {criteria.id}")
+        return EvalHandler.resolve_evaluator(criteria)(criteria, model)
     
     @staticmethod
     def evaluate_semantic_correctness(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
-        if criteria.id == "SEC.CLS":
-            return SemanticsEvaluator.evaluate_classes(criteria, model)
-        elif criteria.id == "SEC.CLS.NAM":
-            return SemanticsEvaluator.evaluate_cls_names(criteria, model)
-        elif criteria.id == "SEC.CLS.ATT":
-            return SemanticsEvaluator.evaluate_cls_attributes(criteria, model)
-        elif criteria.id == "SEC.CLS.OPR":
-            return SemanticsEvaluator.evaluate_cls_operations(criteria, model)
-
-        elif criteria.id == "SEC.ATT":
-            return SemanticsEvaluator.evaluate_attributes(criteria, model)
-        elif criteria.id == "SEC.ATT.NAM":
-            return SemanticsEvaluator.evaluate_att_names(criteria, model)
-        elif criteria.id == "SEC.ATT.DER":
-            return SemanticsEvaluator.evaluate_att_derivation(criteria, model)
-        elif criteria.id == "SEC.ATT.VIS":
-            return SemanticsEvaluator.evaluate_att_visibility(criteria, model)
-        elif criteria.id == "SEC.ATT.MUL":
-            return SemanticsEvaluator.evaluate_att_multiplicity(criteria, model)
-        elif criteria.id == "SEC.ATT.TYP":
-            return SemanticsEvaluator.evaluate_att_data_types(criteria, model)
-        elif criteria.id == "SEC.ATT.INT":
-            return SemanticsEvaluator.evaluate_att_initial_values(criteria, model)
-
-        elif criteria.id == "SEC.OPR":
-            return SemanticsEvaluator.evaluate_operations(criteria, model)
-        elif criteria.id == "SEC.OPR.NAM":
-            return SemanticsEvaluator.evaluate_opr_names(criteria, model)
-        elif criteria.id == "SEC.OPR.VIS":
-            return SemanticsEvaluator.evaluate_opr_visibility(criteria, model)
-        elif criteria.id == "SEC.OPR.PAR":
-            return SemanticsEvaluator.evaluate_opr_params(criteria, model)
-        elif criteria.id == "SEC.OPR.RET":
-            return SemanticsEvaluator.evaluate_opr_return_types(criteria, model)
-        
-        elif criteria.id == "SEC.ENM":
-            return SemanticsEvaluator.evaluate_enumerations(criteria, model)
-        elif criteria.id == "SEC.ENM.NAM":
-            return SemanticsEvaluator.evaluate_enum_names(criteria, model)
-        elif criteria.id == "SEC.ENM.VAL":
-            return SemanticsEvaluator.evaluate_enum_content(criteria, model)
-        
-        elif criteria.id == "SEC.VAL":
-            return SemanticsEvaluator.evaluate_enum_values(criteria, model)
-        
-        elif criteria.id == "SEC.REL":
-            return SemanticsEvaluator.evaluate_relations(criteria, model)
-        elif criteria.id == "SEC.REL.TYP":
-            return SemanticsEvaluator.evaluate_rel_types(criteria, model)
-        elif criteria.id == "SEC.REL.MUL":
-            return SemanticsEvaluator.evaluate_rel_multiplicity(criteria, model)
-        elif criteria.id == "SEC.REL.DSC":
-            return SemanticsEvaluator.evaluate_rel_descriptions(criteria, model)
-        elif criteria.id == "SEC.ASS":
-            return SemanticsEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.ASSOCIATION)
-        elif criteria.id == "SEC.AGG":
-            return SemanticsEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.AGGREGATION)
-        elif criteria.id == "SEC.COM":
-            return SemanticsEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.COMPOSITION)
-        elif criteria.id == "SEC.GEN":
-            return SemanticsEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.GENERALIZATION)
-        elif criteria.id == "SEC.ACR":
-            return SemanticsEvaluator.evaluate_relations_with_type(criteria, model, UMLRelationType.ASSOCIATION_LINK)
-        
-        else:
-            raise ValueError(f"Unknown semantic correctness criteria id: {criteria.id}")
-        
+        return EvalHandler.resolve_evaluator(criteria)(criteria, model)
 
     @staticmethod
     def evaluate_naming(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
@@ -359,4 +143,135 @@ class EvalHandler:
 
     @staticmethod
     def evaluate_naming_global(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
-        pass
\ No newline at end of file
+        pass
+
+def with_relation_type(evaluator, relation_type: UMLRelationType) -> Evaluator:
+    return lambda criteria, model: evaluator(criteria, model, relation_type)
+
+GROUP_SPANS: Dict[str, str] = {
+    "completeness_criteria": "completeness",
+    "syntax_criteria": "syntax",
+    "global_syntax_criteria": "global_syntax",
+    "semantics_criteria": "semantics"
+}
+
+COMPLETENESS_EVALUATORS: Dict[str, Evaluator] = {
+    "CPT.CLS": CompletenessEvaluator.evaluate_classes,
+    "CPT.ATT": CompletenessEvaluator.evaluate_attributes,
+    "CPT.ATT.DER": CompletenessEvaluator.evaluate_att_derivation,
+    "CPT.ATT.VIS": CompletenessEvaluator.evaluate_att_visibility,
+    "CPT.ATT.MUL": CompletenessEvaluator.evaluate_att_multiplicity,
+    "CPT.ATT.TYP": CompletenessEvaluator.evaluate_att_data_type,
+    "CPT.ATT.INT": CompletenessEvaluator.evaluate_att_initial_value,
+    "CPT.OPR": CompletenessEvaluator.evaluate_operations,
+    "CPT.OPR.VIS": CompletenessEvaluator.evaluate_op_visibility,
+    "CPT.OPR.PAR": CompletenessEvaluator.evaluate_op_parameters,
+    "CPT.OPR.RET": CompletenessEvaluator.evaluate_op_return_types,
+    "CPT.ENM": CompletenessEvaluator.evaluate_enumerations,
+    "CPT.VAL": CompletenessEvaluator.evaluate_enum_values,
+    "CPT.REL": CompletenessEvaluator.evaluate_relations,
+    "CPT.REL.MUL": CompletenessEvaluator.evaluate_rel_multiplicity,
+    "CPT.REL.DSC": CompletenessEvaluator.evaluate_rel_description,
+    "CPT.ASS": with_relation_type(CompletenessEvaluator.evaluate_relations_with_type, UMLRelationType.ASSOCIATION),
+    "CPT.AGG": with_relation_type(CompletenessEvaluator.evaluate_relations_with_type, UMLRelationType.AGGREGATION),
+    "CPT.COM": with_relation_type(CompletenessEvaluator.evaluate_relations_with_type, UMLRelationType.COMPOSITION),
+    "CPT.GEN": with_relation_type(CompletenessEvaluator.evaluate_relations_with_type, UMLRelationType.GENERALIZATION),
+    "CPT.ACR": with_relation_type(CompletenessEvaluator.evaluate_relations_with_type, UMLRelationType.ASSOCIATION_LINK)
+}
+
+SYNTAX_EVALUATORS: Dict[str, Evaluator] = {
+    "SYC.CLS": SyntaxEvaluator.evaluate_classes,
+    "SYC.ATT": SyntaxEvaluator.evaluate_attributes,
+    "SYC.ATT.NAM": SyntaxEvaluator.evaluate_att_name,
+    "SYC.ATT.VIS": SyntaxEvaluator.evaluate_att_visibility,
+    "SYC.ATT.MUL": SyntaxEvaluator.evaluate_att_multiplicity,
+    "SYC.ATT.TYP": SyntaxEvaluator.evaluate_att_data_type,
+    "SYC.ATT.INT": SyntaxEvaluator.evaluate_att_initial_value,
+    "SYC.OPR": SyntaxEvaluator.evaluate_operations,
+    "SYC.OPR.NAM": SyntaxEvaluator.evaluate_op_name,
+    "SYC.OPR.VIS": SyntaxEvaluator.evaluate_op_visibility,
+    "SYC.OPR.PAR": SyntaxEvaluator.evaluate_op_parameters,
+    "SYC.OPR.RET": SyntaxEvaluator.evaluate_op_return_types,
+    "SYC.ENM": SyntaxEvaluator.evaluate_enumerations,
+    "SYC.VAL": SyntaxEvaluator.evaluate_enum_values,
+    "SYC.REL": SyntaxEvaluator.evaluate_relations,
+    "SYC.REL.TYP": SyntaxEvaluator.evaluate_rel_type,
+    "SYC.REL.MUL": SyntaxEvaluator.evaluate_rel_multiplicity,
+    "SYC.REL.DSC": SyntaxEvaluator.evaluate_rel_description,
+    "SYC.ASS": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type, UMLRelationType.ASSOCIATION),
+    "SYC.AGG": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type, UMLRelationType.AGGREGATION),
+    "SYC.COM": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type, UMLRelationType.COMPOSITION),
+    "SYC.GEN": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type, UMLRelationType.GENERALIZATION),
+    "SYC.ACR": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type, UMLRelationType.ASSOCIATION_LINK)
+}
+
+SYNTAX_GLOBAL_EVALUATORS: Dict[str, Evaluator] = {
+    "SYG.CLS": SyntaxEvaluator.evaluate_classes_global,
+    "SYG.ATT": SyntaxEvaluator.evaluate_attributes_global,
+    "SYG.ATT.NAM": SyntaxEvaluator.evaluate_att_name_global,
+    "SYG.ATT.VIS": SyntaxEvaluator.evaluate_att_visibility_global,
+    "SYG.ATT.MUL": SyntaxEvaluator.evaluate_att_multiplicity_global,
+    "SYG.ATT.TYP": SyntaxEvaluator.evaluate_att_data_type_global,
+    "SYG.ATT.INT": SyntaxEvaluator.evaluate_att_initial_value_global,
+    "SYG.OPR": SyntaxEvaluator.evaluate_operations_global,
+    "SYG.OPR.NAM": SyntaxEvaluator.evaluate_op_name_global,
+    "SYG.OPR.VIS": SyntaxEvaluator.evaluate_op_visibility_global,
+    "SYG.OPR.PAR": SyntaxEvaluator.evaluate_op_parameters_global,
+    "SYG.OPR.RET": SyntaxEvaluator.evaluate_op_return_types_global,
+    "SYG.ENM": SyntaxEvaluator.evaluate_enumerations_global,
+    "SYG.VAL": SyntaxEvaluator.evaluate_enum_values_global,
+    "SYG.REL": SyntaxEvaluator.evaluate_relations_global,
+    "SYG.REL.TYP": SyntaxEvaluator.evaluate_rel_type_global,
+    "SYG.REL.MUL": SyntaxEvaluator.evaluate_rel_multiplicity_global,
+    "SYG.REL.DSC": SyntaxEvaluator.evaluate_rel_description_global,
+    "SYG.ASS": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type_global, UMLRelationType.ASSOCIATION),
+    "SYG.AGG": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type_global, UMLRelationType.AGGREGATION),
+    "SYG.COM": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type_global, UMLRelationType.COMPOSITION),
+    "SYG.GEN": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type_global, UMLRelationType.GENERALIZATION),
+    "SYG.ACR": with_relation_type(SyntaxEvaluator.evaluate_relations_with_type_global, UMLRelationType.ASSOCIATION_LINK)
+}
+
+SEMANTICS_EVALUATORS: Dict[str, Evaluator] = {
+    "SEC.CLS": SemanticsEvaluator.evaluate_classes,
+    "SEC.CLS.NAM": SemanticsEvaluator.evaluate_cls_names,
+    "SEC.CLS.ATT": SemanticsEvaluator.evaluate_cls_attributes,
+    "SEC.CLS.OPR": SemanticsEvaluator.evaluate_cls_operations,
+    "SEC.ATT": SemanticsEvaluator.evaluate_attributes,
+    "SEC.ATT.NAM": SemanticsEvaluator.evaluate_att_names,
+    "SEC.ATT.DER": SemanticsEvaluator.evaluate_att_derivation,
+    "SEC.ATT.VIS": SemanticsEvaluator.evaluate_att_visibility,
+    "SEC.ATT.MUL": SemanticsEvaluator.evaluate_att_multiplicity,
+    "SEC.ATT.TYP": SemanticsEvaluator.evaluate_att_data_types,
+    "SEC.ATT.INT": SemanticsEvaluator.evaluate_att_initial_values,
+    "SEC.OPR": SemanticsEvaluator.evaluate_operations,
+    "SEC.OPR.NAM": SemanticsEvaluator.evaluate_opr_names,
+    "SEC.OPR.VIS": SemanticsEvaluator.evaluate_opr_visibility,
+    "SEC.OPR.PAR": SemanticsEvaluator.evaluate_opr_params,
+    "SEC.OPR.RET": SemanticsEvaluator.evaluate_opr_return_types,
+    "SEC.ENM": SemanticsEvaluator.evaluate_enumerations,
+    "SEC.ENM.NAM": SemanticsEvaluator.evaluate_enum_names,
+    "SEC.ENM.VAL": SemanticsEvaluator.evaluate_enum_content,
+    "SEC.VAL": SemanticsEvaluator.evaluate_enum_values,
+    "SEC.REL": SemanticsEvaluator.evaluate_relations,
+    "SEC.REL.TYP": SemanticsEvaluator.evaluate_rel_types,
+    "SEC.REL.MUL": SemanticsEvaluator.evaluate_rel_multiplicity,
+    "SEC.REL.DSC": SemanticsEvaluator.evaluate_rel_descriptions,
+    "SEC.ASS": with_relation_type(SemanticsEvaluator.evaluate_relations_with_type, UMLRelationType.ASSOCIATION),
+    "SEC.AGG": with_relation_type(SemanticsEvaluator.evaluate_relations_with_type, UMLRelationType.AGGREGATION),
+    "SEC.COM": with_relation_type(SemanticsEvaluator.evaluate_relations_with_type, UMLRelationType.COMPOSITION),
+    "SEC.GEN": with_relation_type(SemanticsEvaluator.evaluate_relations_with_type, UMLRelationType.GENERALIZATION),
+    "SEC.ACR": with_relation_type(SemanticsEvaluator.evaluate_relations_with_type, UMLRelationType.ASSOCIATION_LINK)
+}
+
+CATEGORY_EVALUATORS: Dict[str, Dict[str, Evaluator]] = {
+    COMPLETENESS: COMPLETENESS_EVALUATORS,
+    SYNTAX: SYNTAX_EVALUATORS,
+    SYNTAX_GLOBAL: SYNTAX_GLOBAL_EVALUATORS,
+    SEMANTICS: SEMANTICS_EVALUATORS
+}
+CATEGORY_NAMES: Dict[str, str] = {
+    COMPLETENESS: "completeness",
+    SYNTAX: "syntactic correctness",
+    SYNTAX_GLOBAL: "global syntactic correctness",
+    SEMANTICS: "semantic correctness"
+}
@@ -15,20 +15,19 @@ class SemanticsEvaluator:
     @staticmethod
     def evaluate_cls_names(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
         class_name_semantic_score: float = NO_STATEMENT
-        inst_matched_classes = {cls for cls in model.instructor_model.class_list if cls not in model.temp_missing_classes}
+        inst_matched_classes = model.match_index.matched_inst_classes
         if inst_matched_classes:
             total_classes = len(inst_matched_classes)
             name_score: float = 0.0
             for cls_i in inst_matched_classes:
                 print(f"cls_i: {cls_i}")
-                if model.class_match_map.get(cls_i) and (SyntacticCheck.syntactic_match(cls_i.name, model.class_match_map.get(cls_i).name)[0] or SemanticCheck.semantic_match(cls_i.name, model.class_match_map.get(cls_i).name)[0]):
+                bucket = model.match_index.bucket(cls_i)
+                if bucket.match and model.evidence.name_match(cls_i, bucket.match):
                     name_score += 1
-                elif model.split_class_map.get(cls_i) and (SyntacticCheck.syntactic_match(cls_i.name, model.split_class_map.get(cls_i)[0].name)[0] or SemanticCheck.semantic_match(cls_i.name, model.split_class_map.get(cls_i)[0].name)[0] or SyntacticCheck.syntactic_match(cls_i.name, model.split_class_map.get(cls_i)[1].name)[0] or SemanticCheck.semantic_match(cls_i.name, model.split_class_map.get(cls_i)[1].name)[0]):
+                elif bucket.split and (model.evidence.name_match(cls_i, bucket.split[0]) or model.evidence.name_match(cls_i, bucket.split[1])):
+                    name_score += 1
+                elif bucket.merged_into and model.evidence.name_match(cls_i, bucket.merged_into):
                     name_score += 1
-                else:
-                    cls_i_merge_map = {classes_i[1]: cls_s for classes_i, cls_s in model.merge_class_map.items() if classes_i[1] == cls_i}
-                    if cls_i_merge_map and (SyntacticCheck.syntactic_match(cls_i.name, cls_i_merge_map.get(cls_i).name)[0] or SemanticCheck.semantic_match(cls_i.name, cls_i_merge_map.get(cls_i).name)[0]):
-                        name_score += 1
             class_name_semantic_score = name_score / total_classes if total_classes > 0 else NO_STATEMENT
         criteria.score = class_name_semantic_score
         return criteria
@@ -37,29 +36,30 @@ class SemanticsEvaluator:
     def evaluate_cls_attributes(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
         class_attr_semantic_score: float = NO_STATEMENT
         SPLIT_MERGE_PENALTY = 0.5
-        inst_matched_classes = {cls for cls in model.instructor_model.class_list if cls not in model.temp_missing_classes}
+        inst_matched_classes = model.match_index.matched_inst_classes
         if inst_matched_classes:
             total_classes = len(inst_matched_classes)
             class_score: float = 0.0
             for cls_i in inst_matched_classes:
                 attr_score: float = 0.0
-                cls_i_matched_attrs = [attr for attr in cls_i.attributes if attr in model.attr_match_map.keys()]
-                cls_i_inherited_attrs = [attr for attr in cls_i.attributes if attr in model.inherited_attr_map.keys()]
-                cls_i_misplaced_attrs = [attr for attr in cls_i.attributes if attr in model.misplaced_attr_map.keys()]
-                total_class_attrs = len(cls_i_matched_attrs) + len(cls_i_inherited_attrs) + len(cls_i_misplaced_attrs)
+                bucket = model.match_index.bucket(cls_i)
+                cls_i_matched_attrs = bucket.matched_attrs
+                cls_i_inherited_attrs = bucket.inherited_attrs
+                cls_i_misplaced_attrs = bucket.misplaced_attrs
+                total_class_attrs = bucket.total_attrs
 
-                # NOTE: cls_i_match_map, cls_i_split_map can only contain one or no mapping
+                # NOTE: cls_i_match, cls_i_split are the single mapping of the class or None
                 # NOTE: if the class is in the match map, that means all its matched, inherited attributes are in the student class 
-                cls_i_match_map = {class_i: cls_s for class_i, cls_s in model.class_match_map.items() if cls_i == class_i}
+                cls_i_match = bucket.match
                 # NOTE: if the class is in the split map, that means all its matched, inherited or misplaced attributes are either in the first or second class of the split
-                cls_i_split_map = {class_i: classes_s for class_i, classes_s in model.split_class_map.items() if cls_i == class_i}
+                cls_i_split = bucket.split
                 # NOTE: here we only check the second class since from the algorith the first class is already matched to the student class
                 # if the class would be the fist class, we would have dealt with it in the match map
                 # if the class is in the merge map as the second class, that means all its missplaced attributes are in the student class (which is matched to the first class)
-                cls_i_merge_map = {classes_i[1]: cls_s for classes_i, cls_s in model.merge_class_map.items() if cls_i == classes_i[1]}
-                if cls_i_match_map:
+                cls_i_merged_into = bucket.merged_into
+                if cls_i_match:
                     attr_score += len(cls_i_matched_attrs) + len(cls_i_inherited_attrs) 
-                if cls_i_split_map or cls_i_merge_map:
+                if cls_i_split or cls_i_merged_into:
                     # NOTE: we only take the len of the misplaced attributes here since the matched attributes are already counted in the match map and if the class has no true match it also has no attributes in the match map
                     attr_score += len(cls_i_misplaced_attrs) * SPLIT_MERGE_PENALTY
                 class_score += attr_score / total_class_attrs if total_class_attrs > 0 else 1.0
@@ -72,29 +72,30 @@ class SemanticsEvaluator:
     def evaluate_cls_operations(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
         class_op_semantic_score: float = NO_STATEMENT
         SPLIT_MERGE_PENALTY = 0.5
-        inst_matched_classes = {cls for cls in model.instructor_model.class_list if cls not in model.temp_missing_classes}
+        inst_matched_classes = model.match_index.matched_inst_classes
         if inst_matched_classes:
             total_classes = len(inst_matched_classes)
             class_score: float = 0.0
             for cls_i in inst_matched_classes:
                 oper_score: float = 0.0
-                cls_i_matched_opers = [oper for oper in cls_i.operations if oper in model.oper_matched_map.keys()]
-                cls_i_inherited_opers = [oper for oper in cls_i.operations if oper in model.inherited_oper_map.keys()]
-                cls_i_misplaced_opers = [oper for oper in cls_i.operations if oper in model.misplaced_oper_map.keys()]
-                total_class_opers = len(cls_i_matched_opers) + len(cls_i_inherited_opers) + len(cls_i_misplaced_opers)
+                bucket = model.match_index.bucket(cls_i)
+                cls_i_matched_opers = bucket.matched_opers
+                cls_i_inherited_opers = bucket.inherited_opers
+                cls_i_misplaced_opers = bucket.misplaced_opers
+                total_class_opers = bucket.total_opers
 
-                # NOTE: cls_i_match_map, cls_i_split_map can only contain one or no mapping
+                # NOTE: cls_i_match, cls_i_split are the single mapping of the class or None
                 # NOTE: if the class is in the match map, that means all its matched, inherited operations are in the student class 
-                cls_i_match_map = {class_i: cls_s for class_i, cls_s in model.class_match_map.items() if cls_i == class_i}
+                cls_i_match = bucket.match
                 # NOTE: if the class is in the split map, that means all its matched, inherited or misplaced operations are either in the first or second class of the split
-                cls_i_split_map = {class_i: classes_s for class_i, classes_s in model.split_class_map.items() if cls_i == class_i}
+                cls_i_split = bucket.split
                 # NOTE: here we only check the second class since from the algorith the first class is already matched to the student class
                 # if the class would be the fist class, we would have dealt with it in the match map
                 # if the class is in the merge map as the second class, that means all its missplaced operations are in the student class (which is matched to the first class)
-                cls_i_merge_map = {classes_i[1]: cls_s for classes_i, cls_s in model.merge_class_map.items() if cls_i == classes_i[1]}
-                if cls_i_match_map:
+                cls_i_merged_into = bucket.merged_into
+                if cls_i_match:
                     oper_score += len(cls_i_matched_opers) + len(cls_i_inherited_opers) 
-                if cls_i_split_map or cls_i_merge_map:
+                if cls_i_split or cls_i_merged_into:
                     # NOTE: we only take the len of the misplaced operations here since the matched operations are already counted in the match map and if the class has no true match it also has no operations in the match map
                     oper_score += len(cls_i_misplaced_opers) * SPLIT_MERGE_PENALTY
                 class_score += oper_score / total_class_opers if total_class_opers > 0 else 1.0
@@ -110,7 +111,7 @@ class SemanticsEvaluator:
             total_attributes = len(model.temp_all_att_matches)
             attr_score: float = 0.0
             for attr_i, attr_s in model.temp_all_att_matches.items():
-                if SyntacticCheck.syntactic_match(attr_i.name, attr_s.name)[0] or SemanticCheck.semantic_match(attr_i.name, attr_s.name)[0]:
+                if model.evidence.name_match(attr_i, attr_s):
                     attr_score += SCORE_PER_CRIT
 
                 if attr_i.derived == attr_s.derived:
@@ -154,7 +155,7 @@ class SemanticsEvaluator:
             total_attributes = len(model.temp_all_att_matches)
             attr_score: float = 0.0
             for attr_i, attr_s in model.temp_all_att_matches.items():
-                if SyntacticCheck.syntactic_match(attr_i.name, attr_s.name)[0] or SemanticCheck.semantic_match(attr_i.name, attr_s.name)[0]:
+                if model.evidence.name_match(attr_i, attr_s):
                     attr_score += 1
             attribute_name_semantic_score = attr_score / total_attributes if total_attributes > 0 else NO_STATEMENT
         criteria.score = attribute_name_semantic_score
@@ -248,7 +249,7 @@ class SemanticsEvaluator:
             total_operations = len(model.temp_all_oper_matches)
             oper_score: float = 0.0
             for oper_i, oper_s in model.temp_all_oper_matches.items():
-                if SyntacticCheck.syntactic_match(oper_i.name, oper_s.name)[0] or SemanticCheck.semantic_match(oper_i.name, oper_s.name)[0]:
+                if model.evidence.name_match(oper_i, oper_s):
                     oper_score += SCORE_PER_CRIT
 
                 if oper_i.visibility == oper_s.visibility:
@@ -282,7 +283,7 @@ class SemanticsEvaluator:
             total_operations = len(model.temp_all_oper_matches)
             oper_score: float = 0.0
             for oper_i, oper_s in model.temp_all_oper_matches.items():
-                if SyntacticCheck.syntactic_match(oper_i.name, oper_s.name)[0] or SemanticCheck.semantic_match(oper_i.name, oper_s.name)[0]:
+                if model.evidence.name_match(oper_i, oper_s):
                     oper_score += 1
             operation_name_semantic_score = oper_score / total_operations if total_operations > 0 else NO_STATEMENT
         criteria.score = operation_name_semantic_score
@@ -349,7 +350,7 @@ class SemanticsEvaluator:
             total_enumerations = len(model.enum_match_map)
             enum_score: float = 0.0
             for enum_i, enum_s in model.enum_match_map.items():
-                if SyntacticCheck.syntactic_match(enum_i.name, enum_s.name)[0] or SemanticCheck.semantic_match(enum_i.name, enum_s.name)[0]:
+                if model.evidence.name_match(enum_i, enum_s):
                     enum_score += 1
             enum_name_semantic_score = enum_score / total_enumerations if total_enumerations > 0 else NO_STATEMENT
         criteria.score = enum_name_semantic_score
@@ -363,8 +364,8 @@ class SemanticsEvaluator:
             enum_score: float = 0.0
             for enum_i in model.enum_match_map.keys():
                 value_score: float = 0.0
-                enm_matched_values_i = {val for val in enum_i.values if val in model.value_match_map.keys()}
-                enm_misplaced_values_i = {val for val in enum_i.values if val in model.misplaced_value_map.keys()}
+                enm_matched_values_i = model.match_index.matched_values(enum_i)
+                enm_misplaced_values_i = model.match_index.misplaced_values(enum_i)
                 if enm_matched_values_i:
                     total_enm_values = len(enm_matched_values_i) + len(enm_misplaced_values_i)
                     value_score = len(enm_matched_values_i) / total_enm_values if total_enm_values > 0 else 1.0
@@ -381,7 +382,7 @@ class SemanticsEvaluator:
             total_enum_values = len(all_matched_values)
             value_score: float = 0.0
             for value_i, value_s in all_matched_values.items():
-                if SyntacticCheck.syntactic_match(value_i.name, value_s.name)[0] or SemanticCheck.semantic_match(value_i.name, value_s.name)[0]:
+                if model.evidence.name_match(value_i, value_s):
                     value_score += 1
             value_semantic_score = value_score / total_enum_values if total_enum_values > 0 else NO_STATEMENT
         criteria.score = value_semantic_score
@@ -397,7 +398,7 @@ class SemanticsEvaluator:
     def evaluate_rel_types(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
         relation_type_semantic_score: float = NO_STATEMENT
         if model.relation_match_map or model.inst_assoc_link_match_map or model.sec_derivation_inst_map or model.sec_derivation_stud_map:
-            total_relations = len(model.relation_match_map) + len(model.inst_assoc_link_match_map) + len(model.sec_derivation_inst_map) * 2 + len(model.sec_derivation_stud_map)
+            total_relations = len(model.relation_match_map) + len(model.inst_assoc_link_match_map) + sum(len(derivation) for derivation in model.sec_derivation_inst_map) + len(model.sec_derivation_stud_map)
             rel_score: float = 0.0
             for rel_i, rel_s in model.relation_match_map.items():
                 if rel_i.type == rel_s.type:
@@ -411,7 +412,7 @@ class SemanticsEvaluator:
     def evaluate_rel_multiplicity(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
         relation_multiplicity_semantic_score: float = NO_STATEMENT
         if model.relation_match_map or model.inst_assoc_link_match_map or model.sec_derivation_inst_map or model.sec_derivation_stud_map:
-            total_relations = len(model.relation_match_map) + len(model.inst_assoc_link_match_map) + len(model.sec_derivation_inst_map) * 2 + len(model.sec_derivation_stud_map)
+            total_relations = len(model.relation_match_map) + len(model.inst_assoc_link_match_map) + sum(len(derivation) for derivation in model.sec_derivation_inst_map) + len(model.sec_derivation_stud_map)
             rel_score: float = 0.0
             for rel_i, rel_s in model.relation_match_map.items():
                 if rel_i.s_multiplicity == rel_s.s_multiplicity:
@@ -439,7 +440,7 @@ class SemanticsEvaluator:
     def evaluate_rel_descriptions(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
         relation_description_semantic_score: float = NO_STATEMENT
         if model.relation_match_map or model.inst_assoc_link_match_map or model.sec_derivation_inst_map or model.sec_derivation_stud_map:
-            total_relations = len(model.relation_match_map) + len(model.inst_assoc_link_match_map) + len(model.sec_derivation_inst_map) * 2 + len(model.sec_derivation_stud_map)
+            total_relations = len(model.relation_match_map) + len(model.inst_assoc_link_match_map) + sum(len(derivation) for derivation in model.sec_derivation_inst_map) + len(model.sec_derivation_stud_map)
             rel_score: float = 0.0
             for rel_i, rel_s in model.relation_match_map.items():
                 # NOTE: we ignore the direction of the description since its hard to check if the reversed direction could be also semantically correct 
@@ -12,11 +12,7 @@ class SyntaxEvaluator:
     @staticmethod
     def evaluate_classes(criteria: ScoringCriteria, model: EvalModel) -> ScoringCriteria:
         class_syntax_score: float = NO_STATEMENT
-        all_matched_classes = (
-            set(model.class_match_map.values())
-            | {cls for classes in model.split_class_map.values() for cls in classes}
-            | set(model.merge_class_map.values())
-        )
+        all_matched_classes = model.match_index.matched_stud_classes
         if all_matched_classes:
             total_classes = len(all_matched_classes)
             syntax_score = total_classes
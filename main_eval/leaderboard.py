@@ -0,0 +1,213 @@
+from main_eval.result_store import ResultStore
+from main_eval.scoring_plan import ScoringPlan, EVALUATED_GROUPS
+from main_eval.batch_scores import BatchScores
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+import logging
+import os
+import zlib
+import numpy as np
+
+logger = logging.getLogger("leaderboard")
+logger.setLevel(logging.DEBUG)
+
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] - %(name)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+LEADERBOARD_FILE = "leaderboard.npz"
+# metadata of single records, the leaderboard does not group by it
+RECORD_METADATA: List[str] = ["name"]
+HISTOGRAM_BINS = 10
+# largest (resamples, records) index matrix drawn at once by the bootstrap
+BOOTSTRAP_BATCH = 4_000_000
+
+class Leaderboard:
+    # NOTE: the statistics of a ResultStore kept up to date by refresh(), which only reads the chunks added since the last refresh:
+    # per record category and total scores (for distributions and bootstrap intervals) and per cell criteria sums,
+    # a cell is one combination of the metadata without the record name (e.g. model, task, run),
+    # save() writes the state into the store directory so the next process continues from it
+    def __init__(self, directory: str, plan: Optional[ScoringPlan] = None, category_weights: Optional[Dict[str, float]] = None, resamples: int = 1000, confidence: float = 0.95, seed: int = 0):
+        self.directory: str = directory
+        self.plan: ScoringPlan = plan or BatchScores.default_plan()
+        self.category_weights: Optional[Dict[str, float]] = category_weights
+        self.resamples: int = resamples
+        self.confidence: float = confidence
+        self.seed: int = seed
+        index = ResultStore.load_index(directory)
+        self.fields: List[str] = [name for name in index["metadata"] if name not in RECORD_METADATA]
+        self.values: Dict[str, List[str]] = index["values"]
+        self.chunks: int = 0
+        self.codes: np.ndarray = np.zeros((0, len(self.fields)), dtype=np.int32)
+        self.categories: np.ndarray = np.zeros((0, len(EVALUATED_GROUPS)))
+        self.totals: np.ndarray = np.zeros(0)
+        self.cells: Dict[Tuple[str, ...], int] = {}
+        self.cell_sums: np.ndarray = np.zeros((0, len(self.plan)))
+        self.cell_counts: np.ndarray = np.zeros((0, len(self.plan)))
+        # (grouping, group key) -> (records, low, high), only recomputed when records were added to the group
+        self.intervals: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Tuple[int, float, float]] = {}
+
+    def __repr__(self):
+        return f"Leaderboard({self.directory}, records: {len(self.totals)}, chunks: {self.chunks}, cells: {len(self.cells)})"
+
+    def settings(self) -> str:
+        # the saved state is only reused with the same criteria, metadata and settings
+        return json.dumps({
+            "criteria": list(self.plan.ids), "fields": self.fields, "category_weights": self.category_weights,
+            "resamples": self.resamples, "confidence": self.confidence, "seed": self.seed
+        }, sort_keys=True)
+
+    @staticmethod
+    def open(directory: str, plan: Optional[ScoringPlan] = None, category_weights: Optional[Dict[str, float]] = None, resamples: int = 1000, confidence: float = 0.95, seed: int = 0) -> 'Leaderboard':
+        # the leaderboard of the store with its saved state and the new chunks
+        leaderboard = Leaderboard(directory, plan, category_weights, resamples, confidence, seed)
+        path = os.path.join(directory, LEADERBOARD_FILE)
+        if os.path.exists(path):
+            with np.load(path) as data:
+                if str(data["settings"]) == leaderboard.settings():
+                    leaderboard.chunks = int(data["chunks"])
+                    leaderboard.codes = data["codes"]
+                    leaderboard.categories = data["categories"]
+                    leaderboard.totals = data["totals"]
+                    leaderboard.cells = {tuple(key): i for i, key in enumerate(json.loads(str(data["cells"])))}
+                    leaderboard.cell_sums = data["cell_sums"]
+                    leaderboard.cell_counts = data["cell_counts"]
+                    leaderboard.intervals = {(tuple(by), tuple(key)): (n, low, high) for by, key, n, low, high in json.loads(str(data["intervals"]))}
+                else:
+                    logger.debug(f"settings changed, rebuilding the leaderboard of {directory}")
+        leaderboard.refresh()
+        return leaderboard
+
+    def save(self) -> None:
+        path = os.path.join(self.directory, LEADERBOARD_FILE)
+        # NOTE: np.savez appends .npz to names without it
+        temp_path = path + ".tmp.npz"
+        np.savez(
+            temp_path,
+            settings=np.array(self.settings()),
+            chunks=np.array(self.chunks),
+            codes=self.codes,
+            categories=self.categories,
+            totals=self.totals,
+            cells=np.array(json.dumps(list(self.cells))),
+            cell_sums=self.cell_sums,
+            cell_counts=self.cell_counts,
+            intervals=np.array(json.dumps([[by, key, n, low, high] for (by, key), (n, low, high) in self.intervals.items()]))
+        )
+        os.replace(temp_path, path)
+
+    def refresh(self) -> int:
+        # reads the chunks added since the last refresh, returns the number of new records
+        store = ResultStore.load(self.directory, self.plan, self.chunks)
+        self.chunks = store.chunks
+        self.values = store.values
+        if not len(store):
+            return 0
+        batch = store.batch_scores(name=None)
+        self.categories = np.vstack([self.categories, batch.category_scores()])
+        self.totals = np.concatenate([self.totals, batch.total_scores(self.category_weights)])
+        codes = np.stack([store.codes[name] for name in self.fields], axis=1) if self.fields else np.zeros((len(store), 0), dtype=np.int32)
+        self.codes = np.vstack([self.codes, codes])
+
+        keys, sums, counts = store.group_sums(self.fields)
+        new_cells = [key for key in keys if key not in self.cells]
+        if new_cells:
+            for key in new_cells:
+                self.cells[key] = len(self.cells)
+            self.cell_sums = np.vstack([self.cell_sums, np.zeros((len(new_cells), len(self.plan)))])
+            self.cell_counts = np.vstack([self.cell_counts, np.zeros((len(new_cells), len(self.plan)))])
+        rows = [self.cells[key] for key in keys]
+        self.cell_sums[rows] += sums
+        self.cell_counts[rows] += counts
+        logger.debug(f"{len(store)} new records in {self.directory}")
+        return len(store)
+
+    def groups(self, by: Sequence[str]) -> List[Tuple[Tuple[str, ...], np.ndarray]]:
+        # the records of every distinct combination of the by fields, the records of one group in the order they were added
+        columns = [self.fields.index(name) for name in by]
+        if not len(self.totals):
+            return []
+        if not columns:
+            return [((), np.arange(len(self.totals)))]
+        dims = tuple(max(len(self.values[name]), 1) for name in by)
+        combined = np.ravel_multi_index(tuple(self.codes[:, column] for column in columns), dims)
+        unique, inverse = np.unique(combined, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+        return [
+            (tuple(self.values[name][int(code)] for name, code in zip(by, key_codes)), order[bounds[g]:bounds[g + 1]])
+            for g, key_codes in enumerate(zip(*np.unravel_index(unique, dims)))
+        ]
+
+    @staticmethod
+    def bootstrap_interval(values: np.ndarray, resamples: int, confidence: float, rng: np.random.Generator) -> Tuple[float, float]:
+        # percentile interval of the mean, the resamples are drawn as index matrices of at most BOOTSTRAP_BATCH entries
+        n = len(values)
+        if n == 0:
+            return (float("nan"), float("nan"))
+        unique, counts = np.unique(values, return_counts=True)
+        if len(unique) * 4 <= n:
+            # NOTE: few distinct scores, drawing n records is the same as multinomial counts of the distinct scores
+            means = rng.multinomial(n, counts / n, size=resamples) @ unique / n
+        else:
+            means = np.empty(resamples)
+            batch = max(1, BOOTSTRAP_BATCH // n)
+            for start in range(0, resamples, batch):
+                size = min(batch, resamples - start)
+                means[start:start + size] = values[rng.integers(0, n, (size, n))].mean(axis=1)
+        alpha = (1 - confidence) / 2
+        low, high = np.quantile(means, [alpha, 1 - alpha])
+        return (float(low), float(high))
+
+    def interval(self, by: Tuple[str, ...], key: Tuple[str, ...], values: np.ndarray) -> Tuple[float, float]:
+        cached = self.intervals.get((by, key))
+        if cached is not None and cached[0] == len(values):
+            return cached[1:]
+        # NOTE: seeded by the group so an interval does not depend on which groups were refreshed before it
+        rng = np.random.default_rng([self.seed, zlib.crc32(json.dumps([by, key]).encode("utf-8"))])
+        low, high = Leaderboard.bootstrap_interval(values, self.resamples, self.confidence, rng)
+        self.intervals[(by, key)] = (len(values), low, high)
+        return (low, high)
+
+    def table(self, by: Sequence[str] = ("model",)) -> List[Dict[str, Any]]:
+        # one row per group ranked by the mean total score: records, mean, std, bootstrap interval of the mean,
+        # the histogram of the total scores in [0, 1] and the mean category scores, records without any statement are left out
+        by = tuple(by)
+        rows: List[Dict[str, Any]] = []
+        for key, records in self.groups(by):
+            totals = self.totals[records]
+            totals = totals[~np.isnan(totals)]
+            categories = self.categories[records]
+            category_counts = np.sum(~np.isnan(categories), axis=0)
+            category_sums = np.nansum(categories, axis=0)
+            low, high = self.interval(by, key, totals)
+            rows.append({
+                **dict(zip(by, key)),
+                "records": int(len(totals)),
+                "mean": float(totals.mean()) if len(totals) else None,
+                "std": float(totals.std()) if len(totals) else None,
+                "ci_low": None if np.isnan(low) else low,
+                "ci_high": None if np.isnan(high) else high,
+                "histogram": np.histogram(totals, bins=HISTOGRAM_BINS, range=(0.0, 1.0))[0].tolist(),
+                **{group: float(category_sums[k] / category_counts[k]) if category_counts[k] else None for k, group in enumerate(EVALUATED_GROUPS)}
+            })
+        rows.sort(key=lambda row: -1.0 if row["mean"] is None else row["mean"], reverse=True)
+        for rank, row in enumerate(rows, 1):
+            row["rank"] = rank
+        return rows
+
+    def criteria_means(self, by: Sequence[str] = ("model",), criteria: Optional[List[str]] = None) -> Tuple[List[Tuple[str, ...]], np.ndarray]:
+        # (groups, criteria) mean over the records with a statement, summed from the cells
+        columns = [self.fields.index(name) for name in by]
+        columns_criteria = [self.plan.index[criteria_id] for criteria_id in criteria] if criteria is not None else list(range(len(self.plan)))
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for cell, row in self.cells.items():
+            groups.setdefault(tuple(cell[column] for column in columns), []).append(row)
+        keys = sorted(groups)
+        sums = np.array([self.cell_sums[groups[key]].sum(axis=0) for key in keys]).reshape(len(keys), len(self.plan))[:, columns_criteria]
+        counts = np.array([self.cell_counts[groups[key]].sum(axis=0) for key in keys]).reshape(len(keys), len(self.plan))[:, columns_criteria]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (keys, np.where(counts > 0, sums / np.where(counts > 0, counts, 1.0), np.nan))
@@ -0,0 +1,234 @@
+from main_eval.eval_metrics import NO_STATEMENT
+from main_eval.scoring_plan import ScoringPlan
+from main_eval.batch_scores import BatchScores
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import json
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger("result_store")
+logger.setLevel(logging.DEBUG)
+
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] - %(name)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+RESULT_FORMAT_VERSION = 1
+RESULT_INDEX = "index.json"
+# per record metadata of a benchmark run, other names can be given to the writer
+RESULT_METADATA: List[str] = ["model", "task", "run", "name"]
+
+# NOTE: a result store is a directory with one .npz file per chunk of records and index.json, e.g.
+# {"format": 1, "criteria": ["CPT.CLS", ...], "metadata": ["model", "task", "run", "name"],
+#  "values": {"model": ["gpt-4o", ...], ...}, "chunks": [{"file": "chunk_000000.npz", "rows": 4096}, ...]}
+# a chunk holds the scores as (criteria, rows) float32, one contiguous column per criteria in the order of "criteria"
+# (NO_STATEMENT is kept as 777), and one int32 code column per metadata name that indexes the append only "values"
+
+class ResultStoreWriter:
+    # NOTE: records are buffered and written as a new chunk every chunk_size records, the index is replaced after
+    # the chunk is written so an interrupted run loses at most the buffered records, an existing store is appended to
+    def __init__(self, directory: str, plan: Optional[ScoringPlan] = None, metadata: Optional[List[str]] = None, chunk_size: int = 4096):
+        self.directory: str = directory
+        self.plan: ScoringPlan = plan or BatchScores.default_plan()
+        self.chunk_size: int = chunk_size
+        os.makedirs(directory, exist_ok=True)
+        index_path = os.path.join(directory, RESULT_INDEX)
+        if os.path.exists(index_path):
+            self.index: Dict[str, Any] = ResultStore.load_index(directory)
+            if self.index["criteria"] != list(self.plan.ids):
+                raise ValueError(f"Criteria of the result store {directory} do not match the scoring plan")
+            if metadata is not None and metadata != self.index["metadata"]:
+                raise ValueError(f"Metadata {metadata} do not match {self.index['metadata']} of the result store {directory}")
+        else:
+            names = metadata if metadata is not None else RESULT_METADATA
+            self.index = {"format": RESULT_FORMAT_VERSION, "criteria": list(self.plan.ids), "metadata": names, "values": {name: [] for name in names}, "chunks": []}
+        self.metadata: List[str] = self.index["metadata"]
+        self.value_codes: Dict[str, Dict[str, int]] = {name: {value: code for code, value in enumerate(values)} for name, values in self.index["values"].items()}
+        self.scores: List[List[float]] = []
+        self.codes: List[List[int]] = []
+
+    def __repr__(self):
+        return f"ResultStoreWriter({self.directory}, rows: {self.rows()}, buffered: {len(self.scores)})"
+
+    def __enter__(self) -> 'ResultStoreWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.flush()
+
+    def rows(self) -> int:
+        return sum(chunk["rows"] for chunk in self.index["chunks"])
+
+    def code(self, name: str, value: Any) -> int:
+        value = "" if value is None else str(value)
+        codes = self.value_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.index["values"][name].append(value)
+        return code
+
+    def append(self, scores: Union[Sequence[float], Dict[str, float]], **metadata: Any) -> None:
+        # scores in the column order of the plan (e.g. EvalHandler.scores) or by criteria id, missing criteria are NO_STATEMENT
+        unknown = set(metadata) - set(self.metadata)
+        if unknown:
+            raise ValueError(f"Unknown metadata {sorted(unknown)}, expected {self.metadata}")
+        if isinstance(scores, dict):
+            row = [NO_STATEMENT] * len(self.plan)
+            for criteria_id, score in scores.items():
+                column = self.plan.index.get(criteria_id)
+                if column is not None:
+                    row[column] = score
+        else:
+            if len(scores) != len(self.plan):
+                raise ValueError(f"Expected {len(self.plan)} scores, got {len(scores)}")
+            row = list(scores)
+        self.scores.append(row)
+        self.codes.append([self.code(name, metadata.get(name)) for name in self.metadata])
+        if len(self.scores) >= self.chunk_size:
+            self.flush()
+
+    def append_handler(self, handler: Any, **metadata: Any) -> None:
+        if handler.plan.ids != self.plan.ids:
+            raise ValueError("The handler was evaluated with another scoring plan")
+        self.append(handler.scores, **metadata)
+
+    def flush(self) -> None:
+        if not self.scores:
+            return
+        file_name = f"chunk_{len(self.index['chunks']):06d}.npz"
+        codes = np.array(self.codes, dtype=np.int32).reshape(len(self.codes), len(self.metadata))
+        arrays = {f"meta_{name}": codes[:, i] for i, name in enumerate(self.metadata)}
+        np.savez(os.path.join(self.directory, file_name), scores=np.array(self.scores, dtype=np.float32).T, **arrays)
+        self.index["chunks"].append({"file": file_name, "rows": len(self.scores)})
+        index_path = os.path.join(self.directory, RESULT_INDEX)
+        with open(index_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(self.index, file)
+        os.replace(index_path + ".tmp", index_path)
+        logger.debug(f"wrote {file_name} with {len(self.scores)} records to {self.directory}")
+        self.scores = []
+        self.codes = []
+
+class ResultStore:
+    # NOTE: all chunks of a store loaded into one (criteria, records) matrix and one code column per metadata name,
+    # filters are boolean masks and grouped means are sums over the codes, no record is parsed one by one
+    def __init__(self, criteria: List[str], metadata: List[str], values: Dict[str, List[str]], codes: Dict[str, np.ndarray], scores: np.ndarray, plan: Optional[ScoringPlan] = None, chunks: int = 0):
+        self.criteria: List[str] = criteria
+        self.criteria_index: Dict[str, int] = {criteria_id: i for i, criteria_id in enumerate(criteria)}
+        self.metadata: List[str] = metadata
+        self.values: Dict[str, List[str]] = values
+        self.codes: Dict[str, np.ndarray] = codes
+        self.plan: Optional[ScoringPlan] = plan
+        # chunks of the index that were read, the next load of new records starts there
+        self.chunks: int = chunks
+        self.valid: np.ndarray = scores != NO_STATEMENT
+        if plan is not None:
+            # criteria that are not evaluated (e.g. naming) never have a statement, see BatchScores
+            self.valid &= np.array([evaluator is not None for evaluator in plan.evaluators], dtype=bool)[:, None]
+        # NOTE: scores without a statement are set to 0 in place, the sums need no mask and the matrix is not copied
+        np.multiply(scores, self.valid, out=scores)
+        self.scores: np.ndarray = scores
+
+    def __repr__(self):
+        return f"ResultStore(records: {len(self)}, criteria: {len(self.criteria)}, metadata: {self.metadata})"
+
+    def __len__(self):
+        return self.scores.shape[1]
+
+    @staticmethod
+    def load_index(directory: str) -> Dict[str, Any]:
+        with open(os.path.join(directory, RESULT_INDEX), encoding="utf-8") as file:
+            index = json.load(file)
+        if index.get("format") != RESULT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported result store format {index.get('format')}, expected {RESULT_FORMAT_VERSION}")
+        return index
+
+    @staticmethod
+    def load(directory: str, plan: Optional[ScoringPlan] = None, first_chunk: int = 0) -> 'ResultStore':
+        # chunks that are not in the index yet (e.g. of an interrupted run) are ignored,
+        # first_chunk skips the chunks that were already read (e.g. by a Leaderboard)
+        index = ResultStore.load_index(directory)
+        if plan is not None and list(plan.ids) != index["criteria"]:
+            raise ValueError(f"Criteria of the result store {directory} do not match the scoring plan")
+        metadata: List[str] = index["metadata"]
+        chunks = index["chunks"][first_chunk:]
+        rows = sum(chunk["rows"] for chunk in chunks)
+        scores = np.empty((len(index["criteria"]), rows), dtype=np.float32)
+        codes = {name: np.empty(rows, dtype=np.int32) for name in metadata}
+        start = 0
+        for chunk in chunks:
+            end = start + chunk["rows"]
+            with np.load(os.path.join(directory, chunk["file"])) as data:
+                scores[:, start:end] = data["scores"]
+                for name in metadata:
+                    codes[name][start:end] = data[f"meta_{name}"]
+            start = end
+        return ResultStore(index["criteria"], metadata, index["values"], codes, scores, plan, len(index["chunks"]))
+
+    def where(self, **filters: Union[Any, Sequence[Any]]) -> np.ndarray:
+        # mask of the records whose metadata is (one of) the given value(s), e.g. where(model="gpt-4o", task=["t1", "t2"])
+        mask = np.ones(len(self), dtype=bool)
+        for name, wanted in filters.items():
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            lookup = {value: code for code, value in enumerate(self.values[name])}
+            codes = [lookup[str(value)] for value in wanted if str(value) in lookup]
+            mask &= np.isin(self.codes[name], codes)
+        return mask
+
+    def metadata_column(self, name: str, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        codes = self.codes[name] if mask is None else self.codes[name][mask]
+        return np.array(self.values[name], dtype=object)[codes]
+
+    def column(self, criteria_id: str, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        # scores of one criteria, NaN where there is no statement
+        i = self.criteria_index[criteria_id]
+        column = np.where(self.valid[i], self.scores[i], np.nan)
+        return column if mask is None else column[mask]
+
+    def group_keys(self, by: Union[str, Sequence[str]], mask: Optional[np.ndarray] = None) -> Tuple[List[Tuple[str, ...]], np.ndarray]:
+        # the distinct metadata combinations of the (masked) records and the group of every record
+        names = [by] if isinstance(by, str) else list(by)
+        if not names:
+            records = len(self) if mask is None else int(np.count_nonzero(mask))
+            return ([()] if records else [], np.zeros(records, dtype=np.int64))
+        codes = [self.codes[name] if mask is None else self.codes[name][mask] for name in names]
+        dims = tuple(max(len(self.values[name]), 1) for name in names)
+        combined = np.ravel_multi_index(codes, dims).astype(np.int64)
+        unique, inverse = np.unique(combined, return_inverse=True)
+        keys = [tuple(self.values[name][int(code)] for name, code in zip(names, key_codes)) for key_codes in zip(*np.unravel_index(unique, dims))]
+        return (keys, inverse.reshape(-1))
+
+    def group_sums(self, by: Union[str, Sequence[str]], criteria: Optional[List[str]] = None, mask: Optional[np.ndarray] = None) -> Tuple[List[Tuple[str, ...]], np.ndarray, np.ndarray]:
+        # (groups, criteria) sums of the scores and counts of the records with a statement
+        keys, groups = self.group_keys(by, mask)
+        rows = [self.criteria_index[criteria_id] for criteria_id in criteria] if criteria is not None else list(range(len(self.criteria)))
+        scores = self.scores if criteria is None else self.scores[rows]
+        valid = self.valid if criteria is None else self.valid[rows]
+        if mask is not None:
+            scores, valid = scores[:, mask], valid[:, mask]
+        # NOTE: one bincount per criteria, sums in float64 without a (groups, records) buffer
+        sums = np.zeros((len(keys), len(rows)))
+        counts = np.zeros((len(keys), len(rows)))
+        for j in range(len(rows)):
+            sums[:, j] = np.bincount(groups, weights=scores[j], minlength=len(keys))
+            counts[:, j] = np.bincount(groups, weights=valid[j], minlength=len(keys))
+        return (keys, sums, counts)
+
+    def group_mean(self, by: Union[str, Sequence[str]], criteria: Optional[List[str]] = None, mask: Optional[np.ndarray] = None) -> Tuple[List[Tuple[str, ...]], np.ndarray]:
+        # (groups, criteria) mean over the records with a statement, NaN if no record of a group has one
+        keys, sums, counts = self.group_sums(by, criteria, mask)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (keys, np.where(counts > 0, sums / np.where(counts > 0, counts, 1.0), np.nan))
+
+    def batch_scores(self, mask: Optional[np.ndarray] = None, name: Optional[str] = "name") -> BatchScores:
+        # category and total scores of the (masked) records, see BatchScores
+        plan = self.plan or BatchScores.default_plan()
+        if list(plan.ids) != self.criteria:
+            raise ValueError("Criteria of the result store do not match the scoring plan")
+        scores, valid = (self.scores, self.valid) if mask is None else (self.scores[:, mask], self.valid[:, mask])
+        names = list(self.metadata_column(name, mask)) if name is not None and name in self.codes else None
+        return BatchScores(plan, np.where(valid, scores, NO_STATEMENT).T, names)
@@ -0,0 +1,101 @@
+from main_eval.eval_metrics import ScoringCriteria, ScoringScheme
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+Evaluator = Callable[[ScoringCriteria, Any], ScoringCriteria]
+CriteriaGroup = Union[Dict[str, ScoringCriteria], Dict[str, Tuple[ScoringCriteria, Optional[List[ScoringCriteria]], Optional[List[ScoringCriteria]]]]]
+
+# criteria groups of the ScoringScheme in evaluation order, the naming groups are not evaluated (see EvalHandler.evaluate_naming)
+EVALUATED_GROUPS: List[str] = ["completeness_criteria", "syntax_criteria", "global_syntax_criteria", "semantics_criteria"]
+PLAN_GROUPS: List[str] = EVALUATED_GROUPS + ["naming_criteria", "global_naming_criteria"]
+
+class ScoringPlan:
+    # NOTE: the ScoringScheme compiled once into flat tuples, entry i describes criteria i in evaluation order
+    # (criteria before its sub-criteria), evaluators are resolved on compile so an evaluation only fills a score list
+    __slots__ = ("ids", "categories", "descriptions", "weights", "parents", "groups", "evaluators", "index", "layout", "group_ranges")
+
+    def __init__(self, scheme: ScoringScheme, resolve: Callable[[ScoringCriteria], Optional[Evaluator]]):
+        ids: List[str] = []
+        categories: List[str] = []
+        descriptions: List[str] = []
+        weights: List[float] = []
+        parents: List[int] = []
+        groups: List[str] = []
+        evaluators: List[Optional[Evaluator]] = []
+        # group -> [(key, criteria index, sub-criteria 1 indices, sub-criteria 2 indices)],
+        # the sub-criteria are False for groups of single criteria (e.g. naming_criteria) and None if there are none
+        layout: Dict[str, Tuple[Tuple[str, int, Union[None, bool, Tuple[int, ...]], Union[None, bool, Tuple[int, ...]]], ...]] = {}
+        group_ranges: Dict[str, Tuple[int, int]] = {}
+
+        def add(criteria: ScoringCriteria, group: str, parent: int) -> int:
+            ids.append(criteria.id)
+            categories.append(criteria.category)
+            descriptions.append(criteria.description)
+            weights.append(criteria.weight)
+            parents.append(parent)
+            groups.append(group)
+            evaluators.append(resolve(criteria) if group in EVALUATED_GROUPS else None)
+            return len(ids) - 1
+
+        for group in PLAN_GROUPS:
+            start = len(ids)
+            entries = []
+            for key, value in getattr(scheme, group).items():
+                if isinstance(value, ScoringCriteria):
+                    entries.append((key, add(value, group, -1), False, False))
+                    continue
+                criteria, sub_criteria_1, sub_criteria_2 = value
+                index = add(criteria, group, -1)
+                sub_1 = tuple(add(sub_criteria, group, index) for sub_criteria in sub_criteria_1) if sub_criteria_1 else None
+                sub_2 = tuple(add(sub_criteria, group, index) for sub_criteria in sub_criteria_2) if sub_criteria_2 else None
+                entries.append((key, index, sub_1, sub_2))
+            layout[group] = tuple(entries)
+            group_ranges[group] = (start, len(ids))
+
+        self.ids: Tuple[str, ...] = tuple(ids)
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self.descriptions: Tuple[str, ...] = tuple(descriptions)
+        self.weights: Tuple[float, ...] = tuple(weights)
+        # index of the criteria a sub-criteria belongs to, -1 for top level criteria
+        self.parents: Tuple[int, ...] = tuple(parents)
+        self.groups: Tuple[str, ...] = tuple(groups)
+        self.evaluators: Tuple[Optional[Evaluator], ...] = tuple(evaluators)
+        self.index: Dict[str, int] = {criteria_id: i for i, criteria_id in enumerate(ids)}
+        self.layout = layout
+        self.group_ranges: Dict[str, Tuple[int, int]] = group_ranges
+
+    def __repr__(self):
+        return f"ScoringPlan(criteria: {len(self.ids)}, evaluated: {sum(evaluator is not None for evaluator in self.evaluators)})"
+
+    def __len__(self):
+        return len(self.ids)
+
+    def new_scores(self) -> List[float]:
+        # NOTE: unevaluated criteria keep the default score of ScoringCriteria
+        return [0.0] * len(self.ids)
+
+    def evaluate_group(self, group: str, model: Any, scores: List[float]) -> None:
+        # one reused ScoringCriteria for the whole group, the evaluators only set its score
+        start, end = self.group_ranges[group]
+        criteria = self.criteria(start)
+        for i in range(start, end):
+            criteria.score = 0.0
+            self.evaluators[i](criteria, model)
+            scores[i] = criteria.score
+
+    def criteria(self, i: int, scores: Optional[List[float]] = None) -> ScoringCriteria:
+        return ScoringCriteria(self.categories[i], self.ids[i], self.descriptions[i], self.weights[i], scores[i] if scores is not None else 0.0)
+
+    def criteria_group(self, group: str, scores: Optional[List[float]] = None) -> CriteriaGroup:
+        # the group in the structure of the ScoringScheme, filled with the given scores
+        criteria_group = {}
+        for key, index, sub_1, sub_2 in self.layout[group]:
+            if sub_1 is False:
+                criteria_group[key] = self.criteria(index, scores)
+                continue
+            criteria_group[key] = (
+                self.criteria(index, scores),
+                [self.criteria(i, scores) for i in sub_1] if sub_1 else None,
+                [self.criteria(i, scores) for i in sub_2] if sub_2 else None
+            )
+        return criteria_group
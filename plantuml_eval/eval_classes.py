@@ -1,10 +1,10 @@
-from tools.syntactic_check import SyntacticCheck
-from tools.semantic_check import SemanticCheck
 from tools.content_check import ContentCheck
+from tools.match_evidence import EvidenceCheck
 from tools.relation_check import RelationCheck
 from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation, UMLVisibility
 from UML_model.uml_relation import UMLRelationType
 from UML_model.uml_model import UMLModel
+from UML_model.uml_graph_index import UMLGraphIndex
 from grading.grade_metamodel import GradeModel
 from plantuml_eval.eval_helper_functions import EvalHelper
 
@@ -47,11 +47,11 @@ class ClassComperator:
             possible_matches[ci] = []
             for cs in student_classes:
                 #5: if syntacticMatch(Cs.name, Ci.name) or
-                if (SyntacticCheck.syntactic_match(ci.name, cs.name)[0]) or (
-                    #6: semanticMatch(Cs.name, Ci.name) ) or
-                    SemanticCheck.semantic_match(ci.name, cs.name)[0]) or (
+                #6: semanticMatch(Cs.name, Ci.name) ) or
+                # NOTE: the check results are kept as evidence for the evaluators, see EvidenceStore
+                if EvidenceCheck.name_match(ci, cs) or (
                     #7: contentMatch(Cs.content, Ci.content) then
-                    ContentCheck.class_content_match(ci, cs)[0]):
+                    EvidenceCheck.content_match(ci, cs, ContentCheck.class_content_match)):
                     #8: storePossibleMatch(Ci, Cs)
                     possible_matches[ci].append(cs)
         logger.info(f"found {len(possible_matches)} possible class matches")
@@ -90,20 +90,25 @@ class ClassComperator:
             logger.debug(f"unmatched instructor classes: {[str(cls) for cls in unmatched_instructor_classes]}")
             logger.debug(f"unmatched student classes: {[str(cls) for cls in unmatched_stud_classes]}")
 
+        # NOTE: the relation ends come from the shared graph index of the models
+        inst_graph = instructor_model.graph_index
+        stud_graph = student_model.graph_index
+        reversed_class_match_map: Dict[UMLClass, UMLClass] = {v: k for k, v in class_match_map.items()}
+
         #14: for all Class Ci in missClassList do 
         for ci in unmatched_instructor_classes:
             possible_matches[ci] = []
+            #17: ListI← Ci.getAssociationEnds()
+            list_i = inst_graph.relation_ends(ci)
+            logger.debug(f"relation ends for {str(ci)}: {[str(li) for li in list_i]}")
             #15: for all Class Cs in studList do 
             #16:if no match exists for Cs then 
             for cs in unmatched_stud_classes:
-                #17: ListI← Ci.getAssociationEnds()
-                list_i = ci.get_relation_ends()
                 #18: ListS← Cs.getAssociationEnds()
-                list_s = cs.get_relation_ends()
-                logger.debug(f"relation ends for {str(ci)}: {[str(li) for li in list_i]}")
+                list_s = stud_graph.relation_ends(cs)
                 logger.debug(f"relation ends for {str(cs)}: {[str(ls) for ls in list_s]}")
                 #19: if assocMatch(ListS,ListI) then
-                if RelationCheck.relation_match(list_s, list_i, class_match_map)[0]:
+                if RelationCheck.relation_match(list_s, list_i, class_match_map, reverse_class_match_map=reversed_class_match_map)[0]:
                     #20: classMatchMap.put(Ci, Cs)
                     possible_matches[ci].append(cs)
         if unmatched_instructor_classes:
@@ -132,8 +137,11 @@ class ClassComperator:
 
     # first part of algorithm 2
     @staticmethod
-    def compare_attributes(inst_att_list: List[UMLAttribute], stud_att_list: List[UMLAttribute], class_match_map: Dict[UMLClass, UMLClass], reversed_class_match_map: Dict[UMLClass, UMLClass], grade_model: Optional[GradeModel] = None) -> Tuple[Dict[UMLAttribute, UMLAttribute], Dict[UMLAttribute, UMLAttribute], Dict[UMLAttribute, UMLAttribute], List[UMLAttribute]]:
+    def compare_attributes(inst_att_list: List[UMLAttribute], stud_att_list: List[UMLAttribute], class_match_map: Dict[UMLClass, UMLClass], reversed_class_match_map: Dict[UMLClass, UMLClass], grade_model: Optional[GradeModel] = None, inst_graph: Optional[UMLGraphIndex] = None) -> Tuple[Dict[UMLAttribute, UMLAttribute], Dict[UMLAttribute, UMLAttribute], Dict[UMLAttribute, UMLAttribute], List[UMLAttribute]]:
         logger.info("starting compare attributes method")
+        # NOTE: ancestors are resolved on demand from super_class, so an empty index is enough for standalone calls
+        if inst_graph is None:
+            inst_graph = UMLGraphIndex([], [], [])
         # helper variables
         possible_attr_matches: Dict[UMLAttribute, List[UMLAttribute]] = {}
         safe_attr_matches: Dict[UMLAttribute, UMLAttribute] = {}
@@ -157,15 +165,15 @@ class ClassComperator:
                 #6:Cs ← As.eContainer()
                 c_s: UMLClass = a_s.reference
                 #7:if Ai is synatax or semtantic match for As then 
-                if SyntacticCheck.syntactic_match(a_i.name, a_s.name)[0] or (SemanticCheck.semantic_match(a_i.name, a_s.name)[0]):
+                if EvidenceCheck.name_match(a_i, a_s):
                     #8:if classMatchMap.get(Cs).equals(Ci) then 
                     if class_match_map.get(c_i) == c_s:
                         #9:matchedAttrMap.put(As, Ai) 
                         possible_attr_matches[a_i].append(a_s)
                     # NOTE: the following could be merged with the previous if statement, but we keep it for the formality of the algorithm
                     #10:else if Ci is superClass of classMatchMap.get(Cs) and Ai is not private then 
-                    # NOTE: the authors recomends to follow the inheritance hierarchy all the way up, but for the given test cases, 2 levels of inheritance are sufficient
-                    elif reversed_class_match_map.get(c_s) and (c_i == reversed_class_match_map.get(c_s).super_class or (reversed_class_match_map.get(c_s).super_class and c_i == reversed_class_match_map.get(c_s).super_class.super_class)) and a_i.visibility != UMLVisibility.PRIVATE:
+                    # NOTE: follows the inheritance hierarchy all the way up as recommended by the authors, see UMLGraphIndex.ancestors
+                    elif reversed_class_match_map.get(c_s) and inst_graph.is_ancestor(c_i, reversed_class_match_map.get(c_s)) and a_i.visibility != UMLVisibility.PRIVATE:
                         #11:matchedAttrMap.put(As, Ai)
                         possible_attr_matches[a_i].append(a_s)
 
@@ -192,7 +200,7 @@ class ClassComperator:
             possible_missplaced_attr_matches[a_i] = []
             #13:if As not matched And Ai is synatax or semtantic match for As then 
             for a_s in unmatched_stud_attrs:
-                if SyntacticCheck.syntactic_match(a_i.name, a_s.name)[0] or SemanticCheck.semantic_match(a_i.name, a_s.name)[0]:
+                if EvidenceCheck.name_match(a_i, a_s):
                     #14:misplaceAttrMap.put(As, Ai)
                     possible_missplaced_attr_matches[a_i].append(a_s)
 
@@ -207,8 +215,11 @@ class ClassComperator:
 
     # second part of algorithm 2
     @staticmethod
-    def compare_operations(inst_opr_list: List[UMLOperation], stud_opr_list: List[UMLOperation], class_match_map: Dict[UMLClass, UMLClass], reversed_class_match_map: Dict[UMLClass, UMLClass], grade_model: Optional[GradeModel] = None) -> Tuple[Dict[UMLOperation, UMLOperation], Dict[UMLOperation, UMLOperation], Dict[UMLOperation, UMLOperation], List[UMLOperation]]:
+    def compare_operations(inst_opr_list: List[UMLOperation], stud_opr_list: List[UMLOperation], class_match_map: Dict[UMLClass, UMLClass], reversed_class_match_map: Dict[UMLClass, UMLClass], grade_model: Optional[GradeModel] = None, inst_graph: Optional[UMLGraphIndex] = None) -> Tuple[Dict[UMLOperation, UMLOperation], Dict[UMLOperation, UMLOperation], Dict[UMLOperation, UMLOperation], List[UMLOperation]]:
         logger.info("starting compare operations method")
+        # NOTE: ancestors are resolved on demand from super_class, so an empty index is enough for standalone calls
+        if inst_graph is None:
+            inst_graph = UMLGraphIndex([], [], [])
         # helper variables
         possible_oper_matches: Dict[UMLOperation, List[UMLOperation]] = {}
         safe_opr_matches: Dict[UMLOperation, UMLOperation] = {}
@@ -232,14 +243,14 @@ class ClassComperator:
                 #19:Cs ← Os.eContainer()
                 cs: UMLClass = os.reference
                 #20:if Oi.synMatch(Os) or Oi.semanticMatch(Os) then 
-                if SyntacticCheck.syntactic_match(oi.name, os.name)[0] or SemanticCheck.semantic_match(oi.name, os.name)[0]:
+                if EvidenceCheck.name_match(oi, os):
                     #21:if classMatchMap.get(Cs) equals Ci then  
                     if class_match_map.get(ci) == cs:
                         #22:matchedOperMap.put(Os, Oi) 
                         possible_oper_matches[oi].append(os)
                     #23:else if Ci is superClass of classMatchMap.get(Cs) and Oi is not private then 
-                    # NOTE: the authors recomends to follow the inheritance hierarchy all the way up, but for the given test cases, 2 levels of inheritance are sufficient
-                    elif reversed_class_match_map.get(cs) and (ci == reversed_class_match_map.get(cs).super_class or (reversed_class_match_map.get(cs).super_class and ci == reversed_class_match_map.get(cs).super_class.super_class)) and oi.visibility != UMLVisibility.PRIVATE:
+                    # NOTE: follows the inheritance hierarchy all the way up as recommended by the authors, see UMLGraphIndex.ancestors
+                    elif reversed_class_match_map.get(cs) and inst_graph.is_ancestor(ci, reversed_class_match_map.get(cs)) and oi.visibility != UMLVisibility.PRIVATE:
                         #24:matchedOperMap.put(Os, Oi)
                         possible_oper_matches[oi].append(os)
         
@@ -264,7 +275,7 @@ class ClassComperator:
             possible_missplaced_oper_matches[oi] = []
             #26:if Os is not matched And Oi.synlMatch(Os) or Oi.semanticMatch(Os) then 
             for os in unmatched_stud_opers:
-                if SyntacticCheck.syntactic_match(oi.name, os.name)[0] or SemanticCheck.semantic_match(oi.name, os.name)[0]:
+                if EvidenceCheck.name_match(oi, os):
                     #27:misplaceOperMap.put(Os, Oi) 
                     possible_missplaced_oper_matches[oi].append(os)
                     #28:instOperList.put(Oi, true) 
@@ -298,7 +309,7 @@ class ClassComperator:
         stud_att_list: List[UMLAttribute] = student_model.attribute_list
 
         #4 - #14
-        attr_match_map, inherited_attr_map, misplaced_attr_map, miss_attr_list = ClassComperator.compare_attributes(inst_att_list, stud_att_list, class_match_map, reversed_class_match_map, grade_model)
+        attr_match_map, inherited_attr_map, misplaced_attr_map, miss_attr_list = ClassComperator.compare_attributes(inst_att_list, stud_att_list, class_match_map, reversed_class_match_map, grade_model, instructor_model.graph_index)
 
         #15: instList← InstructorModel.getOperation()
         inst_opr_list: List[UMLOperation] = instructor_model.operation_list
@@ -307,7 +318,7 @@ class ClassComperator:
         stud_opr_list: List[UMLOperation] = student_model.operation_list
 
         #17 - #28
-        oper_matched_map, inherited_oper_map, misplaced_oper_map, miss_oper_list = ClassComperator.compare_operations(inst_opr_list, stud_opr_list, class_match_map, reversed_class_match_map, grade_model)
+        oper_matched_map, inherited_oper_map, misplaced_oper_map, miss_oper_list = ClassComperator.compare_operations(inst_opr_list, stud_opr_list, class_match_map, reversed_class_match_map, grade_model, instructor_model.graph_index)
 
         logger.info("finished compare content method")
         #29: return matchedAttrMap, misplaceAttrMap, matchedOperMap, misplaceOperMap
@@ -325,15 +336,21 @@ class ClassComperator:
         #2: studList← StudentModel.getClass()
         stud_list: List[UMLClass] = student_model.class_list
 
+        stud_graph = student_model.graph_index
+        one_to_many_ends: Dict[int, List[UMLClass]] = {
+            id(cs1): [rel.destination for rel in stud_graph.relations(cs1, UMLRelationType.ASSOCIATION) if rel.s_multiplicity == "1" and rel.d_multiplicity == "*"]
+            for cs1 in stud_list
+        }
+
         #3: for all Class Cs0 in studList, Cs1 in studList do
         for cs0 in stud_list:
             for cs1 in stud_list:
                 #4: if Cs0 and Cs1 has 1-to-multiple association then
-                if cs0 != cs1 and any(rel for rel in cs1.relations if rel.type == UMLRelationType.ASSOCIATION and rel.destination == cs0 and rel.s_multiplicity == "1" and rel.d_multiplicity == "*"):
+                if cs0 != cs1 and cs0 in one_to_many_ends[id(cs1)]:
                     #5: for all Class Ci in instList do
                     for ci in inst_list:
                         #6: if Ci has same properties with Cs0 and Cs1 then
-                        if ContentCheck.classes_have_same_properties(ci, cs0, cs1, attr_match_map, inherited_attr_map, misplaced_attr_map, oper_matched_map, inherited_oper_map, misplaced_oper_map):
+                        if ContentCheck.classes_have_same_properties(ci, cs0, cs1, attr_match_map, inherited_attr_map, misplaced_attr_map, oper_matched_map, inherited_oper_map, misplaced_oper_map, stud_graph):
                             #7: splitClassMap.put(Ci, <Cs0,Cs1>)
                             split_class_map[ci] = (cs0, cs1)
                             # found a match, no need to continue checking other classes
@@ -350,6 +367,7 @@ class ClassComperator:
     def class_merge_match(instructor_model: UMLModel, class_match_map: Dict[UMLClass, UMLClass], misplaced_attr_map: Dict[UMLAttribute, UMLAttribute], misplaced_oper_map: Dict[UMLOperation, UMLOperation]) -> Dict[Tuple[UMLClass, UMLClass], UMLClass]:
         logger.info("starting class merge match method")
         merge_class_map: Dict[Tuple[UMLClass, UMLClass], UMLClass] = {}
+        inst_graph = instructor_model.graph_index
 
         #2: for all Class Ci1 in InstructorModel matched with Cs in StudentModel do
         for ci1, cs in class_match_map.items():
@@ -358,7 +376,7 @@ class ClassComperator:
                 # NOTE: we restrict the search to classes that are not already matched since if they were matched, it would be more a split than a true merge
                 if ci2 not in class_match_map.keys() and ContentCheck.class_contains_misplaced_properties(ci2, cs, misplaced_attr_map, misplaced_oper_map):
                     #4: if Ci1 has association with Ci2 then
-                    if any(rel for rel in ci1.relations if rel.destination == ci2 and rel.source == ci1 and rel.type == UMLRelationType.ASSOCIATION):
+                    if ci2 in inst_graph.neighbors(ci1, UMLRelationType.ASSOCIATION):
                         #5: mergeClassMap.put(Cs,<Ci1,Ci2>)
                         merge_class_map[(ci1, ci2)] = cs
         # NOTE: this algorithm as of now only puts the first found class in the map, which could be not optimal
@@ -0,0 +1,147 @@
+from UML_model.uml_element import UMLElement
+from UML_model.uml_relation import UMLRelation
+from tools.instrumentation import Instrumentation
+
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+import time
+
+logger = logging.getLogger("derivation_eval")
+logger.setLevel(logging.DEBUG)
+
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] - %(name)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+# NOTE: second degree derivations as in the original algorithm, higher degrees have to be enabled explicitly
+DEFAULT_DERIVATION_DEGREE = 2
+
+class DerivationSearch:
+    # finds relation paths of length 2 to max_degree between two elements, where every element in between
+    # is one of the intermediates (e.g. classes without a match) and is visited once
+    # NOTE: as in the original second degree search every path of length 2 is returned (ordered by intermediate, then
+    # by relation), longer paths are only searched if there is none and then the first shortest one is returned
+    # NOTE: if source and destination are the same element (e.g. both ends matched to one class) the path returns to it,
+    # as in the original second degree search this can use the same undirected relation there and back
+    # NOTE: elements are keyed by id() since hashing a UMLClass hashes its whole content,
+    # directed relations are only followed from source to destination (same as UMLRelation.classes_equal)
+    def __init__(self, relation_list: List[UMLRelation], intermediates: List[UMLElement], max_degree: int = DEFAULT_DERIVATION_DEGREE, time_budget: Optional[float] = None):
+        self.max_degree: int = max_degree
+        self.intermediate_ids: Set[int] = {id(elm) for elm in intermediates}
+        # position of each intermediate, derivations are reported in this order
+        self.intermediate_rank: Dict[int, int] = {}
+        for rank, elm in enumerate(intermediates):
+            self.intermediate_rank.setdefault(id(elm), rank)
+        # element id -> (relation, element at the other end), in order of relation_list
+        self.adjacency: Dict[int, List[Tuple[UMLRelation, UMLElement]]] = {}
+        self.reverse_adjacency: Dict[int, List[UMLElement]] = {}
+        for rel in relation_list:
+            self.add_step(rel, rel.source, rel.destination)
+            if not rel.directed and rel.source is not rel.destination:
+                self.add_step(rel, rel.destination, rel.source)
+        # NOTE: results are memoized per (source, destination), relations sharing ends are searched once
+        # (rank of the first intermediate, path) per pair
+        self.path_cache: Dict[Tuple[int, int], List[Tuple[int, Tuple[UMLRelation, ...]]]] = {}
+        self.deadline: Optional[float] = None if time_budget is None else time.perf_counter() + time_budget
+        self.budget_exceeded: bool = False
+
+    def __repr__(self):
+        return f"DerivationSearch(max degree: {self.max_degree}, intermediates: {len(self.intermediate_ids)}, cached paths: {len(self.path_cache)})"
+
+    def add_step(self, rel: UMLRelation, start: UMLElement, end: UMLElement) -> None:
+        self.adjacency.setdefault(id(start), []).append((rel, end))
+        self.reverse_adjacency.setdefault(id(end), []).append(start)
+
+    def expired(self) -> bool:
+        if not self.budget_exceeded and self.deadline is not None and time.perf_counter() > self.deadline:
+            logger.warning("Derivation search ran out of its time budget, remaining derivations are skipped")
+            Instrumentation.count("derivation_budget_exceeded")
+            self.budget_exceeded = True
+        return self.budget_exceeded
+
+    def path(self, source: UMLElement, destination: UMLElement) -> Optional[Tuple[UMLRelation, ...]]:
+        # first derivation from source to destination, None if there is none within max_degree
+        paths = self.ranked_paths(source, destination)
+        return paths[0][1] if paths else None
+
+    def paths(self, source: UMLElement, destination: UMLElement) -> List[Tuple[UMLRelation, ...]]:
+        return [path for _, path in self.ranked_paths(source, destination)]
+
+    def ranked_paths(self, source: UMLElement, destination: UMLElement) -> List[Tuple[int, Tuple[UMLRelation, ...]]]:
+        # all derivations from source to destination with the rank of their first intermediate
+        key = (id(source), id(destination))
+        if key in self.path_cache:
+            Instrumentation.count("derivation_cache_hits")
+            return self.path_cache[key]
+        if self.expired():
+            return []
+        Instrumentation.count("derivation_searches")
+        paths = self._second_degree(source, destination)
+        if not paths and self.max_degree > 2:
+            path = self._search(source, destination)
+            if path is not None:
+                paths = [(self.intermediate_rank[id(self.other_end(path[0], source))], path)]
+        self.path_cache[key] = paths
+        return paths
+
+    @staticmethod
+    def other_end(rel: UMLRelation, elm: UMLElement) -> UMLElement:
+        return rel.destination if rel.source is elm else rel.source
+
+    def _second_degree(self, source: UMLElement, destination: UMLElement) -> List[Tuple[int, Tuple[UMLRelation, ...]]]:
+        if self.max_degree < 2:
+            return []
+        first_steps: Dict[int, List[UMLRelation]] = {}
+        for rel, end in self.adjacency.get(id(source), []):
+            if id(end) in self.intermediate_ids:
+                first_steps.setdefault(id(end), []).append(rel)
+        paths: List[Tuple[int, Tuple[UMLRelation, ...]]] = []
+        for elm_id in sorted(first_steps, key=self.intermediate_rank.__getitem__):
+            second_steps = [rel for rel, end in self.adjacency.get(elm_id, []) if end is destination]
+            for rel_1 in first_steps[elm_id]:
+                for rel_2 in second_steps:
+                    paths.append((self.intermediate_rank[elm_id], (rel_1, rel_2)))
+        return paths
+
+    def _search(self, source: UMLElement, destination: UMLElement) -> Optional[Tuple[UMLRelation, ...]]:
+        if self.max_degree < 2:
+            return None
+        # hops from each intermediate to the destination, elements that cannot reach it in time are pruned
+        hops_to_destination: Dict[int, int] = {id(destination): 0}
+        queue = deque([destination])
+        while queue:
+            elm = queue.popleft()
+            hops = hops_to_destination[id(elm)]
+            if hops == self.max_degree - 1:
+                continue
+            for previous in self.reverse_adjacency.get(id(elm), []):
+                if id(previous) in self.intermediate_ids and id(previous) not in hops_to_destination:
+                    hops_to_destination[id(previous)] = hops + 1
+                    queue.append(previous)
+
+        # breadth first from the source, so the first path found is a shortest one
+        parents: Dict[int, Tuple[int, Optional[UMLRelation]]] = {id(source): (-1, None)}
+        queue = deque([(source, 0)])
+        while queue:
+            elm, depth = queue.popleft()
+            for rel, end in self.adjacency.get(id(elm), []):
+                if end is destination:
+                    # a direct relation is not a derivation
+                    if depth == 0:
+                        continue
+                    path = [rel]
+                    elm_id = id(elm)
+                    while elm_id != id(source):
+                        elm_id, step = parents[elm_id]
+                        path.append(step)
+                    return tuple(reversed(path))
+                if id(end) in parents or id(end) not in hops_to_destination or id(end) not in self.intermediate_ids:
+                    continue
+                if depth + 1 + hops_to_destination[id(end)] > self.max_degree:
+                    continue
+                parents[id(end)] = (id(elm), rel)
+                queue.append((end, depth + 1))
+        return None
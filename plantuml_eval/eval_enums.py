@@ -4,6 +4,7 @@ from UML_model.uml_enum import UMLEnum, UMLValue
 from tools.syntactic_check import SyntacticCheck
 from tools.semantic_check import SemanticCheck
 from tools.content_check import ContentCheck
+from tools.match_evidence import EvidenceCheck
 from grading.grade_metamodel import GradeModel
 from plantuml_eval.eval_helper_functions import EvalHelper
 
@@ -40,7 +41,7 @@ class EnumComperator:
             for es in stud_enum_list:
                 #5: if syntacticMatch(Es.name, Ei.name) or 
                 #6:semanticMatch(Es.name, Ei.name) then  
-                if SyntacticCheck.syntactic_match(es.name, ei.name)[0] or SemanticCheck.semantic_match(es.name, ei.name)[0]:
+                if EvidenceCheck.name_match(ei, es):
                     possible_enum_match[ei].append(es)
                     #7: enumMatchMap.put(Es, Ei)
                     logger.debug(f"Enum match found: {ei.name} with {es.name}")
@@ -79,14 +80,14 @@ class EnumComperator:
                 #14:for all Attribute As in studClassList do
                 for a_s in stud_att_list:
                     #15:if As.Name.syntacticMatch(L.Name) or As.Name.semanticMatch(L.Name) then
-                   if SyntacticCheck.syntactic_match(a_s.name, value.name)[0] or SemanticCheck.semantic_match(a_s.name, value.name)[0]:
+                   if SyntacticCheck.syntactic_match(a_s.norm, value.norm)[0] or SemanticCheck.semantic_match(a_s.norm, value.norm)[0]:
                        #16:consider As represent L
                        possible_misplaced_values[value] = a_s
                        logger.debug(f"Enum literal match with attribute found: {str(value)} with {str(a_s)}")
                 #17:for all class Cs in studClassList do
                 for cs in stud_class_list:
                     #18:if Cs.Name.syntacticMatch(L.Name) or Cs.Name.semanticMatch(L.Name) then
-                    if SyntacticCheck.syntactic_match(cs.name, value.name)[0] or SemanticCheck.semantic_match(cs.name, value.name)[0]:
+                    if SyntacticCheck.syntactic_match(cs.norm, value.norm)[0] or SemanticCheck.semantic_match(cs.norm, value.norm)[0]:
                         #19:consider Cs represent L
                         possible_misplaced_values[value] = cs
                         logger.debug(f"Enum literal match with class found: {str(value)} with {str(cs)}")
@@ -115,11 +116,7 @@ class EnumComperator:
             possible_literal_matches[l_i] = []
             for l_s in stud_lit_list:
                 e_s = l_s.reference
-                if SyntacticCheck.syntactic_match(l_s.name, l_i.name)[0]:
-                    # check if the enum of the literal is a match
-                    if enum_match_map.get(e_i) == e_s:
-                        possible_literal_matches[l_i].append(l_s)
-                elif SemanticCheck.semantic_match(l_s.name, l_i.name)[0]:
+                if EvidenceCheck.name_match(l_i, l_s):
                     # check if the enum of the literal is a match
                     if enum_match_map.get(e_i) == e_s:
                         possible_literal_matches[l_i].append(l_s)
@@ -133,7 +130,7 @@ class EnumComperator:
         for l_i in unmatched_inst_literals:
             possible_misplaced_lit_matches[l_i] = []
             for l_s in unmatched_stud_literals:
-                if SyntacticCheck.syntactic_match(l_s.name, l_i.name)[0] or SemanticCheck.semantic_match(l_s.name, l_i.name)[0]:
+                if EvidenceCheck.name_match(l_i, l_s):
                     possible_misplaced_lit_matches[l_i].append(l_s)
         
         safe_misplaced_literals, best_misplaced_literal_map = EvalHelper.handle_possible_matches(possible_misplaced_lit_matches, grade_model, literal_match_map)
@@ -3,11 +3,14 @@ from UML_model.uml_enum import UMLEnum, UMLValue
 from UML_model.uml_relation import UMLRelation
 from grading.grade_metamodel import GradeModel
 from grading.grade_reference import GradeReference
+from tools.instrumentation import Instrumentation
 
-from typing import List, Dict, Optional, Tuple, Union
+from typing import Callable, List, Dict, Optional, Tuple, Union
 import logging
 from collections import Counter
 from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, min_weight_full_bipartite_matching
 import numpy as np
 
 
@@ -20,6 +23,11 @@ if not logger.hasHandlers():
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+# NOTE: assignments up to this many cells are solved on one dense cost matrix,
+# larger ones are split into connected components and components sparser than the density use the sparse solver
+DENSE_ASSIGNMENT_CELLS = 4096
+SPARSE_ASSIGNMENT_DENSITY = 0.1
+
 class EvalHelper:
     # helper for algorithm 1, 2, 6
     @staticmethod
@@ -59,53 +67,115 @@ class EvalHelper:
             return {elm: matches[0] for elm, matches in filtered_possible_matches.items() if matches}
 
         inst_elements = list(filtered_possible_matches.keys())
-        all_targets = list({m for matches in filtered_possible_matches.values() for m in matches})
-        cost_matrix = np.full((len(inst_elements), len(all_targets)), fill_value=1.0)
-
+        # NOTE: targets are indexed in order of first appearance, equal targets share one column as before
+        target_index: Dict[GradeReference, int] = {}
+        # (row, column) -> score, only the candidate edges are graded
+        edge_scores: Dict[Tuple[int, int], float] = {}
+        scorers: Dict[type, Callable[[GradeReference, GradeReference], float]] = {}
         for i, elem in enumerate(inst_elements):
+            scorer = scorers.get(type(elem))
+            if scorer is None:
+                scorer = EvalHelper.match_scorer(elem, grade_model, element_match_map)
+                scorers[type(elem)] = scorer
             for match in filtered_possible_matches[elem]:
-                j = all_targets.index(match)
-                if isinstance(elem, UMLClass):
-                    score = grade_model.temp_grade_class(match, elem)[0]  # Score ∈ [0, 1]
-                    logger.debug(f"Grading class {elem.name} against {match.name}: score = {score}")
-                elif isinstance(elem, UMLAttribute) or isinstance(elem, UMLOperation):
-                    if element_match_map is None:
-                        score = grade_model.temp_grade_class_content(match, elem)[0]
-                        logger.debug(f"Grading content element {elem.name} against {match.name}: score = {score}")
-                    else:
-                        score = grade_model.temp_grade_class_content(match, elem, element_match_map)[0]
-                        logger.debug(f"Grading content element {elem.name} against {match.name} with element match map: score = {score}")
-                elif isinstance(elem, UMLEnum):
-                    score = grade_model.temp_grade_enum(match, elem)[0]
-                    logger.debug(f"Grading enum {elem.name} against {match.name}: score = {score}")
-                elif isinstance(elem, UMLRelation):
-                    if element_match_map is None:
-                        logger.warning("Element match map is None, cannot grade relations properly.")
-                        score = 0.0
-                    else:
-                        score = grade_model.temp_grade_relation(match, elem, element_match_map)[0]
-                        logger.debug(f"Grading relation {elem.name} against {match.name}: score = {score}")
-                elif isinstance(elem, UMLValue):
-                    score = grade_model.temp_grade_value(match, elem)[0]
-                    logger.debug(f"Grading value {elem.name} against {match.name}: score = {score}")
-                else:
-                    logger.warning(f"Unknown element type {type(elem)} for grading, using default score of 0.0")
-                    score = 0.0
-                cost_matrix[i][j] = 1.0 - score  # Convert score to cost (1 - score) so lower scores mean better matches
-        logger.debug(f"Cost matrix for assignment:\n{cost_matrix}")
-        row_ind, col_ind = linear_sum_assignment(cost_matrix)
-        logger.debug(f"Row indices: {row_ind}, Column indices: {col_ind}")
+                j = target_index.setdefault(match, len(target_index))
+                score = scorer(match, elem)  # Score ∈ [0, 1]
+                logger.debug(f"Grading {type(elem).__name__} {elem.name} against {match.name}: score = {score}")
+                Instrumentation.count("grade_score")
+                edge_scores[(i, j)] = score
+        all_targets = list(target_index)
+        Instrumentation.count("assignment_solver")
+        Instrumentation.observe("assignment_rows", len(inst_elements))
+        Instrumentation.observe("assignment_cols", len(all_targets))
+        Instrumentation.observe("assignment_edges", len(edge_scores))
+
+        rows = np.fromiter((i for i, _ in edge_scores), dtype=np.int64, count=len(edge_scores))
+        cols = np.fromiter((j for _, j in edge_scores), dtype=np.int64, count=len(edge_scores))
+        scores = np.fromiter(edge_scores.values(), dtype=float, count=len(edge_scores))
+        pairs = EvalHelper.solve_assignment(rows, cols, scores, len(inst_elements), len(all_targets))
 
         element_match_map: Dict[GradeReference, GradeReference] = {}
-        for i, j in zip(row_ind, col_ind):
-            cost = cost_matrix[i][j]
-            if cost < 1.0:  # if the cost is less than 1, it means there was a match
-                element_match_map[inst_elements[i]] = all_targets[j]
+        for i, j in pairs:
+            element_match_map[inst_elements[i]] = all_targets[j]
         logger.info(f"Best matches found: {len(element_match_map)}")
         if element_match_map:
             logger.debug(f"Best element match map: { {str(k): str(v) for k, v in element_match_map.items()} }")
         return element_match_map
 
+    @staticmethod
+    def match_scorer(elem: GradeReference, grade_model: GradeModel, element_match_map: Optional[Dict[Union[UMLClass, UMLEnum], Union[UMLClass, UMLEnum]]] = None) -> Callable[[GradeReference, GradeReference], float]:
+        # grading function for the type of elem, chosen once per assignment instead of once per candidate
+        if isinstance(elem, UMLClass):
+            return lambda match, inst: grade_model.temp_grade_class(match, inst)[0]
+        if isinstance(elem, UMLAttribute) or isinstance(elem, UMLOperation):
+            if element_match_map is None:
+                return lambda match, inst: grade_model.temp_grade_class_content(match, inst)[0]
+            return lambda match, inst: grade_model.temp_grade_class_content(match, inst, element_match_map)[0]
+        if isinstance(elem, UMLEnum):
+            return lambda match, inst: grade_model.temp_grade_enum(match, inst)[0]
+        if isinstance(elem, UMLRelation):
+            if element_match_map is None:
+                logger.warning("Element match map is None, cannot grade relations properly.")
+                return lambda match, inst: 0.0
+            return lambda match, inst: grade_model.temp_grade_relation(match, inst, element_match_map)[0]
+        if isinstance(elem, UMLValue):
+            return lambda match, inst: grade_model.temp_grade_value(match, inst)[0]
+        logger.warning(f"Unknown element type {type(elem)} for grading, using default score of 0.0")
+        return lambda match, inst: 0.0
+
+    @staticmethod
+    def solve_assignment(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, n_rows: int, n_cols: int) -> List[Tuple[int, int]]:
+        # maximum score assignment over the candidate edges (rows[k], cols[k]) with scores[k] ∈ [0, 1]
+        # NOTE: equal to linear_sum_assignment on the dense cost matrix 1 - score (1.0 for non candidates), pairs with score 0 are dropped
+        if n_rows * n_cols <= DENSE_ASSIGNMENT_CELLS:
+            return EvalHelper.solve_dense_assignment(rows, cols, scores, n_rows, n_cols)
+
+        # rows and columns that share no candidates do not influence each other, so every connected component is solved on its own
+        graph = csr_matrix((np.ones(len(rows)), (rows, cols + n_rows)), shape=(n_rows + n_cols, n_rows + n_cols))
+        n_components, labels = connected_components(graph, directed=False)
+        Instrumentation.observe("assignment_components", n_components)
+        edge_labels = labels[rows]
+        order = np.argsort(edge_labels, kind="stable")
+        bounds = np.searchsorted(edge_labels[order], np.arange(n_components + 1))
+        pairs: List[Tuple[int, int]] = []
+        for component in range(n_components):
+            edges = order[bounds[component]:bounds[component + 1]]
+            if len(edges) == 0:
+                # single row or column without candidates
+                continue
+            comp_rows, local_rows = np.unique(rows[edges], return_inverse=True)
+            comp_cols, local_cols = np.unique(cols[edges], return_inverse=True)
+            cells = len(comp_rows) * len(comp_cols)
+            if cells <= DENSE_ASSIGNMENT_CELLS or len(edges) > cells * SPARSE_ASSIGNMENT_DENSITY:
+                local_pairs = EvalHelper.solve_dense_assignment(local_rows, local_cols, scores[edges], len(comp_rows), len(comp_cols))
+            else:
+                local_pairs = EvalHelper.solve_sparse_assignment(local_rows, local_cols, scores[edges], len(comp_rows), len(comp_cols))
+            pairs.extend((int(comp_rows[i]), int(comp_cols[j])) for i, j in local_pairs)
+        return sorted(pairs)
+
+    @staticmethod
+    def solve_dense_assignment(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, n_rows: int, n_cols: int) -> List[Tuple[int, int]]:
+        Instrumentation.count("assignment_dense")
+        cost_matrix = np.full((n_rows, n_cols), fill_value=1.0)
+        cost_matrix[rows, cols] = 1.0 - scores  # Convert score to cost (1 - score) so lower scores mean better matches
+        logger.debug(f"Cost matrix for assignment:\n{cost_matrix}")
+        row_ind, col_ind = linear_sum_assignment(cost_matrix)
+        logger.debug(f"Row indices: {row_ind}, Column indices: {col_ind}")
+        # if the cost is less than 1, it means there was a match
+        return [(int(i), int(j)) for i, j in zip(row_ind, col_ind) if cost_matrix[i][j] < 1.0]
+
+    @staticmethod
+    def solve_sparse_assignment(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, n_rows: int, n_cols: int) -> List[Tuple[int, int]]:
+        # NOTE: every row gets a dummy column with cost 2 so a full matching always exists,
+        # candidates cost 2 - score since the sparse solver treats zero weights as missing edges
+        Instrumentation.count("assignment_sparse")
+        dummy = np.arange(n_rows)
+        weights = np.concatenate((2.0 - scores, np.full(n_rows, 2.0)))
+        biadjacency = csr_matrix((weights, (np.concatenate((rows, dummy)), np.concatenate((cols, dummy + n_cols)))), shape=(n_rows, n_cols + n_rows))
+        row_ind, col_ind = min_weight_full_bipartite_matching(biadjacency)
+        edge_scores = dict(zip(zip(rows.tolist(), cols.tolist()), scores.tolist()))
+        return sorted((int(i), int(j)) for i, j in zip(row_ind, col_ind) if j < n_cols and edge_scores.get((int(i), int(j)), 0.0) > 0.0)
+
     # helper for algorithm 1, 2, 6
     @staticmethod
     def handle_possible_matches(possible_matches: Dict[GradeReference, List[GradeReference]], grade_model: Optional[GradeModel] = None, element_match_map: Optional[Dict[Union[UMLClass, UMLEnum], Union[UMLClass, UMLEnum]]] = None) -> Tuple[Dict[GradeReference, GradeReference], Dict[GradeReference, GradeReference]]:
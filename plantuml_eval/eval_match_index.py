@@ -0,0 +1,130 @@
+from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation
+from UML_model.uml_enum import UMLEnum, UMLValue
+from UML_model.uml_element import UMLElement
+
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from plantuml_eval.eval_model import EvalModel
+
+class ClassMatchBucket:
+    # NOTE: all match results of one instructor class
+    __slots__ = (
+        "inst_class", "match", "split", "merge", "merged_into",
+        "matched_attrs", "inherited_attrs", "misplaced_attrs",
+        "matched_opers", "inherited_opers", "misplaced_opers"
+    )
+
+    def __init__(self, inst_class: UMLClass):
+        self.inst_class: UMLClass = inst_class
+        # student class from the class match map
+        self.match: Optional[UMLClass] = None
+        # student classes from the split class map
+        self.split: Optional[Tuple[UMLClass, UMLClass]] = None
+        # instructor class pair and student class of the merge this class is part of
+        self.merge: Optional[Tuple[Tuple[UMLClass, UMLClass], UMLClass]] = None
+        # student class if this class is the second class of a merge
+        self.merged_into: Optional[UMLClass] = None
+        self.matched_attrs: List[UMLAttribute] = []
+        self.inherited_attrs: List[UMLAttribute] = []
+        self.misplaced_attrs: List[UMLAttribute] = []
+        self.matched_opers: List[UMLOperation] = []
+        self.inherited_opers: List[UMLOperation] = []
+        self.misplaced_opers: List[UMLOperation] = []
+
+    def __repr__(self):
+        return f"ClassMatchBucket({self.inst_class.name}, match: {self.match}, split: {self.split}, merged into: {self.merged_into})"
+
+    @property
+    def total_attrs(self) -> int:
+        return len(self.matched_attrs) + len(self.inherited_attrs) + len(self.misplaced_attrs)
+
+    @property
+    def total_opers(self) -> int:
+        return len(self.matched_opers) + len(self.inherited_opers) + len(self.misplaced_opers)
+
+class EvalMatchIndex:
+    # NOTE: built once after matching (see EvalModel.match_index) so the evaluators do not scan the match maps per class
+    # elements are keyed by id() since hashing a UMLClass hashes its whole content
+    def __init__(self, model: 'EvalModel'):
+        self.model: 'EvalModel' = model
+        self.class_buckets: Dict[int, ClassMatchBucket] = {id(cls): ClassMatchBucket(cls) for cls in model.instructor_model.class_list}
+        for cls_i, cls_s in model.class_match_map.items():
+            self.bucket(cls_i).match = cls_s
+        for cls_i, classes_s in model.split_class_map.items():
+            self.bucket(cls_i).split = classes_s
+        for classes_i, cls_s in model.merge_class_map.items():
+            for cls_i in classes_i:
+                self.bucket(cls_i).merge = (classes_i, cls_s)
+            self.bucket(classes_i[1]).merged_into = cls_s
+
+        for cls_i in model.instructor_model.class_list:
+            bucket = self.bucket(cls_i)
+            for attr in cls_i.attributes:
+                if attr in model.attr_match_map:
+                    bucket.matched_attrs.append(attr)
+                if attr in model.inherited_attr_map:
+                    bucket.inherited_attrs.append(attr)
+                if attr in model.misplaced_attr_map:
+                    bucket.misplaced_attrs.append(attr)
+            for oper in cls_i.operations:
+                if oper in model.oper_matched_map:
+                    bucket.matched_opers.append(oper)
+                if oper in model.inherited_oper_map:
+                    bucket.inherited_opers.append(oper)
+                if oper in model.misplaced_oper_map:
+                    bucket.misplaced_opers.append(oper)
+
+        # instructor classes that are matched, split or merged, in model order
+        missing_ids = {id(cls) for cls in model.temp_missing_classes}
+        self.matched_inst_classes: List[UMLClass] = [cls for cls in model.instructor_model.class_list if id(cls) not in missing_ids]
+
+        # student classes that are part of a match, split or merge, each only once
+        self.matched_stud_classes: List[UMLClass] = []
+        seen_ids = set()
+        for cls_s in [*model.class_match_map.values(), *(cls for classes in model.split_class_map.values() for cls in classes), *model.merge_class_map.values()]:
+            if id(cls_s) not in seen_ids:
+                seen_ids.add(id(cls_s))
+                self.matched_stud_classes.append(cls_s)
+
+    def __repr__(self):
+        return f"EvalMatchIndex(classes: {len(self.class_buckets)}, matched: {len(self.matched_inst_classes)}, student classes: {len(self.matched_stud_classes)})"
+
+    def bucket(self, inst_class: UMLClass) -> ClassMatchBucket:
+        bucket = self.class_buckets.get(id(inst_class))
+        if bucket is None:
+            # NOTE: classes outside of the instructor model get an empty bucket
+            bucket = ClassMatchBucket(inst_class)
+            self.class_buckets[id(inst_class)] = bucket
+        return bucket
+
+    # NOTE: the enum and reverse parts are built on first use, so class evaluators do not trigger the enum and relation stages
+    @cached_property
+    def value_buckets(self) -> Dict[int, Tuple[List[UMLValue], List[UMLValue]]]:
+        return {
+            id(enum_i): (
+                [val for val in enum_i.values if val in self.model.value_match_map],
+                [val for val in enum_i.values if val in self.model.misplaced_value_map]
+            )
+            for enum_i in self.model.instructor_model.enum_list
+        }
+
+    @cached_property
+    def reverse_map(self) -> Dict[int, UMLElement]:
+        # student element id to instructor element
+        reverse_map: Dict[int, UMLElement] = {}
+        model = self.model
+        for match_map in (model.class_match_map, model.temp_all_att_matches, model.temp_all_oper_matches, model.enum_match_map, model.temp_all_value_matches, model.relation_match_map):
+            for elm_i, elm_s in match_map.items():
+                reverse_map.setdefault(id(elm_s), elm_i)
+        return reverse_map
+
+    def matched_values(self, inst_enum: UMLEnum) -> List[UMLValue]:
+        return self.value_buckets.get(id(inst_enum), ([], []))[0]
+
+    def misplaced_values(self, inst_enum: UMLEnum) -> List[UMLValue]:
+        return self.value_buckets.get(id(inst_enum), ([], []))[1]
+
+    def inst_element(self, stud_element: UMLElement) -> Optional[UMLElement]:
+        return self.reverse_map.get(id(stud_element))
@@ -4,10 +4,18 @@ from UML_model.uml_enum import UMLEnum, UMLValue
 from UML_model.uml_relation import UMLRelation, UMLRelationType
 from plantuml_eval.eval_classes import ClassComperator
 from plantuml_eval.eval_relations import RelationComperator
+from plantuml_eval.eval_derivations import DEFAULT_DERIVATION_DEGREE
 from plantuml_eval.eval_enums import EnumComperator
+from plantuml_eval.eval_match_index import EvalMatchIndex
+from plantuml_eval.eval_parallel import ParallelStages
+from tools.instrumentation import EvalMetrics, Instrumentation
+from tools.match_evidence import EvidenceStore, EvidenceCheck
+from tools.match_thresholds import MatchThresholds
 from grading.grade_metamodel import GradeModel
 
-from typing import Optional, Dict, List, Tuple, Union
+from concurrent.futures import Executor
+from functools import cached_property
+from typing import Optional, Dict, List, Set, Tuple, Union
 import logging
 
 logger = logging.getLogger("eval_model")
@@ -19,108 +27,210 @@ if not logger.hasHandlers():
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+# NOTE: raw match results of the algorithms, keys refer to the instructor model and values to the student model
+RESULT_MAP_FIELDS: List[str] = [
+    "class_match_map", "attr_match_map", "inherited_attr_map", "misplaced_attr_map",
+    "oper_matched_map", "inherited_oper_map", "misplaced_oper_map", "split_class_map", "merge_class_map",
+    "enum_match_map", "possible_misplaced_values", "value_match_map", "misplaced_value_map",
+    "relation_match_map", "inst_assoc_link_match_map", "stud_assoc_link_match_map", "sec_derivation_inst_map", "sec_derivation_stud_map"
+]
+RESULT_LIST_FIELDS: List[str] = [
+    "missing_classes", "missed_attr_list", "missed_oper_list", "missing_enums", "missed_value_list", "miss_relation_list", "miss_relation_list_loose"
+]
+
+# NOTE: the algorithms run as lazy stages on first access of one of their result fields
+# each stage lists the stages whose results it needs
+STAGE_DEPENDENCIES: Dict[str, List[str]] = {
+    "classes": [],
+    "class_content": ["classes"],
+    "class_split": ["class_content"],
+    "class_merge": ["classes", "class_content"],
+    "enums": [],
+    "relations": ["classes", "enums"]
+}
+STAGE_FIELDS: Dict[str, List[str]] = {
+    "classes": ["class_match_map", "missing_classes"],
+    "class_content": [
+        "attr_match_map", "inherited_attr_map", "misplaced_attr_map", "missed_attr_list",
+        "oper_matched_map", "inherited_oper_map", "misplaced_oper_map", "missed_oper_list"
+    ],
+    "class_split": ["split_class_map"],
+    "class_merge": ["merge_class_map"],
+    "enums": ["enum_match_map", "missing_enums", "possible_misplaced_values", "value_match_map", "misplaced_value_map", "missed_value_list"],
+    "relations": [
+        "relation_match_map", "inst_assoc_link_match_map", "stud_assoc_link_match_map", "sec_derivation_inst_map", "sec_derivation_stud_map",
+        "miss_relation_list", "miss_relation_list_loose"
+    ]
+}
+FIELD_STAGES: Dict[str, str] = {field: stage for stage, fields in STAGE_FIELDS.items() for field in fields}
+
+# NOTE: the *_str views are only built when printed or exported, maps default to {str(k): str(v)} and lists to [str(e)]
+STR_TUPLE_KEY_FIELDS: List[str] = ["merge_class_map", "stud_assoc_link_match_map", "sec_derivation_inst_map"]
+STR_TUPLE_VALUE_FIELDS: List[str] = ["inst_assoc_link_match_map", "sec_derivation_stud_map"]
+
 class EvalModel:
-    def __init__(self, inst_model: UMLModel, stud_model: UMLModel, grade_model: Optional[GradeModel] = None):
+    def __init__(self, inst_model: UMLModel, stud_model: UMLModel, grade_model: Optional[GradeModel] = None, instrument: bool = False):
         self.instructor_model: UMLModel = inst_model
         self.student_model: UMLModel = stud_model
         self.grade_model: Optional[GradeModel] = grade_model
-
+        self.completed_stages: Set[str] = set()
+        # NOTE: stage timings and scorer counters, only collected if instrument is set (see EvalMetrics.to_json)
+        self.metrics: Optional[EvalMetrics] = EvalMetrics() if instrument else None
+        # NOTE: results of the similarity checks the comparators ran, reused by the evaluators
+        self.evidence: EvidenceStore = EvidenceStore()
+        # NOTE: thresholds of the similarity checks, taken from the context the model is created in (see ThresholdSweep)
+        self.thresholds: MatchThresholds = MatchThresholds.active()
+        # NOTE: settings of the derivation search (see DerivationSearch), can be changed until the relation stage has run
+        self.max_derivation_degree: int = DEFAULT_DERIVATION_DEGREE
+        self.derivation_time_budget: Optional[float] = None
+
+    @classmethod
+    def from_results(cls, inst_model: UMLModel, stud_model: UMLModel, results: Dict[str, Union[Dict, List]], grade_model: Optional[GradeModel] = None, instrument: bool = False) -> 'EvalModel':
+        # NOTE: restores an EvalModel from stored match results (see EvalSerializer) without rerunning the algorithms
+        eval_model = cls(inst_model, stud_model, grade_model, instrument)
+        for field in RESULT_MAP_FIELDS:
+            setattr(eval_model, field, results.get(field, {}))
+        for field in RESULT_LIST_FIELDS:
+            setattr(eval_model, field, results.get(field, []))
+        eval_model.completed_stages.update(STAGE_DEPENDENCIES)
+        return eval_model
+
+    def __getattr__(self, name: str):
+        # NOTE: only called for attributes that are not set yet
+        if name in FIELD_STAGES and FIELD_STAGES[name] not in self.__dict__.get("completed_stages", STAGE_DEPENDENCIES):
+            self.run_stage(FIELD_STAGES[name])
+            return getattr(self, name)
+        if name.endswith("_str") and name[:-4] in FIELD_STAGES and "instructor_model" in self.__dict__:
+            view = self.build_str_view(name[:-4])
+            setattr(self, name, view)
+            return view
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def run_stage(self, stage: str) -> None:
+        if stage in self.completed_stages:
+            return
+        for dependency in STAGE_DEPENDENCIES[stage]:
+            self.run_stage(dependency)
+        self.execute_stage(stage, self.evidence, self.metrics)
+
+    def execute_stage(self, stage: str, evidence: EvidenceStore, metrics: Optional[EvalMetrics]) -> None:
+        # NOTE: the dependencies have to be completed, the parallel lanes pass their own evidence and metrics (see ParallelStages)
+        logger.debug(f"running stage {stage}")
+        with Instrumentation.record(metrics, stage), EvidenceCheck.activate(evidence), MatchThresholds.activate(self.thresholds):
+            getattr(self, f"stage_{stage}")()
+        self.completed_stages.add(stage)
+
+    def run_all_stages(self, workers: int = 1, executor: Optional[Executor] = None) -> None:
+        # with more than one worker or an executor the independent stages run in parallel with the same results,
+        # e.g. for single large diagrams, see ParallelStages
+        if workers > 1 or executor is not None:
+            ParallelStages.run(self, STAGE_DEPENDENCIES, workers, executor)
+            return
+        for stage in STAGE_DEPENDENCIES:
+            self.run_stage(stage)
+
+    def stage_classes(self) -> None:
         # Algorithm 1: Compare classes in InstructorModel and StudentModel
         compare_classes = ClassComperator.compare_classes(self.instructor_model, self.student_model, self.grade_model)
         self.class_match_map: Dict[UMLClass, UMLClass] = compare_classes[0]
-        self.class_match_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.class_match_map.items()}
         self.missing_classes: List[UMLClass] = compare_classes[1]
-        self.missing_classes_str: List[str] = [str(cls) for cls in self.missing_classes]
 
+    def stage_class_content(self) -> None:
         # Algorithm 2: Compare class content in InstructorModel and StudentModel
         compare_class_content = ClassComperator.compare_class_content(self.instructor_model, self.student_model, self.class_match_map, self.grade_model)
-
         self.attr_match_map: Dict[UMLAttribute, UMLAttribute] = compare_class_content[0]
-        self.attr_match_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.attr_match_map.items()}
         self.inherited_attr_map: Dict[UMLAttribute, UMLAttribute] = compare_class_content[1]
-        self.inherited_attr_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.inherited_attr_map.items()}
         self.misplaced_attr_map: Dict[UMLAttribute, UMLAttribute] = compare_class_content[2]
-        self.misplaced_attr_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.misplaced_attr_map.items()}
         self.missed_attr_list: List[UMLAttribute] = compare_class_content[3]
-        self.missed_attr_list_str: List[str] = [f"{str(attr)}" for attr in self.missed_attr_list]
-
-        # **adeded additionally**
-        self.temp_all_att_matches: Dict[UMLAttribute, UMLAttribute] = {**self.attr_match_map, **self.inherited_attr_map, **self.misplaced_attr_map}
-
         self.oper_matched_map: Dict[UMLOperation, UMLOperation] = compare_class_content[4]
-        self.oper_matched_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.oper_matched_map.items()}
         self.inherited_oper_map: Dict[UMLOperation, UMLOperation] = compare_class_content[5]
-        self.inherited_oper_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.inherited_oper_map.items()}
         self.misplaced_oper_map: Dict[UMLOperation, UMLOperation] = compare_class_content[6]
-        self.misplaced_oper_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.misplaced_oper_map.items()}
         self.missed_oper_list: List[UMLOperation] = compare_class_content[7]
-        self.missed_oper_list_str: List[str] = [f"{str(op)}" for op in self.missed_oper_list]
-
-        # **adeded additionally**
-        self.temp_all_oper_matches: Dict[UMLOperation, UMLOperation] = {**self.oper_matched_map, **self.inherited_oper_map, **self.misplaced_oper_map}
 
+    def stage_class_split(self) -> None:
         # Algorithm 3: Find split classes in InstructorModel and StudentModel
         self.split_class_map: Dict[UMLClass, Tuple[UMLClass, UMLClass]] = ClassComperator.class_split_match(self.instructor_model, self.student_model, self.attr_match_map ,self.inherited_attr_map, self.misplaced_attr_map, self.oper_matched_map, self.inherited_oper_map, self.misplaced_oper_map)
-        self.split_class_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.split_class_map.items()}
 
+    def stage_class_merge(self) -> None:
         # Algorithm 4: Find merged classes in InstructorModel and StudentModel
         self.merge_class_map: Dict[Tuple[UMLClass, UMLClass], UMLClass] = ClassComperator.class_merge_match(self.instructor_model, self.class_match_map, self.misplaced_attr_map, self.misplaced_oper_map)
-        self.merge_class_map_str: Dict[Tuple[str, str], str] = {(str(k[0]), str(k[1])): str(v) for k, v in self.merge_class_map.items()}
 
-        # **adeded additionally**
-        # NOTE: maybe update the missing list in Algorithm 3 and 4
-        self.temp_missing_classes: List[UMLClass] = [
-            cls for cls in self.missing_classes
-            if (
-                cls not in self.split_class_map.keys() and
-                not any(
-                    cls == merge_cls_1 or cls == merge_cls_2
-                    for merge_cls_1, merge_cls_2 in self.merge_class_map.keys()
-                )
-            )
-        ]
-        
+    def stage_enums(self) -> None:
         # Algorithm 6: Compare ENUM in InstructorModel and StudentModel
         compare_enums = EnumComperator.compare_enums(self.instructor_model, self.student_model, self.grade_model)
         self.enum_match_map: Dict[UMLEnum, UMLEnum] = compare_enums[0]
-        self.enum_match_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.enum_match_map.items()}
         self.missing_enums: List[UMLEnum] = compare_enums[1]
-        self.missing_enums_str: List[str] = [str(enum) for enum in self.missing_enums]
-
         # NOTE: those are excluded from the evaluation
         self.possible_misplaced_values: Dict[UMLValue, Union[UMLAttribute, UMLClass]] = compare_enums[2]
-        self.possible_misplaced_values_str: Dict[str, str] = {str(k): str(v) for k, v in self.possible_misplaced_values.items()}
-
         # NOTE: these are added additionally
         self.value_match_map: Dict[UMLValue, UMLValue] = compare_enums[3]
-        self.value_match_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.value_match_map.items()}
         self.misplaced_value_map: Dict[UMLValue, UMLValue] = compare_enums[4]
-        self.misplaced_value_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.misplaced_value_map.items()}
         self.missed_value_list: List[UMLValue] = compare_enums[5]
-        self.missed_value_list_str: List[str] = [f"{str(value)} in {str(value.reference)}" for value in self.missed_value_list]
-
-        # **adeded additionally**
-        self.temp_all_value_matches: Dict[UMLValue, UMLValue] = {**self.value_match_map, **self.misplaced_value_map}
 
+    def stage_relations(self) -> None:
         # Algorithm 5: Compare association in InstructorModel and StudentModel
-        compare_relations = RelationComperator.compare_relations(self.instructor_model, self.student_model, self.class_match_map, self.missing_classes, self.enum_match_map, self.missing_enums)
+        compare_relations = RelationComperator.compare_relations(self.instructor_model, self.student_model, self.class_match_map, self.missing_classes, self.enum_match_map, self.missing_enums, max_derivation_degree=self.max_derivation_degree, derivation_time_budget=self.derivation_time_budget)
         self.relation_match_map: Dict[UMLRelation, UMLRelation] = compare_relations[0]
-        self.relation_match_map_str: Dict[str, str] = {str(k): str(v) for k, v in self.relation_match_map.items()}
         self.inst_assoc_link_match_map: Dict[UMLRelation, Tuple[UMLRelation, UMLRelation]] = compare_relations[1]
-        self.inst_assoc_link_match_map_str: Dict[str, Tuple[str, str]] = {str(k): (str(v[0]), str(v[1])) for k, v in self.inst_assoc_link_match_map.items()}
         self.stud_assoc_link_match_map: Dict[Tuple[UMLRelation, UMLRelation], UMLRelation] = compare_relations[2]
-        self.stud_assoc_link_match_map_str: Dict[Tuple[str, str], str] = {(str(k[0]), str(k[1])): str(v) for k, v in self.stud_assoc_link_match_map.items()}
-        self.sec_derivation_inst_map: Dict[Tuple[UMLRelation, UMLRelation], UMLRelation] = compare_relations[3]
-        self.sec_derivation_inst_map_str: Dict[Tuple[str, str], str] = {(str(k[0]), str(k[1])): str(v) for k, v in self.sec_derivation_inst_map.items()}
-        self.sec_derivation_stud_map: Dict[UMLRelation, Tuple[UMLRelation, UMLRelation]] = compare_relations[4]
-        self.sec_derivation_stud_map_str: Dict[str, Tuple[str, str]] = {str(k): (str(v[0]), str(v[1])) for k, v in self.sec_derivation_stud_map.items()}
+        self.sec_derivation_inst_map: Dict[Tuple[UMLRelation, ...], UMLRelation] = compare_relations[3]
+        self.sec_derivation_stud_map: Dict[UMLRelation, Tuple[UMLRelation, ...]] = compare_relations[4]
         self.miss_relation_list: List[UMLRelation] = compare_relations[5]
-        self.miss_relation_list_str: List[str] = [str(rel) for rel in self.miss_relation_list]
         self.miss_relation_list_loose: List[UMLRelation] = compare_relations[6]
-        self.miss_relation_list_loose_str: List[str] = [str(rel) for rel in self.miss_relation_list_loose]
 
+    def build_str_view(self, field: str) -> Union[Dict, List]:
+        value = getattr(self, field)
+        if field == "missed_value_list":
+            return [f"{str(value)} in {str(value.reference)}" for value in self.missed_value_list]
+        if isinstance(value, list):
+            return [str(elm) for elm in value]
+        if field in STR_TUPLE_KEY_FIELDS:
+            return {tuple(str(elm) for elm in k): str(v) for k, v in value.items()}
+        if field in STR_TUPLE_VALUE_FIELDS:
+            return {str(k): tuple(str(elm) for elm in v) for k, v in value.items()}
+        return {str(k): str(v) for k, v in value.items()}
+
+    # **adeded additionally**
+    @cached_property
+    def temp_all_att_matches(self) -> Dict[UMLAttribute, UMLAttribute]:
+        return {**self.attr_match_map, **self.inherited_attr_map, **self.misplaced_attr_map}
+
+    # **adeded additionally**
+    @cached_property
+    def temp_all_oper_matches(self) -> Dict[UMLOperation, UMLOperation]:
+        return {**self.oper_matched_map, **self.inherited_oper_map, **self.misplaced_oper_map}
+
+    # **adeded additionally**
+    # NOTE: maybe update the missing list in Algorithm 3 and 4
+    @cached_property
+    def temp_missing_classes(self) -> List[UMLClass]:
+        return [
+            cls for cls in self.missing_classes
+            if (
+                cls not in self.split_class_map.keys() and
+                not any(
+                    cls == merge_cls_1 or cls == merge_cls_2
+                    for merge_cls_1, merge_cls_2 in self.merge_class_map.keys()
+                )
+            )
+        ]
+
+    # **adeded additionally**
+    @cached_property
+    def temp_all_value_matches(self) -> Dict[UMLValue, UMLValue]:
+        return {**self.value_match_map, **self.misplaced_value_map}
+
+    @cached_property
+    def match_model(self) -> UMLModel:
         # build the student model based on the matches
-        self.match_model: UMLModel = self.build_student_match_model()
+        with Instrumentation.record(self.metrics, "match_model"):
+            return self.build_student_match_model()
+
+    @cached_property
+    def match_index(self) -> EvalMatchIndex:
+        # per class match buckets and reverse maps for the evaluators
+        with Instrumentation.record(self.metrics, "match_index"):
+            return EvalMatchIndex(self)
 
     def print_grade_model(self):
         if self.grade_model:
@@ -192,9 +302,9 @@ class EvalModel:
             print(f"({str(stud_cls_1)}, {str(stud_cls_2)}) -> {str(inst_relation)}")
         print("\nDerivations:")
         for derivation, rel in self.sec_derivation_inst_map.items():
-            print(f"({str(derivation[0])}, {str(derivation[1])}) -> {str(rel)}")
+            print(f"({', '.join(str(d) for d in derivation)}) -> {str(rel)}")
         for rel, derivation in self.sec_derivation_stud_map.items():
-            print(f"{str(rel)} -> ({str(derivation[0])}, {str(derivation[1])})")
+            print(f"{str(rel)} -> ({', '.join(str(d) for d in derivation)})")
         print("\nMissing Relations:")
         for missing in self.miss_relation_list:
             print(f"Missing: {str(missing)}")
@@ -0,0 +1,133 @@
+from UML_model.uml_element import UMLElement
+from tools.instrumentation import EvalMetrics, Instrumentation
+from tools.match_evidence import EvidenceStore
+from tools.match_thresholds import RawScoreCache
+from tools.name_normalizer import NameNormalizer
+from tools.syntactic_check import SyntacticCheck
+from tools.semantic_check import SemanticCheck
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+import contextvars
+import logging
+
+if TYPE_CHECKING:
+    from plantuml_eval.eval_model import EvalModel
+
+logger = logging.getLogger("eval_parallel")
+logger.setLevel(logging.DEBUG)
+
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] - %(name)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+# word pairs of the semantic check per scorer task
+SCORE_CHUNK_SIZE = 16
+# element lists the comparators check pairwise by name (every instructor element against every student element)
+NAME_PAIR_LISTS: List[str] = ["class_list", "attribute_list", "operation_list", "enum_list", "value_list"]
+
+class ParallelStages:
+    # NOTE: parallel mode of EvalModel.run_all_stages, the results are the same as the serial run:
+    # 1. the raw scores of all name pairs the comparators check are computed in chunks on the executor and put into
+    #    the RawScoreCache, the stages then replay them instead of running the semantic models
+    # 2. independent stages (e.g. classes and enums) run as lanes on threads, each lane in a copy of the context with its
+    #    own EvidenceStore and EvalMetrics, which are merged into the ones of the model in the serial stage order
+    @staticmethod
+    def lanes(dependencies: Dict[str, List[str]], completed: Set[str]) -> Tuple[List[List[str]], List[str]]:
+        # lanes of stages that only depend on stages of the same lane and the stages that join several lanes,
+        # the dependencies are listed in a serial order, lanes keep it and the joins run after all lanes
+        lane_of: Dict[str, int] = {}
+        lanes: List[List[str]] = []
+        joins: List[str] = []
+        for stage, stage_dependencies in dependencies.items():
+            if stage in completed:
+                continue
+            dependency_lanes = {lane_of[dependency] for dependency in stage_dependencies if dependency in lane_of}
+            if len(dependency_lanes) > 1 or any(dependency in joins for dependency in stage_dependencies):
+                joins.append(stage)
+            elif dependency_lanes:
+                lane = dependency_lanes.pop()
+                lanes[lane].append(stage)
+                lane_of[stage] = lane
+            else:
+                lane_of[stage] = len(lanes)
+                lanes.append([stage])
+        return (lanes, joins)
+
+    @staticmethod
+    def name_pairs(eval_model: 'EvalModel') -> List[Tuple[UMLElement, UMLElement]]:
+        pairs: List[Tuple[UMLElement, UMLElement]] = []
+        for list_name in NAME_PAIR_LISTS:
+            for inst_element in getattr(eval_model.instructor_model, list_name):
+                for stud_element in getattr(eval_model.student_model, list_name):
+                    pairs.append((inst_element, stud_element))
+        return pairs
+
+    @staticmethod
+    def score_chunk(pairs: List[Tuple[str, str]]) -> List[Dict[str, float]]:
+        # runs in the executor, for a process pool each worker loads the semantic models once (or uses the ScoringDaemon)
+        return SemanticCheck.semantic_components_batch(pairs)
+
+    @staticmethod
+    def prefetch_scores(eval_model: 'EvalModel', cache: RawScoreCache, executor: Executor, chunk_size: int = SCORE_CHUNK_SIZE) -> int:
+        # fills the cache with the scores MatchEvidence.check_names would compute, returns the number of semantic pairs scored
+        semantic_pairs: Dict[Tuple[str, str], None] = {}
+        for inst_element, stud_element in ParallelStages.name_pairs(eval_model):
+            syntactic_key = (NameNormalizer.lower_form(inst_element.norm), NameNormalizer.lower_form(stud_element.norm))
+            similarity = cache.syntactic.get(syntactic_key)
+            if similarity is None:
+                similarity = cache.syntactic[syntactic_key] = SyntacticCheck.levenshtein_score(*syntactic_key)
+            if similarity >= eval_model.thresholds.syntactic:
+                continue
+            semantic_key = (SemanticCheck.normalize_identifier(inst_element.norm), SemanticCheck.normalize_identifier(stud_element.norm))
+            if semantic_key not in cache.semantic:
+                semantic_pairs[semantic_key] = None
+        pairs = list(semantic_pairs)
+        if not pairs:
+            return 0
+        # NOTE: the first pair is scored here, it loads the lazily loaded wordnet corpus which is not thread safe
+        cache.semantic[pairs[0]] = SemanticCheck.semantic_components(*pairs[0])
+        chunks = [pairs[start:start + chunk_size] for start in range(1, len(pairs), chunk_size)]
+        for chunk, components in zip(chunks, executor.map(ParallelStages.score_chunk, chunks)):
+            cache.semantic.update(zip(chunk, components))
+        Instrumentation.count("semantic_match", len(pairs) - 1)
+        return len(pairs)
+
+    @staticmethod
+    def run_lane(eval_model: 'EvalModel', lane: List[str], evidence: EvidenceStore, metrics: Optional[EvalMetrics]) -> None:
+        for stage in lane:
+            eval_model.execute_stage(stage, evidence, metrics)
+
+    @staticmethod
+    def run(eval_model: 'EvalModel', dependencies: Dict[str, List[str]], workers: int = 4, executor: Optional[Executor] = None) -> None:
+        # executor runs the scorer chunks (e.g. a ProcessPoolExecutor), the lanes always run on threads
+        lanes, joins = ParallelStages.lanes(dependencies, eval_model.completed_stages)
+        cache = RawScoreCache.active()
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as threads, (nullcontext(cache) if cache is not None else RawScoreCache.activate(RawScoreCache())) as cache:
+            with Instrumentation.record(eval_model.metrics, "prefetch_scores"):
+                scored = ParallelStages.prefetch_scores(eval_model, cache, executor or threads)
+            logger.debug(f"scored {scored} name pairs, running lanes {lanes}, then {joins}")
+
+            lane_evidence = []
+            lane_metrics = []
+            futures = []
+            for lane in lanes:
+                evidence = EvidenceStore()
+                # NOTE: pairs checked by earlier stages are seen by every lane, as in the serial run
+                evidence.evidence = dict(eval_model.evidence.evidence)
+                metrics = EvalMetrics() if eval_model.metrics is not None else None
+                lane_evidence.append(evidence)
+                lane_metrics.append(metrics)
+                futures.append(threads.submit(contextvars.copy_context().run, ParallelStages.run_lane, eval_model, lane, evidence, metrics))
+            for future in futures:
+                future.result()
+
+            for evidence, metrics in zip(lane_evidence, lane_metrics):
+                eval_model.evidence.merge(evidence)
+                if metrics is not None:
+                    eval_model.metrics.merge(metrics)
+            for stage in joins:
+                eval_model.run_stage(stage)
@@ -5,6 +5,7 @@ from UML_model.uml_element import UMLElement
 from UML_model.uml_relation import UMLRelation, UMLRelationType
 from grading.grade_metamodel import GradeModel
 from plantuml_eval.eval_helper_functions import EvalHelper
+from plantuml_eval.eval_derivations import DerivationSearch, DEFAULT_DERIVATION_DEGREE
 
 from typing import List, Dict, Tuple, Union, Optional
 import logging
@@ -19,18 +20,40 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
 
 class RelationComperator:
+    @staticmethod
+    def pair_key(source: UMLElement, destination: UMLElement) -> Tuple[int, int]:
+        # unordered pair of end elements, keyed by id() since hashing a UMLClass hashes its whole content
+        return (id(source), id(destination)) if id(source) <= id(destination) else (id(destination), id(source))
+
+    @staticmethod
+    def index_relations(relation_list: List[UMLRelation]) -> Dict[Tuple[int, int], List[UMLRelation]]:
+        # relations by the unordered pair of their ends, list order follows relation_list
+        index: Dict[Tuple[int, int], List[UMLRelation]] = {}
+        for rel in relation_list:
+            index.setdefault(RelationComperator.pair_key(rel.source, rel.destination), []).append(rel)
+        return index
+
+    @staticmethod
+    def lookup_relation(index: Dict[Tuple[int, int], List[UMLRelation]], end_1: UMLElement, end_2: UMLElement, other_than: Optional[UMLRelation] = None) -> Optional[UMLRelation]:
+        # first indexed relation between end_1 and end_2 (in any direction) that is not equal to other_than
+        for rel in index.get(RelationComperator.pair_key(end_1, end_2), []):
+            if other_than is None or rel != other_than:
+                return rel
+        return None
+
     #Algorithm 5 Compare association in InstructorModel and StudentModel 
     #1: procedure COMPAREASSOC(InstructorModel, StudentModel,missClassList) 
     @staticmethod
-    def compare_relations(instructor_model: UMLModel, student_model: UMLModel, class_match_map: Dict[UMLClass, UMLClass], miss_inst_class_list: List[UMLClass], enum_match_map: Dict[UMLEnum, UMLEnum], inst_enum_miss_list: List[UMLEnum], grade_model: Optional[GradeModel] = None) -> Tuple[Dict[UMLRelation, UMLRelation], Dict[UMLRelation, Tuple[UMLRelation, UMLRelation]], Dict[Tuple[UMLRelation, UMLRelation],UMLRelation], Dict[Tuple[UMLRelation, UMLRelation], UMLRelation], Dict[UMLRelation, Tuple[UMLRelation, UMLRelation]], List[UMLRelation], List[UMLRelation]]:
+    def compare_relations(instructor_model: UMLModel, student_model: UMLModel, class_match_map: Dict[UMLClass, UMLClass], miss_inst_class_list: List[UMLClass], enum_match_map: Dict[UMLEnum, UMLEnum], inst_enum_miss_list: List[UMLEnum], grade_model: Optional[GradeModel] = None, max_derivation_degree: int = DEFAULT_DERIVATION_DEGREE, derivation_time_budget: Optional[float] = None) -> Tuple[Dict[UMLRelation, UMLRelation], Dict[UMLRelation, Tuple[UMLRelation, UMLRelation]], Dict[Tuple[UMLRelation, UMLRelation],UMLRelation], Dict[Tuple[UMLRelation, ...], UMLRelation], Dict[UMLRelation, Tuple[UMLRelation, ...]], List[UMLRelation], List[UMLRelation]]:
         # NOTE: this algorithm is extended to also match relations between classes and enums
         logger.debug("Starting relation comparison")
         # variables for returning
         relation_match_map: Dict[UMLRelation, UMLRelation] = {}
         inst_assoc_link_match_map: Dict[UMLRelation, Tuple[UMLRelation, UMLRelation]] = {}
         stud_assoc_link_match_map: Dict[Tuple[UMLRelation, UMLRelation], UMLRelation] = {}
-        sec_derivation_inst_map: Dict[Tuple[UMLRelation, UMLRelation], UMLRelation] = {}
-        sec_derivation_stud_map: Dict[UMLRelation, Tuple[UMLRelation, UMLRelation]] = {}
+        # NOTE: derivations of up to max_derivation_degree relations, second degree by default
+        sec_derivation_inst_map: Dict[Tuple[UMLRelation, ...], UMLRelation] = {}
+        sec_derivation_stud_map: Dict[UMLRelation, Tuple[UMLRelation, ...]] = {}
         miss_relation_list: List[UMLRelation] = []
 
         # variables for internal use
@@ -42,13 +65,9 @@ class RelationComperator:
         missing_stud_elms: List[UMLElement] = miss_stud_class_list + stud_enum_miss_list
 
         possible_relation_map: Dict[UMLRelation, List[UMLRelation]] = {}
-        all_reachable_inst_elements: Dict[UMLElement, List[UMLElement]] = instructor_model.build_reachability_map()
-        possible_relation_class_map: Dict[UMLClass, List[UMLClass]] = {}
-        derivation_in_inst_model: Dict[UMLClass, List[UMLRelation]] = {}
-        
-        all_reachable_stud_elements: Dict[UMLElement, List[UMLElement]] = student_model.build_reachability_map()
-        derivation_in_stud_model: Dict[UMLClass, List[UMLRelation]] = {}
-        missing_stud_relations: List[UMLRelation] = []
+        # NOTE: graph views come from the shared graph index of the models
+        inst_graph = instructor_model.graph_index
+        stud_graph = student_model.graph_index
 
         #2: instAssocList←InstructorModel.getAssociation() 
         inst_relation_list: List[UMLRelation] = instructor_model.relation_list
@@ -56,15 +75,22 @@ class RelationComperator:
         stud_relation_list: List[UMLRelation] = student_model.relation_list
 
         #4: for all Association Ai in instAssocList, As in studAssocList do 
+        # NOTE: hash join instead of comparing every pair, the instructor ends are translated with the element match map
+        # and looked up in the student relations indexed by their ends (the match map is not injective, so not the other way round)
+        stud_relation_join = RelationComperator.index_relations(stud_relation_list)
         for ri in inst_relation_list:
             possible_relation_map[ri] = []
-            for rs in stud_relation_list:
+            stud_source = element_match_map.get(ri.source)
+            stud_destination = element_match_map.get(ri.destination)
+            if stud_source is None or stud_destination is None:
+                continue
+            for rs in stud_relation_join.get(RelationComperator.pair_key(stud_source, stud_destination), []):
                 #5: if Ai and As connect two pairs of matched classes then 
-                if (ri.source, rs.source) in element_match_map.items() and (ri.destination, rs.destination) in element_match_map.items():
+                if rs.source is stud_source and rs.destination is stud_destination:
                     logger.debug(f"Possible relation match found: {ri} with {rs}")
                     #6: associationMatchMap.put(As, Ai) 
                     possible_relation_map[ri].append(rs)
-                elif (ri.source, rs.destination) in element_match_map.items() and (ri.destination, rs.source) in element_match_map.items():
+                else:
                     logger.debug(f"Possible relation match found: {ri} with {rs} (reversed)")
                     possible_relation_map[ri].append(rs.swap_source_destination())
 
@@ -79,39 +105,33 @@ class RelationComperator:
         # NOTE:**added additionally**
         # finding alternative structure for association link to associated classes
         logger.debug("Finding association links alternative matches")
+        stud_assoc_lookup = RelationComperator.index_relations([rs for rs in stud_relation_list if rs.type == UMLRelationType.ASSOCIATION])
         for ri in miss_relation_list:
             if ri.type == UMLRelationType.ASSOCIATION_LINK:
                 inst_assoc: UMLRelation = ri.destination
                 stud_cls_1 = class_match_map.get(inst_assoc.source)
                 stud_cls_2 = class_match_map.get(inst_assoc.destination)
                 stud_assoc_class = class_match_map.get(ri.source)
-                stud_ends = stud_assoc_class.get_relation_ends() if stud_assoc_class else []
+                stud_ends = stud_graph.relation_ends(stud_assoc_class) if stud_assoc_class else []
                 if stud_assoc_class and stud_cls_1 in stud_ends and stud_cls_2 in stud_ends:
-                    for rs_1 in stud_relation_list:
-                        if rs_1.equals(UMLRelation(UMLRelationType.ASSOCIATION, stud_cls_1, stud_assoc_class)):
-                            break
-                    for rs_2 in stud_relation_list:
-                        if rs_1 != rs_2 and rs_2.equals(UMLRelation(UMLRelationType.ASSOCIATION, stud_cls_2, stud_assoc_class)):
-                            break
+                    rs_1 = RelationComperator.lookup_relation(stud_assoc_lookup, stud_cls_1, stud_assoc_class)
+                    rs_2 = RelationComperator.lookup_relation(stud_assoc_lookup, stud_cls_2, stud_assoc_class, rs_1)
                     if rs_1 and rs_2:
                         inst_assoc_link_match_map[ri] = (rs_1, rs_2)
                         logger.debug(f"Association link match found: {str(ri)} with relations {str(rs_1)} and {str(rs_2)}")
 
         student_miss_relations = [rel for rel in student_model.relation_list if rel not in relation_match_map.values()]
+        inst_assoc_lookup = RelationComperator.index_relations([ri for ri in miss_relation_list if ri.type == UMLRelationType.ASSOCIATION])
         for rs in student_miss_relations:
             if rs.type == UMLRelationType.ASSOCIATION_LINK:
                 stud_assoc: UMLRelation = rs.destination
                 inst_cls_1 = reversed_element_match_map.get(stud_assoc.source)
                 inst_cls_2 = reversed_element_match_map.get(stud_assoc.destination)
                 inst_assoc_class = reversed_element_match_map.get(rs.source)
-                inst_ends = inst_assoc_class.get_relation_ends() if inst_assoc_class else []
+                inst_ends = inst_graph.relation_ends(inst_assoc_class) if inst_assoc_class else []
                 if inst_assoc_class and inst_cls_1 in inst_ends and inst_cls_2 in inst_ends:
-                    for ri_1 in miss_relation_list:
-                        if ri_1.equals(UMLRelation(UMLRelationType.ASSOCIATION, inst_cls_1, inst_assoc_class)):
-                            break
-                    for ri_2 in miss_relation_list:
-                        if ri_1 != ri_2 and ri_2.equals(UMLRelation(UMLRelationType.ASSOCIATION, inst_cls_2, inst_assoc_class)):
-                            break
+                    ri_1 = RelationComperator.lookup_relation(inst_assoc_lookup, inst_cls_1, inst_assoc_class)
+                    ri_2 = RelationComperator.lookup_relation(inst_assoc_lookup, inst_cls_2, inst_assoc_class, ri_1)
                     if ri_1 and ri_2 and (ri_1 not in relation_match_map or ri_2 not in relation_match_map):
                         stud_assoc_link_match_map[(ri_1, ri_2)] = rs
                         logger.debug(f"Association link match found: {str(rs)} with relations {str(ri_1)} and {str(ri_2)}")
@@ -121,82 +141,39 @@ class RelationComperator:
         logger.debug(f"{len(inst_assoc_link_match_map)} association link matches found in instructor model")
         logger.debug(f"{len(stud_assoc_link_match_map)} association link matches found in student model")
 
-        #7: for all class C in missClassList do
-        for e in missing_inst_elms:
-            possible_relation_class_map[e] = []
-            #8: for all Class Ci in InstructorModel is connected with C do
-            for ci in all_reachable_inst_elements.get(e, []):
-                #9: possibleAssocMap.get(C).add(Ci)
-                possible_relation_class_map[e].append(ci)
-        logger.debug(f"{len(possible_relation_class_map)} elements with possible relations in instructor model found")
-
-        #10: for all Association As in studAssocList do
-        for rs in stud_relation_list:
-            #11: endClass1 ← As.getEnd1()
+        #7-#16: derivations, relations of one model that are represented by a path over unmatched elements in the other model
+        # NOTE:**added additionally**
+        # the original second degree derivations are searched as paths of up to max_derivation_degree relations on the relation graph
+        # finds derivations in the instructor model (i.e. instructor classes that are not matched as a connection between two student classes)
+        # NOTE: every path is recorded, in the order of the original loops (by intermediate, then by relation)
+        inst_derivations = DerivationSearch(miss_relation_list, missing_inst_elms, max_derivation_degree, derivation_time_budget)
+        found_inst_derivations = []
+        for index, rs in enumerate(stud_relation_list):
             source = reversed_element_match_map.get(rs.source)
-            #12: endClass2 ← As.getEnd2() 
             destination = reversed_element_match_map.get(rs.destination)
-            #13: for all Key Class C in possibleAssocMap do 
-            #14: possibleClassList←possibleAssocMap.get(C) 
-            for e, possible_elm_list in possible_relation_class_map.items():
-                derivation_in_inst_model[e] = derivation_in_inst_model.get(e, [])
-                #15: if endClass1 in possibleClassList and endClass2 in possibleClassList then 
-                if source in possible_elm_list and destination in possible_elm_list:
-                    #16:derivationList.add(As)
-                    derivation_in_inst_model[e].append(rs)
-                    logger.debug(f"Derivation found: {str(rs)} for classes {source} and {destination}")
-
-        # NOTE:**added additionally**
-        # finds second degree derivations (i.e. an instructor class that is not matched as a connection between two student classes)
-        # could be extendet for higher degree but for now only second degree derivations are considered
-        for e, derivation in derivation_in_inst_model.items():
-            for rs in derivation:
-                source = reversed_element_match_map.get(rs.source)
-                destination = reversed_element_match_map.get(rs.destination)
-                if source and destination:
-                    for rel_1 in miss_relation_list:
-                        if rel_1 and rel_1.classes_equal(UMLRelation(UMLRelationType.UNKNOWN, source, e)):
-                            for rel_2 in miss_relation_list:
-                                if rel_2 and rel_2.classes_equal(UMLRelation(UMLRelationType.UNKNOWN, e, destination)):
-                                    # Found a second degree derivation
-                                    sec_derivation_inst_map[(rel_1, rel_2)] = rs
-                                    logger.debug(f"Second degree derivation found: {str(rs)} for relations {str(rel_1)} and {str(rel_2)}")
+            if source and destination:
+                for rank, path in inst_derivations.ranked_paths(source, destination):
+                    found_inst_derivations.append((rank, index, path, rs))
+        for _, _, path, rs in sorted(found_inst_derivations, key=lambda found: found[:2]):
+            sec_derivation_inst_map[path] = rs
+            logger.debug(f"Derivation found: {str(rs)} for relations {', '.join(str(rel) for rel in path)}")
 
         # NOTE:**added additionally**
-        # same proceddure as above just for unmatched student classes
-        possible_relation_class_map = {}
-        missing_stud_relations = [rel for rel in student_model.relation_list if rel not in relation_match_map.values()]
-
-        for e in missing_stud_elms:
-            possible_relation_class_map[e] = []
-            for es in all_reachable_stud_elements.get(e, []):
-                possible_relation_class_map[e].append(es)
-        logger.debug(f"{len(possible_relation_class_map)} elements with possible relations in student model found")
-
-        for ri in inst_relation_list:
+        # same proceddure as above just for unmatched student classes, the last path of a relation is kept
+        derived_inst_relations = {rel for path in sec_derivation_inst_map for rel in path}
+        stud_derivations = DerivationSearch(student_miss_relations, missing_stud_elms, max_derivation_degree, derivation_time_budget)
+        found_stud_derivations = []
+        for index, ri in enumerate(inst_relation_list):
+            if ri in relation_match_map or ri in derived_inst_relations:
+                continue
             source = element_match_map.get(ri.source)
             destination = element_match_map.get(ri.destination)
-            for e, possible_elm_list in possible_relation_class_map.items():
-                derivation_in_stud_model[e] = derivation_in_stud_model.get(e, [])
-                if source in possible_elm_list and destination in possible_elm_list:
-                    if ri not in relation_match_map.keys() and ri not in {k[0] for k in sec_derivation_inst_map.keys()}.union({k[1] for k in sec_derivation_inst_map.keys()}):
-                        derivation_in_stud_model[e].append(ri)
-                        logger.debug(f"Derivation found: {str(ri)} for classes {source} and {destination}")
-
-        # finds second degree derivations (i.e. an student class that is not matched as a connection between two instructor classes)
-        for e, derivation in derivation_in_stud_model.items():
-            for ri in derivation:
-
-                source = element_match_map.get(ri.source)
-                destination = element_match_map.get(ri.destination)
-                if source and destination:
-                    for rel_1 in missing_stud_relations:
-                        if rel_1 and rel_1.classes_equal(UMLRelation(UMLRelationType.UNKNOWN, source, e)):
-                            for rel_2 in missing_stud_relations:
-                                if rel_2 and rel_2.classes_equal(UMLRelation(UMLRelationType.UNKNOWN, e, destination)):
-                                    # Found a second degree derivation
-                                    sec_derivation_stud_map[ri] = (rel_1, rel_2)
-                                    logger.debug(f"Second degree derivation found: {str(ri)} for relations {str(rel_1)} and {str(rel_2)}")
+            if source and destination:
+                for rank, path in stud_derivations.ranked_paths(source, destination):
+                    found_stud_derivations.append((rank, index, ri, path))
+        for _, _, ri, path in sorted(found_stud_derivations, key=lambda found: found[:2]):
+            sec_derivation_stud_map[ri] = path
+            logger.debug(f"Derivation found: {str(ri)} for relations {', '.join(str(rel) for rel in path)}")
 
         miss_relation_list_loose = [
             rel for rel in miss_relation_list
@@ -205,8 +182,7 @@ class RelationComperator:
             and not any(k.destination == rel for k in inst_assoc_link_match_map.keys())
             #and not any(k[0] == rel for k in stud_assoc_link_match_map.keys())
             #and not any(k[1] == rel for k in stud_assoc_link_match_map.keys())
-            and not any(k[0] == rel for k in sec_derivation_inst_map.keys())
-            and not any(k[1] == rel for k in sec_derivation_inst_map.keys())
+            and not any(rel in k for k in sec_derivation_inst_map.keys())
             and not sec_derivation_stud_map.get(rel)
         ]
         logger.info(f"Relation comparison complete: {len(relation_match_map)} matches found, {len(sec_derivation_inst_map) + len(sec_derivation_stud_map)} derivations found, {len(miss_relation_list)} missing relations found")
@@ -0,0 +1,112 @@
+from UML_model.uml_model import UMLModel
+from UML_model.uml_relation import UMLRelation
+from plantuml_eval.eval_model import EvalModel, RESULT_MAP_FIELDS, RESULT_LIST_FIELDS
+from tools.UML_serializer import UMLSerializer, FORMAT_VERSION
+from grading.grade_metamodel import GradeModel
+
+from typing import Any, Dict, List, Optional, Tuple
+import msgpack
+
+# NOTE: a reference is stored as [kind, index] into the matching list of the model
+KIND_CLASS = 0
+KIND_ENUM = 1
+KIND_ATTRIBUTE = 2
+KIND_OPERATION = 3
+KIND_VALUE = 4
+KIND_RELATION = 5
+# NOTE: undirected relations swapped by the comparator (see UMLRelation.swap_source_destination)
+KIND_SWAPPED_RELATION = 6
+
+class _ReferenceTable:
+    def __init__(self, model: UMLModel):
+        self.model: UMLModel = model
+        self.lists: Dict[int, List[Any]] = {
+            KIND_CLASS: model.class_list,
+            KIND_ENUM: model.enum_list,
+            KIND_ATTRIBUTE: model.attribute_list,
+            KIND_OPERATION: model.operation_list,
+            KIND_VALUE: model.value_list,
+            KIND_RELATION: model.relation_list,
+        }
+        self.ids: Dict[int, Tuple[int, int]] = {}
+        for kind, elements in self.lists.items():
+            for idx, elm in enumerate(elements):
+                self.ids[id(elm)] = (kind, idx)
+
+    def encode(self, obj: Any) -> Any:
+        if isinstance(obj, tuple):
+            return [self.encode(elm) for elm in obj]
+        ref = self.ids.get(id(obj))
+        if ref is not None:
+            return list(ref)
+        if isinstance(obj, UMLRelation) and not obj.directed:
+            for idx, rel in enumerate(self.model.relation_list):
+                if rel.type == obj.type and rel.source is obj.destination and rel.destination is obj.source and rel.s_multiplicity == obj.d_multiplicity and rel.d_multiplicity == obj.s_multiplicity:
+                    return [KIND_SWAPPED_RELATION, idx]
+        raise ValueError(f"{obj!r} is not part of the model")
+
+    def decode(self, ref: List[Any]) -> Any:
+        if ref and isinstance(ref[0], list):
+            return tuple(self.decode(elm) for elm in ref)
+        kind, idx = ref
+        if kind == KIND_SWAPPED_RELATION:
+            return self.model.relation_list[idx].swap_source_destination()
+        return self.lists[kind][idx]
+
+class EvalSerializer:
+    @staticmethod
+    def eval_to_tables(eval_model: EvalModel) -> Dict[str, Any]:
+        inst_refs = _ReferenceTable(eval_model.instructor_model)
+        stud_refs = _ReferenceTable(eval_model.student_model)
+        maps = {
+            field: [[inst_refs.encode(key), stud_refs.encode(value)] for key, value in getattr(eval_model, field).items()]
+            for field in RESULT_MAP_FIELDS
+        }
+        lists = {
+            field: [inst_refs.encode(elm) for elm in getattr(eval_model, field)]
+            for field in RESULT_LIST_FIELDS
+        }
+        return {
+            "version": FORMAT_VERSION,
+            "instructor": UMLSerializer.model_to_tables(eval_model.instructor_model),
+            "student": UMLSerializer.model_to_tables(eval_model.student_model),
+            "maps": maps,
+            "lists": lists,
+        }
+
+    @staticmethod
+    def eval_from_tables(tables: Dict[str, Any], grade_model: Optional[GradeModel] = None) -> EvalModel:
+        version = tables.get("version")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported eval format version: {version}")
+        inst_model = UMLSerializer.model_from_tables(tables["instructor"])
+        stud_model = UMLSerializer.model_from_tables(tables["student"])
+        inst_refs = _ReferenceTable(inst_model)
+        stud_refs = _ReferenceTable(stud_model)
+        results: Dict[str, Any] = {
+            field: {inst_refs.decode(key): stud_refs.decode(value) for key, value in rows}
+            for field, rows in tables["maps"].items()
+        }
+        results.update({
+            field: [inst_refs.decode(ref) for ref in refs]
+            for field, refs in tables["lists"].items()
+        })
+        return EvalModel.from_results(inst_model, stud_model, results, grade_model)
+
+    @staticmethod
+    def dumps_eval(eval_model: EvalModel) -> bytes:
+        return msgpack.packb(EvalSerializer.eval_to_tables(eval_model), use_bin_type=True)
+
+    @staticmethod
+    def loads_eval(data: bytes, grade_model: Optional[GradeModel] = None) -> EvalModel:
+        return EvalSerializer.eval_from_tables(msgpack.unpackb(data, raw=False, strict_map_key=False), grade_model)
+
+    @staticmethod
+    def dump_eval(eval_model: EvalModel, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(EvalSerializer.dumps_eval(eval_model))
+
+    @staticmethod
+    def load_eval(path: str, grade_model: Optional[GradeModel] = None) -> EvalModel:
+        with open(path, "rb") as file:
+            return EvalSerializer.loads_eval(file.read(), grade_model)
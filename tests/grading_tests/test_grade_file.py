@@ -0,0 +1,87 @@
+from grading.grade_file import GradeModelFile
+from grading.grade_metamodel import GradeModel
+from UML_model.uml_model import UMLModel
+import os
+import tempfile
+import unittest
+
+INST_UML = """
+@startuml
+class Position {
+    /check
+    executeMove()
+}
+class Piece
+class Square
+enum Color {
+    BLACK
+    WHITE
+}
+Position "*" -- "*" Piece
+(Position, Piece) .. Square
+Piece " " o-- "1" Color
+@enduml
+"""
+
+SPEC = {
+    "format": 1,
+    "name": "Chess",
+    "classes": [{"name": "Position", "exists": 1.0, "attributes": 1.0, "operations": 0.5}, {"name": "piece", "exists": 1.0}],
+    "enums": [{"name": "Color", "exists": 0.5, "values": 0.5}],
+    "relations": [
+        {"relation": "(Position, Piece)", "exists": 0.5, "structure": 0.5},
+        {"source": "Square", "destination": "(Position, Piece)", "type": "association link", "exists": 1.0, "structure": 1.0},
+        {"source": "Color", "destination": "Piece", "exists": 0.5}
+    ]
+}
+
+class TestGradeModelFile(unittest.TestCase):
+    def setUp(self):
+        self.model = UMLModel(INST_UML)
+
+    def test_build_matches_python(self):
+        grade_model = GradeModel("Chess", self.model)
+        grade_model.add_class_grade_structure(self.model.class_lookup["position"], 1.0, 1.0, 0.5)
+        grade_model.add_class_grade_structure(self.model.class_lookup["piece"], 1.0)
+        grade_model.add_enum_grade_structure(self.model.enum_lookup["color"], 0.5, 0.5)
+        grade_model.add_relation_grade_structure(self.model.relation_lookup["(position, piece)"], 0.5, 0.5)
+        grade_model.add_relation_grade_structure(self.model.relation_lookup["(square, (position, piece))"], 1.0, 1.0)
+        grade_model.add_relation_grade_structure(self.model.relation_lookup["(color, piece)"], 0.5)
+        loaded = GradeModelFile.build(SPEC, self.model)
+        self.assertEqual(repr(loaded), repr(grade_model))
+        self.assertEqual(GradeModelFile.build(GradeModelFile.to_spec(loaded), self.model).total_points, grade_model.total_points)
+
+    def test_to_spec_value_points(self):
+        model = UMLModel("@startuml\nenum PieceType {\n    PAWN\n    KING\n    QUEEN\n    ROOK\n    BISHOP\n    KNIGHT\n}\n@enduml")
+        grade_model = GradeModel("Chess", model)
+        grade_model.add_enum_grade_structure(model.enum_lookup["piecetype"], 0.5, 0.5)
+        self.assertEqual(GradeModelFile.to_spec(grade_model)["enums"], [{"name": "PieceType", "exists": 0.5, "values": 0.5}])
+
+    def test_validation(self):
+        spec = {
+            "format": 1,
+            "classes": [{"name": "Board", "exists": 1.0}, {"name": "Piece", "exists": -1.0}, {"name": "Piece", "size": 1.0}],
+            "relations": [{"source": "Piece", "destination": "Square"}, {"relation": "(Color, Piece)", "type": "composition"}]
+        }
+        errors = GradeModelFile.validate(spec, self.model)
+        self.assertEqual(len(errors), 6)
+        self.assertIn("classes[0]: class 'Board' not found", errors)
+        self.assertTrue(any("is graded twice" in error for error in errors))
+        self.assertTrue(any("matches 0 relations" in error for error in errors))
+        with self.assertRaises(ValueError):
+            GradeModelFile.build(spec, self.model)
+        self.assertEqual(GradeModelFile.validate(SPEC, self.model), [])
+
+    def test_bundle(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = os.path.join(out_dir, "chess.bundle")
+            GradeModelFile.dump_bundle(self.model, SPEC, path)
+            uml_model, grade_model = GradeModelFile.load_bundle(path)
+            self.assertIs(GradeModelFile.load_bundle(path)[1], grade_model)
+        self.assertEqual(uml_model.to_plantuml(), self.model.to_plantuml())
+        self.assertEqual(repr(grade_model), repr(GradeModelFile.build(SPEC, self.model)))
+        # the grade model is bound to the restored instructor model
+        self.assertIs(grade_model.classes[0].element, uml_model.class_list[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+from grading.grade_metamodel import GradeModel, FeatureType
+from UML_model.uml_model import UMLModel
+import copy
+import unittest
+
+INST_UML = """
+@startuml
+class Customer {
+    name: str
+    age: int
+    +getName(): str
+}
+enum Status {
+    OPEN
+    CLOSED
+}
+Customer -- Status
+@enduml
+"""
+
+class TestGradeModelIndex(unittest.TestCase):
+    def setUp(self):
+        self.model = UMLModel(INST_UML)
+        self.customer = self.model.class_lookup["customer"]
+        self.status = self.model.enum_lookup["status"]
+        self.grade_model = GradeModel("Test", self.model)
+        self.grade_model.add_class_grade_structure(self.customer, 1.0, 0.5, 1.0)
+        self.grade_model.add_enum_grade_structure(self.status, 1.0, 1.0)
+        self.grade_model.add_relation_grade_structure(self.model.relation_list[0], 0.5, 0.5)
+
+    def test_point_totals(self):
+        grade_class = self.grade_model.grade_object(self.customer, FeatureType.CLASS)
+        self.assertEqual(grade_class.points, 3.0)
+        self.assertEqual(grade_class.type_points, {FeatureType.CLASS: 1.0, FeatureType.ATTRIBUTE: 1.0, FeatureType.OPERATION: 1.0})
+        self.assertEqual(self.grade_model.total_points, 6.0)
+        grade_enum = self.grade_model.grade_object(self.status, FeatureType.ENUM)
+        self.assertEqual(len(grade_enum.type_features[FeatureType.VALUE]), 2)
+        self.assertEqual(grade_enum.type_points[FeatureType.VALUE], 1.0)
+        # replacing the features rebuilds the indexes
+        grade_enum.set_st_features(grade_enum.type_features[FeatureType.ENUM])
+        self.assertEqual(grade_enum.type_points, {FeatureType.ENUM: 1.0})
+        self.assertIsNone(grade_enum.st_feature(self.status.values[0], FeatureType.VALUE))
+
+    def test_feature_lookup(self):
+        grade_class = self.grade_model.grade_object(self.customer, FeatureType.CLASS)
+        age = self.customer.attributes[1]
+        self.assertIs(grade_class.st_feature(age, FeatureType.ATTRIBUTE).reference, age)
+        self.assertIsNone(grade_class.st_feature(age, FeatureType.OPERATION))
+        # copies are found by content
+        self.assertIs(grade_class.st_feature(copy.copy(age), FeatureType.ATTRIBUTE).reference, age)
+        self.assertIsNone(self.grade_model.grade_object(self.status, FeatureType.CLASS))
+
+    def test_temp_grades(self):
+        self.assertEqual(self.grade_model.temp_grade_class(self.customer, self.customer), (1.0, 3.0))
+        name = self.customer.attributes[0]
+        self.assertEqual(self.grade_model.temp_grade_class_content(name, name), (1.0, 0.5))
+        # syntactic match -> 3/5 of the value points, the semantic match adds up to 2/5
+        self.assertGreaterEqual(self.grade_model.temp_grade_value(self.status.values[0], self.status.values[0])[1], 0.3)
+        # an enum with points for existing but none for its values
+        grade_model = GradeModel("Test", self.model)
+        grade_model.add_enum_grade_structure(self.status, 1.0, 0.0)
+        self.assertEqual(grade_model.temp_grade_value(self.status.values[0], self.status.values[0]), (0.0, 0.0))
+
+if __name__ == "__main__":
+    unittest.main()
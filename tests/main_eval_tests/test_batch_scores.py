@@ -0,0 +1,71 @@
+from main_eval.batch_scores import BatchScores
+from main_eval.eval_handler import EvalHandler
+from main_eval.eval_metrics import NO_STATEMENT
+from main_eval.scoring_plan import EVALUATED_GROUPS
+from plantuml_eval.eval_model import EvalModel
+from UML_model.uml_model import UMLModel
+import numpy as np
+import unittest
+
+INST_UML = """
+@startuml
+class Customer {
+    name: str
+}
+class Order {
+    orderId: int
+}
+Customer "1" -- "*" Order
+@enduml
+"""
+
+STUD_UML = """
+@startuml
+class Client {
+    name: str
+}
+class Order {
+    id: int
+}
+Client "1" -- "*" Order
+@enduml
+"""
+
+class TestBatchScores(unittest.TestCase):
+    def setUp(self):
+        self.plan = EvalHandler.scoring_plan()
+
+    def test_mask_and_weights(self):
+        # completeness: CLS 1.0, ATT 0.5, the rest has no statement
+        scores = {criteria_id: NO_STATEMENT for criteria_id in self.plan.ids}
+        scores.update({"CPT.CLS": 1.0, "CPT.ATT": 0.5, "CPT.ATT.VIS": 0.0, "SYC.CLS": 0.25})
+        batch = BatchScores.from_criteria_scores([scores, {}], ["a", "b"])
+        self.assertEqual(batch.matrix.shape, (2, len(self.plan)))
+        self.assertTrue(np.isnan(batch.column("CPT.OPR")[0]))
+        self.assertFalse(batch.valid[0, self.plan.index["NAM.CLS"]])
+
+        categories = batch.category_scores()
+        self.assertAlmostEqual(categories[0, 0], 0.75)
+        self.assertAlmostEqual(categories[0, 1], 0.25)
+        self.assertTrue(np.isnan(categories[0, 2]) and np.isnan(categories[0, 3]))
+        self.assertTrue(np.isnan(categories[1]).all())
+
+        totals = batch.total_scores()
+        self.assertAlmostEqual(totals[0], 0.5)
+        self.assertTrue(np.isnan(totals[1]))
+        self.assertAlmostEqual(batch.total_scores({"completeness_criteria": 3.0, "syntax_criteria": 1.0})[0], 0.625)
+        self.assertIsNone(batch.to_rows()[1]["total"])
+
+    def test_from_handlers(self):
+        handlers = [EvalHandler(EvalModel(UMLModel(INST_UML), UMLModel(STUD_UML))) for _ in range(3)]
+        batch = BatchScores.from_handlers(handlers)
+        self.assertEqual(len(batch), 3)
+        expected = BatchScores.from_criteria_scores([handlers[0].criteria_scores()])
+        np.testing.assert_array_equal(batch.valid[0], expected.valid[0])
+        np.testing.assert_allclose(batch.category_scores()[0], expected.category_scores()[0])
+        rows = batch.to_rows()
+        self.assertEqual(set(rows[0]), {"name", "total"} | set(EVALUATED_GROUPS))
+        self.assertTrue(0.0 <= rows[0]["total"] <= 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+from main_eval.leaderboard import Leaderboard, LEADERBOARD_FILE
+from main_eval.result_store import ResultStore, ResultStoreWriter
+from main_eval.eval_handler import EvalHandler
+import numpy as np
+import os
+import tempfile
+import unittest
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.plan = EvalHandler.scoring_plan()
+        self.out_dir = tempfile.TemporaryDirectory()
+        self.directory = self.out_dir.name
+
+    def tearDown(self):
+        self.out_dir.cleanup()
+
+    def write(self, records):
+        with ResultStoreWriter(self.directory, self.plan, chunk_size=3) as writer:
+            for model, task, score in records:
+                writer.append({"CPT.CLS": score, "SYC.CLS": score}, model=model, task=task, run=1, name=f"{model}_{task}")
+
+    def test_table(self):
+        self.write([("a", "t1", 1.0), ("a", "t2", 0.5), ("b", "t1", 0.25), ("b", "t1", 0.75), ("c", "t1", 0.0)])
+        leaderboard = Leaderboard.open(self.directory, self.plan, resamples=200)
+        rows = leaderboard.table(["model"])
+        self.assertEqual([row["model"] for row in rows], ["a", "b", "c"])
+        self.assertEqual([row["rank"] for row in rows], [1, 2, 3])
+        self.assertAlmostEqual(rows[0]["mean"], 0.75)
+        self.assertEqual(rows[0]["records"], 2)
+        self.assertTrue(0.5 <= rows[0]["ci_low"] <= rows[0]["mean"] <= rows[0]["ci_high"] <= 1.0)
+        self.assertEqual(rows[2]["ci_low"], rows[2]["ci_high"])
+        self.assertEqual(sum(rows[1]["histogram"]), 2)
+        self.assertAlmostEqual(rows[1]["completeness_criteria"], 0.5)
+
+        keys, means = leaderboard.criteria_means(["task"], ["CPT.CLS", "NAM.CLS"])
+        self.assertEqual(keys, [("t1",), ("t2",)])
+        np.testing.assert_allclose(means[:, 0], [0.5, 0.5])
+        self.assertTrue(np.isnan(means[:, 1]).all())
+
+    def test_incremental_refresh_matches_rebuild(self):
+        self.write([("a", "t1", 1.0), ("b", "t1", 0.5)])
+        leaderboard = Leaderboard.open(self.directory, self.plan, resamples=200)
+        leaderboard.table(["model"])
+        leaderboard.save()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, LEADERBOARD_FILE)))
+
+        self.write([("a", "t2", 0.0), ("c", "t1", 0.25)])
+        reopened = Leaderboard.open(self.directory, self.plan, resamples=200)
+        self.assertEqual(reopened.refresh(), 0)
+        self.assertEqual(len(reopened.totals), 4)
+        # the interval of b is taken from the saved state, a has new records
+        self.assertEqual(reopened.intervals[(("model",), ("b",))][0], 1)
+
+        os.remove(os.path.join(self.directory, LEADERBOARD_FILE))
+        rebuilt = Leaderboard.open(self.directory, self.plan, resamples=200)
+        self.assertEqual(reopened.table(["model"]), rebuilt.table(["model"]))
+        self.assertEqual(reopened.table(["model", "task"]), rebuilt.table(["model", "task"]))
+        np.testing.assert_allclose(reopened.criteria_means(["model"])[1], ResultStore.load(self.directory, self.plan).group_mean("model")[1])
+
+    def test_bootstrap_interval(self):
+        rng = np.random.default_rng(0)
+        values = rng.random(2000)
+        low, high = Leaderboard.bootstrap_interval(values, 500, 0.95, rng)
+        # the standard error of the mean of uniform values is about 0.29 / sqrt(n)
+        self.assertAlmostEqual(high - low, 2 * 1.96 * values.std() / np.sqrt(len(values)), delta=0.005)
+        low, high = Leaderboard.bootstrap_interval(np.repeat([0.0, 1.0], 1000), 500, 0.95, rng)
+        self.assertTrue(low < 0.5 < high)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+from main_eval.result_store import ResultStore, ResultStoreWriter, RESULT_INDEX
+from main_eval.batch_scores import BatchScores
+from main_eval.eval_handler import EvalHandler
+from main_eval.eval_metrics import NO_STATEMENT
+from plantuml_eval.eval_model import EvalModel
+from UML_model.uml_model import UMLModel
+import numpy as np
+import os
+import tempfile
+import unittest
+
+INST_UML = """
+@startuml
+class Customer {
+    name: str
+}
+class Order {
+    orderId: int
+}
+Customer "1" -- "*" Order
+@enduml
+"""
+
+STUD_UML = """
+@startuml
+class Client {
+    name: str
+}
+class Order {
+    id: int
+}
+Client "1" -- "*" Order
+@enduml
+"""
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.plan = EvalHandler.scoring_plan()
+        self.out_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.out_dir.name, "results")
+
+    def tearDown(self):
+        self.out_dir.cleanup()
+
+    def test_incremental_write_and_group_mean(self):
+        with ResultStoreWriter(self.directory, self.plan, chunk_size=2) as writer:
+            writer.append({"CPT.CLS": 1.0, "SYC.CLS": 0.5}, model="a", task="t1", run=1, name="r0")
+            writer.append({"CPT.CLS": 0.5}, model="a", task="t2", run=1, name="r1")
+            writer.append({"CPT.CLS": 0.0, "SYC.CLS": 1.0}, model="b", task="t1", run=1, name="r2")
+        self.assertEqual(len(writer.index["chunks"]), 2)
+
+        # a second run appends to the existing store
+        with ResultStoreWriter(self.directory, self.plan) as writer:
+            writer.append({"CPT.CLS": 1.0}, model="b", task="t1", run=2, name="r3")
+        self.assertEqual(writer.rows(), 4)
+
+        store = ResultStore.load(self.directory, self.plan)
+        self.assertEqual(len(store), 4)
+        keys, means = store.group_mean("model", ["CPT.CLS", "SYC.CLS", "NAM.CLS"])
+        self.assertEqual(keys, [("a",), ("b",)])
+        np.testing.assert_allclose(means[:, 0], [0.75, 0.5])
+        # SYC.CLS has no statement in r1 and r3, NAM.CLS is never evaluated
+        np.testing.assert_allclose(means[:, 1], [0.5, 1.0])
+        self.assertTrue(np.isnan(means[:, 2]).all())
+
+        keys, means = store.group_mean(["model", "run"], ["CPT.CLS"], mask=store.where(task="t1"))
+        self.assertEqual(keys, [("a", "1"), ("b", "1"), ("b", "2")])
+        np.testing.assert_allclose(means[:, 0], [1.0, 0.0, 1.0])
+        self.assertTrue(np.isnan(store.column("SYC.CLS")[1]))
+
+    def test_handler_scores_round_trip(self):
+        handler = EvalHandler(EvalModel(UMLModel(INST_UML), UMLModel(STUD_UML)))
+        with ResultStoreWriter(self.directory, self.plan) as writer:
+            writer.append_handler(handler, model="a", name="s0")
+        self.assertTrue(os.path.exists(os.path.join(self.directory, RESULT_INDEX)))
+
+        store = ResultStore.load(self.directory, self.plan)
+        batch = store.batch_scores()
+        expected = BatchScores.from_handlers([handler], ["s0"])
+        self.assertEqual(batch.names, ["s0"])
+        np.testing.assert_array_equal(batch.valid, expected.valid)
+        np.testing.assert_allclose(batch.total_scores(), expected.total_scores(), rtol=1e-6)
+        for criteria_id, score in handler.criteria_scores().items():
+            if score != NO_STATEMENT and self.plan.evaluators[self.plan.index[criteria_id]] is not None:
+                self.assertAlmostEqual(store.column(criteria_id)[0], score, places=6)
+
+    def test_mismatching_plan(self):
+        with ResultStoreWriter(self.directory, self.plan) as writer:
+            writer.append({}, model="a")
+            with self.assertRaises(ValueError):
+                writer.append({}, modell="a")
+        with self.assertRaises(ValueError):
+            ResultStoreWriter(self.directory, self.plan, metadata=["model"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+from main_eval.eval_handler import EvalHandler
+from main_eval.eval_metrics import ScoringCriteria, ScoringScheme, COMPLETENESS
+from main_eval.scoring_plan import EVALUATED_GROUPS
+from plantuml_eval.eval_model import EvalModel
+from UML_model.uml_model import UMLModel
+import unittest
+
+INST_UML = """
+@startuml
+class Customer {
+    name: str
+    +getName(): str
+}
+class Order {
+    orderId: int
+}
+enum Status {
+    OPEN
+    CLOSED
+}
+Customer "1" -- "*" Order
+@enduml
+"""
+
+STUD_UML = """
+@startuml
+class Client {
+    name: str
+}
+class Order {
+    id: int
+}
+enum Status {
+    OPEN
+}
+Client "1" -- "*" Order
+@enduml
+"""
+
+class TestScoringPlan(unittest.TestCase):
+    def test_compiled_once(self):
+        plan = EvalHandler.scoring_plan()
+        self.assertIs(EvalHandler.scoring_plan(), plan)
+        self.assertEqual(plan.ids[plan.parents[plan.index["CPT.ATT.VIS"]]], "CPT.ATT")
+        self.assertEqual(plan.parents[plan.index["CPT.CLS"]], -1)
+        self.assertTrue(all(plan.evaluators[i] is not None for group in EVALUATED_GROUPS for i in range(*plan.group_ranges[group])))
+        self.assertIsNone(plan.evaluators[plan.index["NAM.CLS"]])
+
+    def test_same_scores_as_scheme(self):
+        model = EvalModel(UMLModel(INST_UML), UMLModel(STUD_UML))
+        handler = EvalHandler(model)
+        scheme = ScoringScheme()
+        for group in EVALUATED_GROUPS:
+            for key, (criteria, sub_criteria_1, sub_criteria_2) in getattr(scheme, group).items():
+                view = getattr(handler, group)[key][0]
+                self.assertEqual(repr(view), repr(EvalHandler.evaluate_criteria(criteria, model)))
+                for sub_criteria in (sub_criteria_1 or []) + (sub_criteria_2 or []):
+                    self.assertEqual(handler.criteria_scores()[sub_criteria.id], EvalHandler.evaluate_criteria(sub_criteria, model).score)
+        self.assertEqual(len(handler.naming_criteria), len(scheme.naming_criteria))
+
+    def test_unknown_criteria(self):
+        with self.assertRaises(ValueError):
+            EvalHandler.resolve_evaluator(ScoringCriteria(COMPLETENESS, "CPT.XYZ", ""))
+        with self.assertRaises(ValueError):
+            EvalHandler.resolve_evaluator(ScoringCriteria("Unknown", "CPT.CLS", ""))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+from plantuml_eval.eval_derivations import DerivationSearch
+from UML_model.uml_class import UMLClass
+from UML_model.uml_relation import UMLRelation, UMLRelationType
+import unittest
+
+class TestDerivationSearch(unittest.TestCase):
+    def setUp(self):
+        self.a, self.b, self.c, self.d = UMLClass("A"), UMLClass("B"), UMLClass("C"), UMLClass("D")
+        self.ab = UMLRelation(UMLRelationType.ASSOCIATION, self.a, self.b)
+        self.bc = UMLRelation(UMLRelationType.ASSOCIATION, self.b, self.c)
+        self.dc = UMLRelation(UMLRelationType.ASSOCIATION, self.d, self.c)
+        self.relations = [self.ab, self.bc, self.dc]
+
+    def test_second_degree(self):
+        search = DerivationSearch(self.relations, [self.b])
+        self.assertEqual(search.path(self.a, self.c), (self.ab, self.bc))
+        self.assertEqual(search.path(self.c, self.a), (self.bc, self.ab))
+        self.assertIsNone(search.path(self.a, self.d))
+        # a direct relation is not a derivation
+        self.assertIsNone(search.path(self.a, self.b))
+
+    def test_all_second_degree_paths(self):
+        e = UMLClass("E")
+        ae = UMLRelation(UMLRelationType.ASSOCIATION, self.a, e)
+        ec = UMLRelation(UMLRelationType.ASSOCIATION, e, self.c)
+        ab_2 = UMLRelation(UMLRelationType.AGGREGATION, self.a, self.b)
+        search = DerivationSearch([ae, self.ab, self.bc, ec, ab_2], [self.b, e])
+        # ordered by intermediate, then by relation
+        self.assertEqual(search.paths(self.a, self.c), [(self.ab, self.bc), (ab_2, self.bc), (ae, ec)])
+        self.assertEqual([rank for rank, _ in search.ranked_paths(self.a, self.c)], [0, 0, 1])
+        self.assertEqual(search.path(self.a, self.c), (self.ab, self.bc))
+
+    def test_higher_degree(self):
+        search = DerivationSearch(self.relations, [self.b, self.c], max_degree=3)
+        self.assertEqual(search.path(self.a, self.d), (self.ab, self.bc, self.dc))
+        self.assertIsNone(DerivationSearch(self.relations, [self.b], max_degree=3).path(self.a, self.d))
+
+    def test_directed_relations(self):
+        generalization = UMLRelation(UMLRelationType.GENERALIZATION, self.b, self.a)
+        search = DerivationSearch([generalization, self.bc], [self.b])
+        self.assertIsNone(search.path(self.a, self.c))
+        self.assertEqual(search.path(self.c, self.a), (self.bc, generalization))
+
+    def test_same_source_and_destination(self):
+        search = DerivationSearch(self.relations, [self.b])
+        self.assertEqual(search.path(self.a, self.a), (self.ab, self.ab))
+
+    def test_memoization_and_budget(self):
+        search = DerivationSearch(self.relations, [self.b])
+        path = search.path(self.a, self.c)
+        self.assertIs(search.path(self.a, self.c), path)
+        self.assertEqual(len(search.path_cache), 1)
+
+        expired = DerivationSearch(self.relations, [self.b], time_budget=-1.0)
+        self.assertIsNone(expired.path(self.a, self.c))
+        self.assertTrue(expired.budget_exceeded)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from plantuml_eval.eval_helper_functions import EvalHelper
+from scipy.optimize import linear_sum_assignment
+import numpy as np
+import unittest
+
+class TestSolveAssignment(unittest.TestCase):
+    def random_edges(self, seed: int, n_rows: int, n_cols: int, density: float):
+        rng = np.random.default_rng(seed)
+        edges = {}
+        for i, j in zip(rng.integers(0, n_rows, int(n_rows * n_cols * density)), rng.integers(0, n_cols, int(n_rows * n_cols * density))):
+            edges[(int(i), int(j))] = 0.0 if rng.random() < 0.2 else float(rng.random())
+        rows = np.array([i for i, _ in edges], dtype=np.int64)
+        cols = np.array([j for _, j in edges], dtype=np.int64)
+        return edges, rows, cols, np.array(list(edges.values()))
+
+    def dense_total(self, rows, cols, scores, n_rows, n_cols) -> float:
+        cost_matrix = np.full((n_rows, n_cols), 1.0)
+        cost_matrix[rows, cols] = 1.0 - scores
+        row_ind, col_ind = linear_sum_assignment(cost_matrix)
+        return float(sum(1.0 - cost_matrix[i][j] for i, j in zip(row_ind, col_ind)))
+
+    def assert_optimal(self, edges, rows, cols, scores, n_rows, n_cols):
+        pairs = EvalHelper.solve_assignment(rows, cols, scores, n_rows, n_cols)
+        self.assertEqual(len({i for i, _ in pairs}), len(pairs))
+        self.assertEqual(len({j for _, j in pairs}), len(pairs))
+        self.assertTrue(all(edges[pair] > 0.0 for pair in pairs))
+        self.assertAlmostEqual(sum(edges[pair] for pair in pairs), self.dense_total(rows, cols, scores, n_rows, n_cols))
+
+    def test_small_assignment(self):
+        edges = {(0, 0): 0.9, (0, 1): 0.8, (1, 0): 0.85, (2, 1): 0.0}
+        rows, cols = np.array([0, 0, 1, 2]), np.array([0, 1, 0, 1])
+        pairs = EvalHelper.solve_assignment(rows, cols, np.array(list(edges.values())), 3, 2)
+        self.assertEqual(pairs, [(0, 1), (1, 0)])
+
+    def test_empty_assignment(self):
+        empty = np.array([], dtype=np.int64)
+        self.assertEqual(EvalHelper.solve_assignment(empty, empty, np.array([]), 0, 0), [])
+
+    def test_large_sparse_assignment(self):
+        for seed in range(5):
+            self.assert_optimal(*self.random_edges(seed, 150, 120, 0.01), 150, 120)
+
+    def test_large_dense_components(self):
+        for seed in range(5):
+            self.assert_optimal(*self.random_edges(seed, 80, 90, 0.3), 80, 90)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+from plantuml_eval.eval_model import EvalModel
+from plantuml_eval.eval_match_index import EvalMatchIndex, ClassMatchBucket
+from UML_model.uml_model import UMLModel
+from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation
+from UML_model.uml_enum import UMLEnum, UMLValue
+import unittest
+
+class TestEvalMatchIndex(unittest.TestCase):
+    def setUp(self):
+        self.person = UMLClass("Person", [UMLAttribute("name"), UMLAttribute("age")], [UMLOperation("greet")])
+        self.address = UMLClass("Address", [UMLAttribute("street")])
+        self.order = UMLClass("Order", [UMLAttribute("orderId"), UMLAttribute("total")])
+        self.missing = UMLClass("Invoice", [UMLAttribute("amount")])
+        self.color = UMLEnum("Color", [UMLValue("RED"), UMLValue("GREEN")])
+        self.inst_model = UMLModel(class_list=[self.person, self.address, self.order, self.missing], enum_list=[self.color])
+
+        self.stud_person = UMLClass("Person", [UMLAttribute("name"), UMLAttribute("street")], [UMLOperation("greet")])
+        self.stud_order = UMLClass("Order", [UMLAttribute("orderId")])
+        self.stud_total = UMLClass("OrderTotal", [UMLAttribute("total")])
+        self.stud_color = UMLEnum("Colour", [UMLValue("RED"), UMLValue("GREEN")])
+        self.stud_model = UMLModel(class_list=[self.stud_person, self.stud_order, self.stud_total], enum_list=[self.stud_color])
+
+        results = {
+            "class_match_map": {self.person: self.stud_person, self.order: self.stud_order},
+            "attr_match_map": {self.person.attributes[0]: self.stud_person.attributes[0], self.order.attributes[0]: self.stud_order.attributes[0]},
+            "misplaced_attr_map": {self.address.attributes[0]: self.stud_person.attributes[1], self.order.attributes[1]: self.stud_total.attributes[0]},
+            "oper_matched_map": {self.person.operations[0]: self.stud_person.operations[0]},
+            "split_class_map": {self.order: (self.stud_order, self.stud_total)},
+            "merge_class_map": {(self.person, self.address): self.stud_person},
+            "enum_match_map": {self.color: self.stud_color},
+            "value_match_map": {self.color.values[0]: self.stud_color.values[0]},
+            "misplaced_value_map": {self.color.values[1]: self.stud_color.values[1]},
+            "missing_classes": [self.address, self.missing],
+            "missed_attr_list": [self.person.attributes[1], self.missing.attributes[0]]
+        }
+        self.eval_model = EvalModel.from_results(self.inst_model, self.stud_model, results)
+        self.index = self.eval_model.match_index
+
+    def test_index_is_built_with_results(self):
+        self.assertIsInstance(self.index, EvalMatchIndex)
+
+    def test_class_buckets(self):
+        bucket = self.index.bucket(self.person)
+        self.assertIsInstance(bucket, ClassMatchBucket)
+        self.assertIs(bucket.match, self.stud_person)
+        self.assertEqual(bucket.matched_attrs, [self.person.attributes[0]])
+        self.assertEqual(bucket.matched_opers, [self.person.operations[0]])
+        self.assertEqual(bucket.total_attrs, 1)
+        self.assertIsNone(bucket.merged_into)
+
+        order_bucket = self.index.bucket(self.order)
+        self.assertEqual(order_bucket.split, (self.stud_order, self.stud_total))
+        self.assertEqual(order_bucket.misplaced_attrs, [self.order.attributes[1]])
+
+        address_bucket = self.index.bucket(self.address)
+        self.assertIsNone(address_bucket.match)
+        self.assertIs(address_bucket.merged_into, self.stud_person)
+        self.assertEqual(address_bucket.merge, ((self.person, self.address), self.stud_person))
+
+        self.assertEqual(self.index.bucket(self.missing).total_attrs, 0)
+
+    def test_matched_classes(self):
+        self.assertEqual(self.index.matched_inst_classes, [self.person, self.address, self.order])
+        self.assertEqual(self.index.matched_stud_classes, [self.stud_person, self.stud_order, self.stud_total])
+
+    def test_enum_values(self):
+        self.assertEqual(self.index.matched_values(self.color), [self.color.values[0]])
+        self.assertEqual(self.index.misplaced_values(self.color), [self.color.values[1]])
+        self.assertEqual(self.index.matched_values(self.stud_color), [])
+
+    def test_reverse_map(self):
+        self.assertIs(self.index.inst_element(self.stud_person), self.person)
+        self.assertIs(self.index.inst_element(self.stud_total.attributes[0]), self.order.attributes[1])
+        self.assertIs(self.index.inst_element(self.stud_color.values[1]), self.color.values[1])
+        self.assertIsNone(self.index.inst_element(UMLClass("Unknown")))
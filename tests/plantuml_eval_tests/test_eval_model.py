@@ -0,0 +1,87 @@
+from plantuml_eval.eval_model import EvalModel, STAGE_DEPENDENCIES, FIELD_STAGES
+from UML_model.uml_model import UMLModel
+import unittest
+
+class TestEvalModelStages(unittest.TestCase):
+    def setUp(self):
+        self.inst_model = UMLModel("""
+        @startuml
+        class Customer {
+            name: str
+            email: str
+        }
+        class Order {
+            orderId: int
+            +total(): float
+        }
+        enum Status {
+            OPEN
+            CLOSED
+        }
+        Customer "1" -- "*" Order
+        Order "*" -- "1" Status
+        @enduml
+        """)
+        self.stud_model = UMLModel("""
+        @startuml
+        class Customer {
+            name: str
+            email: str
+        }
+        class Order {
+            orderId: int
+            +total(): float
+        }
+        enum Status {
+            OPEN
+            CLOSED
+        }
+        Customer "1" -- "*" Order
+        Order "*" -- "1" Status
+        @enduml
+        """)
+        self.eval_model = EvalModel(self.inst_model, self.stud_model)
+
+    def test_no_stage_runs_on_init(self):
+        self.assertEqual(self.eval_model.completed_stages, set())
+        self.assertNotIn("class_match_map", self.eval_model.__dict__)
+
+    def test_stage_runs_with_dependencies_only(self):
+        self.assertEqual(len(self.eval_model.class_match_map), 2)
+        self.assertEqual(self.eval_model.completed_stages, {"classes"})
+        self.assertEqual(len(self.eval_model.temp_all_att_matches), 3)
+        self.assertEqual(self.eval_model.completed_stages, {"classes", "class_content"})
+        self.assertNotIn("relation_match_map", self.eval_model.__dict__)
+
+    def test_relations_pull_in_classes_and_enums(self):
+        self.assertEqual(len(self.eval_model.relation_match_map), 2)
+        self.assertEqual(self.eval_model.completed_stages, {"classes", "enums", "relations"})
+
+    def test_str_views_are_lazy(self):
+        self.eval_model.run_all_stages()
+        self.assertEqual(self.eval_model.completed_stages, set(STAGE_DEPENDENCIES))
+        self.assertNotIn("class_match_map_str", self.eval_model.__dict__)
+        self.assertEqual(self.eval_model.class_match_map_str, {"UMLClass(Customer)": "UMLClass(Customer)", "UMLClass(Order)": "UMLClass(Order)"})
+        self.assertIn("class_match_map_str", self.eval_model.__dict__)
+        self.assertIn("Algorithm 5: Compare Relations", repr(self.eval_model))
+
+    def test_from_results_runs_no_stage(self):
+        restored = EvalModel.from_results(self.inst_model, self.stud_model, {"missing_classes": self.inst_model.class_list[:1]})
+        self.assertEqual(restored.completed_stages, set(STAGE_DEPENDENCIES))
+        self.assertEqual(restored.class_match_map, {})
+        self.assertEqual(restored.temp_missing_classes, self.inst_model.class_list[:1])
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.eval_model.not_a_result
+        with self.assertRaises(AttributeError):
+            self.eval_model.not_a_result_str
+        self.assertTrue(all(stage in STAGE_DEPENDENCIES for stage in FIELD_STAGES.values()))
+
+    def test_instrumented_stages(self):
+        self.assertIsNone(self.eval_model.metrics)
+        eval_model = EvalModel(self.inst_model, self.stud_model, instrument=True)
+        eval_model.run_all_stages()
+        self.assertEqual([span["name"] for span in eval_model.metrics.spans if span["depth"] == 0], list(STAGE_DEPENDENCIES))
+        self.assertGreater(eval_model.metrics.counters["syntactic_match"], 0)
+        self.assertGreater(eval_model.metrics.spans[0]["counters"]["syntactic_match"], 0)
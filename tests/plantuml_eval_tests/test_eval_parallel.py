@@ -0,0 +1,120 @@
+from plantuml_eval.eval_model import EvalModel, STAGE_DEPENDENCIES, RESULT_MAP_FIELDS, RESULT_LIST_FIELDS
+from plantuml_eval.eval_parallel import ParallelStages
+from main_eval.eval_handler import EvalHandler
+from tools.match_thresholds import RawScoreCache
+from UML_model.uml_model import UMLModel
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+INST_UML = """
+@startuml
+class Square {
+    file
+    rank
+}
+class Move
+class Position {
+    /check
+    /checkmate
+    executeMove()
+    capturePiece()
+}
+class Piece
+enum Color {
+    BLACK
+    WHITE
+}
+enum Type as "PieceType" {
+    PAWN
+    KING
+}
+Square "*" -- "*" Square
+(Square, Square) .. Move
+Position "*" -- "*" Piece
+Position " " -- "1" Color
+Move " " o-- "0..1" Type
+Piece " " o-- "1" Color
+@enduml
+"""
+
+STUD_UML = """
+@startuml
+class ChessPiece {
+    pieceColor
+}
+class Square {
+    file
+    rank
+}
+class Move {
+    fromSquare
+    toSquare
+}
+class Position {
+    turn
+    /check
+    /checkmate
+    executeMove(move)
+}
+enum PieceColor {
+    black
+    white
+}
+enum PieceType {
+    king
+    pawn
+}
+ChessPiece "1" -- "1" PieceColor: pieceColor
+Move "1" -- "1" Square: fromSquare
+Position "1" -- "64" Square: squares
+Position "1" -- "1" PieceColor: turn
+@enduml
+"""
+
+def results(eval_model: EvalModel):
+    return {field: getattr(eval_model, f"{field}_str") for field in RESULT_MAP_FIELDS + RESULT_LIST_FIELDS}
+
+def evidence(eval_model: EvalModel):
+    return [(str(item.inst_element), str(item.stud_element), item.fired, item.syntactic_score, item.semantic_score) for item in eval_model.evidence.evidence.values()]
+
+class TestParallelStages(unittest.TestCase):
+    def setUp(self):
+        self.inst_model = UMLModel(INST_UML)
+        self.stud_model = UMLModel(STUD_UML)
+
+    def test_lanes(self):
+        lanes, joins = ParallelStages.lanes(STAGE_DEPENDENCIES, set())
+        self.assertEqual(lanes, [["classes", "class_content", "class_split", "class_merge"], ["enums"]])
+        self.assertEqual(joins, ["relations"])
+        # with the classes done the relations only wait for the enums
+        lanes, joins = ParallelStages.lanes(STAGE_DEPENDENCIES, {"classes"})
+        self.assertEqual(lanes, [["class_content", "class_split", "class_merge"], ["enums", "relations"]])
+        self.assertEqual(joins, [])
+
+    def test_same_results_as_serial(self):
+        serial = EvalModel(self.inst_model, self.stud_model)
+        serial.run_all_stages()
+        parallel = EvalModel(self.inst_model, self.stud_model)
+        parallel.run_all_stages(workers=4)
+        self.assertEqual(parallel.completed_stages, set(STAGE_DEPENDENCIES))
+        self.assertEqual(results(parallel), results(serial))
+        self.assertEqual(evidence(parallel), evidence(serial))
+        self.assertEqual(EvalHandler(parallel).scores, EvalHandler(serial).scores)
+
+    def test_scorer_executor_and_active_cache(self):
+        serial = EvalModel(self.inst_model, self.stud_model)
+        serial.run_all_stages()
+        cache = RawScoreCache()
+        with RawScoreCache.activate(cache), ThreadPoolExecutor(max_workers=2) as executor:
+            parallel = EvalModel(self.inst_model, self.stud_model, instrument=True)
+            parallel.run_all_stages(executor=executor)
+        self.assertGreater(len(cache.syntactic), 0)
+        self.assertEqual(results(parallel), results(serial))
+        self.assertEqual(
+            sorted(span["name"] for span in parallel.metrics.spans if span["depth"] == 0),
+            sorted(list(STAGE_DEPENDENCIES) + ["prefetch_scores"])
+        )
+        self.assertTrue(all(span["parent"] is None or span["parent"] < i for i, span in enumerate(parallel.metrics.spans)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+from plantuml_eval.eval_relations import RelationComperator
+from UML_model.uml_model import UMLModel
+from UML_model.uml_class import UMLClass
+from UML_model.uml_relation import UMLRelation, UMLRelationType
+import unittest
+
+class TestRelationComperator(unittest.TestCase):
+    def setUp(self):
+        self.inst_model = UMLModel("""@startuml
+class Student
+class Course
+class Enrollment
+class Room
+Student "*" -- "*" Course
+Enrollment .. (Student, Course)
+Room "1" -- "*" Course
+@enduml""")
+        self.stud_model = UMLModel("""@startuml
+class Student
+class Course
+class Enrollment
+class Room
+Course "*" -- "1" Room
+Student "1" -- "*" Enrollment
+Course "1" -- "*" Enrollment
+@enduml""")
+        self.inst_classes = {cls.name: cls for cls in self.inst_model.class_list}
+        self.stud_classes = {cls.name: cls for cls in self.stud_model.class_list}
+        self.class_match_map = {cls: self.stud_classes[name] for name, cls in self.inst_classes.items()}
+
+    def test_pair_key_is_unordered(self):
+        a, b = UMLClass("A"), UMLClass("B")
+        self.assertEqual(RelationComperator.pair_key(a, b), RelationComperator.pair_key(b, a))
+        self.assertNotEqual(RelationComperator.pair_key(a, a), RelationComperator.pair_key(a, b))
+
+    def test_lookup_relation(self):
+        a, b, c = UMLClass("A"), UMLClass("B"), UMLClass("C")
+        rel_1 = UMLRelation(UMLRelationType.ASSOCIATION, a, b)
+        rel_2 = UMLRelation(UMLRelationType.ASSOCIATION, b, a, "*")
+        index = RelationComperator.index_relations([rel_1, rel_2, UMLRelation(UMLRelationType.ASSOCIATION, b, c)])
+        self.assertIs(RelationComperator.lookup_relation(index, b, a), rel_1)
+        self.assertIs(RelationComperator.lookup_relation(index, a, b, rel_1), rel_2)
+        self.assertIsNone(RelationComperator.lookup_relation(index, a, c))
+
+    def test_compare_relations(self):
+        result = RelationComperator.compare_relations(self.inst_model, self.stud_model, self.class_match_map, [], {}, [])
+        relation_match_map, inst_assoc_link_match_map = result[0], result[1]
+        room_course = next(rel for rel in self.inst_model.relation_list if rel.source is self.inst_classes["Room"])
+        # the student relation is stored with swapped ends
+        self.assertIs(relation_match_map[room_course].source, self.stud_classes["Room"])
+        self.assertEqual(relation_match_map[room_course].s_multiplicity, "1")
+
+        student_course = next(rel for rel in self.inst_model.relation_list if rel.source is self.inst_classes["Student"])
+        self.assertIn(student_course, result[5])
+        assoc_link = next(rel for rel in self.inst_model.relation_list if rel.type == UMLRelationType.ASSOCIATION_LINK)
+        rs_1, rs_2 = inst_assoc_link_match_map[assoc_link]
+        self.assertIs(rs_1.source, self.stud_classes["Student"])
+        self.assertIs(rs_2.source, self.stud_classes["Course"])
+
+    def test_derivations_through_several_intermediates(self):
+        # every path over an unmatched class is a derivation, as in the original second degree loops
+        inst_model = UMLModel("""@startuml
+class Student
+class Course
+class Enrollment
+class Grade
+Student "1" -- "*" Enrollment
+Enrollment "*" -- "1" Course
+Student "1" -- "*" Grade
+Grade "*" -- "1" Course
+@enduml""")
+        stud_model = UMLModel("""@startuml
+class Student
+class Course
+Student "*" -- "*" Course
+@enduml""")
+        inst_classes = {cls.name: cls for cls in inst_model.class_list}
+        stud_classes = {cls.name: cls for cls in stud_model.class_list}
+        class_match_map = {inst_classes[name]: stud_classes[name] for name in ["Student", "Course"]}
+        result = RelationComperator.compare_relations(inst_model, stud_model, class_match_map, [inst_classes["Enrollment"], inst_classes["Grade"]], {}, [])
+        sec_derivation_inst_map = result[3]
+        self.assertEqual(list(sec_derivation_inst_map), [tuple(inst_model.relation_list[0:2]), tuple(inst_model.relation_list[2:4])])
+        self.assertTrue(all(rs is stud_model.relation_list[0] for rs in sec_derivation_inst_map.values()))
+        self.assertEqual(result[6], [])
+
+        # the other way round the instructor relation keeps the path over the last unmatched class
+        result = RelationComperator.compare_relations(stud_model, inst_model, {cls: inst_classes[cls.name] for cls in stud_model.class_list}, [], {}, [])
+        self.assertEqual(result[4], {stud_model.relation_list[0]: tuple(inst_model.relation_list[2:4])})
+
+if __name__ == "__main__":
+    unittest.main()
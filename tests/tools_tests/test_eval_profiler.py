@@ -0,0 +1,77 @@
+from tools.eval_profiler import EvalProfiler, SamplingProfiler, REPO_ROOT, REPO_PACKAGES, DETERMINISTIC, SAMPLING
+from UML_model.uml_model import UMLModel
+import json
+import os
+import tempfile
+import unittest
+
+INST_UML = """
+@startuml
+class Customer {
+    name: str
+}
+class Order {
+    orderId: int
+}
+Customer "1" -- "*" Order
+@enduml
+"""
+
+STUD_UML = """
+@startuml
+class Client {
+    name: str
+}
+class Order {
+    id: int
+}
+Client "1" -- "*" Order
+@enduml
+"""
+
+class TestEvalProfiler(unittest.TestCase):
+    def test_function_key(self):
+        path = os.path.join(REPO_ROOT, "tools", "semantic_check.py")
+        self.assertEqual(EvalProfiler.function_key(path, 10, "semantic_match"), "tools/semantic_check.py:semantic_match")
+        self.assertEqual(EvalProfiler.function_key("~", 0, "<built-in method builtins.len>"), "<built-in method builtins.len>")
+        self.assertEqual(EvalProfiler.function_key("<frozen abc>", 1, "f"), "<frozen abc>:f")
+
+    def test_top_functions_and_merge(self):
+        total = {}
+        EvalProfiler.merge_rows(total, {"tools/a.py:f": {"function": "tools/a.py:f", "calls": 2, "self_s": 0.5, "cum_s": 1.0}})
+        EvalProfiler.merge_rows(total, {
+            "tools/a.py:f": {"function": "tools/a.py:f", "calls": 1, "self_s": 0.25, "cum_s": 0.5},
+            "numpy/core.py:g": {"function": "numpy/core.py:g", "calls": 5, "self_s": 2.0, "cum_s": 2.0}
+        })
+        self.assertEqual(total["tools/a.py:f"], {"function": "tools/a.py:f", "calls": 3, "self_s": 0.75, "cum_s": 1.5})
+        self.assertEqual([row["function"] for row in EvalProfiler.top_functions(total, 5)], ["numpy/core.py:g", "tools/a.py:f"])
+        self.assertEqual([row["function"] for row in EvalProfiler.top_functions(total, 5, packages=REPO_PACKAGES)], ["tools/a.py:f"])
+
+    def test_compare_reports(self):
+        old = {"top_self": [{"function": "tools/a.py:f", "self_s": 1.0}, {"function": "tools/b.py:g", "self_s": 1.0}]}
+        new = {"top_self": [{"function": "tools/a.py:f", "self_s": 1.5}, {"function": "tools/b.py:g", "self_s": 1.05}, {"function": "tools/c.py:h", "self_s": 0.2}]}
+        regressions = EvalProfiler.compare_reports(old, new)
+        self.assertEqual([regression["function"] for regression in regressions], ["tools/a.py:f", "tools/c.py:h"])
+        self.assertAlmostEqual(regressions[0]["delta_s"], 0.5)
+
+        # the full function lists are compared, not the top lists
+        old = {"top_self": [{"function": "tools/a.py:f", "self_s": 1.0}], "functions": [{"function": "tools/a.py:f", "self_s": 1.0}, {"function": "tools/b.py:g", "self_s": 0.5}, {"function": "tools/c.py:h", "self_s": 0.1}]}
+        new = {"top_self": [{"function": "tools/b.py:g", "self_s": 1.0}], "functions": [{"function": "tools/b.py:g", "self_s": 1.0}, {"function": "tools/a.py:f", "self_s": 1.0}, {"function": "tools/c.py:h", "self_s": 0.3}]}
+        regressions = EvalProfiler.compare_reports(old, new)
+        self.assertEqual([regression["function"] for regression in regressions], ["tools/b.py:g", "tools/c.py:h"])
+        self.assertAlmostEqual(regressions[0]["old_self_s"], 0.5)
+
+    def test_profile_batch(self):
+        inst_model = UMLModel(INST_UML)
+        modes = [DETERMINISTIC, SAMPLING] if SamplingProfiler.available() else [DETERMINISTIC]
+        for mode in modes:
+            with tempfile.TemporaryDirectory() as out_dir:
+                report = EvalProfiler.profile_batch(inst_model, [("first", UMLModel(STUD_UML)), ("second", UMLModel(STUD_UML))], None, out_dir, mode, top_n=5)
+                self.assertEqual([diagram["name"] for diagram in report["diagrams"]], ["first", "second"])
+                for diagram in report["diagrams"]:
+                    self.assertTrue(os.path.isfile(diagram["file"]))
+                self.assertLessEqual(len(report["top_self"]), 5)
+                self.assertEqual(report["top_self"], report["functions"][:len(report["top_self"])])
+                with open(os.path.join(out_dir, "report.json"), encoding="utf-8") as file:
+                    self.assertEqual(json.load(file)["mode"], mode)
+                self.assertTrue(os.path.isfile(os.path.join(out_dir, "report.txt")))
@@ -0,0 +1,62 @@
+from tools.instrumentation import EvalMetrics, Instrumentation
+from tools.syntactic_check import SyntacticCheck
+from UML_model.uml_class import UMLClass
+from UML_model.uml_relation import UMLRelation, UMLRelationType
+from UML_model.uml_model import UMLModel
+import json
+import unittest
+
+class TestInstrumentation(unittest.TestCase):
+    def test_off_by_default(self):
+        self.assertIsNone(Instrumentation.active())
+        # no metrics active, the hooks must not fail
+        Instrumentation.count("syntactic_match")
+        Instrumentation.observe("assignment_rows", 3)
+        with Instrumentation.record(None, "stage"):
+            SyntacticCheck.syntactic_match("Student", "Students")
+        self.assertIsNone(Instrumentation.active())
+
+    def test_counters_and_observations(self):
+        metrics = EvalMetrics()
+        with Instrumentation.activate(metrics):
+            SyntacticCheck.syntactic_match("Student", "Students")
+            SyntacticCheck.syntactic_match("Course", "Lecture")
+            Instrumentation.observe("assignment_rows", 3)
+            Instrumentation.observe("assignment_rows", 5)
+        self.assertIsNone(Instrumentation.active())
+        self.assertEqual(metrics.counters["syntactic_match"], 2)
+        self.assertEqual(metrics.observations["assignment_rows"], {"count": 2, "total": 8, "max": 5})
+
+    def test_nested_spans(self):
+        metrics = EvalMetrics()
+        with Instrumentation.record(metrics, "outer"):
+            SyntacticCheck.syntactic_match("Student", "Students")
+            with Instrumentation.record(metrics, "inner"):
+                SyntacticCheck.syntactic_match("Course", "Lecture")
+        outer, inner = metrics.spans
+        self.assertEqual((outer["name"], outer["depth"], outer["parent"]), ("outer", 0, None))
+        self.assertEqual((inner["name"], inner["depth"], inner["parent"]), ("inner", 1, 0))
+        self.assertEqual(outer["counters"]["syntactic_match"], 2)
+        self.assertEqual(inner["counters"]["syntactic_match"], 1)
+        self.assertGreaterEqual(outer["wall_s"], inner["wall_s"])
+        self.assertIn("cpu_s", inner)
+        self.assertEqual(set(metrics.stage_times()), {"outer", "inner"})
+
+    def test_reach_cache_counters(self):
+        a, b = UMLClass("ClassA"), UMLClass("ClassB")
+        model = UMLModel(class_list=[a, b], relation_list=[UMLRelation(UMLRelationType.ASSOCIATION, a, b)])
+        metrics = EvalMetrics()
+        with Instrumentation.activate(metrics):
+            model.graph_index.reachable(a)
+            model.graph_index.reachable(a)
+        self.assertEqual(metrics.counters["reach_cache_misses"], 1)
+        self.assertEqual(metrics.counters["reach_cache_hits"], 1)
+
+    def test_json_export(self):
+        metrics = EvalMetrics()
+        with Instrumentation.record(metrics, "classes"):
+            Instrumentation.count("semantic_match", 4)
+        exported = json.loads(metrics.to_json())
+        self.assertEqual(exported["counters"], {"semantic_match": 4})
+        self.assertEqual(exported["spans"][0]["name"], "classes")
+        self.assertEqual(exported["spans"][0]["counters"]["semantic_match"], 4)
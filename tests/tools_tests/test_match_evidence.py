@@ -0,0 +1,70 @@
+from tools.match_evidence import MatchEvidence, EvidenceStore, EvidenceCheck, SYNTACTIC
+from tools.instrumentation import EvalMetrics, Instrumentation
+from tools.content_check import ContentCheck
+from plantuml_eval.eval_model import EvalModel
+from main_eval.eval_semantics import SemanticsEvaluator
+from main_eval.eval_metrics import ScoringCriteria
+from UML_model.uml_model import UMLModel
+from UML_model.uml_class import UMLClass, UMLAttribute
+import unittest
+
+class TestMatchEvidence(unittest.TestCase):
+    def setUp(self):
+        self.person = UMLClass("Person", [UMLAttribute("name")])
+        self.stud_person = UMLClass("Person", [UMLAttribute("name")])
+        self.car = UMLClass("Car")
+
+    def test_syntactic_evidence(self):
+        evidence = MatchEvidence(self.person, self.stud_person)
+        self.assertTrue(evidence.check_names())
+        self.assertEqual(evidence.fired, SYNTACTIC)
+        self.assertEqual(evidence.syntactic_score, 1.0)
+        # the semantic check is not needed after a syntactic match
+        self.assertIsNone(evidence.semantic)
+
+    def test_semantic_components(self):
+        evidence = MatchEvidence(self.person, self.car)
+        evidence.check_names()
+        self.assertFalse(evidence.syntactic)
+        self.assertIsNotNone(evidence.semantic)
+        self.assertEqual(set(evidence.semantic_scores), {"wup", "lin", "w2v", "tra"})
+
+    def test_content_evidence(self):
+        evidence = MatchEvidence(self.person, self.stud_person)
+        self.assertTrue(evidence.check_content(ContentCheck.class_content_match))
+        self.assertEqual(evidence.content_score, 1.0)
+
+    def test_store_records_once(self):
+        store = EvidenceStore()
+        metrics = EvalMetrics()
+        with Instrumentation.activate(metrics):
+            self.assertEqual(store.name_match(self.person, self.car), store.name_match(self.person, self.car))
+        self.assertEqual(len(store), 1)
+        self.assertEqual(metrics.counters["semantic_match"], 1)
+        self.assertEqual(metrics.counters["evidence_hits"], 1)
+        self.assertIs(store.get(self.person, self.car).stud_element, self.car)
+        self.assertIsNone(store.get(self.car, self.person))
+
+    def test_check_records_only_when_active(self):
+        store = EvidenceStore()
+        EvidenceCheck.name_match(self.person, self.stud_person)
+        self.assertEqual(len(store), 0)
+        with EvidenceCheck.activate(store):
+            EvidenceCheck.name_match(self.person, self.stud_person)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.matches()[0].fired, SYNTACTIC)
+
+    def test_evaluators_reuse_evidence(self):
+        eval_model = EvalModel(UMLModel(class_list=[self.person, self.car]), UMLModel(class_list=[self.stud_person]), instrument=True)
+        eval_model.run_all_stages()
+        self.assertIsNotNone(eval_model.evidence.get(self.person, self.stud_person))
+        metrics = EvalMetrics()
+        with Instrumentation.activate(metrics):
+            SemanticsEvaluator.evaluate_cls_names(ScoringCriteria("Semantic Correctness", "SEC.CLS.NAM", "", 1.0), eval_model)
+            SemanticsEvaluator.evaluate_att_names(ScoringCriteria("Semantic Correctness", "SEC.ATT.NAM", "", 1.0), eval_model)
+        self.assertNotIn("syntactic_match", metrics.counters)
+        self.assertNotIn("semantic_match", metrics.counters)
+        self.assertNotIn("evidence_misses", metrics.counters)
+
+if __name__ == "__main__":
+    unittest.main()
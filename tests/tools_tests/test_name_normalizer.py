@@ -0,0 +1,51 @@
+from tools.name_normalizer import NameNormalizer, NormalizedName
+from tools.syntactic_check import SyntacticCheck
+from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation
+from UML_model.uml_enum import UMLValue
+from UML_model.uml_model import UMLModel
+import unittest
+
+class TestNameNormalizer(unittest.TestCase):
+    def test_split_identifier(self):
+        self.assertEqual(NameNormalizer.split_identifier("studentName"), "student name")
+        self.assertEqual(NameNormalizer.split_identifier("XMLParser"), "xml parser")
+        self.assertEqual(NameNormalizer.split_identifier("matr_nr2Id"), "matr nr2 id")
+        self.assertEqual(NameNormalizer.split_identifier("VALUE"), "value")
+
+    def test_normalized_forms(self):
+        norm = NameNormalizer.normalize(" StudentCourse ")
+        self.assertIsInstance(norm, NormalizedName)
+        self.assertEqual(norm.raw, " StudentCourse ")
+        self.assertEqual(norm.lower, "studentcourse")
+        self.assertEqual(norm.split, " student course ")
+        self.assertEqual(norm.tokens, ("student", "course"))
+        self.assertEqual(str(norm), " StudentCourse ")
+
+    def test_normalize_is_shared(self):
+        self.assertIs(NameNormalizer.normalize("Student"), NameNormalizer.normalize("Student"))
+        self.assertIs(UMLClass("Student").norm, UMLAttribute("Student").norm)
+
+    def test_elements_carry_norm(self):
+        cls = UMLClass("StudentCard", [UMLAttribute("cardId")], [UMLOperation("getOwner")])
+        self.assertEqual(cls.norm.lower, "studentcard")
+        self.assertEqual(cls.attributes[0].norm.split, "card id")
+        self.assertEqual(cls.operations[0].norm.tokens, ("get", "owner"))
+        self.assertEqual(UMLValue("WINTER_TERM").norm.split, "winter term")
+        self.assertIs(cls.find_attribute(NameNormalizer.normalize("CARDID")), cls.attributes[0])
+        self.assertIs(cls.find_operation(" getowner"), cls.operations[0])
+
+    def test_model_lookup_accepts_norm(self):
+        cls = UMLClass("StudentCard")
+        model = UMLModel(class_list=[cls])
+        self.assertIs(model.find_class(cls.norm), cls)
+        self.assertIs(model.find_element(" studentcard "), cls)
+
+    def test_forms_of_raw_strings(self):
+        self.assertEqual(NameNormalizer.lower_form(" Name "), "name")
+        self.assertEqual(NameNormalizer.split_form("firstName"), "first name")
+
+    def test_syntactic_match_accepts_norm(self):
+        self.assertEqual(
+            SyntacticCheck.syntactic_match(UMLClass("Student").norm, UMLClass("Students").norm),
+            SyntacticCheck.syntactic_match("Student", " students ")
+        )
@@ -0,0 +1,83 @@
+from tools.scoring_daemon import ScoringDaemon, ScoringClient, ScoringProtocol, SCORING_CLIENTS, SOCKET_ENV
+from tools.semantic_check import SemanticCheck
+from unittest import mock
+import numpy as np
+import os
+import socketserver
+import tempfile
+import threading
+import unittest
+
+PAIRS = [("square", "field"), ("piece color", "color"), ("execute move", "make move"), ("position", "board")]
+
+@unittest.skipUnless(hasattr(socketserver, "ThreadingUnixStreamServer"), "the scoring daemon needs Unix sockets")
+class TestScoringDaemon(unittest.TestCase):
+    def setUp(self):
+        self.out_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.out_dir.name, "scoring.sock")
+        self.daemon = ScoringDaemon(self.path)
+        self.daemon.bind()
+        self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.thread.start()
+        SCORING_CLIENTS.pop(self.path, None)
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            ScoringClient(self.path).stop()
+            self.thread.join(5)
+        SCORING_CLIENTS.pop(self.path, None)
+        self.out_dir.cleanup()
+
+    def test_scores_match_in_process(self):
+        client = ScoringClient(self.path)
+        self.assertEqual(client.ping()["requests"], 0)
+        components = client.score(PAIRS)
+        self.assertEqual(components, [SemanticCheck.local_components(*pair) for pair in PAIRS])
+        self.assertEqual(client.ping()["pairs"], len(PAIRS))
+        client.close()
+
+        with mock.patch.dict(os.environ, {SOCKET_ENV: self.path}):
+            self.assertIsNotNone(ScoringClient.active())
+            self.assertEqual(SemanticCheck.semantic_components_batch(PAIRS), components)
+            self.assertEqual(SemanticCheck.semantic_components(*PAIRS[0]), components[0])
+        self.assertEqual(self.daemon.pairs, 2 * len(PAIRS) + 1)
+
+    def test_fallback_without_daemon(self):
+        with mock.patch.dict(os.environ, {SOCKET_ENV: os.path.join(self.out_dir.name, "missing.sock")}):
+            self.assertIsNone(ScoringClient.active())
+            self.assertEqual(SemanticCheck.semantic_components(*PAIRS[0]), SemanticCheck.local_components(*PAIRS[0]))
+        with mock.patch.dict(os.environ, {SOCKET_ENV: ""}):
+            self.assertIsNone(ScoringProtocol.socket_path())
+            self.assertIsNone(ScoringClient.active())
+
+        # a daemon that stops is dropped and the scores are computed in process
+        with mock.patch.dict(os.environ, {SOCKET_ENV: self.path}):
+            client = ScoringClient.active()
+            self.assertIsNotNone(client)
+            ScoringClient(self.path).stop()
+            self.thread.join(5)
+            self.assertEqual(SemanticCheck.semantic_components(*PAIRS[1]), SemanticCheck.local_components(*PAIRS[1]))
+            self.assertIsNone(ScoringClient.active())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_untrusted_socket(self):
+        self.assertTrue(ScoringProtocol.trusted(self.path))
+        os.chmod(self.path, 0o666)
+        self.assertFalse(ScoringProtocol.trusted(self.path))
+        with mock.patch.dict(os.environ, {SOCKET_ENV: self.path}):
+            self.assertIsNone(ScoringClient.active())
+
+class TestScoringProtocol(unittest.TestCase):
+    def test_socket_path(self):
+        with tempfile.TemporaryDirectory() as runtime_dir, mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": runtime_dir}):
+            os.environ.pop(SOCKET_ENV, None)
+            self.assertEqual(ScoringProtocol.socket_path(), os.path.join(runtime_dir, "uml_scoring.sock"))
+
+    def test_numpy_scalars(self):
+        value = np.float32(0.1)
+        decoded = ScoringProtocol.unpack_ext(*ScoringProtocol.pack_default(value))
+        self.assertEqual(type(decoded), np.float32)
+        self.assertEqual(decoded, value)
+
+if __name__ == "__main__":
+    unittest.main()
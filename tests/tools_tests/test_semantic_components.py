@@ -0,0 +1,64 @@
+from tools.semantic_components import SemanticComponentStore, SemanticReweighting, SEMANTIC_WEIGHTS, SEMANTIC_COMPONENTS
+from tools.match_thresholds import RawScoreCache
+import numpy as np
+import os
+import tempfile
+import unittest
+
+def build_cache() -> RawScoreCache:
+    cache = RawScoreCache()
+    cache.semantic[("customer", "client")] = {"wup": 0.9, "lin": 0.8, "w2v": 0.7, "tra": 0.7}
+    cache.semantic[("order", "car")] = {"wup": 0.2, "lin": 0.1, "w2v": 0.2, "tra": 0.1}
+    # only matches if wup weighs more: 0.1 * 1.0 + 0.2 * 0.9 + 0.3 * 0.5 + 0.4 * 0.5 = 0.63
+    cache.semantic[("name", "title")] = {"wup": 1.0, "lin": 0.9, "w2v": 0.5, "tra": 0.5}
+    return cache
+
+class TestSemanticComponentStore(unittest.TestCase):
+    def setUp(self):
+        self.cache = build_cache()
+        self.store = SemanticComponentStore.from_cache(self.cache)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = os.path.join(out_dir, "components.npz")
+            self.store.save(path)
+            loaded = SemanticComponentStore.load(path)
+        self.assertEqual(loaded.pairs, self.store.pairs)
+        np.testing.assert_array_equal(loaded.components, self.store.components)
+
+        cache = RawScoreCache()
+        loaded.fill_cache(cache)
+        self.assertEqual(cache.semantic, self.cache.semantic)
+
+    def test_update(self):
+        cache = RawScoreCache()
+        cache.semantic[("order", "car")] = self.cache.semantic[("order", "car")]
+        cache.semantic[("price", "cost")] = {"wup": 0.8, "lin": 0.8, "w2v": 0.8, "tra": 0.8}
+        self.assertEqual(self.store.update(cache), 1)
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(self.store.components.shape, (4, len(SEMANTIC_COMPONENTS)))
+
+class TestSemanticReweighting(unittest.TestCase):
+    def setUp(self):
+        self.store = SemanticComponentStore.from_cache(build_cache())
+
+    def test_current_weights_do_not_flip(self):
+        result = SemanticReweighting.evaluate(self.store, [SEMANTIC_WEIGHTS], 0.65)[0]
+        self.assertEqual(result["flips"], 0)
+        self.assertEqual(result["matches"], 1)
+
+    def test_flips(self):
+        results = SemanticReweighting.evaluate(self.store, [{"wup": 0.4, "lin": 0.3, "w2v": 0.2, "tra": 0.1}, {"tra": 1.0}], 0.65)
+        self.assertEqual(results[0]["to_match"], 1)
+        self.assertEqual(results[0]["flipped_pairs"], [("name", "title")])
+        self.assertEqual(results[1]["flips"], 0)
+
+    def test_fit(self):
+        labels = {("customer", "client"): True, ("order", "car"): False, ("name", "title"): True}
+        fitted = SemanticReweighting.fit(self.store, labels, 0.65, step=0.25)
+        self.assertEqual(fitted["agreement"], 1.0)
+        self.assertAlmostEqual(sum(fitted["weights"].values()), 1.0)
+        self.assertEqual(fitted["weightings"], len(SemanticReweighting.simplex_weightings(0.25)))
+
+if __name__ == "__main__":
+    unittest.main()
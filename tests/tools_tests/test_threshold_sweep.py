@@ -0,0 +1,85 @@
+from tools.threshold_sweep import ThresholdSweep
+from tools.match_thresholds import MatchThresholds, RawScoreCache
+from tools.syntactic_check import SyntacticCheck
+from tools.instrumentation import EvalMetrics, Instrumentation
+from UML_model.uml_model import UMLModel
+from plantuml_eval.eval_model import EvalModel
+from main_eval.eval_handler import EvalHandler
+import csv
+import os
+import tempfile
+import unittest
+
+INST_UML = """
+@startuml
+class Customer {
+    name: str
+}
+class Order {
+    orderId: int
+}
+Customer "1" -- "*" Order
+@enduml
+"""
+
+STUD_UML = """
+@startuml
+class Client {
+    name: str
+}
+class Order {
+    id: int
+}
+Client "1" -- "*" Order
+@enduml
+"""
+
+class TestMatchThresholds(unittest.TestCase):
+    def test_grid(self):
+        grid = MatchThresholds.grid(semantic=[0.5, 0.6, 0.7], content=[0.4, 0.5])
+        self.assertEqual(len(grid), 6)
+        self.assertTrue(all(thresholds.syntactic == 0.6 for thresholds in grid))
+        self.assertEqual({(t.semantic, t.content) for t in grid}, {(s, c) for s in [0.5, 0.6, 0.7] for c in [0.4, 0.5]})
+
+    def test_active_thresholds(self):
+        self.assertTrue(SyntacticCheck.syntactic_match("order", "orders")[0])
+        with MatchThresholds.activate(MatchThresholds(syntactic=1.0)):
+            self.assertFalse(SyntacticCheck.syntactic_match("order", "orders")[0])
+            # an explicit threshold still wins
+            self.assertTrue(SyntacticCheck.syntactic_match("order", "orders", 0.6)[0])
+
+class TestThresholdSweep(unittest.TestCase):
+    def setUp(self):
+        self.inst_model = UMLModel(INST_UML)
+        self.stud_model = UMLModel(STUD_UML)
+
+    def test_default_matches_plain_run(self):
+        plain = EvalHandler(EvalModel(UMLModel(INST_UML), UMLModel(STUD_UML))).criteria_scores()
+        rows = ThresholdSweep.sweep(self.inst_model, self.stud_model, [MatchThresholds()])
+        self.assertEqual(rows[0]["scores"], plain)
+
+    def test_scores_computed_once(self):
+        grid = MatchThresholds.grid(semantic=[0.5, 0.65, 0.8])
+        cache = RawScoreCache()
+        ThresholdSweep.sweep(self.inst_model, self.stud_model, grid[:1], cache=cache)
+        self.assertGreater(len(cache.semantic), 0)
+        metrics = EvalMetrics()
+        with Instrumentation.activate(metrics):
+            rows = ThresholdSweep.sweep(self.inst_model, self.stud_model, grid, cache=cache)
+        self.assertEqual(len(rows), 3)
+        self.assertNotIn("semantic_match", metrics.counters)
+        self.assertGreater(metrics.counters["raw_score_hits"], 0)
+
+    def test_write_csv(self):
+        rows = ThresholdSweep.sweep_batch(self.inst_model, [("stud_1", self.stud_model)], MatchThresholds.grid(content=[0.4, 0.6]))
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = os.path.join(out_dir, "sweep.csv")
+            ThresholdSweep.write_csv(rows, path)
+            with open(path, encoding="utf-8") as file:
+                lines = list(csv.DictReader(file))
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["diagram"], "stud_1")
+        self.assertIn("CPT.CLS", lines[0])
+
+if __name__ == "__main__":
+    unittest.main()
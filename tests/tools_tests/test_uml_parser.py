@@ -1,4 +1,5 @@
-from tools.UML_parser import UMLParser
+from tools.UML_parser import UMLParser, ParseBudget, ParseAbortedError
+from UML_model.uml_model import UMLModel
 from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation, UMLVisibility, UMLDataType
 from UML_model.uml_enum import UMLEnum, UMLValue
 import unittest
@@ -432,4 +433,99 @@ class TestUMLParser(unittest.TestCase):
         result = UMLParser.parse_plantuml_enums(uml_text)
         self.assertEqual(result, expected)
 
-    # TODO: relation tests
\ No newline at end of file
+    # TODO: relation tests
+
+class TestParseBudget(unittest.TestCase):
+    def setUp(self):
+        self.uml_text = """
+        @startuml
+        class Student {
+            name: String
+            +enroll(course: Course): boolean
+        }
+        class Course
+        enum Semester {
+            WINTER
+            SUMMER
+        }
+        Student "*" -- "*" Course : attends
+        @enduml
+        """
+
+    def test_within_budget(self):
+        classes, enums, relations = UMLParser.parse_plantuml(self.uml_text, ParseBudget())
+        self.assertEqual(classes, UMLParser.parse_plantuml_classes(self.uml_text))
+        self.assertEqual(enums, UMLParser.parse_plantuml_enums(self.uml_text))
+        self.assertEqual(len(relations), 1)
+        model = UMLModel(self.uml_text, budget=ParseBudget())
+        self.assertFalse(model.parse_aborted)
+        self.assertEqual(len(model.class_list), 2)
+
+    def test_input_size_limit(self):
+        with self.assertRaises(ParseAbortedError) as context:
+            UMLParser.parse_plantuml(self.uml_text, ParseBudget(max_chars=20))
+        self.assertEqual(context.exception.reason, "chars")
+        self.assertEqual(context.exception.stage, "input")
+        with self.assertRaises(ParseAbortedError) as context:
+            UMLParser.parse_plantuml(self.uml_text, ParseBudget(max_lines=3))
+        self.assertEqual(context.exception.reason, "lines")
+
+    def test_member_limit(self):
+        body = "\n".join(f"attr{i}: int" for i in range(50))
+        uml_text = f"@startuml\nclass Huge {{\n{body}\n}}\n@enduml"
+        with self.assertRaises(ParseAbortedError) as context:
+            UMLParser.parse_plantuml(uml_text, ParseBudget(max_members=10))
+        self.assertEqual(context.exception.reason, "members")
+        self.assertEqual(context.exception.stage, "class Huge")
+        self.assertEqual(context.exception.value, 50)
+
+    def test_element_and_relation_limits(self):
+        uml_text = "\n".join(f"class Class{i}" for i in range(20))
+        with self.assertRaises(ParseAbortedError) as context:
+            UMLParser.parse_plantuml(uml_text, ParseBudget(max_elements=5))
+        self.assertEqual(context.exception.reason, "elements")
+        self.assertEqual(context.exception.stage, "classes")
+        # classes and enums within the limit on their own, but not together
+        elements = "\n".join([f"class Class{i}" for i in range(3)] + [f"enum Enum{i} {{\nA\n}}" for i in range(3)])
+        with self.assertRaises(ParseAbortedError) as context:
+            UMLParser.parse_plantuml(elements, ParseBudget(max_elements=5))
+        self.assertEqual((context.exception.reason, context.exception.stage, context.exception.value), ("elements", "elements", 6))
+        relations = "\n".join(f"Class{i} -- Class{i + 1}" for i in range(19))
+        with self.assertRaises(ParseAbortedError) as context:
+            UMLParser.parse_plantuml(f"{uml_text}\n{relations}", ParseBudget(max_relations=5))
+        self.assertEqual(context.exception.reason, "relations")
+
+    def test_time_limit(self):
+        with self.assertRaises(ParseAbortedError) as context:
+            UMLParser.parse_plantuml(self.uml_text, ParseBudget(max_seconds=0))
+        self.assertEqual(context.exception.reason, "time")
+
+    def test_model_records_aborted_parse(self):
+        with self.assertLogs("uml.model", level="WARNING"):
+            model = UMLModel(self.uml_text, budget=ParseBudget(max_chars=20))
+        self.assertTrue(model.parse_aborted)
+        self.assertEqual(model.element_list, [])
+        result = model.parse_error.to_dict()
+        self.assertEqual(result["status"], "parse aborted")
+        self.assertEqual(result["reason"], "chars")
+        self.assertEqual(result["limit"], 20)
+        self.assertEqual(result["value"], len(self.uml_text))
+
+    def test_no_budget_is_unbounded(self):
+        body = "\n".join(f"attr{i}: int" for i in range(50))
+        uml_text = f"@startuml\nclass Huge {{\n{body}\n}}\n@enduml"
+        classes, _, _ = UMLParser.parse_plantuml(uml_text)
+        self.assertEqual(len(classes[0].attributes), 50)
+        # the limits are opt-in, a model is parsed without them by default
+        uml_text = "\n".join(f"class Class{i}" for i in range(ParseBudget().max_elements + 1))
+        model = UMLModel(uml_text)
+        self.assertFalse(model.parse_aborted)
+        self.assertEqual(len(model.class_list), ParseBudget().max_elements + 1)
+
+    def test_shared_budget_is_not_changed(self):
+        budget = ParseBudget(max_seconds=5.0)
+        UMLParser.parse_plantuml(self.uml_text, budget)
+        self.assertIsNone(budget.deadline)
+        started = budget.started()
+        self.assertIsNot(started, budget)
+        self.assertIsNotNone(started.deadline)
@@ -0,0 +1,111 @@
+from tools.UML_serializer import UMLSerializer
+from UML_model.uml_model import UMLModel
+from UML_model.uml_class import UMLClass
+from UML_model.uml_relation import UMLRelationType
+import unittest
+import os
+import tempfile
+import time
+
+class TestUMLSerializer(unittest.TestCase):
+    def setUp(self):
+        self.uml_text = """
+        @startuml
+        class Student {
+            +name: String
+            -matrNr: int = 0
+            /age: int
+            +enroll(course: Course): boolean
+        }
+        class Course {
+            title: String
+            +getCredits(): int
+        }
+        class Enrollment {
+            grade: float
+        }
+        enum Semester {
+            WINTER
+            SUMMER
+        }
+        Student "1..*" -- "0..*" Course : attends
+        Enrollment .. (Student, Course)
+        Course "*" -- "1" Semester
+        @enduml
+        """
+        self.model = UMLModel(self.uml_text)
+
+    def assert_models_equal(self, original: UMLModel, restored: UMLModel):
+        self.assertEqual([cls.to_plantuml() for cls in original.class_list], [cls.to_plantuml() for cls in restored.class_list])
+        self.assertEqual([enm.to_plantuml() for enm in original.enum_list], [enm.to_plantuml() for enm in restored.enum_list])
+        self.assertEqual([repr(rel) for rel in original.relation_list], [repr(rel) for rel in restored.relation_list])
+        self.assertEqual(original.to_plantuml(), restored.to_plantuml())
+
+    def test_round_trip(self):
+        restored = UMLSerializer.loads_model(UMLSerializer.dumps_model(self.model))
+        self.assert_models_equal(self.model, restored)
+        student = restored.find_class("Student")
+        self.assertIs(student.find_attribute("name").reference, student)
+        self.assertEqual(student.find_operation("enroll").params, self.model.find_class("Student").find_operation("enroll").params)
+        self.assertIs(restored.find_enum("Semester").values[0].reference, restored.find_enum("Semester"))
+        self.assertEqual(len(student.relations), len(self.model.find_class("Student").relations))
+
+    def test_association_link(self):
+        restored = UMLSerializer.loads_model(UMLSerializer.dumps_model(self.model))
+        self.assertEqual(len(restored.association_link_list), 1)
+        link = restored.association_link_list[0]
+        self.assertIs(link.source, restored.find_class("Enrollment"))
+        # the link points to the restored relation object and not to a copy
+        self.assertIn(link.destination, restored.relation_list)
+        self.assertTrue(any(link.destination is rel for rel in restored.relation_list))
+        self.assertEqual(link.destination.type, UMLRelationType.ASSOCIATION)
+
+    def test_link_before_target(self):
+        # association links that are listed before their target relation are resolved as well
+        relation_list = self.model.relation_list[::-1]
+        model = UMLModel(plantuml_str=None, class_list=self.model.class_list, enum_list=self.model.enum_list, relation_list=relation_list)
+        restored = UMLSerializer.loads_model(UMLSerializer.dumps_model(model))
+        self.assertEqual([repr(rel) for rel in relation_list], [repr(rel) for rel in restored.relation_list])
+        self.assertTrue(any(restored.relation_list[0].destination is rel for rel in restored.relation_list))
+
+    def test_generalization_round_trip(self):
+        base = UMLClass("Person")
+        sub = UMLClass("Teacher")
+        base.add_sub_class(sub)
+        model = UMLModel(plantuml_str=None, class_list=[base, sub])
+        restored = UMLSerializer.loads_model(UMLSerializer.dumps_model(model))
+        self.assertIs(restored.find_class("Teacher").super_class, restored.find_class("Person"))
+        self.assertEqual(restored.find_class("Person").sub_classes, [restored.find_class("Teacher")])
+
+    def test_empty_model(self):
+        restored = UMLSerializer.loads_model(UMLSerializer.dumps_model(UMLModel()))
+        self.assertEqual(restored.element_list, [])
+
+    def test_unsupported_version(self):
+        tables = UMLSerializer.model_to_tables(self.model)
+        tables["version"] = -1
+        with self.assertRaises(ValueError):
+            UMLSerializer.model_from_tables(tables)
+
+    def test_dump_and_load_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".umlpack", delete=False) as tmp:
+            path = tmp.name
+        try:
+            UMLSerializer.dump_model(self.model, path)
+            restored = UMLSerializer.load_model(path)
+        finally:
+            os.remove(path)
+        self.assert_models_equal(self.model, restored)
+
+    def test_loading_is_faster_than_parsing(self):
+        data = UMLSerializer.dumps_model(self.model)
+        runs = 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            UMLModel(self.uml_text)
+        parse_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(runs):
+            UMLSerializer.loads_model(data)
+        load_time = time.perf_counter() - start
+        self.assertLess(load_time, parse_time)
@@ -0,0 +1,89 @@
+from tools.UML_stream_parser import UMLStreamParser, UMLDiagramBlock
+from UML_model.uml_model import UMLModel
+import unittest
+import io
+import os
+import tempfile
+
+class TestUMLStreamParser(unittest.TestCase):
+    def setUp(self):
+        self.diagram_1 = "@startuml\nclass Alpha {\nname\n}\nclass Beta\nAlpha -- Beta\n@enduml"
+        self.diagram_2 = "@startuml\nenum Color {\nRED\nGREEN\n}\n@enduml"
+        self.text = f"some LLM answer\n```plantuml\n{self.diagram_1}\n```\nand a second one:\n{self.diagram_2}\ntrailing text\n"
+
+    def test_iter_blocks_from_string(self):
+        blocks = list(UMLStreamParser.iter_blocks_from_string(self.text))
+        self.assertEqual(len(blocks), 2)
+        self.assertIsInstance(blocks[0], UMLDiagramBlock)
+        self.assertEqual(blocks[0].index, 0)
+        self.assertEqual(blocks[0].text, self.diagram_1)
+        self.assertEqual(blocks[1].index, 1)
+        self.assertEqual(blocks[1].text, self.diagram_2)
+        self.assertTrue(all(block.terminated for block in blocks))
+
+    def test_block_offsets_and_lines(self):
+        blocks = list(UMLStreamParser.iter_blocks_from_string(self.text))
+        for block in blocks:
+            self.assertEqual(self.text[block.start_offset:block.end_offset], block.text)
+        self.assertEqual(blocks[0].start_line, 3)
+        self.assertEqual(blocks[0].end_line, 9)
+        self.assertEqual(blocks[1].start_line, 12)
+        self.assertEqual(blocks[1].end_line, 17)
+
+    def test_no_blocks(self):
+        self.assertEqual(list(UMLStreamParser.iter_blocks_from_string("")), [])
+        self.assertEqual(list(UMLStreamParser.iter_blocks_from_string("class A\nclass B\n")), [])
+
+    def test_single_line_block(self):
+        text = "prefix @startuml class A @enduml suffix\n"
+        blocks = list(UMLStreamParser.iter_blocks_from_string(text))
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0].text, "@startuml class A @enduml")
+        self.assertEqual(text[blocks[0].start_offset:blocks[0].end_offset], blocks[0].text)
+
+    def test_block_starting_after_enduml(self):
+        text = "@startuml\nclass A\n@enduml @startuml\nclass B\n@enduml\n@startuml class C @enduml @startuml class D @enduml @startuml\nclass E\n@enduml\n"
+        blocks = list(UMLStreamParser.iter_blocks_from_string(text))
+        self.assertEqual([block.text for block in blocks], [
+            "@startuml\nclass A\n@enduml", "@startuml\nclass B\n@enduml", "@startuml class C @enduml", "@startuml class D @enduml", "@startuml\nclass E\n@enduml"
+        ])
+        self.assertEqual([block.start_line for block in blocks], [1, 3, 6, 6, 6])
+        self.assertTrue(all(block.terminated for block in blocks))
+        for block in blocks:
+            self.assertEqual(text[block.start_offset:block.end_offset], block.text)
+
+    def test_unterminated_blocks(self):
+        text = "@startuml\nclass A\n@startuml\nclass B\n@enduml\n@startuml\nclass C\n"
+        blocks = list(UMLStreamParser.iter_blocks_from_string(text))
+        self.assertEqual(len(blocks), 3)
+        self.assertFalse(blocks[0].terminated)
+        self.assertEqual(blocks[0].text, "@startuml\nclass A\n")
+        self.assertTrue(blocks[1].terminated)
+        self.assertEqual(blocks[1].text, "@startuml\nclass B\n@enduml")
+        self.assertFalse(blocks[2].terminated)
+        self.assertEqual(blocks[2].text, "@startuml\nclass C\n")
+
+    def test_iter_blocks_is_lazy(self):
+        stream = io.StringIO(self.text)
+        blocks = UMLStreamParser.iter_blocks(stream)
+        first = next(blocks)
+        self.assertEqual(first.index, 0)
+        # the stream is only consumed up to the end of the first block
+        self.assertLess(stream.tell(), len(self.text))
+
+    def test_iter_models_from_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".puml", delete=False, encoding="utf-8") as tmp:
+            tmp.write(self.text)
+            path = tmp.name
+        try:
+            results = list(UMLStreamParser.iter_models(path))
+        finally:
+            os.remove(path)
+        self.assertEqual(len(results), 2)
+        block_1, model_1 = results[0]
+        block_2, model_2 = results[1]
+        self.assertIsInstance(model_1, UMLModel)
+        self.assertEqual([cls.name for cls in model_1.class_list], ["Alpha", "Beta"])
+        self.assertEqual(len(model_1.relation_list), 1)
+        self.assertEqual([enm.name for enm in model_2.enum_list], ["Color"])
+        self.assertEqual(block_2.index, 1)
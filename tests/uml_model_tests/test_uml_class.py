@@ -152,6 +152,11 @@ class TestUMLAttribute(unittest.TestCase):
 
         self.assertNotEqual(uml_attribute1, uml_operation)
 
+    def test_uml_attribute_slots(self):
+        self.assertFalse(hasattr(self.full_attribute, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.full_attribute.unknown = True
+
 class UMLOperationTest(unittest.TestCase):
     def setUp(self):
         self.empty_operation = UMLOperation(name="testOperationEmpty")
@@ -160,6 +165,11 @@ class UMLOperationTest(unittest.TestCase):
         self.no_return_operation = UMLOperation(name="testOperationNoReturn", params={"param1": UMLDataType.INT}, visibility=UMLVisibility.PROTECTED)
         self.no_visibility_operation = UMLOperation(name="testOperationNoVisibility", params={"param1": UMLDataType.INT}, return_types=[UMLDataType.VOID])
 
+    def test_uml_operation_slots(self):
+        self.assertFalse(hasattr(self.full_operation, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.full_operation.unknown = True
+
     def test_uml_operation_initialization_empty(self):
         # Test initialization with basic attributes
         uml_operation = UMLOperation(name="testOperation")
@@ -8,6 +8,12 @@ class TestUMLValue(unittest.TestCase):
         value = UMLValue("WHITE")
         self.assertEqual(value.name, "WHITE")
 
+    def test_uml_value_slots(self):
+        value = UMLValue("WHITE")
+        self.assertFalse(hasattr(value, "__dict__"))
+        with self.assertRaises(AttributeError):
+            value.unknown = True
+
     def test__uml_value_repr(self):
         value = UMLValue("WHITE")
         self.assertEqual(repr(value), "UMLValue(WHITE)")
@@ -0,0 +1,120 @@
+from UML_model.uml_model import UMLModel
+from UML_model.uml_graph_index import UMLGraphIndex
+from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation
+from UML_model.uml_enum import UMLEnum
+from UML_model.uml_relation import UMLRelation, UMLRelationType
+import unittest
+
+class TestUMLGraphIndex(unittest.TestCase):
+    def setUp(self):
+        self.a = UMLClass("ClassA")
+        self.b = UMLClass("ClassB")
+        self.c = UMLClass("ClassC")
+        self.d = UMLClass("ClassD")
+        self.lonely = UMLClass("Lonely")
+        self.color = UMLEnum("Color")
+        self.ab = UMLRelation(UMLRelationType.ASSOCIATION, self.a, self.b, "1", "*")
+        self.bc = UMLRelation(UMLRelationType.COMPOSITION, self.b, self.c)
+        self.cd = UMLRelation(UMLRelationType.AGGREGATION, self.c, self.d)
+        self.d_color = UMLRelation(UMLRelationType.ASSOCIATION, self.d, self.color)
+        self.dd = UMLRelation(UMLRelationType.COMPOSITION, self.d, self.d)
+        self.link = UMLRelation(UMLRelationType.ASSOCIATION_LINK, self.c, self.ab)
+        self.model = UMLModel(
+            class_list=[self.a, self.b, self.c, self.d, self.lonely],
+            enum_list=[self.color],
+            relation_list=[self.ab, self.bc, self.cd, self.d_color, self.dd, self.link]
+        )
+        self.index = self.model.graph_index
+
+    def test_index_is_built_once(self):
+        self.assertIsInstance(self.index, UMLGraphIndex)
+        self.assertIs(self.model.graph_index, self.index)
+
+    def test_relation_ends_match_class(self):
+        for cls in self.model.class_list:
+            self.assertEqual(self.index.relation_ends(cls), cls.get_relation_ends())
+        self.assertEqual(self.index.relation_ends(UMLClass("NotInModel")), [])
+
+    def test_neighbors_by_type(self):
+        self.assertEqual(self.index.neighbors(self.b, UMLRelationType.ASSOCIATION), [self.a])
+        self.assertEqual(self.index.neighbors(self.b, UMLRelationType.COMPOSITION), [self.c])
+        self.assertEqual(self.index.neighbors(self.c, UMLRelationType.ASSOCIATION_LINK), [self.ab])
+        self.assertEqual(self.index.relations(self.a, UMLRelationType.ASSOCIATION)[0].d_multiplicity, "*")
+        self.assertEqual(self.index.neighbors(self.lonely), [])
+
+    def test_degree(self):
+        self.assertEqual(self.index.degree(self.b), 2)
+        # directed relations only count for their source
+        self.assertEqual(self.index.degree(self.d), 2)
+        self.assertEqual(self.index.degree(self.c), 2)
+        self.assertEqual(self.index.degree(self.d, UMLRelationType.COMPOSITION), 1)
+        self.assertEqual(self.index.degree(self.lonely), 0)
+
+    def test_k_hop_reachability(self):
+        self.assertEqual(self.index.reachable(self.a, 1), [self.b])
+        self.assertEqual(self.index.reachable(self.a, 2), [self.b, self.c])
+        self.assertEqual(self.index.reachable(self.a), [self.b, self.c, self.d, self.color])
+        # directed relations are only followed from source to destination
+        self.assertEqual(self.index.reachable(self.c), [self.d, self.color])
+        # undirected relations are followed in both directions
+        self.assertEqual(self.index.reachable(self.color), [self.d])
+        self.assertEqual(self.index.reachable(self.lonely), [])
+
+    def test_self_relation(self):
+        self.assertIn(self.d, self.index.reachable(self.d))
+        self.assertNotIn(self.a, self.index.reachable(self.a))
+        self.assertIn(id(self.d), self.index.reachable_ids(self.d))
+
+    def test_reachable_is_memoized(self):
+        self.assertIs(self.index.reachable(self.a, 2), self.index.reachable(self.a, 2))
+
+    def test_build_reachability_map(self):
+        reach_map = self.model.build_reachability_map()
+        self.assertEqual(len(reach_map), 6)
+        self.assertEqual(set(reach_map[self.b]), {self.a, self.c, self.d, self.color})
+
+class TestUMLInheritanceIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = UMLClass("Root", [UMLAttribute("rootId")], [UMLOperation("describe")])
+        self.middle = UMLClass("Middle", [UMLAttribute("level")])
+        self.parent = UMLClass("Parent", [UMLAttribute("name")])
+        self.leaf = UMLClass("Leaf", [UMLAttribute("leafName")])
+        self.other = UMLClass("Other", [UMLAttribute("rootId")])
+        self.model = UMLModel(
+            class_list=[self.root, self.middle, self.parent, self.leaf, self.other],
+            relation_list=[
+                UMLRelation(UMLRelationType.GENERALIZATION, self.leaf, self.parent),
+                UMLRelation(UMLRelationType.GENERALIZATION, self.parent, self.middle),
+                UMLRelation(UMLRelationType.GENERALIZATION, self.middle, self.root)
+            ]
+        )
+        self.index = self.model.graph_index
+
+    def test_ancestors_full_depth(self):
+        self.assertEqual(self.index.ancestors(self.leaf), [self.parent, self.middle, self.root])
+        self.assertEqual(self.index.ancestors(self.middle), [self.root])
+        self.assertEqual(self.index.ancestors(self.root), [])
+        self.assertTrue(self.index.is_ancestor(self.root, self.leaf))
+        self.assertFalse(self.index.is_ancestor(self.leaf, self.root))
+        self.assertFalse(self.index.is_ancestor(self.other, self.leaf))
+
+    def test_ancestors_are_memoized(self):
+        self.assertIs(self.index.ancestors(self.leaf), self.index.ancestors(self.leaf))
+        self.assertIs(self.index.inherited_member_ids(self.leaf), self.index.inherited_member_ids(self.leaf))
+
+    def test_inherited_members(self):
+        self.assertTrue(self.index.inherits(self.leaf, self.root.attributes[0]))
+        self.assertTrue(self.index.inherits(self.leaf, self.root.operations[0]))
+        self.assertTrue(self.index.inherits(self.leaf, self.middle.attributes[0]))
+        self.assertFalse(self.index.inherits(self.leaf, self.leaf.attributes[0]))
+        # equal attribute of an unrelated class is not inherited
+        self.assertFalse(self.index.inherits(self.leaf, self.other.attributes[0]))
+
+    def test_cyclic_hierarchy_terminates(self):
+        a = UMLClass("CycleA")
+        b = UMLClass("CycleB")
+        a.assign_super_class(b)
+        b.assign_super_class(a)
+        index = UMLGraphIndex([a, b], [], [])
+        self.assertEqual(index.ancestors(a), [b])
+        self.assertEqual(index.ancestors(b), [a])
@@ -27,6 +27,11 @@ class TestUMLRelation(unittest.TestCase):
         self.assertFalse(relation.directed)
         self.assertIsInstance(relation, UMLElement)
 
+    def test_uml_relation_slots(self):
+        self.assertFalse(hasattr(self.relation, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.relation.unknown = True
+
     def test_uml_relation_init_full_not_directed(self):
         relation = UMLRelation(type=UMLRelationType.AGGREGATION, source=self.source, destination=self.destination, s_multiplicity="1", d_multiplicity="0..*")
         self.assertEqual(relation.type, UMLRelationType.AGGREGATION)
@@ -4,19 +4,110 @@ from UML_model.uml_enum import UMLEnum, UMLValue
 from UML_model.uml_element import UMLElement
 from tools.syntactic_check import SyntacticCheck
 
-import re
+import copy
 import regex
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Tuple, Any
 import logging 
 
 logger = logging.getLogger("uml.parser")
 logger.setLevel(logging.INFO)
 ERROR_FLAG = "--error--"
+REGEX_TIMEOUT = 10
+
+class ParseAbortedError(Exception):
+    # NOTE: raised when a diagram exceeds its ParseBudget, the model keeps it as structured parse result
+    def __init__(self, reason: str, stage: str, limit: Any, value: Any):
+        self.reason: str = reason
+        self.stage: str = stage
+        self.limit: Any = limit
+        self.value: Any = value
+        super().__init__(f"parse aborted during '{stage}': {reason} limit {limit} exceeded ({value})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"status": "parse aborted", "reason": self.reason, "stage": self.stage, "limit": self.limit, "value": self.value}
+
+class ParseBudget:
+    # NOTE: opt-in limits for parsing a single diagram, None disables the respective limit
+    def __init__(self, max_seconds: Optional[float] = 30.0, max_chars: Optional[int] = 200_000, max_lines: Optional[int] = 10_000, max_elements: Optional[int] = 500, max_members: Optional[int] = 500, max_relations: Optional[int] = 2_000):
+        self.max_seconds: Optional[float] = max_seconds
+        self.max_chars: Optional[int] = max_chars
+        self.max_lines: Optional[int] = max_lines
+        self.max_elements: Optional[int] = max_elements
+        self.max_members: Optional[int] = max_members
+        self.max_relations: Optional[int] = max_relations
+        self.deadline: Optional[float] = None
+
+    def __repr__(self):
+        return f"ParseBudget(seconds={self.max_seconds}, chars={self.max_chars}, lines={self.max_lines}, elements={self.max_elements}, members={self.max_members}, relations={self.max_relations})"
+
+    def started(self) -> 'ParseBudget':
+        # NOTE: a copy whose wall-clock limit counts from here, the budget itself is not changed so one budget
+        # can be shared by several diagrams and threads
+        budget = copy.copy(self)
+        budget.deadline = time.monotonic() + self.max_seconds if self.max_seconds is not None else None
+        return budget
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def regex_timeout(self) -> float:
+        if self.deadline is None:
+            return REGEX_TIMEOUT
+        return max(min(REGEX_TIMEOUT, self.deadline - time.monotonic()), 0.001)
+
+    def check_time(self, stage: str):
+        if self.expired():
+            raise ParseAbortedError("time", stage, self.max_seconds, f"{self.max_seconds + time.monotonic() - self.deadline:.3f}s")
+
+    def check_count(self, reason: str, stage: str, count: int, limit: Optional[int]):
+        if limit is not None and count > limit:
+            raise ParseAbortedError(reason, stage, limit, count)
+
+    def check_input(self, uml_text: str):
+        self.check_count("chars", "input", len(uml_text), self.max_chars)
+        if self.max_lines is not None:
+            self.check_count("lines", "input", uml_text.count("\n") + 1, self.max_lines)
 
 class UMLParser:
+    @staticmethod
+    def regex_timeout(budget: Optional[ParseBudget] = None) -> float:
+        return budget.regex_timeout() if budget is not None else REGEX_TIMEOUT
+
+    @staticmethod
+    def iter_matches(pattern: regex.Pattern, uml_text: str, stage: str, budget: Optional[ParseBudget] = None):
+        # NOTE: without a budget the patterns run over the whole text unbounded
+        if budget is None:
+            yield from pattern.finditer(uml_text)
+            return
+        pos = 0
+        while pos <= len(uml_text):
+            budget.check_time(stage)
+            try:
+                match = pattern.search(uml_text, pos, timeout = budget.regex_timeout())
+            except regex.TimeoutError:
+                raise ParseAbortedError("time", stage, budget.max_seconds, f"at offset {pos}")
+            if not match:
+                return
+            yield match
+            pos = match.end() if match.end() > match.start() else match.end() + 1
+
+    @staticmethod
+    def parse_plantuml(uml_text: str, budget: Optional[ParseBudget] = None) -> Tuple[List[UMLClass], List[UMLEnum], List[UMLRelation]]:
+        # raises ParseAbortedError as soon as the diagram exceeds the budget
+        if budget is not None:
+            budget = budget.started()
+            budget.check_input(uml_text)
+        classes = UMLParser.parse_plantuml_classes(uml_text, budget)
+        enums = UMLParser.parse_plantuml_enums(uml_text, budget)
+        if budget is not None:
+            budget.check_count("elements", "elements", len(classes) + len(enums), budget.max_elements)
+        relations = UMLParser.parse_plantuml_relations(uml_text, classes, enums, budget)
+        return classes, enums, relations
+
     #TODO: syntax wrong visibility
     @staticmethod
-    def parse_attribute(line: str) -> Optional[UMLAttribute]:
+    def parse_attribute(line: str, budget: Optional[ParseBudget] = None) -> Optional[UMLAttribute]:
         if not line or line.strip() == "":
             return None
 
@@ -25,8 +116,10 @@ class UMLParser:
         )
 
         try:
-            match = attr_pattern.match(line, timeout = 10)  
+            match = attr_pattern.match(line, timeout = UMLParser.regex_timeout(budget))  
         except regex.TimeoutError:
+            if budget is not None and budget.expired():
+                raise ParseAbortedError("time", "attribute", budget.max_seconds, line[:50])
             raise ValueError(f"Regex timeout while parsing attribute line: '{line}'")
 
         if not match:
@@ -65,14 +158,16 @@ class UMLParser:
         return UMLAttribute(name=name, data_type=datatype, initial=initial, visibility=visibility, derived=derived, multiplicity=multiplicity)
 
     @staticmethod
-    def parse_operation(line: str) -> UMLOperation:
+    def parse_operation(line: str, budget: Optional[ParseBudget] = None) -> UMLOperation:
         operation_pattern = regex.compile(
             r'^(?P<visibility>[+#\-~])?\s*(?P<name>\w+)?\s*\((?P<params>[^)]*)\)\s*(?::\s*(?P<return_type>[\w<>, ]+))?$'
         )
 
         try:
-            match = operation_pattern.match(line, timeout = 10)
+            match = operation_pattern.match(line, timeout = UMLParser.regex_timeout(budget))
         except regex.TimeoutError:
+            if budget is not None and budget.expired():
+                raise ParseAbortedError("time", "operation", budget.max_seconds, line[:50])
             raise ValueError(f"Regex timeout while parsing operation line: '{line}'")
 
         if not match:
@@ -121,59 +216,67 @@ class UMLParser:
         return UMLOperation(name=name, params=params, return_types=return_types, visibility=visibility)
 
     @staticmethod
-    def parse_plantuml_classes(uml_text: str) -> List[UMLClass]:
-        class_pattern = re.compile(
+    def parse_plantuml_classes(uml_text: str, budget: Optional[ParseBudget] = None) -> List[UMLClass]:
+        class_pattern = regex.compile(
             r'class\s+(?P<name>\w+)?(?:\s+[aA][sS]\s+"[^"]*")?\s*(?:\{\s*(?P<body>[^}]*)\})?',
-            re.MULTILINE | re.DOTALL
+            regex.MULTILINE | regex.DOTALL
         )
         classes = []
 
-        for match in class_pattern.finditer(uml_text):
+        for match in UMLParser.iter_matches(class_pattern, uml_text, "classes", budget):
             name = match.group("name") or ""
             if name.strip() == "":
                 logger.warning(f"Class name not specified, setting to '{ERROR_FLAG}'.")
                 name = ERROR_FLAG
             body = match.group("body") or ""
             lines = [line.strip() for line in body.strip().splitlines() if line.strip()]
+            if budget is not None:
+                budget.check_count("members", f"class {name}", len(lines), budget.max_members)
             attributes = []
             for line in lines:
                 if "(" not in line and ")" not in line:
-                    attr = UMLParser.parse_attribute(line)
+                    attr = UMLParser.parse_attribute(line, budget)
                     if attr is not None:
                         attributes.append(attr)
-            operations = [UMLParser.parse_operation(line) for line in lines if "(" in line and ")" in line]
+            operations = [UMLParser.parse_operation(line, budget) for line in lines if "(" in line and ")" in line]
             classes.append(UMLClass(name, attributes, operations))
+            if budget is not None:
+                budget.check_count("elements", "classes", len(classes), budget.max_elements)
 
         return classes
     
     @staticmethod
-    def parse_plantuml_enums(uml_text: str) -> List[UMLEnum]:
-        enum_pattern = re.compile(
+    def parse_plantuml_enums(uml_text: str, budget: Optional[ParseBudget] = None) -> List[UMLEnum]:
+        enum_pattern = regex.compile(
             r'enum\s+(?P<name>\w+)?(?:\s+[aA][sS]\s+"[^"]*")?\s*(?:\{\s*(?P<body>[^}]*)\})?',
-            re.MULTILINE | re.DOTALL
+            regex.MULTILINE | regex.DOTALL
         )
         enums = []
 
-        for match in enum_pattern.finditer(uml_text):
+        for match in UMLParser.iter_matches(enum_pattern, uml_text, "enums", budget):
             name = match.group("name") or ""
             if name.strip() == "":
                 logger.warning(f"Enum name not specified, setting to '{ERROR_FLAG}'.")
                 name = ERROR_FLAG
             body = match.group("body") or ""
             lines = [line.strip() for line in body.strip().splitlines() if line.strip()]
+            if budget is not None:
+                budget.check_count("members", f"enum {name}", len(lines), budget.max_members)
             values = [UMLValue(line) if "  " not in line else UMLValue(ERROR_FLAG) for line in lines]
             enums.append(UMLEnum(name, values)) 
+            if budget is not None:
+                budget.check_count("elements", "enums", len(enums), budget.max_elements)
 
         return enums
     
     @staticmethod
-    def parse_relation_left_to_right(uml_text: str, element_lookup: Dict[str, UMLElement], relations: List[UMLRelation]):
+    def parse_relation_left_to_right(uml_text: str, element_lookup: Dict[str, UMLElement], relations: List[UMLRelation], budget: Optional[ParseBudget] = None):
         #1.1) A "m1" -> "m2" B : desc
         # Only match relations that occur within a single line (no multiline matches)
-        bin_pattern = re.compile(
+        bin_pattern = regex.compile(
             r'(?P<a>\w\w+)\s*(?:"(?P<m1>[^"]*)")?\s*(?P<type>-+[o\*\|\<\>]{0,2})\s*(?:"(?P<m2>[^"]*)")?\s*(?P<b>\w+)(?:\s*:\s*(?P<desc>.*))?'
         )
-        for match in bin_pattern.finditer(uml_text.strip()):
+        for match in UMLParser.iter_matches(bin_pattern, uml_text.strip(), "relations", budget):
             a = match.group("a")
             b = match.group("b")
             m1 = match.group("m1") or ""
@@ -204,17 +307,19 @@ class UMLParser:
                 )
                 if relation not in relations:
                     relations.append(relation)
+                    if budget is not None:
+                        budget.check_count("relations", "relations", len(relations), budget.max_relations)
             else:
                 #NOTE: maybe later create classes if not found since this works in PlantUML
                 logger.warning(f"relation between '{a}' and '{b}' could not be created, as one of the elements was not found.")
 
     @staticmethod
-    def parse_relation_right_to_left(uml_text: str, element_lookup: Dict[str, UMLElement], relations: List[UMLRelation]):
+    def parse_relation_right_to_left(uml_text: str, element_lookup: Dict[str, UMLElement], relations: List[UMLRelation], budget: Optional[ParseBudget] = None):
         # 1.2) A "m1" <- "m2" B : desc
-        bin_pattern = re.compile(
+        bin_pattern = regex.compile(
             r'(?P<a>\w+)\s*(?:"(?P<m1>[^"]*)")?\s*(?P<type>[o\*\|\<\>]{1,2}-+)\s*(?:"(?P<m2>[^"]*)")?\s*(?P<b>\w+)(?:\s*:\s*(?P<desc>.*))?'
         )
-        for match in bin_pattern.finditer(uml_text):
+        for match in UMLParser.iter_matches(bin_pattern, uml_text, "relations", budget):
             a = match.group("a")
             b = match.group("b")
             m1 = match.group("m1") or ""
@@ -246,14 +351,16 @@ class UMLParser:
                 )
                 if relation not in relations:
                     relations.append(relation)
+                    if budget is not None:
+                        budget.check_count("relations", "relations", len(relations), budget.max_relations)
             else:
                 logger.warning(f"relation between '{a}' and '{b}' could not be created, as one of the elements was not found.")
 
     @staticmethod 
-    def parse_asso_class_left_to_right(uml_text: str, element_lookup: Dict[str, UMLElement], relations: List[UMLRelation]):
+    def parse_asso_class_left_to_right(uml_text: str, element_lookup: Dict[str, UMLElement], relations: List[UMLRelation], budget: Optional[ParseBudget] = None):
         # 2.1) C .. (A, B)
-        assoc_pattern_1 = re.compile(r'(\w+)\s*\.+\s*\(\s*(\w+)\s*,\s*(\w+)\s*\)')
-        for match in assoc_pattern_1.finditer(uml_text):
+        assoc_pattern_1 = regex.compile(r'(\w+)\s*\.+\s*\(\s*(\w+)\s*,\s*(\w+)\s*\)')
+        for match in UMLParser.iter_matches(assoc_pattern_1, uml_text, "association classes", budget):
             raw_c, raw_a, raw_b = match.groups()
             a = raw_a
             b = raw_b
@@ -267,15 +374,17 @@ class UMLParser:
                 relation = UMLRelation(type = UMLRelationType.ASSOCIATION_LINK, source = element_lookup[c], destination = rel)
                 if relation not in relations:
                     relations.append(relation)
+                    if budget is not None:
+                        budget.check_count("relations", "relations", len(relations), budget.max_relations)
             else:
                 # NOTE: maybe later create classes if not found
                 logger.warning(f"relation between '{a}', '{b}' and '{c}' could not be created, as one of the elements was not found.")
 
     @staticmethod
-    def parse_asso_class_right_to_left(uml_text: str, element_lookup: Dict[str, UMLElement], relations: List[UMLRelation]):
+    def parse_asso_class_right_to_left(uml_text: str, element_lookup: Dict[str, UMLElement], relations: List[UMLRelation], budget: Optional[ParseBudget] = None):
         # 2.2) (A, B) .. C
-        assoc_pattern_2 = re.compile(r'\(\s*(\w+)\s*,\s*(\w+)\s*\)\s*\.+\s*(\w+)')
-        for match in assoc_pattern_2.finditer(uml_text):
+        assoc_pattern_2 = regex.compile(r'\(\s*(\w+)\s*,\s*(\w+)\s*\)\s*\.+\s*(\w+)')
+        for match in UMLParser.iter_matches(assoc_pattern_2, uml_text, "association classes", budget):
             raw_a, raw_b, raw_c = match.groups()
             a = raw_a
             b = raw_b
@@ -289,12 +398,14 @@ class UMLParser:
                 relation = UMLRelation(type = UMLRelationType.ASSOCIATION_LINK, source = element_lookup[c], destination = rel)
                 if relation not in relations:
                     relations.append(relation)
+                    if budget is not None:
+                        budget.check_count("relations", "relations", len(relations), budget.max_relations)
             else:
                 # NOTE: maybe later create classes if not found
                 logger.warning(f"relation between '{a}', '{b}' and '{c}' could not be created, as one of the elements was not found.")
 
     @staticmethod
-    def parse_plantuml_relations(uml_text: str, classes: List[UMLClass], enums: List[UMLEnum]) -> List[UMLRelation]:
+    def parse_plantuml_relations(uml_text: str, classes: List[UMLClass], enums: List[UMLEnum], budget: Optional[ParseBudget] = None) -> List[UMLRelation]:
         relations: List[UMLRelation] = []
         class_lookup: Dict[str, UMLClass] = {cls.name: cls for cls in classes}
         enum_lookup: Dict[str, UMLEnum] = {enu.name: enu for enu in enums}
@@ -304,16 +415,16 @@ class UMLParser:
         # 1.1) ->
         # 1.1.1) A m1 -> m2 B
         # 1.1.2) A -> B
-        UMLParser.parse_relation_left_to_right(uml_text, element_lookup, relations)
+        UMLParser.parse_relation_left_to_right(uml_text, element_lookup, relations, budget)
         
         # 1.2) <-
         # 1.2.1) A m1 <- m2 B
         # 1.2.2) A <- B
-        UMLParser.parse_relation_right_to_left(uml_text, element_lookup, relations)
+        UMLParser.parse_relation_right_to_left(uml_text, element_lookup, relations, budget)
         
         # 2.) association class
         # 2.1) C .. (A, B)
-        UMLParser.parse_asso_class_left_to_right(uml_text, element_lookup, relations)
+        UMLParser.parse_asso_class_left_to_right(uml_text, element_lookup, relations, budget)
         # 2.2) (A, B) .. C
-        UMLParser.parse_asso_class_right_to_left(uml_text, element_lookup, relations)
+        UMLParser.parse_asso_class_right_to_left(uml_text, element_lookup, relations, budget)
         return relations
\ No newline at end of file
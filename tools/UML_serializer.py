@@ -0,0 +1,126 @@
+from UML_model.uml_model import UMLModel
+from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation, UMLDataType, UMLVisibility
+from UML_model.uml_enum import UMLEnum, UMLValue
+from UML_model.uml_relation import UMLRelation, UMLRelationType
+
+from typing import Any, Dict, List, Optional
+import msgpack
+import logging
+
+logger = logging.getLogger("uml.serializer")
+logger.setLevel(logging.INFO)
+
+FORMAT_VERSION = 1
+
+class UMLSerializer:
+    # NOTE: models are stored as ID-linked tables, an element id is the index into model.element_list
+    # (classes, then enums, then relations), content ids are the indices into the attribute/operation/value lists
+    @staticmethod
+    def model_to_tables(model: UMLModel) -> Dict[str, Any]:
+        element_ids: Dict[int, int] = {id(elm): idx for idx, elm in enumerate(model.element_list)}
+        class_ids: Dict[int, int] = {id(cls): idx for idx, cls in enumerate(model.class_list)}
+        enum_ids: Dict[int, int] = {id(enm): idx for idx, enm in enumerate(model.enum_list)}
+
+        attributes = [
+            [class_ids[id(cls)], att.name, att.data_type.value, att.initial, att.visibility.value, att.derived, att.multiplicity]
+            for cls in model.class_list for att in cls.attributes
+        ]
+        operations = [
+            [class_ids[id(cls)], opr.name, [[param, dtype.value] for param, dtype in opr.params.items()], [rtype.value for rtype in opr.return_types], opr.visibility.value]
+            for cls in model.class_list for opr in cls.operations
+        ]
+        values = [[enum_ids[id(enm)], val.name] for enm in model.enum_list for val in enm.values]
+        relations = []
+        for rel in model.relation_list:
+            source = element_ids.get(id(rel.source))
+            destination = element_ids.get(id(rel.destination))
+            if source is None or destination is None:
+                raise ValueError(f"relation {rel} references an element that is not part of the model")
+            relations.append([rel.type.value, source, destination, rel.s_multiplicity, rel.d_multiplicity, rel.description])
+        # NOTE: generalizations that were assigned directly and not through a relation
+        generalizations = [
+            [class_ids[id(cls)], class_ids[id(cls.super_class)]]
+            for cls in model.class_list if cls.super_class is not None and id(cls.super_class) in class_ids
+        ]
+
+        return {
+            "version": FORMAT_VERSION,
+            "classes": [cls.name for cls in model.class_list],
+            "attributes": attributes,
+            "operations": operations,
+            "enums": [enm.name for enm in model.enum_list],
+            "values": values,
+            "relations": relations,
+            "generalizations": generalizations,
+        }
+
+    @staticmethod
+    def model_from_tables(tables: Dict[str, Any]) -> UMLModel:
+        version = tables.get("version")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported model format version: {version}")
+
+        class_list = [UMLClass(name) for name in tables["classes"]]
+        for cls_id, name, data_type, initial, visibility, derived, multiplicity in tables["attributes"]:
+            class_list[cls_id].attributes.append(UMLAttribute(name, UMLDataType(data_type), initial, UMLVisibility(visibility), derived, multiplicity))
+        for cls_id, name, params, return_types, visibility in tables["operations"]:
+            class_list[cls_id].operations.append(UMLOperation(name, {param: UMLDataType(dtype) for param, dtype in params}, [UMLDataType(rtype) for rtype in return_types], UMLVisibility(visibility)))
+        for cls in class_list:
+            cls.assign_content_reference()
+
+        enum_list = [UMLEnum(name) for name in tables["enums"]]
+        for enm_id, name in tables["values"]:
+            enum_list[enm_id].values.append(UMLValue(name))
+        for enm in enum_list:
+            enm.assign_content_reference()
+
+        offset = len(class_list) + len(enum_list)
+        elements: List[Any] = class_list + enum_list
+        rows = tables["relations"]
+        relation_list: List[Optional[UMLRelation]] = [None] * len(rows)
+
+        def build_relation(rel_id: int, pending: set) -> UMLRelation:
+            # NOTE: association links point to another relation, which may appear later in the table
+            if relation_list[rel_id] is not None:
+                return relation_list[rel_id]
+            if rel_id in pending:
+                raise ValueError(f"cyclic relation reference in relation {rel_id}")
+            pending.add(rel_id)
+            rel_type, source, destination, s_multiplicity, d_multiplicity, description = rows[rel_id]
+            relation = UMLRelation(UMLRelationType(rel_type), resolve(source, pending), resolve(destination, pending), s_multiplicity, d_multiplicity, description)
+            relation_list[rel_id] = relation
+            return relation
+
+        def resolve(elm_id: int, pending: set):
+            if elm_id < offset:
+                return elements[elm_id]
+            return build_relation(elm_id - offset, pending)
+
+        for rel_id in range(len(rows)):
+            build_relation(rel_id, set())
+
+        model = UMLModel(plantuml_str=None, class_list=class_list, enum_list=enum_list, relation_list=relation_list)
+        for sub_id, super_id in tables.get("generalizations", []):
+            sub_class, super_class = class_list[sub_id], class_list[super_id]
+            if sub_class.super_class is None:
+                sub_class.assign_super_class(super_class)
+            super_class.add_sub_class(sub_class)
+        return model
+
+    @staticmethod
+    def dumps_model(model: UMLModel) -> bytes:
+        return msgpack.packb(UMLSerializer.model_to_tables(model), use_bin_type=True)
+
+    @staticmethod
+    def loads_model(data: bytes) -> UMLModel:
+        return UMLSerializer.model_from_tables(msgpack.unpackb(data, raw=False, strict_map_key=False))
+
+    @staticmethod
+    def dump_model(model: UMLModel, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(UMLSerializer.dumps_model(model))
+
+    @staticmethod
+    def load_model(path: str) -> UMLModel:
+        with open(path, "rb") as file:
+            return UMLSerializer.loads_model(file.read())
@@ -0,0 +1,109 @@
+from UML_model.uml_model import UMLModel
+from tools.UML_parser import ParseBudget
+
+from typing import Iterator, List, Optional, TextIO, Tuple, Union
+import io
+import logging
+
+logger = logging.getLogger("uml.stream_parser")
+logger.setLevel(logging.INFO)
+
+START_TAG = "@startuml"
+END_TAG = "@enduml"
+
+class UMLDiagramBlock:
+    # NOTE: offsets are character offsets into the decoded text, lines are 1-based
+    def __init__(self, index: int, text: str, start_offset: int, end_offset: int, start_line: int, end_line: int, terminated: bool = True):
+        self.index: int = index
+        self.text: str = text
+        self.start_offset: int = start_offset
+        self.end_offset: int = end_offset
+        self.start_line: int = start_line
+        self.end_line: int = end_line
+        # NOTE: False if the input ended before the matching @enduml (e.g. truncated LLM output)
+        self.terminated: bool = terminated
+
+    def __repr__(self):
+        return f"UMLDiagramBlock({self.index}): lines {self.start_line}-{self.end_line}, offsets {self.start_offset}-{self.end_offset}{'' if self.terminated else ', unterminated'}"
+
+    def __str__(self):
+        return f"UMLDiagramBlock({self.index})"
+
+    def to_model(self, budget: Optional[ParseBudget] = None) -> UMLModel:
+        return UMLModel(self.text, budget=budget)
+
+class UMLStreamParser:
+    @staticmethod
+    def iter_blocks(source: Union[str, TextIO], encoding: str = "utf-8") -> Iterator[UMLDiagramBlock]:
+        # reads the source line by line and only buffers the lines of the current diagram block
+        # source is either a path or an open text stream
+        if isinstance(source, str):
+            with open(source, encoding=encoding) as stream:
+                yield from UMLStreamParser._iter_stream_blocks(stream)
+        else:
+            yield from UMLStreamParser._iter_stream_blocks(source)
+
+    @staticmethod
+    def iter_blocks_from_string(uml_text: str) -> Iterator[UMLDiagramBlock]:
+        yield from UMLStreamParser._iter_stream_blocks(io.StringIO(uml_text))
+
+    @staticmethod
+    def iter_models(source: Union[str, TextIO], encoding: str = "utf-8", budget: Optional[ParseBudget] = None) -> Iterator[Tuple[UMLDiagramBlock, UMLModel]]:
+        # lazily parses one UMLModel per diagram block, the budget applies to each block separately
+        for block in UMLStreamParser.iter_blocks(source, encoding):
+            yield block, block.to_model(budget)
+
+    @staticmethod
+    def _iter_stream_blocks(stream: TextIO) -> Iterator[UMLDiagramBlock]:
+        index = 0
+        offset = 0
+        line_no = 0
+        # NOTE: buffer is None while we are outside of a diagram block
+        buffer: Optional[List[str]] = None
+        start_offset = 0
+        start_line = 0
+
+        for line in stream:
+            line_no += 1
+            line_start = offset
+            offset += len(line)
+
+            # NOTE: position in the line from which a new block can start, the rest of a line after @enduml is scanned as well
+            pos = 0
+            if buffer is not None:
+                end_pos = line.find(END_TAG)
+                if end_pos != -1:
+                    buffer.append(line[:end_pos + len(END_TAG)])
+                    yield UMLDiagramBlock(index, "".join(buffer), start_offset, line_start + end_pos + len(END_TAG), start_line, line_no)
+                    index += 1
+                    buffer = None
+                    pos = end_pos + len(END_TAG)
+                elif START_TAG not in line:
+                    buffer.append(line)
+                    continue
+                else:
+                    # a new block starts before the previous one was closed
+                    logger.warning(f"diagram block {index} starting in line {start_line} is not terminated before line {line_no}")
+                    yield UMLDiagramBlock(index, "".join(buffer), start_offset, line_start, start_line, line_no - 1, terminated=False)
+                    index += 1
+                    buffer = None
+
+            while True:
+                column = line.find(START_TAG, pos)
+                if column == -1:
+                    break
+                # NOTE: text in front of @startuml (e.g. a markdown fence) is not part of the block
+                start_offset = line_start + column
+                start_line = line_no
+                end_pos = line.find(END_TAG, column + len(START_TAG))
+                if end_pos == -1:
+                    buffer = [line[column:]]
+                    break
+                # single line diagram
+                yield UMLDiagramBlock(index, line[column:end_pos + len(END_TAG)], start_offset, line_start + end_pos + len(END_TAG), start_line, line_no)
+                index += 1
+                pos = end_pos + len(END_TAG)
+
+        if buffer is not None:
+            logger.warning(f"diagram block {index} starting in line {start_line} is not terminated")
+            yield UMLDiagramBlock(index, "".join(buffer), start_offset, offset, start_line, line_no, terminated=False)
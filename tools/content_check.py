@@ -1,9 +1,10 @@
 from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation
 from UML_model.uml_enum import UMLEnum, UMLValue
-from tools.semantic_check import SemanticCheck
-from tools.syntactic_check import SyntacticCheck
+from UML_model.uml_graph_index import UMLGraphIndex
+from tools.match_evidence import EvidenceCheck
+from tools.match_thresholds import MatchThresholds
 
-from typing import Tuple, Dict, Union, List
+from typing import Tuple, Dict, Union, List, Optional
 import logging
 
 logger = logging.getLogger("content_check")
@@ -26,7 +27,7 @@ class ContentCheck:
 
         for inst_att in inst_class.attributes:
             for stud_att in stud_class.attributes:
-                if SyntacticCheck.syntactic_match(inst_att.name, stud_att.name)[0] or SemanticCheck.semantic_match(inst_att.name, stud_att.name)[0]:
+                if EvidenceCheck.name_match(inst_att, stud_att):
                     match_count += 1
                     break
 
@@ -42,13 +43,15 @@ class ContentCheck:
 
         for inst_opr in inst_class.operations:
             for stud_opr in stud_class.operations:
-                if SyntacticCheck.syntactic_match(inst_opr.name, stud_opr.name)[0] or SemanticCheck.semantic_match(inst_opr.name, stud_opr.name)[0]:
+                if EvidenceCheck.name_match(inst_opr, stud_opr):
                     match_count += 1
                     break
         return match_count
 
     @staticmethod
-    def class_content_match(inst_class: UMLClass, stud_class: UMLClass, threshold: float = 0.5) -> Tuple[bool, float]:
+    def class_content_match(inst_class: UMLClass, stud_class: UMLClass, threshold: Optional[float] = None) -> Tuple[bool, float]:
+        if threshold is None:
+            threshold = MatchThresholds.active().content
         total = len(inst_class.attributes) + len(inst_class.operations)
         if total == 0:
             return (False, 0)
@@ -64,7 +67,7 @@ class ContentCheck:
         return (similarity >= threshold, similarity)
     
     @staticmethod
-    def classes_have_same_properties(inst_class: UMLClass, stud_class_1: UMLClass, stud_class_2: UMLClass, attr_match_map: Dict[UMLAttribute, UMLAttribute], inherited_attr_map: Dict[UMLAttribute, UMLAttribute], misplaced_attr_map: Dict[UMLAttribute, UMLAttribute], oper_matched_map: Dict[UMLOperation, UMLOperation], inherited_oper_map: Dict[UMLOperation, UMLOperation], misplaced_oper_map: Dict[UMLOperation, UMLOperation]) -> bool:
+    def classes_have_same_properties(inst_class: UMLClass, stud_class_1: UMLClass, stud_class_2: UMLClass, attr_match_map: Dict[UMLAttribute, UMLAttribute], inherited_attr_map: Dict[UMLAttribute, UMLAttribute], misplaced_attr_map: Dict[UMLAttribute, UMLAttribute], oper_matched_map: Dict[UMLOperation, UMLOperation], inherited_oper_map: Dict[UMLOperation, UMLOperation], misplaced_oper_map: Dict[UMLOperation, UMLOperation], stud_graph: Optional[UMLGraphIndex] = None) -> bool:
         """
         Check if the instructor class has the same properties as the two student classes.
         This means that the instructor class has attributes and operations that are mapped to the student classes.
@@ -72,6 +75,9 @@ class ContentCheck:
         This could be extended later if needed.
         """
 
+        # NOTE: inherited members are resolved on demand from super_class, so an empty index is enough for standalone calls
+        if stud_graph is None:
+            stud_graph = UMLGraphIndex([], [], [])
         logger.debug(f"Comparing instructor class {str(inst_class)} with student classes {str(stud_class_1)} and {str(stud_class_2)} for same properties")
         # all instructor attributes that are mapped to any student attribute
         mapped_inst_attributes = {att for att in inst_class.attributes if att in attr_match_map.keys() or att in inherited_attr_map or att in misplaced_attr_map.keys()}
@@ -90,14 +96,14 @@ class ContentCheck:
             if att in attr_match_map.values() or att in misplaced_attr_map.values()
         } | {
             att for att in inherited_attr_map.values() 
-            if stud_class_1.super_class and (att in stud_class_1.super_class.attributes or (stud_class_1.super_class.super_class and att in stud_class_1.super_class.super_class.attributes))
+            if stud_graph.inherits(stud_class_1, att)
         }
         mapped_stud_attributes_2 = {
             att for att in stud_class_2.attributes 
             if att in attr_match_map.values() or att in misplaced_attr_map.values()
         } | {
             att for att in inherited_attr_map.values() 
-            if stud_class_2.super_class and (att in stud_class_2.super_class.attributes or (stud_class_2.super_class.super_class and att in stud_class_2.super_class.super_class.attributes))
+            if stud_graph.inherits(stud_class_2, att)
         }
 
         # all student operations that are mapped to any instructor operation
@@ -106,14 +112,14 @@ class ContentCheck:
             if opr in oper_matched_map.values() or opr in misplaced_oper_map.values()
         } | {
             opr for opr in inherited_oper_map.values() 
-            if stud_class_1.super_class and (opr in stud_class_1.super_class.operations or (stud_class_1.super_class.super_class and opr in stud_class_1.super_class.super_class.operations))
+            if stud_graph.inherits(stud_class_1, opr)
         }
         mapped_stud_operations_2 = {
                 opr for opr in stud_class_2.operations 
                 if opr in oper_matched_map.values() or opr in misplaced_oper_map.values()
             } | {
             opr for opr in inherited_oper_map.values() 
-            if stud_class_2.super_class and (opr in stud_class_2.super_class.operations or (stud_class_2.super_class.super_class and opr in stud_class_2.super_class.super_class.operations))
+            if stud_graph.inherits(stud_class_2, opr)
         }
 
         if (not mapped_stud_attributes_1 and not mapped_stud_operations_1) or (not mapped_stud_attributes_2 and not mapped_stud_operations_2):
@@ -173,7 +179,9 @@ class ContentCheck:
                 
     
     @staticmethod
-    def enum_content_match(inst_enum: UMLEnum, stud_enum: UMLEnum, threshold: float = 0.5) -> Tuple[bool, float]:
+    def enum_content_match(inst_enum: UMLEnum, stud_enum: UMLEnum, threshold: Optional[float] = None) -> Tuple[bool, float]:
+        if threshold is None:
+            threshold = MatchThresholds.active().content
         total = len(inst_enum.values)
         if total == 0:
             return (False, 0)
@@ -182,7 +190,7 @@ class ContentCheck:
 
         for inst_value in inst_enum.values:
             for stud_value in stud_enum.values:
-                if SyntacticCheck.syntactic_match(inst_value.name, stud_value.name)[0] or SemanticCheck.semantic_match(inst_value.name, stud_value.name)[0]:
+                if EvidenceCheck.name_match(inst_value, stud_value):
                     match_count += 1
                     break
 
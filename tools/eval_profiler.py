@@ -0,0 +1,223 @@
+from UML_model.uml_model import UMLModel
+from grading.grade_metamodel import GradeModel
+# NOTE: imported on module level so loading the semantic models is not part of the first profile
+from plantuml_eval.eval_model import EvalModel
+from main_eval.eval_handler import EvalHandler
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import cProfile
+import json
+import logging
+import os
+import pstats
+import signal
+import threading
+import time
+
+logger = logging.getLogger("eval_profiler")
+logger.setLevel(logging.DEBUG)
+
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] - %(name)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+DETERMINISTIC = "deterministic"
+SAMPLING = "sampling"
+PROFILE_MODES: List[str] = [DETERMINISTIC, SAMPLING]
+
+# NOTE: function keys are relative to the repository root so reports of different checkouts can be compared
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_PACKAGES: List[str] = ["plantuml_eval", "tools", "UML_model", "main_eval", "grading"]
+
+class SamplingProfiler:
+    # NOTE: samples the call stack of the main thread on a CPU timer signal, only available on Unix
+    def __init__(self, interval: float = 0.001):
+        self.interval: float = interval
+        self.samples: Counter = Counter()
+        self.previous_handler = None
+
+    @staticmethod
+    def available() -> bool:
+        return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    def sample(self, signum, frame) -> None:
+        stack: List[Tuple[str, int, str]] = []
+        while frame is not None:
+            stack.append((frame.f_code.co_filename, frame.f_code.co_firstlineno, frame.f_code.co_name))
+            frame = frame.f_back
+        self.samples[tuple(reversed(stack))] += 1
+
+    def enable(self) -> None:
+        self.previous_handler = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def disable(self) -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self.previous_handler or signal.SIG_DFL)
+
+    def function_rows(self) -> Dict[str, Dict[str, Any]]:
+        rows: Dict[str, Dict[str, Any]] = {}
+        for stack, count in self.samples.items():
+            for position, (filename, lineno, funcname) in enumerate(stack):
+                key = EvalProfiler.function_key(filename, lineno, funcname)
+                row = rows.setdefault(key, {"function": key, "calls": None, "self_s": 0.0, "cum_s": 0.0, "last_stack": None})
+                # NOTE: recursive functions are counted once per sample for the cumulative time
+                if row["last_stack"] is not stack:
+                    row["cum_s"] += count * self.interval
+                    row["last_stack"] = stack
+                if position == len(stack) - 1:
+                    row["self_s"] += count * self.interval
+        for row in rows.values():
+            del row["last_stack"]
+        return rows
+
+    def write_folded(self, path: str) -> None:
+        # collapsed stacks, one "frame;frame;frame count" line per stack (flame graph input)
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.samples.most_common():
+                frames = ";".join(EvalProfiler.function_key(*entry) for entry in stack)
+                file.write(f"{frames} {count}\n")
+
+class EvalProfiler:
+    @staticmethod
+    def function_key(filename: str, lineno: int, funcname: str) -> str:
+        if filename == "~":
+            # built-in functions
+            return funcname
+        if filename.startswith("<"):
+            # frozen modules and generated code
+            return f"{filename}:{funcname}"
+        path = os.path.abspath(filename)
+        if path.startswith(REPO_ROOT + os.sep):
+            path = os.path.relpath(path, REPO_ROOT)
+        elif "site-packages" in path:
+            path = path.split("site-packages" + os.sep, 1)[1]
+        return f"{path.replace(os.sep, '/')}:{funcname}"
+
+    @staticmethod
+    def evaluate(inst_model: UMLModel, stud_model: UMLModel, grade_model: Optional[GradeModel] = None) -> EvalHandler:
+        eval_model = EvalModel(inst_model, stud_model, grade_model)
+        eval_model.run_all_stages()
+        return EvalHandler(eval_model)
+
+    @staticmethod
+    def profile_diagram(name: str, inst_model: UMLModel, stud_model: UMLModel, grade_model: Optional[GradeModel], out_dir: str, mode: str = DETERMINISTIC, interval: float = 0.001) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        # runs one evaluation under the profiler and writes <name>.prof (deterministic) or <name>.folded (sampling)
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        if mode == SAMPLING and not SamplingProfiler.available():
+            logger.warning("sampling profiler is not available on this platform or thread, using the deterministic profiler")
+            mode = DETERMINISTIC
+        os.makedirs(out_dir, exist_ok=True)
+        start = time.perf_counter()
+        if mode == DETERMINISTIC:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                EvalProfiler.evaluate(inst_model, stud_model, grade_model)
+            finally:
+                profiler.disable()
+            wall_s = time.perf_counter() - start
+            path = os.path.join(out_dir, f"{name}.prof")
+            profiler.dump_stats(path)
+            rows = EvalProfiler.stats_rows(pstats.Stats(profiler))
+        else:
+            profiler = SamplingProfiler(interval)
+            profiler.enable()
+            try:
+                EvalProfiler.evaluate(inst_model, stud_model, grade_model)
+            finally:
+                profiler.disable()
+            wall_s = time.perf_counter() - start
+            path = os.path.join(out_dir, f"{name}.folded")
+            profiler.write_folded(path)
+            rows = profiler.function_rows()
+        logger.info(f"profiled {name} in {wall_s:.3f}s -> {path}")
+        return {"name": name, "mode": mode, "wall_s": wall_s, "file": path}, rows
+
+    @staticmethod
+    def stats_rows(stats: pstats.Stats) -> Dict[str, Dict[str, Any]]:
+        rows: Dict[str, Dict[str, Any]] = {}
+        for (filename, lineno, funcname), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            key = EvalProfiler.function_key(filename, lineno, funcname)
+            row = rows.setdefault(key, {"function": key, "calls": 0, "self_s": 0.0, "cum_s": 0.0})
+            row["calls"] += ncalls
+            row["self_s"] += tottime
+            row["cum_s"] += cumtime
+        return rows
+
+    @staticmethod
+    def merge_rows(total: Dict[str, Dict[str, Any]], rows: Dict[str, Dict[str, Any]]) -> None:
+        for key, row in rows.items():
+            merged = total.get(key)
+            if merged is None:
+                total[key] = dict(row)
+                continue
+            if merged["calls"] is not None and row["calls"] is not None:
+                merged["calls"] += row["calls"]
+            merged["self_s"] += row["self_s"]
+            merged["cum_s"] += row["cum_s"]
+
+    @staticmethod
+    def top_functions(rows: Dict[str, Dict[str, Any]], top_n: Optional[int] = 25, sort: str = "self_s", packages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        # packages limits the report to functions of the given top-level directories, e.g. REPO_PACKAGES,
+        # top_n None returns all of them
+        selected = [
+            row for row in rows.values()
+            if packages is None or any(row["function"].startswith(f"{package}/") for package in packages)
+        ]
+        return sorted(selected, key=lambda row: row[sort], reverse=True)[:top_n]
+
+    @staticmethod
+    def profile_batch(inst_model: UMLModel, stud_models: Iterable[Tuple[str, UMLModel]], grade_model: Optional[GradeModel], out_dir: str, mode: str = DETERMINISTIC, top_n: int = 25, packages: Optional[List[str]] = None) -> Dict[str, Any]:
+        # profiles every diagram separately and writes the aggregated report.json and report.txt to out_dir
+        diagrams: List[Dict[str, Any]] = []
+        total_rows: Dict[str, Dict[str, Any]] = {}
+        for name, stud_model in stud_models:
+            diagram, rows = EvalProfiler.profile_diagram(name, inst_model, stud_model, grade_model, out_dir, mode)
+            diagrams.append(diagram)
+            EvalProfiler.merge_rows(total_rows, rows)
+        report = {
+            "mode": mode,
+            "diagrams": diagrams,
+            "total_wall_s": sum(diagram["wall_s"] for diagram in diagrams),
+            "top_self": EvalProfiler.top_functions(total_rows, top_n, "self_s", packages),
+            "top_cumulative": EvalProfiler.top_functions(total_rows, top_n, "cum_s", packages),
+            # NOTE: all functions, compare_reports uses them so functions outside the top lists are compared as well
+            "functions": EvalProfiler.top_functions(total_rows, None, "self_s", packages)
+        }
+        with open(os.path.join(out_dir, "report.json"), "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        with open(os.path.join(out_dir, "report.txt"), "w", encoding="utf-8") as file:
+            file.write(EvalProfiler.format_report(report))
+        return report
+
+    @staticmethod
+    def format_report(report: Dict[str, Any]) -> str:
+        lines = [f"mode: {report['mode']}, diagrams: {len(report['diagrams'])}, total: {report['total_wall_s']:.3f}s", ""]
+        for diagram in sorted(report["diagrams"], key=lambda diagram: diagram["wall_s"], reverse=True):
+            lines.append(f"{diagram['wall_s']:>10.3f}s  {diagram['name']}")
+        for title, key in (("top self time", "top_self"), ("top cumulative time", "top_cumulative")):
+            lines.append("")
+            lines.append(f"{title}:")
+            lines.append(f"{'self_s':>10} {'cum_s':>10} {'calls':>10}  function")
+            for row in report[key]:
+                calls = "-" if row["calls"] is None else str(row["calls"])
+                lines.append(f"{row['self_s']:>10.4f} {row['cum_s']:>10.4f} {calls:>10}  {row['function']}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def compare_reports(old_report: Dict[str, Any], new_report: Dict[str, Any], threshold: float = 0.2, min_seconds: float = 0.001) -> List[Dict[str, Any]]:
+        # functions whose self time grew by more than threshold (relative) between two reports, largest first,
+        # reports without the full function list (written before it was added) are compared by their top_self lists
+        old_rows = {row["function"]: row for row in old_report.get("functions", old_report["top_self"])}
+        regressions: List[Dict[str, Any]] = []
+        for row in new_report.get("functions", new_report["top_self"]):
+            old = old_rows.get(row["function"])
+            old_s = old["self_s"] if old else 0.0
+            if row["self_s"] - old_s >= min_seconds and row["self_s"] > old_s * (1 + threshold):
+                regressions.append({"function": row["function"], "old_self_s": old_s, "new_self_s": row["self_s"], "delta_s": row["self_s"] - old_s})
+        return sorted(regressions, key=lambda regression: regression["delta_s"], reverse=True)
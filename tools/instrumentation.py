@@ -0,0 +1,142 @@
+from tools.name_normalizer import NameNormalizer
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import time
+
+class EvalMetrics:
+    # NOTE: collected timings and counters of one evaluation, see Instrumentation
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        # count, total and max of observed sizes (e.g. assignment matrix rows)
+        self.observations: Dict[str, Dict[str, float]] = {}
+        self.open_spans: List[int] = []
+
+    def __repr__(self):
+        return f"EvalMetrics(spans: {len(self.spans)}, counters: {self.counters})"
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float) -> None:
+        stats = self.observations.get(name)
+        if stats is None:
+            self.observations[name] = {"count": 1, "total": value, "max": value}
+        else:
+            stats["count"] += 1
+            stats["total"] += value
+            stats["max"] = max(stats["max"], value)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Dict[str, Any]]:
+        # NOTE: the counters of a span include the counters of its nested spans
+        span: Dict[str, Any] = {
+            "name": name,
+            "parent": self.open_spans[-1] if self.open_spans else None,
+            "depth": len(self.open_spans)
+        }
+        self.spans.append(span)
+        self.open_spans.append(len(self.spans) - 1)
+        counters_before = dict(self.counters)
+        cache_before = NameNormalizer.normalize.cache_info()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield span
+        finally:
+            span["wall_s"] = time.perf_counter() - wall_start
+            span["cpu_s"] = time.process_time() - cpu_start
+            cache_after = NameNormalizer.normalize.cache_info()
+            counters = {name: value - counters_before.get(name, 0) for name, value in self.counters.items() if value != counters_before.get(name, 0)}
+            if cache_after.hits != cache_before.hits:
+                counters["normalize_cache_hits"] = cache_after.hits - cache_before.hits
+            if cache_after.misses != cache_before.misses:
+                counters["normalize_cache_misses"] = cache_after.misses - cache_before.misses
+            span["counters"] = counters
+            self.open_spans.pop()
+
+    def merge(self, other: 'EvalMetrics') -> None:
+        # adds the spans, counters and observations of other, its top level spans become children of the open span
+        offset = len(self.spans)
+        parent = self.open_spans[-1] if self.open_spans else None
+        for span in other.spans:
+            span = dict(span)
+            span["parent"] = parent if span["parent"] is None else span["parent"] + offset
+            span["depth"] += len(self.open_spans)
+            self.spans.append(span)
+        for name, value in other.counters.items():
+            self.count(name, value)
+        for name, stats in other.observations.items():
+            own = self.observations.get(name)
+            if own is None:
+                self.observations[name] = dict(stats)
+            else:
+                own["count"] += stats["count"]
+                own["total"] += stats["total"]
+                own["max"] = max(own["max"], stats["max"])
+
+    def stage_times(self) -> Dict[str, float]:
+        # total wall time per span name
+        times: Dict[str, float] = {}
+        for span in self.spans:
+            times[span["name"]] = times.get(span["name"], 0.0) + span.get("wall_s", 0.0)
+        return times
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "spans": [dict(span) for span in self.spans],
+            "counters": dict(self.counters),
+            "observations": {name: dict(stats) for name, stats in self.observations.items()}
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def dump_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_json())
+
+# NOTE: None when instrumentation is off, so each hook costs a single lookup
+ACTIVE_METRICS: ContextVar[Optional[EvalMetrics]] = ContextVar("active_metrics", default=None)
+
+class Instrumentation:
+    @staticmethod
+    def count(name: str, n: int = 1) -> None:
+        metrics = ACTIVE_METRICS.get()
+        if metrics is not None:
+            metrics.count(name, n)
+
+    @staticmethod
+    def observe(name: str, value: float) -> None:
+        metrics = ACTIVE_METRICS.get()
+        if metrics is not None:
+            metrics.observe(name, value)
+
+    @staticmethod
+    def active() -> Optional[EvalMetrics]:
+        return ACTIVE_METRICS.get()
+
+    @staticmethod
+    @contextmanager
+    def activate(metrics: EvalMetrics) -> Iterator[EvalMetrics]:
+        token = ACTIVE_METRICS.set(metrics)
+        try:
+            yield metrics
+        finally:
+            ACTIVE_METRICS.reset(token)
+
+    @staticmethod
+    def record(metrics: Optional[EvalMetrics], name: str):
+        # activates the metrics and opens a span, does nothing if the metrics are None
+        if metrics is None:
+            return nullcontext()
+        return Instrumentation._record(metrics, name)
+
+    @staticmethod
+    @contextmanager
+    def _record(metrics: EvalMetrics, name: str) -> Iterator[EvalMetrics]:
+        with Instrumentation.activate(metrics), metrics.span(name):
+            yield metrics
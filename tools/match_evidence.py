@@ -0,0 +1,135 @@
+from UML_model.uml_element import UMLElement
+from tools.syntactic_check import SyntacticCheck
+from tools.semantic_check import SemanticCheck
+from tools.instrumentation import Instrumentation
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+SYNTACTIC = "syntactic"
+SEMANTIC = "semantic"
+CONTENT = "content"
+
+class MatchEvidence:
+    # NOTE: results of the similarity checks of one (instructor, student) element pair,
+    # checks that were not needed (e.g. semantic after a syntactic match) stay None
+    __slots__ = ("inst_element", "stud_element", "syntactic", "syntactic_score", "semantic", "semantic_score", "semantic_scores", "content", "content_score")
+
+    def __init__(self, inst_element: UMLElement, stud_element: UMLElement):
+        self.inst_element: UMLElement = inst_element
+        self.stud_element: UMLElement = stud_element
+        self.syntactic: Optional[bool] = None
+        self.syntactic_score: Optional[float] = None
+        self.semantic: Optional[bool] = None
+        self.semantic_score: Optional[float] = None
+        # single scores of the semantic check, see SEMANTIC_WEIGHTS
+        self.semantic_scores: Optional[Dict[str, float]] = None
+        self.content: Optional[bool] = None
+        self.content_score: Optional[float] = None
+
+    def __repr__(self):
+        return f"MatchEvidence({self.inst_element.name}, {self.stud_element.name}, fired: {self.fired}, syntactic: {self.syntactic_score}, semantic: {self.semantic_score}, content: {self.content_score})"
+
+    @property
+    def fired(self) -> Optional[str]:
+        # the first check that matched, in the order the comparators run them
+        if self.syntactic:
+            return SYNTACTIC
+        if self.semantic:
+            return SEMANTIC
+        if self.content:
+            return CONTENT
+        return None
+
+    @property
+    def name_match(self) -> bool:
+        return bool(self.syntactic or self.semantic)
+
+    def check_names(self) -> bool:
+        # syntactic check first, semantic check only if needed, each at most once
+        if self.syntactic is None:
+            self.syntactic, self.syntactic_score = SyntacticCheck.syntactic_match(self.inst_element.norm, self.stud_element.norm)
+        if not self.syntactic and self.semantic is None:
+            self.semantic, self.semantic_score, self.semantic_scores = SemanticCheck.semantic_match_components(self.inst_element.norm, self.stud_element.norm)
+        return self.name_match
+
+    def check_content(self, content_check: Callable[[UMLElement, UMLElement], Tuple[bool, float]]) -> bool:
+        if self.content is None:
+            self.content, self.content_score = content_check(self.inst_element, self.stud_element)
+        return self.content
+
+class EvidenceStore:
+    # NOTE: filled by the comparators while matching (see EvalModel.evidence) so the evaluators can reuse the results,
+    # pairs are keyed by id() since hashing a UMLClass hashes its whole content
+    def __init__(self):
+        self.evidence: Dict[Tuple[int, int], MatchEvidence] = {}
+
+    def __repr__(self):
+        return f"EvidenceStore(pairs: {len(self.evidence)})"
+
+    def __len__(self):
+        return len(self.evidence)
+
+    def get(self, inst_element: UMLElement, stud_element: UMLElement) -> Optional[MatchEvidence]:
+        return self.evidence.get((id(inst_element), id(stud_element)))
+
+    def evidence_for(self, inst_element: UMLElement, stud_element: UMLElement) -> MatchEvidence:
+        key = (id(inst_element), id(stud_element))
+        evidence = self.evidence.get(key)
+        if evidence is None:
+            Instrumentation.count("evidence_misses")
+            evidence = MatchEvidence(inst_element, stud_element)
+            self.evidence[key] = evidence
+        else:
+            Instrumentation.count("evidence_hits")
+        return evidence
+
+    def name_match(self, inst_element: UMLElement, stud_element: UMLElement) -> bool:
+        # same result as syntactic_match(...)[0] or semantic_match(...)[0] with the active thresholds
+        return self.evidence_for(inst_element, stud_element).check_names()
+
+    def content_match(self, inst_element: UMLElement, stud_element: UMLElement, content_check: Callable[[UMLElement, UMLElement], Tuple[bool, float]]) -> bool:
+        return self.evidence_for(inst_element, stud_element).check_content(content_check)
+
+    def merge(self, other: 'EvidenceStore') -> None:
+        # adds the pairs of other that are missing and the check results that are missing in pairs of both stores,
+        # e.g. the stores of parallel stages (see ParallelStages) in the order the stages would run serially
+        for key, evidence in other.evidence.items():
+            own = self.evidence.get(key)
+            if own is None:
+                self.evidence[key] = evidence
+            elif own is not evidence:
+                for slot in MatchEvidence.__slots__[2:]:
+                    if getattr(own, slot) is None:
+                        setattr(own, slot, getattr(evidence, slot))
+
+    def matches(self) -> List[MatchEvidence]:
+        return [evidence for evidence in self.evidence.values() if evidence.fired]
+
+# NOTE: None outside of EvalModel stages, the checks then run without recording
+ACTIVE_EVIDENCE: ContextVar[Optional[EvidenceStore]] = ContextVar("active_evidence", default=None)
+
+class EvidenceCheck:
+    @staticmethod
+    def name_match(inst_element: UMLElement, stud_element: UMLElement) -> bool:
+        store = ACTIVE_EVIDENCE.get()
+        if store is None:
+            return MatchEvidence(inst_element, stud_element).check_names()
+        return store.name_match(inst_element, stud_element)
+
+    @staticmethod
+    def content_match(inst_element: UMLElement, stud_element: UMLElement, content_check: Callable[[UMLElement, UMLElement], Tuple[bool, float]]) -> bool:
+        store = ACTIVE_EVIDENCE.get()
+        if store is None:
+            return MatchEvidence(inst_element, stud_element).check_content(content_check)
+        return store.content_match(inst_element, stud_element, content_check)
+
+    @staticmethod
+    @contextmanager
+    def activate(store: EvidenceStore) -> Iterator[EvidenceStore]:
+        token = ACTIVE_EVIDENCE.set(store)
+        try:
+            yield store
+        finally:
+            ACTIVE_EVIDENCE.reset(token)
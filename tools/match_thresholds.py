@@ -0,0 +1,74 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import product
+from typing import Dict, Iterator, List, Optional, Tuple
+
+class MatchThresholds:
+    # NOTE: thresholds of the similarity checks, the checks use the active thresholds if no threshold is passed
+    __slots__ = ("syntactic", "semantic", "content", "relation")
+
+    def __init__(self, syntactic: float = 0.6, semantic: float = 0.65, content: float = 0.5, relation: float = 0.5):
+        self.syntactic: float = syntactic
+        self.semantic: float = semantic
+        # class and enum content match
+        self.content: float = content
+        self.relation: float = relation
+
+    def __repr__(self):
+        return f"MatchThresholds(syntactic: {self.syntactic}, semantic: {self.semantic}, content: {self.content}, relation: {self.relation})"
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in MatchThresholds.__slots__}
+
+    @staticmethod
+    def grid(syntactic: Optional[List[float]] = None, semantic: Optional[List[float]] = None, content: Optional[List[float]] = None, relation: Optional[List[float]] = None) -> List['MatchThresholds']:
+        # all combinations of the given values, thresholds without values keep their default
+        default = MatchThresholds()
+        values = [
+            syntactic or [default.syntactic],
+            semantic or [default.semantic],
+            content or [default.content],
+            relation or [default.relation]
+        ]
+        return [MatchThresholds(*combination) for combination in product(*values)]
+
+    @staticmethod
+    def active() -> 'MatchThresholds':
+        return ACTIVE_THRESHOLDS.get()
+
+    @staticmethod
+    @contextmanager
+    def activate(thresholds: 'MatchThresholds') -> Iterator['MatchThresholds']:
+        token = ACTIVE_THRESHOLDS.set(thresholds)
+        try:
+            yield thresholds
+        finally:
+            ACTIVE_THRESHOLDS.reset(token)
+
+ACTIVE_THRESHOLDS: ContextVar[MatchThresholds] = ContextVar("active_thresholds", default=MatchThresholds())
+
+class RawScoreCache:
+    # NOTE: similarity scores by normalized word pair before any threshold is applied,
+    # shared by the runs of a threshold sweep so the semantic models run once per pair
+    def __init__(self):
+        self.syntactic: Dict[Tuple[str, str], float] = {}
+        self.semantic: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def __repr__(self):
+        return f"RawScoreCache(syntactic: {len(self.syntactic)}, semantic: {len(self.semantic)})"
+
+    @staticmethod
+    def active() -> Optional['RawScoreCache']:
+        return ACTIVE_SCORE_CACHE.get()
+
+    @staticmethod
+    @contextmanager
+    def activate(cache: 'RawScoreCache') -> Iterator['RawScoreCache']:
+        token = ACTIVE_SCORE_CACHE.set(cache)
+        try:
+            yield cache
+        finally:
+            ACTIVE_SCORE_CACHE.reset(token)
+
+# NOTE: None unless a sweep is running, the checks then compute every score
+ACTIVE_SCORE_CACHE: ContextVar[Optional[RawScoreCache]] = ContextVar("active_score_cache", default=None)
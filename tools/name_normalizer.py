@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import Tuple, Union
+import re
+import sys
+
+# NOTE: compiled once, see NameNormalizer.split_identifier
+CAMEL_CASE_PATTERN = re.compile(r'(?<=[a-z0-9])([A-Z])')
+ACRONYM_PATTERN = re.compile(r'(?<=[A-Z])([A-Z][a-z])')
+
+class NormalizedName:
+    # NOTE: precomputed name forms of a UML element, all strings are interned
+    __slots__ = ("raw", "lower", "split", "tokens")
+
+    def __init__(self, raw: str):
+        self.raw: str = sys.intern(raw)
+        # lowercase and stripped, used for lookups and the syntactic check
+        self.lower: str = sys.intern(raw.strip().lower())
+        # camel case split and lowercase, used for the semantic check
+        self.split: str = sys.intern(NameNormalizer.split_identifier(raw))
+        self.tokens: Tuple[str, ...] = tuple(sys.intern(token) for token in self.split.split())
+
+    def __repr__(self):
+        return f"NormalizedName({self.raw})"
+
+    def __str__(self):
+        return self.raw
+
+class NameNormalizer:
+    @staticmethod
+    def split_identifier(identifier: str) -> str:
+        # Insert space before any uppercase letter that follows a lowercase letter or a number
+        s = CAMEL_CASE_PATTERN.sub(r' \1', identifier)
+        # Insert space before sequences of uppercase letters followed by lowercase letters (acronyms like XMLParser)
+        s = ACRONYM_PATTERN.sub(r' \1', s)
+        # Replace underscores with spaces
+        s = s.replace("_", " ")
+        s = s.lower()
+        return s
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def normalize(name: str) -> NormalizedName:
+        # NOTE: equal names share one NormalizedName instance across all models
+        return NormalizedName(name)
+
+    @staticmethod
+    def lower_form(name: Union[str, NormalizedName]) -> str:
+        return name.lower if isinstance(name, NormalizedName) else name.strip().lower()
+
+    @staticmethod
+    def split_form(name: Union[str, NormalizedName]) -> str:
+        return name.split if isinstance(name, NormalizedName) else NameNormalizer.normalize(name).split
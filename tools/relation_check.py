@@ -1,7 +1,8 @@
 from UML_model.uml_class import UMLClass
 from UML_model.uml_element import UMLElement
+from tools.match_thresholds import MatchThresholds
 
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import logging
 
 logger = logging.getLogger("relation_check")
@@ -16,10 +17,14 @@ if not logger.hasHandlers():
 class RelationCheck:
     # NOTE: only works if the other relationships are to already mapped destination classes
     @staticmethod
-    def relation_match(list_s: List[UMLElement], list_i: List[UMLElement], class_match_map: Dict[UMLClass, UMLClass], threshold: float = 0.5) -> Tuple[bool, float]:
+    def relation_match(list_s: List[UMLElement], list_i: List[UMLElement], class_match_map: Dict[UMLClass, UMLClass], threshold: Optional[float] = None, reverse_class_match_map: Optional[Dict[UMLClass, UMLClass]] = None) -> Tuple[bool, float]:
+        # NOTE: pass reverse_class_match_map when calling this in a loop to avoid rebuilding it per pair
         if not list_s or not list_i:
             return (False, 0)
-        reverse_class_match_map = {v: k for k, v in class_match_map.items()}
+        if threshold is None:
+            threshold = MatchThresholds.active().relation
+        if reverse_class_match_map is None:
+            reverse_class_match_map = {v: k for k, v in class_match_map.items()}
         mapped_list_s = [reverse_class_match_map.get(cs).name for cs in list_s if reverse_class_match_map.get(cs)]
         set_s, set_i = set(mapped_list_s), {ci.name for ci in list_i}
         overlap = len(set_s & set_i)
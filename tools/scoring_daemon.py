@@ -0,0 +1,303 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+import threading
+import msgpack
+import numpy as np
+
+logger = logging.getLogger("scoring_daemon")
+logger.setLevel(logging.DEBUG)
+
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] - %(name)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+DAEMON_PROTOCOL_VERSION = 1
+# socket of the daemon, an empty value turns the daemon off for the SemanticCheck,
+# defaults to the runtime directory of the user (or the temp directory)
+SOCKET_ENV = "UML_SCORING_SOCKET"
+CONNECT_TIMEOUT = 1.0
+# a request is one chunk of word pairs, the first request of a daemon also loads wordnet
+REQUEST_TIMEOUT = 120.0
+# msgpack extension of numpy scalars, the scores are returned with the types the models computed
+NUMPY_EXT = 1
+FRAME_HEADER = struct.Struct(">I")
+
+class ScoringProtocol:
+    # NOTE: length prefixed msgpack frames, requests are {"op": "ping" | "score" | "stop", "pairs": [[word1, word2], ...]},
+    # answers {"ok": True, ...} or {"ok": False, "error": message}
+    @staticmethod
+    def socket_path() -> Optional[str]:
+        path = os.environ.get(SOCKET_ENV)
+        if path is None:
+            runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+            if runtime_dir and os.path.isdir(runtime_dir):
+                path = os.path.join(runtime_dir, "uml_scoring.sock")
+            else:
+                uid = os.getuid() if hasattr(os, "getuid") else 0
+                path = os.path.join(tempfile.gettempdir(), f"uml_scoring_{uid}.sock")
+        return path or None
+
+    @staticmethod
+    def trusted(path: str) -> bool:
+        # NOTE: the scores decide the grades, a socket of another user (e.g. created first in the shared temp directory)
+        # or one others may write to is not used
+        try:
+            status = os.stat(path)
+        except OSError:
+            return False
+        if hasattr(os, "getuid") and status.st_uid != os.getuid():
+            return False
+        return not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    @staticmethod
+    def pack_default(value: Any) -> Any:
+        if isinstance(value, np.generic):
+            dtype = value.dtype.str.encode()
+            return msgpack.ExtType(NUMPY_EXT, bytes([len(dtype)]) + dtype + value.tobytes())
+        raise TypeError(f"cannot send {type(value).__name__}")
+
+    @staticmethod
+    def unpack_ext(code: int, data: bytes) -> Any:
+        if code == NUMPY_EXT:
+            dtype = data[1:data[0] + 1].decode()
+            return np.frombuffer(data[data[0] + 1:], dtype=dtype)[0]
+        return msgpack.ExtType(code, data)
+
+    @staticmethod
+    def send(connection: socket.socket, message: Dict[str, Any]) -> None:
+        data = msgpack.packb(message, default=ScoringProtocol.pack_default, use_bin_type=True)
+        connection.sendall(FRAME_HEADER.pack(len(data)) + data)
+
+    @staticmethod
+    def receive(connection: socket.socket) -> Optional[Dict[str, Any]]:
+        # None if the other side closed the connection between two frames
+        header = ScoringProtocol.receive_exactly(connection, FRAME_HEADER.size)
+        if header is None:
+            return None
+        data = ScoringProtocol.receive_exactly(connection, FRAME_HEADER.unpack(header)[0])
+        if data is None:
+            raise ConnectionError("connection closed within a frame")
+        return msgpack.unpackb(data, ext_hook=ScoringProtocol.unpack_ext, raw=False)
+
+    @staticmethod
+    def receive_exactly(connection: socket.socket, size: int) -> Optional[bytes]:
+        buffer = bytearray()
+        while len(buffer) < size:
+            data = connection.recv(size - len(buffer))
+            if not data:
+                return None
+            buffer += data
+        return bytes(buffer)
+
+class ScoringClient:
+    # NOTE: one connection per process, requests of several threads are sent one after another
+    def __init__(self, path: str):
+        self.path: str = path
+        self.connection: Optional[socket.socket] = None
+        self.pid: Optional[int] = None
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ScoringClient(path: {self.path}, connected: {self.connection is not None})"
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            # NOTE: a forked worker (e.g. of a ProcessPoolExecutor) opens its own connection
+            if self.connection is None or self.pid != os.getpid():
+                connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                connection.settimeout(CONNECT_TIMEOUT)
+                try:
+                    connection.connect(self.path)
+                except OSError:
+                    connection.close()
+                    raise
+                connection.settimeout(REQUEST_TIMEOUT)
+                self.connection = connection
+                self.pid = os.getpid()
+            try:
+                ScoringProtocol.send(self.connection, message)
+                answer = ScoringProtocol.receive(self.connection)
+                if answer is None:
+                    raise ConnectionError("daemon closed the connection")
+            except Exception:
+                self.close()
+                raise
+        if not answer.get("ok"):
+            raise RuntimeError(answer.get("error", "request failed"))
+        return answer
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        try:
+            answer = self.request({"op": "ping"})
+        except Exception:
+            return None
+        return answer if answer.get("version") == DAEMON_PROTOCOL_VERSION else None
+
+    def score(self, pairs: List[Tuple[str, str]]) -> Optional[List[Dict[str, float]]]:
+        # None if the daemon failed, the client is then dropped and the caller scores in its own process
+        try:
+            return self.request({"op": "score", "pairs": [list(pair) for pair in pairs]})["components"]
+        except Exception as e:
+            logger.warning(f"scoring daemon at {self.path} failed, scoring in process: {e}")
+            SCORING_CLIENTS[self.path] = None
+            return None
+
+    def stop(self) -> None:
+        self.request({"op": "stop"})
+        self.close()
+
+    def close(self) -> None:
+        if self.connection is not None and self.pid == os.getpid():
+            self.connection.close()
+        self.connection = None
+
+    @staticmethod
+    def active() -> Optional['ScoringClient']:
+        # NOTE: checked once per process and socket path, a daemon started later is not picked up
+        path = ScoringProtocol.socket_path()
+        if path is None or not hasattr(socket, "AF_UNIX"):
+            return None
+        if path in SCORING_CLIENTS:
+            return SCORING_CLIENTS[path]
+        client = None
+        if os.path.exists(path) and not ScoringProtocol.trusted(path):
+            logger.warning(f"ignoring the scoring socket {path}, it is not owned by this user or writable by others")
+        elif os.path.exists(path):
+            client = ScoringClient(path)
+            if client.ping() is None:
+                logger.warning(f"no scoring daemon answers at {path}, scoring in process")
+                client = None
+            else:
+                logger.debug(f"scoring through the daemon at {path}")
+        SCORING_CLIENTS[path] = client
+        return client
+
+# None for socket paths without a working daemon
+SCORING_CLIENTS: Dict[str, Optional[ScoringClient]] = {}
+
+class ScoringRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        daemon: 'ScoringDaemon' = self.server.daemon
+        with daemon.connections_lock:
+            daemon.connections.add(self.request)
+        try:
+            self.serve(daemon)
+        finally:
+            with daemon.connections_lock:
+                daemon.connections.discard(self.request)
+
+    def serve(self, daemon: 'ScoringDaemon') -> None:
+        while True:
+            try:
+                message = ScoringProtocol.receive(self.request)
+            except (OSError, ValueError) as e:
+                logger.warning(f"dropped connection: {e}")
+                return
+            if message is None:
+                return
+            try:
+                answer = daemon.answer(message)
+            except Exception as e:
+                logger.exception(f"request {message.get('op')} failed")
+                answer = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            try:
+                ScoringProtocol.send(self.request, answer)
+            except OSError as e:
+                logger.warning(f"dropped connection: {e}")
+                return
+            if message.get("op") == "stop":
+                # NOTE: shutdown waits for serve_forever, which runs in another thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class ScoringServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        daemon: 'ScoringDaemon'
+
+class ScoringDaemon:
+    # NOTE: keeps the semantic models of the SemanticCheck loaded and scores word pairs for short lived processes,
+    # the connections are served on threads but the models run one request at a time
+    def __init__(self, path: Optional[str] = None):
+        path = path or ScoringProtocol.socket_path()
+        if path is None:
+            raise ValueError(f"no socket path, {SOCKET_ENV} is empty")
+        self.path: str = path
+        self.lock = threading.Lock()
+        self.requests: int = 0
+        self.pairs: int = 0
+        self.server: Optional['ScoringServer'] = None
+        # open client connections, closed with the daemon
+        self.connections: Set[socket.socket] = set()
+        self.connections_lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ScoringDaemon(path: {self.path}, requests: {self.requests}, pairs: {self.pairs})"
+
+    def warm(self) -> None:
+        # loads the models and the lazily loaded wordnet corpus before the first request
+        from tools.semantic_check import SemanticCheck
+        SemanticCheck.local_components("class diagram", "model")
+
+    def answer(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        op = message.get("op")
+        if op == "ping" or op == "stop":
+            return {"ok": True, "version": DAEMON_PROTOCOL_VERSION, "pid": os.getpid(), "requests": self.requests, "pairs": self.pairs}
+        if op == "score":
+            from tools.semantic_check import SemanticCheck
+            pairs = message["pairs"]
+            with self.lock:
+                components = [SemanticCheck.local_components(word1, word2) for word1, word2 in pairs]
+                self.requests += 1
+                self.pairs += len(pairs)
+            return {"ok": True, "components": components}
+        raise ValueError(f"unknown op {op}")
+
+    def bind(self) -> 'ScoringServer':
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise RuntimeError("the scoring daemon needs Unix sockets")
+        if os.path.exists(self.path):
+            client = ScoringClient(self.path)
+            running = client.ping() is not None
+            client.close()
+            if running:
+                raise RuntimeError(f"a scoring daemon is already running at {self.path}")
+            # NOTE: left over by a daemon that was killed
+            os.remove(self.path)
+        # NOTE: the socket is created without group and other permissions, see ScoringProtocol.trusted
+        umask = os.umask(0o177)
+        try:
+            self.server = ScoringServer(self.path, ScoringRequestHandler)
+        finally:
+            os.umask(umask)
+        self.server.daemon = self
+        return self.server
+
+    def serve_forever(self) -> None:
+        server = self.server or self.bind()
+        logger.info(f"scoring daemon listening at {self.path}")
+        try:
+            server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.server_close()
+            self.server = None
+            with self.connections_lock:
+                for connection in self.connections:
+                    try:
+                        connection.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+            if os.path.exists(self.path):
+                os.remove(self.path)
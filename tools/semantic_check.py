@@ -1,11 +1,12 @@
+from tools.name_normalizer import NameNormalizer, NormalizedName
+from tools.instrumentation import Instrumentation
+from tools.match_thresholds import MatchThresholds, RawScoreCache
+from tools.semantic_components import SEMANTIC_WEIGHTS
+from tools.scoring_daemon import ScoringClient
 from itertools import product
-from typing import Tuple
-from sentence_transformers import SentenceTransformer
-import spacy
-from nltk.corpus import wordnet as wn
-from nltk.corpus import wordnet_ic
-import re
+from typing import Any, Dict, List, Optional, Tuple, Union
 import logging
+import threading
 
 logger = logging.getLogger("semantic_check")
 logger.setLevel(logging.DEBUG)
@@ -16,36 +17,56 @@ if not logger.hasHandlers():
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
-model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-try:
-    logger.info("loading spacy \'en_core_web_lg\'")
-    nlp = spacy.load('en_core_web_lg')
-except OSError:
-    logger.error("spaCy model 'en_core_web_lg' is not installed. Run: python -m spacy download en_core_web_lg")
-    raise
-try:
-    logger.info("loading wordnet \'ic-brown.dat\'")
-    brown_ic = wordnet_ic.ic('ic-brown.dat')
-except LookupError:
-    logger.error("NLTK WordNet IC file 'ic-brown.dat' is missing. Run: nltk.download('wordnet_ic')")
-    raise
+class SemanticModels:
+    # NOTE: the models are loaded on first use, a process that scores through the ScoringDaemon never loads them
+    @staticmethod
+    def get(name: str) -> Any:
+        if not SEMANTIC_MODELS:
+            SemanticModels.load()
+        return SEMANTIC_MODELS[name]
+
+    @staticmethod
+    def load() -> Dict[str, Any]:
+        with MODELS_LOCK:
+            if SEMANTIC_MODELS:
+                return SEMANTIC_MODELS
+            from sentence_transformers import SentenceTransformer
+            import spacy
+            from nltk.corpus import wordnet as wn
+            from nltk.corpus import wordnet_ic
+
+            models = {"wordnet": wn}
+            models["transformer"] = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+            try:
+                logger.info("loading spacy \'en_core_web_lg\'")
+                models["spacy"] = spacy.load('en_core_web_lg')
+            except OSError:
+                logger.error("spaCy model 'en_core_web_lg' is not installed. Run: python -m spacy download en_core_web_lg")
+                raise
+            try:
+                logger.info("loading wordnet \'ic-brown.dat\'")
+                models["brown_ic"] = wordnet_ic.ic('ic-brown.dat')
+            except LookupError:
+                logger.error("NLTK WordNet IC file 'ic-brown.dat' is missing. Run: nltk.download('wordnet_ic')")
+                raise
+            # NOTE: filled at once, get reads it without the lock
+            SEMANTIC_MODELS.update(models)
+            return SEMANTIC_MODELS
+
+SEMANTIC_MODELS: Dict[str, Any] = {}
+MODELS_LOCK = threading.Lock()
 
 class SemanticCheck:
     @staticmethod
-    def normalize_identifier(identifier: str) -> str:
-        # Insert space before any uppercase letter that follows a lowercase letter or a number
-        s = re.sub(r'(?<=[a-z0-9])([A-Z])', r' \1', identifier)
-        # Insert space before sequences of uppercase letters followed by lowercase letters (acronyms like XMLParser)
-        s = re.sub(r'(?<=[A-Z])([A-Z][a-z])', r' \1', s)
-        # Replace underscores with spaces
-        s = s.replace("_", " ")
-        s = s.lower()
-        return s
+    def normalize_identifier(identifier: Union[str, NormalizedName]) -> str:
+        # NOTE: cached, see NameNormalizer.split_identifier
+        return NameNormalizer.split_form(identifier)
 
     @staticmethod
     def wup_score(w1: str, w2: str):
         words1 = w1.split()
         words2 = w2.split()
+        wn = SemanticModels.get("wordnet")
         max_score = 0
         for word1, word2 in product(words1, words2):
             synsets1 = wn.synsets(word1)
@@ -59,6 +80,8 @@ class SemanticCheck:
     def lin_score(w1: str, w2: str):
         words1 = w1.split()
         words2 = w2.split()
+        wn = SemanticModels.get("wordnet")
+        brown_ic = SemanticModels.get("brown_ic")
         max_score = 0
         positions = [wn.NOUN, wn.VERB]
         for word1, word2 in product(words1, words2):
@@ -75,6 +98,7 @@ class SemanticCheck:
 
     @staticmethod
     def transformer_score(w1: str, w2: str):
+        model = SemanticModels.get("transformer")
         wordlist = [w1, w2]
         embeddings = model.encode(wordlist)
         similarity = model.similarity(embeddings[0], embeddings[1]).item()
@@ -82,20 +106,65 @@ class SemanticCheck:
 
     @staticmethod
     def word2vec_score(w1, w2):
+        nlp = SemanticModels.get("spacy")
         wordlist = [w1, w2]
         embeddings = [nlp(w) for w in wordlist]
         similarity = embeddings[0].similarity(embeddings[1])
         return similarity
 
     @staticmethod
-    def semantic_match(word1: str, word2: str, threshold: float = 0.65) -> Tuple[bool, float]:
+    def semantic_match(word1: Union[str, NormalizedName], word2: Union[str, NormalizedName], threshold: Optional[float] = None) -> Tuple[bool, float]:
+        # NOTE: accepts the precomputed element.norm to skip the normalization
+        # the threshold defaults to the active MatchThresholds (0.65)
+        match, score, _ = SemanticCheck.semantic_match_components(word1, word2, threshold)
+        return (match, score)
+
+    @staticmethod
+    def semantic_match_components(word1: Union[str, NormalizedName], word2: Union[str, NormalizedName], threshold: Optional[float] = None) -> Tuple[bool, float, Dict[str, float]]:
+        # same as semantic_match, additionally returns the single scores (see SEMANTIC_WEIGHTS) e.g. for the MatchEvidence
+        if threshold is None:
+            threshold = MatchThresholds.active().semantic
         word1 = SemanticCheck.normalize_identifier(word1)
         word2 = SemanticCheck.normalize_identifier(word2)
-        wup = SemanticCheck.wup_score(word1, word2)
-        lin = SemanticCheck.lin_score(word1, word2)
-        w2v = SemanticCheck.word2vec_score(word1, word2)
-        tra = SemanticCheck.transformer_score(word1, word2)
-        score = (0.1 * wup + 0.2 * lin + 0.3 * w2v + 0.4 * tra)
+        cache = RawScoreCache.active()
+        components = None if cache is None else cache.semantic.get((word1, word2))
+        if components is None:
+            components = SemanticCheck.semantic_components(word1, word2)
+            if cache is not None:
+                cache.semantic[(word1, word2)] = components
+        else:
+            Instrumentation.count("raw_score_hits")
+        score = SemanticCheck.combine_components(components)
         if score >= threshold:
             logger.debug(f"Semantic match: '{word1}' and '{word2}': score = {score:.2f}")
-        return (score >= threshold, score)
+        return (score >= threshold, score, components)
+
+    @staticmethod
+    def semantic_components(word1: str, word2: str) -> Dict[str, float]:
+        # the single scores of two normalized identifiers
+        return SemanticCheck.semantic_components_batch([(word1, word2)])[0]
+
+    @staticmethod
+    def semantic_components_batch(pairs: List[Tuple[str, str]]) -> List[Dict[str, float]]:
+        # NOTE: scored by the ScoringDaemon in one request if one is running, otherwise in this process
+        Instrumentation.count("semantic_match", len(pairs))
+        client = ScoringClient.active()
+        if client is not None:
+            components = client.score(pairs)
+            if components is not None:
+                return components
+        return [SemanticCheck.local_components(word1, word2) for word1, word2 in pairs]
+
+    @staticmethod
+    def local_components(word1: str, word2: str) -> Dict[str, float]:
+        # this is where the models run
+        return {
+            "wup": SemanticCheck.wup_score(word1, word2),
+            "lin": SemanticCheck.lin_score(word1, word2),
+            "w2v": SemanticCheck.word2vec_score(word1, word2),
+            "tra": SemanticCheck.transformer_score(word1, word2)
+        }
+
+    @staticmethod
+    def combine_components(components: Dict[str, float]) -> float:
+        return sum(weight * components[name] for name, weight in SEMANTIC_WEIGHTS.items())
@@ -0,0 +1,120 @@
+from tools.match_thresholds import MatchThresholds, RawScoreCache
+
+from itertools import product
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+# weights of the single similarity scores in the semantic score
+# NOTE: kept apart from semantic_check so the stored scores can be re-weighted without loading the semantic models
+SEMANTIC_WEIGHTS: Dict[str, float] = {"wup": 0.1, "lin": 0.2, "w2v": 0.3, "tra": 0.4}
+SEMANTIC_COMPONENTS: List[str] = list(SEMANTIC_WEIGHTS)
+
+class SemanticComponentStore:
+    # NOTE: component scores of the semantic check by normalized word pair, one row per pair and one column
+    # per component in the order of SEMANTIC_COMPONENTS, saved as .npz so other weightings can be evaluated offline
+    def __init__(self, pairs: Optional[List[Tuple[str, str]]] = None, components: Optional[np.ndarray] = None):
+        self.pairs: List[Tuple[str, str]] = pairs or []
+        self.components: np.ndarray = components if components is not None else np.zeros((0, len(SEMANTIC_COMPONENTS)))
+        self.pair_index: Dict[Tuple[str, str], int] = {pair: i for i, pair in enumerate(self.pairs)}
+
+    def __repr__(self):
+        return f"SemanticComponentStore(pairs: {len(self.pairs)})"
+
+    def __len__(self):
+        return len(self.pairs)
+
+    @staticmethod
+    def from_cache(cache: RawScoreCache) -> 'SemanticComponentStore':
+        pairs = list(cache.semantic)
+        components = np.array([[cache.semantic[pair][name] for name in SEMANTIC_COMPONENTS] for pair in pairs], dtype=float).reshape(len(pairs), len(SEMANTIC_COMPONENTS))
+        return SemanticComponentStore(pairs, components)
+
+    def update(self, cache: RawScoreCache) -> int:
+        # adds the pairs of the cache that are not stored yet, returns how many were added
+        new_pairs = [pair for pair in cache.semantic if pair not in self.pair_index]
+        if new_pairs:
+            rows = np.array([[cache.semantic[pair][name] for name in SEMANTIC_COMPONENTS] for pair in new_pairs], dtype=float)
+            self.components = np.vstack([self.components, rows])
+            for pair in new_pairs:
+                self.pair_index[pair] = len(self.pairs)
+                self.pairs.append(pair)
+        return len(new_pairs)
+
+    def fill_cache(self, cache: RawScoreCache) -> None:
+        # NOTE: stored pairs are replayed by the semantic check instead of running the models again
+        for pair, row in zip(self.pairs, self.components.tolist()):
+            cache.semantic.setdefault(pair, dict(zip(SEMANTIC_COMPONENTS, row)))
+
+    def save(self, path: str) -> None:
+        words = np.array(self.pairs, dtype=str).reshape(len(self.pairs), 2)
+        np.savez_compressed(path, words=words, components=self.components, names=np.array(SEMANTIC_COMPONENTS))
+
+    @staticmethod
+    def load(path: str) -> 'SemanticComponentStore':
+        with np.load(path) as data:
+            if list(data["names"]) != SEMANTIC_COMPONENTS:
+                raise ValueError(f"Stored components {list(data['names'])} do not match {SEMANTIC_COMPONENTS}")
+            pairs = [(str(word1), str(word2)) for word1, word2 in data["words"]]
+            return SemanticComponentStore(pairs, data["components"].astype(float))
+
+class SemanticReweighting:
+    # NOTE: weightings are rows of a (k, 4) matrix, scoring all of them is one matrix product over the stored corpus
+    @staticmethod
+    def weight_matrix(weightings: List[Dict[str, float]]) -> np.ndarray:
+        return np.array([[weighting.get(name, 0.0) for name in SEMANTIC_COMPONENTS] for weighting in weightings], dtype=float).reshape(len(weightings), len(SEMANTIC_COMPONENTS))
+
+    @staticmethod
+    def scores(store: SemanticComponentStore, weights: np.ndarray) -> np.ndarray:
+        # (pairs, k) combined scores for the (k, 4) weights
+        return store.components @ weights.T
+
+    @staticmethod
+    def simplex_weightings(step: float = 0.1) -> np.ndarray:
+        # all weightings with non negative weights in multiples of step that add up to 1
+        steps = int(round(1 / step))
+        grid = [combination for combination in product(range(steps + 1), repeat=len(SEMANTIC_COMPONENTS) - 1) if sum(combination) <= steps]
+        weights = np.array([list(combination) + [steps - sum(combination)] for combination in grid], dtype=float)
+        return weights / steps
+
+    @staticmethod
+    def evaluate(store: SemanticComponentStore, weightings: List[Dict[str, float]], threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        # decisions of every weighting compared to the current SEMANTIC_WEIGHTS, flips counted in both directions
+        if threshold is None:
+            threshold = MatchThresholds.active().semantic
+        weights = SemanticReweighting.weight_matrix(weightings)
+        current = SemanticReweighting.scores(store, SemanticReweighting.weight_matrix([SEMANTIC_WEIGHTS]))[:, 0] >= threshold
+        decisions = SemanticReweighting.scores(store, weights) >= threshold
+        to_match = (decisions & ~current[:, None]).sum(axis=0)
+        to_no_match = (~decisions & current[:, None]).sum(axis=0)
+        results: List[Dict[str, Any]] = []
+        for k, weighting in enumerate(weightings):
+            flipped = np.flatnonzero(decisions[:, k] != current)
+            results.append({
+                "weights": {name: float(weights[k, c]) for c, name in enumerate(SEMANTIC_COMPONENTS)},
+                "matches": int(decisions[:, k].sum()),
+                "flips": int(to_match[k] + to_no_match[k]),
+                "to_match": int(to_match[k]),
+                "to_no_match": int(to_no_match[k]),
+                "flipped_pairs": [store.pairs[i] for i in flipped]
+            })
+        return results
+
+    @staticmethod
+    def fit(store: SemanticComponentStore, labels: Dict[Tuple[str, str], bool], threshold: Optional[float] = None, step: float = 0.1) -> Dict[str, Any]:
+        # weighting of the simplex grid that agrees with the most labeled pairs, ties keep the grid order
+        if threshold is None:
+            threshold = MatchThresholds.active().semantic
+        rows = [store.pair_index[pair] for pair in labels if pair in store.pair_index]
+        if not rows:
+            raise ValueError("None of the labeled pairs are in the store")
+        expected = np.array([labels[store.pairs[i]] for i in rows], dtype=bool)
+        weights = SemanticReweighting.simplex_weightings(step)
+        decisions = store.components[rows] @ weights.T >= threshold
+        agreement = (decisions == expected[:, None]).mean(axis=0)
+        best = int(np.argmax(agreement))
+        return {
+            "weights": {name: float(weights[best, c]) for c, name in enumerate(SEMANTIC_COMPONENTS)},
+            "agreement": float(agreement[best]),
+            "labeled_pairs": len(rows),
+            "weightings": len(weights)
+        }
@@ -1,5 +1,8 @@
+from tools.name_normalizer import NameNormalizer, NormalizedName
+from tools.instrumentation import Instrumentation
+from tools.match_thresholds import MatchThresholds, RawScoreCache
 import Levenshtein
-from typing import Tuple
+from typing import Optional, Tuple, Union
 import logging
 import re
 
@@ -24,10 +27,22 @@ class SyntacticCheck:
         return similarity
     
     @staticmethod
-    def syntactic_match(word1: str, word2: str, threshold: float = 0.6) -> Tuple[bool, float]:
-        word1 = word1.strip().lower()
-        word2 = word2.strip().lower()
-        similarity = SyntacticCheck.levenshtein_score(word1, word2)
+    def syntactic_match(word1: Union[str, NormalizedName], word2: Union[str, NormalizedName], threshold: Optional[float] = None) -> Tuple[bool, float]:
+        # NOTE: accepts the precomputed element.norm to skip the normalization
+        # the threshold defaults to the active MatchThresholds (0.6)
+        if threshold is None:
+            threshold = MatchThresholds.active().syntactic
+        word1 = NameNormalizer.lower_form(word1)
+        word2 = NameNormalizer.lower_form(word2)
+        cache = RawScoreCache.active()
+        similarity = None if cache is None else cache.syntactic.get((word1, word2))
+        if similarity is None:
+            Instrumentation.count("syntactic_match")
+            similarity = SyntacticCheck.levenshtein_score(word1, word2)
+            if cache is not None:
+                cache.syntactic[(word1, word2)] = similarity
+        else:
+            Instrumentation.count("raw_score_hits")
         if similarity >= threshold:
             logger.debug(f"Syntactic match: '{word1}' and '{word2}': score = {similarity:.2f}")
         return (similarity >= threshold, similarity)
@@ -0,0 +1,76 @@
+from UML_model.uml_model import UMLModel
+from grading.grade_metamodel import GradeModel
+from plantuml_eval.eval_model import EvalModel
+from main_eval.eval_handler import EvalHandler
+from tools.match_thresholds import MatchThresholds, RawScoreCache
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import csv
+import json
+import logging
+import time
+
+logger = logging.getLogger("threshold_sweep")
+logger.setLevel(logging.DEBUG)
+
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] - %(name)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+class ThresholdSweep:
+    # NOTE: every setting reruns the comparators and evaluators with its thresholds, the raw similarity scores
+    # (levenshtein and the semantic models) are computed once and replayed from the RawScoreCache
+    @staticmethod
+    def evaluate(inst_model: UMLModel, stud_model: UMLModel, thresholds: MatchThresholds, grade_model: Optional[GradeModel] = None) -> Dict[str, float]:
+        with MatchThresholds.activate(thresholds):
+            eval_model = EvalModel(inst_model, stud_model, grade_model)
+            return EvalHandler(eval_model).criteria_scores()
+
+    @staticmethod
+    def sweep(inst_model: UMLModel, stud_model: UMLModel, grid: List[MatchThresholds], grade_model: Optional[GradeModel] = None, cache: Optional[RawScoreCache] = None) -> List[Dict[str, Any]]:
+        # one row per setting: {"thresholds": {...}, "scores": {criteria id: score}}
+        cache = cache or RawScoreCache()
+        rows: List[Dict[str, Any]] = []
+        with RawScoreCache.activate(cache):
+            for thresholds in grid:
+                start = time.perf_counter()
+                scores = ThresholdSweep.evaluate(inst_model, stud_model, thresholds, grade_model)
+                rows.append({"thresholds": thresholds.to_dict(), "scores": scores, "wall_s": time.perf_counter() - start})
+        return rows
+
+    @staticmethod
+    def sweep_batch(inst_model: UMLModel, stud_models: Iterable[Tuple[str, UMLModel]], grid: List[MatchThresholds], grade_model: Optional[GradeModel] = None) -> List[Dict[str, Any]]:
+        # NOTE: the cache is shared by all diagrams, the same names are often compared in several student diagrams
+        cache = RawScoreCache()
+        rows: List[Dict[str, Any]] = []
+        for name, stud_model in stud_models:
+            for row in ThresholdSweep.sweep(inst_model, stud_model, grid, grade_model, cache):
+                rows.append({"diagram": name, **row})
+            logger.info(f"{name}: swept {len(grid)} settings, {cache}")
+        return rows
+
+    @staticmethod
+    def write_json(rows: List[Dict[str, Any]], path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(rows, file, indent=2)
+
+    @staticmethod
+    def write_csv(rows: List[Dict[str, Any]], path: str) -> None:
+        # one line per (diagram, setting), one column per threshold and per criteria
+        criteria_ids: List[str] = []
+        for row in rows:
+            for criteria_id in row["scores"]:
+                if criteria_id not in criteria_ids:
+                    criteria_ids.append(criteria_id)
+        header = ["diagram"] + list(MatchThresholds.__slots__) + criteria_ids
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(
+                    [row.get("diagram", "")]
+                    + [row["thresholds"][name] for name in MatchThresholds.__slots__]
+                    + [row["scores"].get(criteria_id, "") for criteria_id in criteria_ids]
+                )
@@ -0,0 +1,41 @@
+from tools.UML_stream_parser import UMLStreamParser
+from grading.grade_file import GradeModelFile
+from plantuml_eval.eval_model import EvalModel
+from main_eval.eval_handler import EvalHandler
+from main_eval.result_store import ResultStoreWriter
+
+import argparse
+import os
+
+# batch grading into a columnar result store
+# python z_grade_batch.py instructor.puml responses.puml [more.puml ...] --store results --model gpt-4o --task chess --run 1
+# every @startuml block of the response files is evaluated against the first block of the instructor file and appended
+# to the store with the given metadata, running it again for another model or run adds to the same store,
+# --workers runs the stages of large diagrams in parallel (see ParallelStages),
+# see ResultStore for loading and aggregating the results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grade diagrams against an instructor diagram and append the criteria scores to a result store.")
+    parser.add_argument("instructor", help="PlantUML file with the instructor diagram (first @startuml block)")
+    parser.add_argument("students", nargs="+", help="PlantUML files with one or more diagrams to grade")
+    parser.add_argument("--grade", help="grade model JSON of the instructor diagram (see GradeModelFile)")
+    parser.add_argument("--store", default="results", help="directory of the result store")
+    parser.add_argument("--model", default="", help="metadata: model that produced the diagrams")
+    parser.add_argument("--task", default="", help="metadata: task of the diagrams")
+    parser.add_argument("--run", default="", help="metadata: run of the benchmark")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="records per chunk file")
+    parser.add_argument("--workers", type=int, default=1, help="threads per diagram for the independent stages and the similarity scores")
+    args = parser.parse_args()
+
+    _, instructor_model = next(UMLStreamParser.iter_models(args.instructor))
+    grade_model = GradeModelFile.load(args.grade, instructor_model) if args.grade else None
+
+    with ResultStoreWriter(args.store, EvalHandler.scoring_plan(), chunk_size=args.chunk_size) as writer:
+        for path in args.students:
+            prefix = os.path.splitext(os.path.basename(path))[0]
+            for block, model in UMLStreamParser.iter_models(path):
+                eval_model = EvalModel(instructor_model, model, grade_model)
+                eval_model.run_all_stages(args.workers)
+                handler = EvalHandler(eval_model)
+                writer.append_handler(handler, model=args.model, task=args.task, run=args.run, name=f"{prefix}_{block.index}")
+    print(repr(writer))
@@ -0,0 +1,41 @@
+from main_eval.leaderboard import Leaderboard
+
+import argparse
+import json
+
+# leaderboard of a result store written by z_grade_batch.py
+# python z_leaderboard.py --store results --by model task --resamples 1000 --confidence 0.95 --criteria CPT.CLS SYC.CLS
+# the state is saved in the store, running it again only reads the records that were graded since,
+# --json writes the table with the histograms of the total scores
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank the models of a result store by their mean total score with bootstrap confidence intervals.")
+    parser.add_argument("--store", default="results", help="directory of the result store")
+    parser.add_argument("--by", nargs="*", default=["model"], help="metadata to group by")
+    parser.add_argument("--resamples", type=int, default=1000, help="bootstrap resamples per group")
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence of the bootstrap intervals")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--criteria", nargs="+", help="also print the mean scores of these criteria ids")
+    parser.add_argument("--json", help="file to write the table to")
+    args = parser.parse_args()
+
+    leaderboard = Leaderboard.open(args.store, resamples=args.resamples, confidence=args.confidence, seed=args.seed)
+    rows = leaderboard.table(args.by)
+    leaderboard.save()
+
+    def number(value) -> str:
+        return "-" if value is None else f"{value:.3f}"
+
+    for row in rows:
+        group = ", ".join(str(row[name]) for name in args.by)
+        print(f"{row['rank']:>3}  {group:<30} n={row['records']:<7} mean={number(row['mean'])} [{number(row['ci_low'])}, {number(row['ci_high'])}]  std={number(row['std'])}")
+
+    if args.criteria:
+        keys, means = leaderboard.criteria_means(args.by, args.criteria)
+        print(" " * 32 + "  ".join(f"{criteria_id:>8}" for criteria_id in args.criteria))
+        for key, row in zip(keys, means):
+            print(f"{', '.join(key):<32}" + "  ".join(f"{'-' if value != value else f'{value:.3f}':>8}" for value in row))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(rows, file, indent=2)
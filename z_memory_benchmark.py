@@ -0,0 +1,52 @@
+from UML_model.uml_model import UMLModel
+from UML_model.uml_class import UMLClass, UMLAttribute, UMLOperation, UMLDataType, UMLVisibility
+from UML_model.uml_enum import UMLEnum, UMLValue
+from UML_model.uml_relation import UMLRelation, UMLRelationType
+
+import gc
+import tracemalloc
+
+# memory footprint of a large synthetic model with the __slots__ based element classes
+# compared to the same model built from subclasses that carry a per-instance __dict__ again
+
+N_CLASSES = 2_000
+N_ATTRIBUTES = 8
+N_OPERATIONS = 4
+N_ENUMS = 500
+N_VALUES = 6
+
+DictAttribute = type("UMLAttribute", (UMLAttribute,), {})
+DictOperation = type("UMLOperation", (UMLOperation,), {})
+DictValue = type("UMLValue", (UMLValue,), {})
+DictRelation = type("UMLRelation", (UMLRelation,), {})
+
+def build_model(attribute_cls, operation_cls, value_cls, relation_cls) -> UMLModel:
+    classes = [
+        UMLClass(
+            f"Class{i}",
+            [attribute_cls(f"attr{j}", UMLDataType.INT, "", UMLVisibility.PRIVATE) for j in range(N_ATTRIBUTES)],
+            [operation_cls(f"oper{j}", {"param": UMLDataType.STR}, [UMLDataType.BOOL], UMLVisibility.PUBLIC) for j in range(N_OPERATIONS)]
+        )
+        for i in range(N_CLASSES)
+    ]
+    enums = [UMLEnum(f"Enum{i}", [value_cls(f"VALUE{j}") for j in range(N_VALUES)]) for i in range(N_ENUMS)]
+    relations = [relation_cls(UMLRelationType.COMPOSITION, classes[i], classes[i + 1], "1", "*") for i in range(N_CLASSES - 1)]
+    return UMLModel(plantuml_str=None, class_list=classes, enum_list=enums, relation_list=relations)
+
+def measure(attribute_cls, operation_cls, value_cls, relation_cls) -> int:
+    gc.collect()
+    tracemalloc.start()
+    model = build_model(attribute_cls, operation_cls, value_cls, relation_cls)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model
+    return size
+
+if __name__ == "__main__":
+    n_elements = N_CLASSES * (N_ATTRIBUTES + N_OPERATIONS) + N_ENUMS * N_VALUES + N_CLASSES - 1
+    with_dict = measure(DictAttribute, DictOperation, DictValue, DictRelation)
+    with_slots = measure(UMLAttribute, UMLOperation, UMLValue, UMLRelation)
+    print(f"elements (attributes, operations, values, relations): {n_elements}")
+    print(f"with __dict__:  {with_dict / 1024 / 1024:.2f} MiB ({with_dict / n_elements:.0f} B per element)")
+    print(f"with __slots__: {with_slots / 1024 / 1024:.2f} MiB ({with_slots / n_elements:.0f} B per element)")
+    print(f"reduction: {(1 - with_slots / with_dict) * 100:.1f}%")
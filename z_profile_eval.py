@@ -0,0 +1,43 @@
+from tools.UML_stream_parser import UMLStreamParser
+from tools.eval_profiler import EvalProfiler, PROFILE_MODES, DETERMINISTIC, REPO_PACKAGES
+
+import argparse
+import json
+import os
+
+# profiling mode of the grading pipeline
+# python z_profile_eval.py instructor.puml students.puml [more.puml ...] --mode sampling --out profiles --top 30
+# every @startuml block of the student files is evaluated against the first block of the instructor file,
+# each evaluation writes its own profile, report.json / report.txt aggregate the top functions of the batch
+# --compare profiles_old/report.json lists the functions that got slower since that run
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the evaluation of student diagrams against an instructor diagram.")
+    parser.add_argument("instructor", help="PlantUML file with the instructor diagram (first @startuml block)")
+    parser.add_argument("students", nargs="+", help="PlantUML files with one or more student diagrams")
+    parser.add_argument("--mode", choices=PROFILE_MODES, default=DETERMINISTIC)
+    parser.add_argument("--out", default="profiles", help="output directory for the profiles and the report")
+    parser.add_argument("--top", type=int, default=25, help="number of functions in the report")
+    parser.add_argument("--all-functions", action="store_true", help="also report functions outside of the repository packages")
+    parser.add_argument("--compare", help="report.json of an earlier run to compare against")
+    args = parser.parse_args()
+
+    _, instructor_model = next(UMLStreamParser.iter_models(args.instructor))
+
+    def student_models():
+        for path in args.students:
+            prefix = os.path.splitext(os.path.basename(path))[0]
+            for block, model in UMLStreamParser.iter_models(path):
+                yield f"{prefix}_{block.index}", model
+
+    packages = None if args.all_functions else REPO_PACKAGES
+    report = EvalProfiler.profile_batch(instructor_model, student_models(), None, args.out, args.mode, args.top, packages)
+    print(EvalProfiler.format_report(report))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            old_report = json.load(file)
+        regressions = EvalProfiler.compare_reports(old_report, report)
+        print(f"{len(regressions)} functions got slower than in {args.compare}")
+        for regression in regressions:
+            print(f"{regression['old_self_s']:>10.4f} -> {regression['new_self_s']:>10.4f}  {regression['function']}")
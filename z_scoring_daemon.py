@@ -0,0 +1,40 @@
+from tools.scoring_daemon import ScoringDaemon, ScoringClient, ScoringProtocol, SOCKET_ENV
+
+import argparse
+import sys
+
+# local scoring daemon that keeps the semantic models loaded between grading runs
+# python z_scoring_daemon.py                 (runs in the foreground, stop it with ctrl+c or --stop)
+# python z_scoring_daemon.py --status | --stop
+# the SemanticCheck of every other process uses the daemon if it answers at the socket and scores in process otherwise,
+# the socket defaults to uml_scoring.sock in $XDG_RUNTIME_DIR (or uml_scoring_<uid>.sock in the temp directory) and can be
+# set with UML_SCORING_SOCKET (an empty value turns the daemon off), sockets of other users are not used
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the semantic similarity scores of the SemanticCheck over a Unix socket.")
+    parser.add_argument("--socket", help=f"socket path, defaults to ${SOCKET_ENV} or a file in the runtime directory")
+    parser.add_argument("--status", action="store_true", help="print the state of a running daemon")
+    parser.add_argument("--stop", action="store_true", help="stop a running daemon")
+    args = parser.parse_args()
+
+    path = args.socket or ScoringProtocol.socket_path()
+    if args.status or args.stop:
+        client = ScoringClient(path)
+        status = client.ping()
+        if status is None:
+            print(f"no scoring daemon at {path}")
+            sys.exit(1)
+        print(f"scoring daemon at {path}: pid {status['pid']}, {status['requests']} requests, {status['pairs']} pairs")
+        if args.stop:
+            client.stop()
+            print("stopped")
+        sys.exit(0)
+
+    daemon = ScoringDaemon(path)
+    daemon.bind()
+    daemon.warm()
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(repr(daemon))
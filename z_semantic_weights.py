@@ -0,0 +1,69 @@
+from tools.match_thresholds import RawScoreCache
+from tools.semantic_components import SemanticComponentStore, SemanticReweighting, SEMANTIC_COMPONENTS
+
+import argparse
+import csv
+import json
+import os
+
+# stored component scores of the semantic check and offline re-weighting
+# python z_semantic_weights.py collect --store components.npz instructor.puml students.puml [more.puml ...]
+# python z_semantic_weights.py evaluate --store components.npz --weights wup=0.25,lin=0.25,w2v=0.25,tra=0.25 --weights w2v=0.5,tra=0.5
+# python z_semantic_weights.py fit --store components.npz --labels labels.csv --step 0.05
+# collect runs the evaluations and adds the component scores of every new word pair to the store,
+# evaluate and fit only use the store, labels.csv has the columns word1, word2, match (1 or 0) with normalized words
+
+def parse_weights(text: str):
+    weights = {}
+    for part in text.split(","):
+        name, value = part.split("=")
+        if name not in SEMANTIC_COMPONENTS:
+            raise argparse.ArgumentTypeError(f"Unknown component '{name}', expected one of {SEMANTIC_COMPONENTS}")
+        weights[name] = float(value)
+    return weights
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Store the component scores of the semantic check and evaluate other weightings on them.")
+    parser.add_argument("command", choices=["collect", "evaluate", "fit"])
+    parser.add_argument("files", nargs="*", help="collect: instructor file followed by the student files")
+    parser.add_argument("--store", default="semantic_components.npz", help="npz file with the stored component scores")
+    parser.add_argument("--weights", action="append", type=parse_weights, default=[], help="evaluate: a weighting as name=value pairs")
+    parser.add_argument("--threshold", type=float, help="threshold of the match decision, default of MatchThresholds if not set")
+    parser.add_argument("--labels", help="fit: csv with the columns word1, word2, match")
+    parser.add_argument("--step", type=float, default=0.1, help="fit: step of the weight grid")
+    args = parser.parse_intermixed_args()
+
+    store = SemanticComponentStore.load(args.store) if os.path.exists(args.store) else SemanticComponentStore()
+
+    if args.command == "collect":
+        # NOTE: imported here so evaluate and fit do not load the semantic models
+        from tools.UML_stream_parser import UMLStreamParser
+        from tools.match_thresholds import MatchThresholds
+        from tools.threshold_sweep import ThresholdSweep
+
+        if len(args.files) < 2:
+            parser.error("collect needs the instructor file and at least one student file")
+        _, instructor_model = next(UMLStreamParser.iter_models(args.files[0]))
+        cache = RawScoreCache()
+        store.fill_cache(cache)
+        for path in args.files[1:]:
+            for _, model in UMLStreamParser.iter_models(path):
+                ThresholdSweep.sweep(instructor_model, model, [MatchThresholds()], cache=cache)
+        added = store.update(cache)
+        store.save(args.store)
+        print(f"{added} new pairs, {len(store)} pairs stored in {args.store}")
+
+    elif args.command == "evaluate":
+        if not args.weights:
+            parser.error("evaluate needs at least one --weights")
+        for result in SemanticReweighting.evaluate(store, args.weights, args.threshold):
+            print(json.dumps({key: value for key, value in result.items() if key != "flipped_pairs"}))
+            for word1, word2 in result["flipped_pairs"]:
+                print(f"\t{word1} - {word2}")
+
+    else:
+        if not args.labels:
+            parser.error("fit needs --labels")
+        with open(args.labels, encoding="utf-8") as file:
+            labels = {(row["word1"], row["word2"]): row["match"].strip() in ("1", "true", "True") for row in csv.DictReader(file)}
+        print(json.dumps(SemanticReweighting.fit(store, labels, args.threshold, args.step), indent=2))
@@ -0,0 +1,38 @@
+from tools.UML_stream_parser import UMLStreamParser
+from tools.match_thresholds import MatchThresholds
+from tools.threshold_sweep import ThresholdSweep
+
+import argparse
+import os
+
+# threshold sweep of the similarity checks
+# python z_threshold_sweep.py instructor.puml students.puml [more.puml ...] --semantic 0.55 0.6 0.65 0.7 0.75 --content 0.4 0.5 --out sweep
+# every combination of the given thresholds is evaluated for every student diagram, thresholds without values keep their default,
+# the raw similarity scores are only computed once, sweep.csv and sweep.json hold the per criteria scores of every setting
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate student diagrams against an instructor diagram for a grid of match thresholds.")
+    parser.add_argument("instructor", help="PlantUML file with the instructor diagram (first @startuml block)")
+    parser.add_argument("students", nargs="+", help="PlantUML files with one or more student diagrams")
+    parser.add_argument("--syntactic", nargs="+", type=float, help="thresholds of the syntactic name check")
+    parser.add_argument("--semantic", nargs="+", type=float, help="thresholds of the semantic name check")
+    parser.add_argument("--content", nargs="+", type=float, help="thresholds of the class and enum content check")
+    parser.add_argument("--relation", nargs="+", type=float, help="thresholds of the relation check")
+    parser.add_argument("--out", default="sweep", help="output directory for sweep.csv and sweep.json")
+    args = parser.parse_args()
+
+    _, instructor_model = next(UMLStreamParser.iter_models(args.instructor))
+
+    def student_models():
+        for path in args.students:
+            prefix = os.path.splitext(os.path.basename(path))[0]
+            for block, model in UMLStreamParser.iter_models(path):
+                yield f"{prefix}_{block.index}", model
+
+    grid = MatchThresholds.grid(args.syntactic, args.semantic, args.content, args.relation)
+    rows = ThresholdSweep.sweep_batch(instructor_model, student_models(), grid)
+
+    os.makedirs(args.out, exist_ok=True)
+    ThresholdSweep.write_csv(rows, os.path.join(args.out, "sweep.csv"))
+    ThresholdSweep.write_json(rows, os.path.join(args.out, "sweep.json"))
+    print(f"{len(grid)} settings, {len(rows)} rows written to {args.out}")